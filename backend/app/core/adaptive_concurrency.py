@@ -0,0 +1,221 @@
+"""
+Adaptive Concurrency
+Latency-driven concurrency limits with bounded, priority-ordered wait queues.
+The limit grows additively while latency stays near its observed floor and is
+cut multiplicatively once latency inflates past ``latency_tolerance`` times
+the floor (AIMD), so a slow dependency sheds load instead of accumulating an
+unbounded backlog. Requests that cannot be queued are rejected with
+``OverloadedError`` (an HTTP 429 at the API boundary); when the queue is full,
+a higher-priority arrival evicts the lowest-priority waiter.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class OverloadedError(Exception):
+    """A request was shed because the limiter and its queue are full"""
+
+    def __init__(self, name: str, reason: str, retry_after: float = 1.0):
+        super().__init__(f"{name} is overloaded: {reason}")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for one downstream.
+
+    ``acquire``/``release`` (or the ``slot`` context manager) bracket each
+    call. Every completed call feeds its latency back: the limit rises by
+    ``1/limit`` per call that found the limit in use, and falls by
+    ``backoff`` at most once per round trip when latency exceeds the
+    tolerated multiple of the baseline (the smallest latency seen, drifting
+    upward by ``baseline_drift`` per sample so it follows lasting shifts).
+    Latencies under ``latency_floor`` seconds never count as congestion, so
+    a few instant cache hits cannot pin the baseline near zero.
+    Waiters are served highest priority first, then in arrival order.
+    """
+
+    def __init__(self, name: str, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 32,
+                 max_queue: int = 16, queue_timeout: float = 5.0, latency_tolerance: float = 2.0,
+                 backoff: float = 0.75, baseline_drift: float = 0.01, latency_floor: float = 0.05):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.baseline_drift = baseline_drift
+        self.latency_floor = latency_floor
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self.smoothed_latency: Optional[float] = None
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._last_decrease = 0.0
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0, "evicted": 0, "timed_out": 0,
+                      "increases": 0, "decreases": 0}
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def load(self) -> float:
+        """Share of capacity in use, counting waiters; capped at 1.0"""
+        return min(1.0, (self.in_flight + len(self._queue)) / self.capacity)
+
+    @property
+    def saturated(self) -> bool:
+        return self.in_flight >= self.capacity or bool(self._queue)
+
+    def retry_after(self) -> float:
+        """Rough seconds until a new request could start"""
+        latency = self.smoothed_latency or 1.0
+        return max(1.0, latency * (len(self._queue) + 1) / self.capacity)
+
+    def would_shed(self, priority: int) -> bool:
+        """Whether a request at ``priority`` would be rejected right now"""
+        if not self.saturated or len(self._queue) < self.max_queue:
+            return False
+        return priority <= -self._lowest_waiter()[0]
+
+    # -- admission -----------------------------------------------------------
+
+    async def acquire(self, priority: int = 5) -> None:
+        if self.in_flight < self.capacity and not self._queue:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(priority, future)
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(future)
+            self.stats["timed_out"] += 1
+            raise OverloadedError(self.name, "queue wait timed out", self.retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # The slot was handed over just as the caller went away
+                self.in_flight -= 1
+                self._dispatch()
+            self._discard(future)
+            raise
+        self.stats["admitted"] += 1
+
+    def release(self, started: Optional[float] = None, dropped: bool = False) -> None:
+        """Return a slot; ``started`` (``time.monotonic()`` at admission) feeds the limit"""
+        was_limited = self.in_flight >= self.capacity
+        self.in_flight -= 1
+        if started is not None:
+            self.record(time.monotonic() - started, started, dropped, was_limited)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 5) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        started = time.monotonic()
+        dropped = False
+        try:
+            yield
+        except asyncio.TimeoutError:
+            dropped = True
+            raise
+        finally:
+            self.release(started, dropped)
+
+    def _enqueue(self, priority: int, future: asyncio.Future) -> None:
+        if len(self._queue) >= self.max_queue:
+            lowest = self._lowest_waiter()
+            if priority <= -lowest[0]:
+                self.stats["rejected"] += 1
+                raise OverloadedError(self.name, "wait queue is full", self.retry_after())
+            self._queue.remove(lowest)
+            heapq.heapify(self._queue)
+            self.stats["evicted"] += 1
+            lowest[2].set_exception(
+                OverloadedError(self.name, "displaced by a higher-priority request", self.retry_after())
+            )
+        heapq.heappush(self._queue, (-priority, next(self._seq), future))
+        self.stats["queued"] += 1
+
+    def _lowest_waiter(self) -> Tuple[int, int, asyncio.Future]:
+        # Lowest priority, most recent arrival
+        return max(self._queue, key=lambda entry: (entry[0], entry[1]))
+
+    def _discard(self, future: asyncio.Future) -> None:
+        for entry in self._queue:
+            if entry[2] is future:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                return
+
+    def _dispatch(self) -> None:
+        while self._queue and self.in_flight < self.capacity:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(True)
+
+    # -- limit ---------------------------------------------------------------
+
+    def record(self, latency: float, started: Optional[float] = None, dropped: bool = False,
+               was_limited: bool = True) -> None:
+        """Adjust the limit from one completed call"""
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency *= 1 + self.baseline_drift
+        self.smoothed_latency = latency if self.smoothed_latency is None else \
+            0.8 * self.smoothed_latency + 0.2 * latency
+
+        congested = dropped or latency > max(self.baseline_latency, self.latency_floor) * self.latency_tolerance
+        if congested:
+            # Calls admitted before the last cut already saw the old limit
+            if started is None or started >= self._last_decrease:
+                previous = self.limit
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                self.stats["decreases"] += 1
+                if int(previous) != int(self.limit):
+                    logger.info("Concurrency limit lowered", limiter=self.name, limit=self.capacity,
+                                latency_ms=round(latency * 1000, 1))
+        elif was_limited and self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self.stats["increases"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "limit": self.capacity,
+            "in_flight": self.in_flight,
+            "queued": len(self._queue),
+            "load": self.load,
+            "baseline_latency_ms": self.baseline_latency * 1000 if self.baseline_latency is not None else None,
+            "smoothed_latency_ms": self.smoothed_latency * 1000 if self.smoothed_latency is not None else None,
+        }
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "OverloadedError",
+]
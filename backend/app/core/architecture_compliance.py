@@ -20,6 +20,8 @@ from functools import wraps
 import sys
 import os
 
+from app.core.code_analysis_context import CodeAnalysisContext, get_analysis_context
+
 logger = structlog.get_logger(__name__)
 
 class ComplianceLevel(Enum):
@@ -78,6 +80,7 @@ class ArchitectureAnalyzer:
     
     def __init__(self):
         self.analyzed_files: Dict[str, ast.AST] = {}
+        self._contexts: Dict[int, CodeAnalysisContext] = {}
         self.dependency_graph: Dict[str, List[str]] = defaultdict(list)
         self.interface_registry: Dict[str, List[str]] = defaultdict(list)
         
@@ -87,8 +90,10 @@ class ArchitectureAnalyzer:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            tree = ast.parse(content, filename=file_path)
+            context = get_analysis_context(content)
+            tree = context.require_tree()
             self.analyzed_files[file_path] = tree
+            self._contexts[id(tree)] = context
             return tree
         except Exception as e:
             logger.error("Failed to analyze file", file=file_path, error=str(e))
@@ -110,26 +115,25 @@ class ArchitectureAnalyzer:
         
         return trees
     
+    def nodes_of(self, tree: ast.AST, *node_types: Type[ast.AST]) -> List[ast.AST]:
+        """Nodes of the given types, from the shared analysis buckets when the tree came from analyze_file"""
+        context = self._contexts.get(id(tree))
+        if context is not None and context.tree is tree:
+            return context.of_type(*node_types)
+        return [node for node in ast.walk(tree) if isinstance(node, node_types)]
+    
     def extract_classes(self, tree: ast.AST) -> List[ast.ClassDef]:
         """Extract class definitions from AST"""
-        classes = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                classes.append(node)
-        return classes
+        return self.nodes_of(tree, ast.ClassDef)
     
     def extract_functions(self, tree: ast.AST) -> List[ast.FunctionDef]:
         """Extract function definitions from AST"""
-        functions = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append(node)
-        return functions
+        return self.nodes_of(tree, ast.FunctionDef)
     
     def extract_imports(self, tree: ast.AST) -> List[str]:
         """Extract import statements from AST"""
         imports = []
-        for node in ast.walk(tree):
+        for node in self.nodes_of(tree, ast.Import, ast.ImportFrom):
             if isinstance(node, ast.Import):
                 for alias in node.names:
                     imports.append(alias.name)
@@ -304,20 +308,24 @@ class SOLIDPrinciplesChecker:
             
             # Check for unused methods (clients forced to depend on unused methods)
             # This would require more complex analysis of method usage
+            # Names called from each method, collected once instead of per method pair
+            called_names = {
+                id(method): {
+                    node.func.id for node in ast.walk(method)
+                    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                }
+                for method in methods
+            }
             for method in methods:
                 if method.name.startswith('_') and not method.name.startswith('__'):
                     # Private methods are okay
                     continue
                 
                 # Check if method is used within the class
-                method_used = False
-                for other_method in methods:
-                    if method != other_method:
-                        for node in ast.walk(other_method):
-                            if isinstance(node, ast.Call):
-                                if isinstance(node.func, ast.Name) and node.func.id == method.name:
-                                    method_used = True
-                                    break
+                method_used = any(
+                    method.name in called_names[id(other_method)]
+                    for other_method in methods if other_method is not method
+                )
                 
                 if not method_used and len(methods) > 5:
                     violations.append(ComplianceViolation(
@@ -339,21 +347,20 @@ class SOLIDPrinciplesChecker:
         violations = []
         
         # Check for direct instantiations of concrete classes
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    # Check for direct instantiation of concrete classes
-                    class_name = node.func.id
-                    if class_name[0].isupper():  # Likely a class name
-                        violations.append(ComplianceViolation(
-                            principle=PrincipleType.DEPENDENCY_INVERSION,
-                            violation_type="direct_instantiation",
-                            severity="medium",
-                            description=f"Direct instantiation of concrete class {class_name}",
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            suggestion="Use dependency injection or factory pattern"
-                        ))
+        for node in self.analyzer.nodes_of(tree, ast.Call):
+            if isinstance(node.func, ast.Name):
+                # Check for direct instantiation of concrete classes
+                class_name = node.func.id
+                if class_name[0].isupper():  # Likely a class name
+                    violations.append(ComplianceViolation(
+                        principle=PrincipleType.DEPENDENCY_INVERSION,
+                        violation_type="direct_instantiation",
+                        severity="medium",
+                        description=f"Direct instantiation of concrete class {class_name}",
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        suggestion="Use dependency injection or factory pattern"
+                    ))
         
         # Check for imports of concrete implementations instead of abstractions
         imports = self.analyzer.extract_imports(tree)
@@ -0,0 +1,357 @@
+"""
+Shared Code Analysis Context
+Parses a piece of source once per content hash and shares the tree, token
+stream, line index and node-type buckets between every analyzer that looks at
+it, plus a single-pass multi-visitor so analyzers register node callbacks
+instead of each walking the tree again
+"""
+
+import ast
+import hashlib
+import io
+import threading
+import tokenize
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+import structlog
+
+logger = structlog.get_logger()
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+CLASS_NODES = (ast.ClassDef,)
+IMPORT_NODES = (ast.Import, ast.ImportFrom)
+CALL_NODES = (ast.Call,)
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+
+
+def content_hash(code: str) -> str:
+    """Stable key for a piece of source code"""
+    return hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class CodeAnalysisContext:
+    """
+    Everything analyzers need about one source text, computed once.
+
+    The tree is shared between analyzers and must be treated as read-only;
+    code that rewrites the AST should parse its own copy.
+    """
+
+    def __init__(self, code: str, key: Optional[str] = None):
+        self.code = code
+        self.key = key or content_hash(code)
+        self.lines: List[str] = code.splitlines()
+        self.tree: Optional[ast.Module] = None
+        self.syntax_error: Optional[SyntaxError] = None
+        self.nodes: List[ast.AST] = []
+        self._by_type: Dict[Type[ast.AST], List[ast.AST]] = defaultdict(list)
+        self._line_offsets: Optional[List[int]] = None
+        self._tokens: Optional[List[tokenize.TokenInfo]] = None
+        self._parents: Optional[Dict[int, ast.AST]] = None
+
+        try:
+            self.tree = ast.parse(code)
+        except (SyntaxError, ValueError) as e:
+            # ValueError covers source containing null bytes
+            self.syntax_error = e if isinstance(e, SyntaxError) else SyntaxError(str(e))
+            return
+
+        for node in ast.walk(self.tree):
+            self.nodes.append(node)
+            self._by_type[type(node)].append(node)
+
+    @property
+    def is_valid(self) -> bool:
+        return self.tree is not None
+
+    def require_tree(self) -> ast.Module:
+        """The parsed tree, re-raising the original SyntaxError for invalid code"""
+        if self.tree is None:
+            raise self.syntax_error
+        return self.tree
+
+    def of_type(self, *node_types: Type[ast.AST]) -> List[ast.AST]:
+        """Nodes matching any of the given types, in ``ast.walk`` order"""
+        matched = [t for t in self._by_type if issubclass(t, node_types)]
+        if not matched:
+            return []
+        if len(matched) == 1:
+            return list(self._by_type[matched[0]])
+        wanted = set(matched)
+        return [node for node in self.nodes if type(node) in wanted]
+
+    @property
+    def functions(self) -> List[ast.AST]:
+        return self.of_type(*FUNCTION_NODES)
+
+    @property
+    def classes(self) -> List[ast.ClassDef]:
+        return self.of_type(*CLASS_NODES)
+
+    @property
+    def imports(self) -> List[ast.AST]:
+        return self.of_type(*IMPORT_NODES)
+
+    @property
+    def calls(self) -> List[ast.Call]:
+        return self.of_type(*CALL_NODES)
+
+    @property
+    def loops(self) -> List[ast.AST]:
+        return self.of_type(*LOOP_NODES)
+
+    @property
+    def tokens(self) -> List[tokenize.TokenInfo]:
+        """Token stream (partial for code that does not tokenize cleanly)"""
+        if self._tokens is None:
+            tokens: List[tokenize.TokenInfo] = []
+            try:
+                for token in tokenize.generate_tokens(io.StringIO(self.code).readline):
+                    tokens.append(token)
+            except (tokenize.TokenError, IndentationError, SyntaxError):
+                pass
+            self._tokens = tokens
+        return self._tokens
+
+    @property
+    def comment_lines(self) -> int:
+        return sum(1 for token in self.tokens if token.type == tokenize.COMMENT)
+
+    def line(self, lineno: int) -> str:
+        """1-based source line, empty when out of range"""
+        return self.lines[lineno - 1] if 0 < lineno <= len(self.lines) else ""
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """(1-based line, 0-based column) of a character offset"""
+        if self._line_offsets is None:
+            offsets, total = [], 0
+            for text in self.code.splitlines(keepends=True):
+                offsets.append(total)
+                total += len(text)
+            self._line_offsets = offsets or [0]
+        index = bisect_right(self._line_offsets, offset) - 1
+        return index + 1, offset - self._line_offsets[index]
+
+    def parent(self, node: ast.AST) -> Optional[ast.AST]:
+        if self._parents is None:
+            self._parents = {}
+            for candidate in self.nodes:
+                for child in ast.iter_child_nodes(candidate):
+                    self._parents[id(child)] = candidate
+        return self._parents.get(id(node))
+
+    def segment(self, node: ast.AST) -> str:
+        return ast.get_source_segment(self.code, node) or ""
+
+
+class AnalysisContextCache:
+    """Bounded LRU of analysis contexts keyed by content hash"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CodeAnalysisContext]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, code: str) -> CodeAnalysisContext:
+        key = content_hash(code)
+        with self._lock:
+            context = self._entries.get(key)
+            if context is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return context
+            self.misses += 1
+
+        # Parse outside the lock; a concurrent miss on the same code just parses twice
+        context = CodeAnalysisContext(code, key)
+        with self._lock:
+            self._entries[key] = context
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return context
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_analysis_context_cache = AnalysisContextCache()
+
+
+def get_analysis_context(code: str) -> CodeAnalysisContext:
+    """Shared parse of ``code`` (cached by content hash)"""
+    return _analysis_context_cache.get(code)
+
+
+def parse_code(code: str) -> ast.Module:
+    """Drop-in for ``ast.parse(code)`` backed by the shared cache; do not mutate the result"""
+    return get_analysis_context(code).require_tree()
+
+
+NodeCallback = Callable[[ast.AST, "VisitState"], None]
+
+
+class VisitState:
+    """Traversal position handed to node callbacks"""
+
+    __slots__ = ("context", "ancestors")
+
+    def __init__(self, context: Optional[CodeAnalysisContext]):
+        self.context = context
+        self.ancestors: List[ast.AST] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self.ancestors)
+
+    @property
+    def parent(self) -> Optional[ast.AST]:
+        return self.ancestors[-1] if self.ancestors else None
+
+    def enclosing(self, *node_types: Type[ast.AST]) -> Optional[ast.AST]:
+        """Innermost ancestor of the given types"""
+        for ancestor in reversed(self.ancestors):
+            if isinstance(ancestor, node_types):
+                return ancestor
+        return None
+
+    def count_enclosing(self, *node_types: Type[ast.AST]) -> int:
+        return sum(1 for ancestor in self.ancestors if isinstance(ancestor, node_types))
+
+
+class AnalysisVisitor:
+    """
+    Base for analyzers run by ``MultiVisitor``. Define ``visit_<NodeName>`` and
+    ``leave_<NodeName>`` methods taking ``(node, state)``; ``result()`` returns
+    whatever the analyzer collected.
+    """
+
+    def result(self) -> Any:
+        return None
+
+
+class MultiVisitor:
+    """Runs many analyzers over a tree in one depth-first pass"""
+
+    def __init__(self, visitors: Iterable[AnalysisVisitor] = ()):
+        self._enter: Dict[Type[ast.AST], List[NodeCallback]] = defaultdict(list)
+        self._leave: Dict[Type[ast.AST], List[NodeCallback]] = defaultdict(list)
+        self._dispatch_cache: Dict[Type[ast.AST], Tuple[List[NodeCallback], List[NodeCallback]]] = {}
+        self.visitors: List[AnalysisVisitor] = []
+        for visitor in visitors:
+            self.add_visitor(visitor)
+
+    def on(self, node_types: Any, enter: Optional[NodeCallback] = None,
+           leave: Optional[NodeCallback] = None) -> "MultiVisitor":
+        """Register callbacks for a node type (or tuple of types, including abstract bases)"""
+        for node_type in node_types if isinstance(node_types, tuple) else (node_types,):
+            if enter:
+                self._enter[node_type].append(enter)
+            if leave:
+                self._leave[node_type].append(leave)
+        self._dispatch_cache.clear()
+        return self
+
+    def add_visitor(self, visitor: AnalysisVisitor) -> "MultiVisitor":
+        self.visitors.append(visitor)
+        for name in dir(visitor):
+            prefix, _, node_name = name.partition("_")
+            if prefix not in ("visit", "leave") or not node_name:
+                continue
+            node_type = getattr(ast, node_name, None)
+            if not (isinstance(node_type, type) and issubclass(node_type, ast.AST)):
+                continue
+            callback = getattr(visitor, name)
+            if prefix == "visit":
+                self.on(node_type, enter=callback)
+            else:
+                self.on(node_type, leave=callback)
+        return self
+
+    def _callbacks(self, node_type: Type[ast.AST]) -> Tuple[List[NodeCallback], List[NodeCallback]]:
+        cached = self._dispatch_cache.get(node_type)
+        if cached is None:
+            enter = [cb for t, cbs in self._enter.items() if issubclass(node_type, t) for cb in cbs]
+            leave = [cb for t, cbs in self._leave.items() if issubclass(node_type, t) for cb in cbs]
+            cached = self._dispatch_cache[node_type] = (enter, leave)
+        return cached
+
+    def run(self, source: Any) -> List[Any]:
+        """
+        Traverse a ``CodeAnalysisContext``, source string or AST node once and
+        return each registered visitor's ``result()``
+        """
+        context = None
+        if isinstance(source, str):
+            source = get_analysis_context(source)
+        if isinstance(source, CodeAnalysisContext):
+            context = source
+            root = source.require_tree()
+        else:
+            root = source
+
+        state = VisitState(context)
+        # Iterative traversal: deeply nested generated code must not hit the recursion limit
+        stack: List[Tuple[ast.AST, bool]] = [(root, False)]
+        while stack:
+            node, leaving = stack.pop()
+            enter, leave = self._callbacks(type(node))
+            if leaving:
+                state.ancestors.pop()
+                for callback in leave:
+                    callback(node, state)
+                continue
+            for callback in enter:
+                callback(node, state)
+            stack.append((node, True))
+            state.ancestors.append(node)
+            children = list(ast.iter_child_nodes(node))
+            for child in reversed(children):
+                stack.append((child, False))
+            if not children:
+                stack.pop()
+                state.ancestors.pop()
+                for callback in leave:
+                    callback(node, state)
+        return [visitor.result() for visitor in self.visitors]
+
+
+def run_visitors(source: Any, *visitors: AnalysisVisitor) -> List[Any]:
+    """Run several analyzers over ``source`` in a single pass"""
+    return MultiVisitor(visitors).run(source)
+
+
+__all__ = [
+    'FUNCTION_NODES',
+    'CLASS_NODES',
+    'IMPORT_NODES',
+    'CALL_NODES',
+    'LOOP_NODES',
+    'content_hash',
+    'CodeAnalysisContext',
+    'AnalysisContextCache',
+    'get_analysis_context',
+    'parse_code',
+    'VisitState',
+    'AnalysisVisitor',
+    'MultiVisitor',
+    'run_visitors',
+]
@@ -15,6 +15,7 @@ from datetime import datetime
 import json
 import math
 
+from app.core.code_analysis_context import CodeAnalysisContext, MultiVisitor, get_analysis_context
 from app.core.redis import get_redis_client
 from app.core.ethical_ai_core import ethical_ai_core
 
@@ -136,8 +137,9 @@ class CodeQualityAnalyzer:
             
             # Parse code based on language
             if language.lower() == "python":
-                tree = ast.parse(code)
-                metrics = await self._analyze_python_code(code, tree)
+                context = get_analysis_context(code)
+                context.require_tree()
+                metrics = await self._analyze_python_code(code, context)
             else:
                 metrics = await self._analyze_generic_code(code)
             
@@ -186,7 +188,7 @@ class CodeQualityAnalyzer:
             logger.error("Code quality analysis failed", error=str(e))
             raise
     
-    async def _analyze_python_code(self, code: str, tree: ast.AST) -> QualityMetrics:
+    async def _analyze_python_code(self, code: str, context: CodeAnalysisContext) -> QualityMetrics:
         """Analyze Python code specifically"""
         lines = code.split('\n')
         
@@ -196,14 +198,14 @@ class CodeQualityAnalyzer:
         blank_lines = len([line for line in lines if not line.strip()])
         
         # AST-based analysis
-        function_count = len([node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)])
-        class_count = len([node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)])
+        function_count = len(context.of_type(ast.FunctionDef))
+        class_count = len(context.classes)
         
         # Calculate cyclomatic complexity
-        cyclomatic_complexity = self._calculate_cyclomatic_complexity(tree)
+        cyclomatic_complexity = self._calculate_cyclomatic_complexity(context)
         
         # Calculate cognitive complexity
-        cognitive_complexity = self._calculate_cognitive_complexity(tree)
+        cognitive_complexity = self._calculate_cognitive_complexity(context)
         
         # Calculate maintainability index
         maintainability_index = self._calculate_maintainability_index(
@@ -289,11 +291,11 @@ class CodeQualityAnalyzer:
             average_class_length=average_class_length
         )
     
-    def _calculate_cyclomatic_complexity(self, tree: ast.AST) -> int:
+    def _calculate_cyclomatic_complexity(self, context: CodeAnalysisContext) -> int:
         """Calculate cyclomatic complexity for Python AST"""
         complexity = 1  # Base complexity
         
-        for node in ast.walk(tree):
+        for node in context.of_type(ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler, ast.BoolOp):
             if isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
                 complexity += 1
             elif isinstance(node, ast.ExceptHandler):
@@ -303,15 +305,14 @@ class CodeQualityAnalyzer:
         
         return complexity
     
-    def _calculate_cognitive_complexity(self, tree: ast.AST) -> int:
+    def _calculate_cognitive_complexity(self, context: CodeAnalysisContext) -> int:
         """Calculate cognitive complexity for Python AST"""
-        complexity = 0
+        # Nested conditions add extra complexity
+        complexity = self._count_nested_conditions(context)
         
-        for node in ast.walk(tree):
+        for node in context.of_type(ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler, ast.BoolOp):
             if isinstance(node, ast.If):
                 complexity += 1
-                # Nested conditions add extra complexity
-                complexity += self._count_nested_conditions(node)
             elif isinstance(node, ast.While):
                 complexity += 2  # Loops are more complex than conditions
             elif isinstance(node, ast.For):
@@ -325,12 +326,15 @@ class CodeQualityAnalyzer:
         
         return complexity
     
-    def _count_nested_conditions(self, node: ast.If) -> int:
-        """Count nested conditions in an if statement"""
+    def _count_nested_conditions(self, context: CodeAnalysisContext) -> int:
+        """Count (if, nested if) pairs across the module in one pass"""
         nested = 0
-        for child in ast.walk(node):
-            if isinstance(child, ast.If) and child != node:
-                nested += 1
+        
+        def on_if(node, state):
+            nonlocal nested
+            nested += state.count_enclosing(ast.If)
+        
+        MultiVisitor().on(ast.If, enter=on_if).run(context)
         return nested
     
     def _estimate_cyclomatic_complexity(self, code: str) -> int:
@@ -0,0 +1,169 @@
+"""
+Inline Completion Cache
+Completions keyed by a bounded window of text around the cursor instead of the
+whole file, held in an LRU bounded by entries and bytes. A completion is also
+reachable after the user types part of it: each cached completion registers
+the windows its own continuations produce, so the remaining text is served
+without generating again (a prefix-continuation hit).
+"""
+
+import dataclasses
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rough per-entry and per-continuation-key bookkeeping cost for the byte bound
+ENTRY_OVERHEAD_BYTES = 512
+KEY_OVERHEAD_BYTES = 96
+
+
+@dataclass
+class _Entry:
+    scope: Tuple[Any, ...]  # (file_path, language, selection)
+    window: str  # text before the cursor when the completion was generated
+    suffix: str  # text after the cursor
+    completion: Any
+    keys: List[int]
+    size: int
+
+
+def cursor_offset(content: str, line: int, column: int) -> int:
+    """Character offset of a (1-based line, 0-based column) cursor, clamped to the line"""
+    start = 0
+    if line > 1:
+        lines = content.split("\n", line - 1)
+        if len(lines) < line:
+            return len(content)
+        start = len(content) - len(lines[-1])
+    line_end = content.find("\n", start)
+    return min(start + max(column, 0), len(content) if line_end < 0 else line_end)
+
+
+class CompletionCache:
+    """
+    LRU of inline completions.
+
+    The key is the last ``prefix_chars`` characters before the cursor plus the
+    next ``suffix_chars`` after it, scoped by file, language and selection, so edits
+    elsewhere in the file do not invalidate it. ``max_continuation`` bounds
+    how many typed characters of a completion can still hit.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 8_000_000, prefix_chars: int = 512,
+                 suffix_chars: int = 128, max_continuation: int = 256):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.prefix_chars = prefix_chars
+        self.suffix_chars = suffix_chars
+        self.max_continuation = max_continuation
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._keys: Dict[int, Tuple[int, int]] = {}  # window hash -> (entry id, characters typed)
+        self._next_id = 0
+        self._bytes = 0
+        self.stats = {"hits": 0, "continuation_hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _window(self, context: Any) -> Tuple[Tuple[Any, ...], str, str]:
+        content = context.content or ""
+        offset = cursor_offset(content, *context.cursor_position)
+        scope = (context.file_path, getattr(context.language, "value", context.language),
+                 getattr(context, "selection", None))
+        return scope, content[max(0, offset - self.prefix_chars):offset], content[offset:offset + self.suffix_chars]
+
+    def _lookup(self, context: Any) -> Optional[Tuple[_Entry, int, int]]:
+        scope, window, suffix = self._window(context)
+        found = self._keys.get(hash((scope, window, suffix)))
+        if found is None:
+            return None
+        entry_id, typed = found
+        entry = self._entries[entry_id]
+        text = entry.completion.text
+        # Hashes only locate the entry; the text itself must match
+        if entry.scope != scope or entry.suffix != suffix or \
+                (entry.window + text[:typed])[-self.prefix_chars:] != window:
+            return None
+        return entry, entry_id, typed
+
+    def get(self, context: Any) -> Optional[Any]:
+        """The cached completion for the cursor, trimmed by whatever the user already typed of it"""
+        found = self._lookup(context)
+        if found is None:
+            self.stats["misses"] += 1
+            return None
+        entry, entry_id, typed = found
+        self._entries.move_to_end(entry_id)
+        if not typed:
+            self.stats["hits"] += 1
+            return entry.completion
+        self.stats["continuation_hits"] += 1
+        line, column = context.cursor_position
+        remaining = entry.completion.text[typed:]
+        return dataclasses.replace(entry.completion, text=remaining, start_line=line, end_line=line,
+                                   start_column=column, end_column=column + len(remaining))
+
+    def peek(self, context: Any) -> bool:
+        """Whether ``get`` would hit, without touching recency or stats"""
+        return self._lookup(context) is not None
+
+    def put(self, context: Any, completion: Any) -> None:
+        """Cache a completion generated at the context's cursor"""
+        scope, window, suffix = self._window(context)
+        text = completion.text or ""
+        entry_id = self._next_id
+        self._next_id += 1
+
+        keys = []
+        extended = window
+        for typed in range(min(len(text), self.max_continuation + 1)):
+            if typed:
+                extended = (extended + text[typed - 1])[-self.prefix_chars:]
+            key = hash((scope, extended, suffix))
+            previous = self._keys.get(key)
+            if previous is not None and previous[0] in self._entries:
+                self._release_key(previous[0], key)
+            self._keys[key] = (entry_id, typed)
+            keys.append(key)
+
+        size = ENTRY_OVERHEAD_BYTES + len(window) + len(suffix) + 2 * len(text) + KEY_OVERHEAD_BYTES * len(keys)
+        self._entries[entry_id] = _Entry(scope, window, suffix, completion, keys, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._evict(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _release_key(self, entry_id: int, key: int) -> None:
+        # A newer completion took over this window; the older entry goes once it has no keys left
+        entry = self._entries[entry_id]
+        entry.keys.remove(key)
+        if not entry.keys:
+            self._evict(entry_id)
+
+    def _evict(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        self._bytes -= entry.size
+        for key in entry.keys:
+            if self._keys.get(key, (None,))[0] == entry_id:
+                del self._keys[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+        self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["continuation_hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": (lookups - self.stats["misses"]) / lookups if lookups else 0.0,
+            **self.stats,
+        }
+
+
+__all__ = [
+    "CompletionCache",
+    "cursor_offset",
+]
@@ -884,9 +884,11 @@ class ComplianceEngine:
             return 0.0
         
         import ast
+        from app.core.code_analysis_context import get_analysis_context
         try:
-            tree = ast.parse(code)
-            functions = [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            analysis = get_analysis_context(code)
+            analysis.require_tree()
+            functions = analysis.functions
             documented = [f for f in functions if ast.get_docstring(f)]
             
             if len(functions) > 0:
@@ -4,7 +4,7 @@ Configuration management for Voice-to-App SaaS Platform
 
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import os
 import structlog
 
@@ -149,11 +149,112 @@ class Settings(BaseSettings):
     ALLOW_LOCAL_LLM: bool = True
     ENABLE_VOICE_COMMANDS: bool = True
     LOCAL_MODEL_PATH: str = "./models/"
+    LOCAL_LLM_BASE_URL: str = "http://localhost:11434"  # Ollama-compatible endpoint
+    
+    # Paid providers (optional, OpenAI-compatible base URL allows local stand-ins)
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+    ANTHROPIC_API_KEY: Optional[str] = None
+    
+    # Embeddings (requests are micro-batched across concurrent callers)
+    EMBEDDING_BACKEND: str = "provider"  # provider or local_transformers
+    EMBEDDING_MODEL: Optional[str] = None  # provider default when unset
+    EMBEDDING_LOCAL_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_TOKENS: int = 8000
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_MAX_CONCURRENT_BATCHES: int = 4
+    
+    # Inline completion cache (keyed by the text around the cursor, LRU by entries and bytes)
+    INLINE_COMPLETION_CACHE_MAX_ENTRIES: int = 2048
+    INLINE_COMPLETION_CACHE_MAX_BYTES: int = 8_000_000
+    INLINE_COMPLETION_CACHE_PREFIX_CHARS: int = 512
+    INLINE_COMPLETION_CACHE_SUFFIX_CHARS: int = 128
+    
+    # Speculative prefetch for the file the user is predicted to open next
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_CONFIDENCE_THRESHOLD: float = 0.5  # share of past switches from the current file
+    PREFETCH_TIME_BUDGET_MS: float = 250.0  # per predicted file
+    PREFETCH_CPU_SHARE: float = 0.25  # of wall-clock time across all prefetching
+    PREFETCH_IDLE_MS: float = 150.0  # pause in typing before prefetch work runs
+    
+    # Persistent completion channel (WebSocket): per-file debounce and limits per connection
+    COMPLETION_CHANNEL_DEBOUNCE_MS: float = 30.0
+    COMPLETION_CHANNEL_MAX_FILES: int = 32
+    COMPLETION_CHANNEL_MAX_DOCUMENT_CHARS: int = 2_000_000
+    
+    # Hierarchical orchestration admission control (per-orchestrator AIMD concurrency limits)
+    ORCHESTRATOR_INITIAL_CONCURRENCY: int = 4
+    ORCHESTRATOR_MAX_CONCURRENCY: int = 10
+    ORCHESTRATOR_MAX_QUEUED_TASKS: int = 16  # beyond this, the lowest-priority task is shed (HTTP 429)
+    ORCHESTRATOR_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    ORCHESTRATOR_LATENCY_TOLERANCE: float = 2.0  # latency over this multiple of the baseline lowers the limit
+    
+    # Bounded result stores (task results, plans): TTL, LRU memory budget, compressed spill to disk
+    RESULT_STORE_TTL_SECONDS: float = 3600.0
+    RESULT_STORE_MAX_ENTRIES: int = 10_000
+    RESULT_STORE_MAX_MEMORY_BYTES: int = 64_000_000  # per store, serialized size
+    RESULT_STORE_SPILL_MIN_BYTES: int = 16_384  # smaller values are dropped rather than spilled
+    RESULT_STORE_MAX_DISK_BYTES: int = 512_000_000
+    RESULT_STORE_SPILL_DIR: Optional[str] = None  # system temp directory when unset
+    
+    # DAG execution of multi-step plans (decomposed tasks, workflows, code generation steps)
+    DAG_MAX_CONCURRENCY: int = 4  # nodes running at once per plan
+    DAG_NODE_TIMEOUT_SECONDS: Optional[float] = 120.0  # per attempt
+    DAG_NODE_RETRIES: int = 1
+    DAG_MEMO_ENTRIES: int = 1024
+    
+    # Multi-agent message bus (bounded per-agent mailboxes)
+    MESSAGE_BUS_MAILBOX_SIZE: int = 256  # senders wait once an agent's mailbox is full
+    MESSAGE_BUS_BATCH_SIZE: int = 32  # messages an agent takes from its mailbox per wakeup
+    MESSAGE_BUS_SEND_TIMEOUT_SECONDS: float = 2.0  # wait for mailbox space before shedding
+    MESSAGE_BUS_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    
+    # Offline speech-to-text (CPU; uploads are decoded, segmented and transcribed as they stream in)
+    STT_BACKEND: str = "whisper"  # whisper (local transformers model) or deterministic (no model, for tests)
+    STT_MODEL: str = "openai/whisper-tiny"  # local directory or hub id already in the local cache
+    STT_ALLOW_DOWNLOAD: bool = False  # fetch STT_MODEL from the hub when it is not cached (not offline)
+    STT_WORKERS: int = 2  # segments decoded in parallel; torch threads are split between them
+    STT_MAX_PENDING_SEGMENTS: int = 8  # reading the upload pauses once this many segments await decoding
+    STT_MAX_SEGMENT_SECONDS: float = 25.0  # Whisper decodes 30 s windows
+    STT_MIN_SILENCE_MS: int = 400  # pause that ends a segment
+    STT_READ_CHUNK_BYTES: int = 65_536
     
     # AI Provider Priority (for zero-cost optimization)
     AI_PROVIDER_PRIORITY: List[str] = ["groq", "together", "local_llm", "huggingface"]
     ENABLE_AI_PROVIDER_FALLBACK: bool = True
     
+    # AI Provider Routing (per task type overrides of RoutingPolicy fields)
+    AI_ROUTING_POLICIES: Dict[str, Dict[str, Any]] = {}
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    AI_CIRCUIT_OPEN_SECONDS: float = 30.0
+    
+    # Code validation engine (CPU-bound validators run in a process pool)
+    VALIDATION_EXECUTION_MODE: str = "process"  # process or async
+    VALIDATION_MAX_WORKERS: Optional[int] = None  # defaults to min(4, cpu_count)
+    VALIDATION_TIMEOUT_SECONDS: float = 2.0
+    VALIDATION_BUDGET_MS: float = 3000.0
+    VALIDATION_SHORT_CIRCUIT: bool = True
+    VALIDATION_PROCESS_MIN_CODE_CHARS: int = 16000
+    
+    # Code analysis endpoints (batch analysis runs in a process pool)
+    CODE_ANALYSIS_MAX_WORKERS: Optional[int] = None  # defaults to cpu_count
+    CODE_ANALYSIS_CACHE_ENTRIES: int = 4096
+    CODE_ANALYSIS_MAX_FILE_BYTES: int = 1_000_000
+    CODE_ANALYSIS_MAX_BATCH_FILES: int = 20000
+    CODE_ANALYSIS_MAX_ARCHIVE_BYTES: int = 200_000_000
+    
+    # Codebase memory repository indexing
+    MEMORY_INDEX_MAX_WORKERS: Optional[int] = None  # defaults to cpu_count
+    MEMORY_INDEX_MAX_FILE_BYTES: int = 1_000_000
+    MEMORY_INDEX_WATCH_INTERVAL_SECONDS: float = 2.0
+    MEMORY_SNAPSHOT_DIR: Optional[str] = None  # unset keeps encoded snapshots in process memory
+    MEMORY_SNAPSHOT_KEEP_VERSIONS: int = 2
+    MEMORY_EMBEDDING_BACKEND: str = "hashing"  # hashing (offline) or batcher (EMBEDDING_BACKEND models)
+    MEMORY_EMBEDDING_DIM: int = 256  # hashing embedder only
+    MEMORY_VECTOR_DIR: Optional[str] = None  # unset keeps the vector index in process memory
+    MEMORY_VECTOR_ANN_THRESHOLD: int = 50_000  # live vectors before searches switch to IVF
+    
     # WhatsApp Business API (Replaces SMS Provider)
     WHATSAPP_WEBHOOK_URL: Optional[str] = None
     WHATSAPP_VERIFY_TOKEN: Optional[str] = None
@@ -0,0 +1,359 @@
+"""
+DAG Executor
+Runs multi-step plans as dependency graphs instead of step by step. Ready
+nodes start as soon as their dependencies succeed, up to a concurrency budget,
+longest-remaining-path first so the critical path is never starved by side
+branches. Each node gets its own timeout and retries; successful results are
+memoized by a hash of the node's inputs and its upstream results, so running
+the plan again (or resuming a failed run) re-executes only what failed or
+changed. A failed node skips its dependents while independent branches finish.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+NodeAction = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class DAGError(ValueError):
+    """The plan is not a valid DAG (unknown dependency, duplicate id or cycle)"""
+
+
+class NodeStatus(str, Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"  # an upstream node failed
+
+
+@dataclass
+class DAGNode:
+    """One step; ``action`` receives the results of its dependencies by node id"""
+    node_id: str
+    action: NodeAction
+    dependencies: List[str] = field(default_factory=list)
+    inputs: Any = None  # part of the memoization key
+    cost: float = 1.0  # expected duration, for critical-path priority
+    retries: Optional[int] = None  # executor default when None
+    timeout: Optional[float] = None  # seconds per attempt; executor default when None
+    memoize: bool = True
+
+
+@dataclass
+class NodeResult:
+    node_id: str
+    status: NodeStatus
+    result: Any = None
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed_ms: float = 0.0
+    cached: bool = False
+    input_hash: Optional[str] = None
+
+
+@dataclass
+class DAGRun:
+    results: Dict[str, NodeResult]
+    critical_path: List[str]
+    elapsed_ms: float = 0.0
+    max_parallelism: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        return all(result.status == NodeStatus.SUCCEEDED for result in self.results.values())
+
+    @property
+    def outputs(self) -> Dict[str, Any]:
+        return {node_id: result.result for node_id, result in self.results.items()
+                if result.status == NodeStatus.SUCCEEDED}
+
+    def failed_nodes(self) -> List[str]:
+        return [node_id for node_id, result in self.results.items() if result.status != NodeStatus.SUCCEEDED]
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for result in self.results.values():
+            counts[result.status.value] = counts.get(result.status.value, 0) + 1
+        return {
+            "succeeded": self.succeeded,
+            "nodes": counts,
+            "cached": sum(1 for result in self.results.values() if result.cached),
+            "critical_path": self.critical_path,
+            "elapsed_ms": self.elapsed_ms,
+            "max_parallelism": self.max_parallelism,
+        }
+
+
+# -- graph analysis ----------------------------------------------------------
+
+def topological_order(nodes: List[DAGNode]) -> List[str]:
+    """Node ids with every node after its dependencies; raises DAGError"""
+    by_id: Dict[str, DAGNode] = {}
+    for node in nodes:
+        if node.node_id in by_id:
+            raise DAGError(f"Duplicate node id: {node.node_id}")
+        by_id[node.node_id] = node
+    indegree = {node_id: 0 for node_id in by_id}
+    dependents: Dict[str, List[str]] = {node_id: [] for node_id in by_id}
+    for node in nodes:
+        for dependency in node.dependencies:
+            if dependency not in by_id:
+                raise DAGError(f"{node.node_id} depends on unknown node {dependency}")
+            indegree[node.node_id] += 1
+            dependents[dependency].append(node.node_id)
+
+    order = []
+    ready = [node.node_id for node in nodes if indegree[node.node_id] == 0]
+    while ready:
+        node_id = ready.pop(0)
+        order.append(node_id)
+        for dependent in dependents[node_id]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+    if len(order) != len(by_id):
+        raise DAGError(f"Cycle among nodes: {sorted(set(by_id) - set(order))}")
+    return order
+
+
+def _remaining_path(nodes: List[DAGNode], order: List[str]) -> Dict[str, Tuple[float, Optional[str]]]:
+    # Longest cost from each node to a sink, and the next node on that path
+    by_id = {node.node_id: node for node in nodes}
+    dependents: Dict[str, List[str]] = {node_id: [] for node_id in by_id}
+    for node in nodes:
+        for dependency in node.dependencies:
+            dependents[dependency].append(node.node_id)
+    remaining: Dict[str, Tuple[float, Optional[str]]] = {}
+    for node_id in reversed(order):
+        best = max(dependents[node_id], key=lambda d: remaining[d][0], default=None)
+        tail = remaining[best][0] if best is not None else 0.0
+        remaining[node_id] = (by_id[node_id].cost + tail, best)
+    return remaining
+
+
+def critical_path(nodes: List[DAGNode]) -> Tuple[List[str], float]:
+    """The most expensive dependency chain and its total cost"""
+    if not nodes:
+        return [], 0.0
+    remaining = _remaining_path(nodes, topological_order(nodes))
+    node_id: Optional[str] = max(remaining, key=lambda n: remaining[n][0])
+    length = remaining[node_id][0]
+    path = []
+    while node_id is not None:
+        path.append(node_id)
+        node_id = remaining[node_id][1]
+    return path, length
+
+
+def parallel_levels(nodes: List[DAGNode]) -> List[List[str]]:
+    """Nodes grouped by depth; every group can run concurrently"""
+    by_id = {node.node_id: node for node in nodes}
+    depth: Dict[str, int] = {}
+    for node_id in topological_order(nodes):
+        depth[node_id] = 1 + max((depth[d] for d in by_id[node_id].dependencies), default=-1)
+    levels: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for node_id, level in depth.items():
+        levels[level].append(node_id)
+    return levels
+
+
+def input_hash(node: DAGNode, upstream: Dict[str, Any]) -> str:
+    payload = json.dumps({"node": node.node_id, "inputs": node.inputs, "upstream": upstream},
+                         sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# -- execution ---------------------------------------------------------------
+
+class DAGExecutor:
+    """
+    Executes DAG plans, at most ``max_concurrency`` nodes at a time per run.
+    One executor can serve many runs; its memo of successful node results
+    (LRU, ``memo_entries``) is what makes re-running a partially failed plan
+    cheap. Nodes with side effects should set ``memoize=False``.
+    """
+
+    def __init__(self, max_concurrency: int = 4, default_timeout: Optional[float] = None,
+                 default_retries: int = 0, retry_backoff: float = 0.1, memo_entries: int = 1024):
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.default_retries = default_retries
+        self.retry_backoff = retry_backoff
+        self.memo_entries = memo_entries
+        self._memo: "OrderedDict[str, Any]" = OrderedDict()
+        self.stats = {"runs": 0, "nodes_run": 0, "memo_hits": 0, "retries": 0, "timeouts": 0,
+                      "failures": 0, "skipped": 0}
+
+    async def run(self, nodes: List[DAGNode], previous: Optional[DAGRun] = None) -> DAGRun:
+        """
+        Execute the plan. With ``previous``, nodes that succeeded there with the
+        same input hash keep their results and only the rest run again.
+        """
+        order = topological_order(nodes)
+        remaining = _remaining_path(nodes, order)
+        by_id = {node.node_id: node for node in nodes}
+        position = {node_id: index for index, node_id in enumerate(order)}
+        waiting = {node.node_id: set(node.dependencies) for node in nodes}
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in by_id}
+        for node in nodes:
+            for dependency in node.dependencies:
+                dependents[dependency].append(node.node_id)
+
+        self.stats["runs"] += 1
+        started = time.perf_counter()
+        results: Dict[str, NodeResult] = {}
+        ready: List[Tuple[float, int, str]] = []
+        running: Dict[asyncio.Task, str] = {}
+        max_parallelism = 0
+
+        def release(node_id: str) -> None:
+            for dependent in dependents[node_id]:
+                waiting[dependent].discard(node_id)
+                if not waiting[dependent] and dependent not in results:
+                    heapq.heappush(ready, (-remaining[dependent][0], position[dependent], dependent))
+
+        def skip_downstream(node_id: str) -> None:
+            for dependent in dependents[node_id]:
+                if dependent not in results:
+                    results[dependent] = NodeResult(dependent, NodeStatus.SKIPPED,
+                                                    error=f"Upstream node {node_id} did not succeed")
+                    self.stats["skipped"] += 1
+                    skip_downstream(dependent)
+
+        for node_id in order:
+            if not waiting[node_id]:
+                heapq.heappush(ready, (-remaining[node_id][0], position[node_id], node_id))
+
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_concurrency:
+                    _, _, node_id = heapq.heappop(ready)
+                    if node_id in results:
+                        continue
+                    node = by_id[node_id]
+                    upstream = {dependency: results[dependency].result for dependency in node.dependencies}
+                    reused = self._reuse(node, upstream, previous)
+                    if reused is not None:
+                        results[node_id] = reused
+                        release(node_id)
+                        continue
+                    running[asyncio.create_task(self._run_node(node, upstream))] = node_id
+                max_parallelism = max(max_parallelism, len(running))
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    result = task.result()
+                    results[node_id] = result
+                    if result.status == NodeStatus.SUCCEEDED:
+                        release(node_id)
+                    else:
+                        skip_downstream(node_id)
+        finally:
+            for task in running:
+                task.cancel()
+
+        path, _ = critical_path(nodes)
+        run = DAGRun({node_id: results[node_id] for node_id in order}, path,
+                     (time.perf_counter() - started) * 1000, max_parallelism)
+        if not run.succeeded:
+            logger.info("DAG run incomplete", failed=run.failed_nodes(), elapsed_ms=round(run.elapsed_ms, 1))
+        return run
+
+    def _reuse(self, node: DAGNode, upstream: Dict[str, Any], previous: Optional[DAGRun]) -> Optional[NodeResult]:
+        if not node.memoize:
+            return None
+        key = input_hash(node, upstream)
+        prior = previous.results.get(node.node_id) if previous is not None else None
+        if prior is not None and prior.status == NodeStatus.SUCCEEDED and prior.input_hash == key:
+            result = prior.result
+        elif key in self._memo:
+            self._memo.move_to_end(key)
+            result = self._memo[key]
+        else:
+            return None
+        self.stats["memo_hits"] += 1
+        return NodeResult(node.node_id, NodeStatus.SUCCEEDED, result, cached=True, input_hash=key)
+
+    async def _run_node(self, node: DAGNode, upstream: Dict[str, Any]) -> NodeResult:
+        key = input_hash(node, upstream) if node.memoize else None
+        retries = self.default_retries if node.retries is None else node.retries
+        timeout = self.default_timeout if node.timeout is None else node.timeout
+        started = time.perf_counter()
+        error = None
+        attempt = 0
+        for attempt in range(1, retries + 2):
+            self.stats["nodes_run"] += 1
+            try:
+                result = await asyncio.wait_for(node.action(upstream), timeout)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                error = f"Timed out after {timeout}s"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                if key is not None:
+                    self._memo[key] = result
+                    self._memo.move_to_end(key)
+                    while len(self._memo) > self.memo_entries:
+                        self._memo.popitem(last=False)
+                return NodeResult(node.node_id, NodeStatus.SUCCEEDED, result, attempts=attempt,
+                                  elapsed_ms=(time.perf_counter() - started) * 1000, input_hash=key)
+            if attempt <= retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+        self.stats["failures"] += 1
+        logger.warning("DAG node failed", node_id=node.node_id, attempts=attempt, error=error)
+        return NodeResult(node.node_id, NodeStatus.FAILED, error=error, attempts=attempt,
+                          elapsed_ms=(time.perf_counter() - started) * 1000, input_hash=key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "memo_entries": len(self._memo), "max_concurrency": self.max_concurrency}
+
+
+_dag_executor: Optional[DAGExecutor] = None
+
+
+def get_dag_executor() -> DAGExecutor:
+    """Shared executor configured from settings"""
+    global _dag_executor
+    if _dag_executor is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        _dag_executor = DAGExecutor(
+            max_concurrency=settings.DAG_MAX_CONCURRENCY,
+            default_timeout=settings.DAG_NODE_TIMEOUT_SECONDS,
+            default_retries=settings.DAG_NODE_RETRIES,
+            memo_entries=settings.DAG_MEMO_ENTRIES,
+        )
+    return _dag_executor
+
+
+__all__ = [
+    "DAGError",
+    "DAGExecutor",
+    "DAGNode",
+    "DAGRun",
+    "NodeResult",
+    "NodeStatus",
+    "critical_path",
+    "get_dag_executor",
+    "input_hash",
+    "parallel_levels",
+    "topological_order",
+]
@@ -0,0 +1,281 @@
+"""
+Micro-Batched Embedding Generation
+Collects concurrent single-text embedding requests for a few milliseconds,
+sends one batched provider call (or one local forward pass) and scatters the
+vectors back to the waiting callers
+"""
+
+import asyncio
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+EmbedBatchFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for batch limits"""
+    return len(text) // 4 + 1
+
+
+@dataclass
+class EmbeddingBatcherConfig:
+    """Batch window and size limits"""
+    max_batch_size: int = 64
+    max_batch_tokens: int = 8000
+    max_wait_ms: float = 5.0
+    max_concurrent_batches: int = 4
+
+
+@dataclass
+class EmbeddingBatcherStats:
+    """Counters for observing batching efficiency"""
+    requests: int = 0
+    deduplicated: int = 0
+    batches: int = 0
+    texts_sent: int = 0
+    failed_batches: int = 0
+    total_batch_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "texts_sent": self.texts_sent,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": self.texts_sent / self.batches if self.batches else 0.0,
+            "avg_batch_ms": self.total_batch_ms / self.batches if self.batches else 0.0,
+        }
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces ``embed(text)`` calls into batched ``embed_batch(texts)`` calls.
+
+    A batch is dispatched when it reaches ``max_batch_size`` unique texts, when
+    adding a text would exceed ``max_batch_tokens``, or ``max_wait_ms`` after
+    its first text arrived. Identical texts within a window share one slot.
+    """
+
+    def __init__(self, embed_batch: EmbedBatchFn, config: Optional[EmbeddingBatcherConfig] = None):
+        self.embed_batch = embed_batch
+        self.config = config or EmbeddingBatcherConfig()
+        self.stats = EmbeddingBatcherStats()
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._pending_tokens = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._dispatching: set = set()
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text; concurrent callers are batched together"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.stats.requests += 1
+
+        waiters = self._pending.get(text)
+        if waiters is not None:
+            waiters.append(future)
+            self.stats.deduplicated += 1
+            return await future
+
+        tokens = estimate_tokens(text)
+        if self._pending and self._pending_tokens + tokens > self.config.max_batch_tokens:
+            self._flush()
+        if tokens > self.config.max_batch_tokens:
+            logger.warning("Embedding text exceeds batch token limit, sending alone",
+                           estimated_tokens=tokens, limit=self.config.max_batch_tokens)
+
+        self._pending[text] = [future]
+        self._pending_tokens += tokens
+
+        if len(self._pending) >= self.config.max_batch_size or self._pending_tokens >= self.config.max_batch_tokens:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config.max_wait_ms / 1000.0, self._flush)
+
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, sharing batches with any concurrent callers"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._pending_tokens = 0
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.config.max_concurrent_batches)
+
+        texts = list(batch)
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                vectors = await self.embed_batch(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"Embedding backend returned {len(vectors)} vectors for {len(texts)} texts")
+            except Exception as e:
+                self.stats.failed_batches += 1
+                logger.error("Embedding batch failed", batch_size=len(texts), error=str(e))
+                for waiters in batch.values():
+                    for future in waiters:
+                        if not future.done():
+                            future.set_exception(e)
+                return
+            finally:
+                self.stats.batches += 1
+                self.stats.texts_sent += len(texts)
+                self.stats.total_batch_ms += (time.perf_counter() - started) * 1000.0
+
+        for text, vector in zip(texts, vectors):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(vector)
+
+    async def flush(self) -> None:
+        """Dispatch anything pending and wait for in-flight batches"""
+        self._flush()
+        if self._dispatching:
+            await asyncio.gather(*self._dispatching, return_exceptions=True)
+
+
+class LocalTransformerEmbedder:
+    """
+    Batched mean-pooled sentence embeddings from a local transformers model.
+    The forward pass runs in a worker thread so the event loop stays responsive.
+    """
+
+    def __init__(self, model_name: str, max_length: int = 512, device: str = "cpu"):
+        self.model_name = model_name
+        self.max_length = max_length
+        self.device = device
+        self._tokenizer = None
+        self._model = None
+
+    def _load(self) -> None:
+        from transformers import AutoModel, AutoTokenizer
+
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self._model = AutoModel.from_pretrained(self.model_name).to(self.device).eval()
+        logger.info("Local embedding model loaded", model=self.model_name, device=self.device)
+
+    def _forward(self, texts: List[str]) -> List[List[float]]:
+        import torch
+
+        if self._model is None:
+            self._load()
+        encoded = self._tokenizer(texts, padding=True, truncation=True, max_length=self.max_length,
+                                  return_tensors="pt").to(self.device)
+        with torch.inference_mode():
+            hidden = self._model(**encoded).last_hidden_state
+        mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+        return pooled.cpu().tolist()
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.to_thread(self._forward, texts)
+
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing embeddings: identifier parts and their
+    character trigrams hashed into ``dim`` signed buckets. Needs no model or
+    network, so code memory can always be searched by similarity; vectors are
+    stable across processes and can be persisted.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> Dict[int, float]:
+        from app.core.search_index import split_identifiers
+
+        features: Dict[int, float] = {}
+
+        def add(feature: str, weight: float) -> None:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            bucket = digest % self.dim
+            features[bucket] = features.get(bucket, 0.0) + (weight if digest & 0x80000000 else -weight)
+
+        for identifier, parts in split_identifiers(text):
+            add(identifier, 1.0)
+            for part in parts or [identifier]:
+                if part != identifier:
+                    add(part, 0.7)
+                padded = f"#{part}#"
+                for i in range(len(padded) - 2):
+                    add(padded[i:i + 3], 0.3)
+        return features
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized float32 matrix, one row per text"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if features:
+                matrix[row, list(features)] = list(features.values())
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_texts(texts).tolist()
+
+
+_embedding_batchers: Dict[Optional[str], EmbeddingBatcher] = {}
+
+
+def get_embedding_batcher(model: Optional[str] = None) -> EmbeddingBatcher:
+    """Shared batcher per embedding model, configured from settings"""
+    from app.core.config import get_settings
+    settings = get_settings()
+    model = model or settings.EMBEDDING_MODEL
+
+    batcher = _embedding_batchers.get(model)
+    if batcher is None:
+        config = EmbeddingBatcherConfig(
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_batch_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+            max_concurrent_batches=settings.EMBEDDING_MAX_CONCURRENT_BATCHES,
+        )
+        if settings.EMBEDDING_BACKEND == "local_transformers":
+            embed_batch = LocalTransformerEmbedder(model or settings.EMBEDDING_LOCAL_MODEL).embed_batch
+        else:
+            from app.core.strategies.ai_provider_strategy import get_ai_provider_manager
+
+            async def embed_batch(texts: List[str]) -> List[List[float]]:
+                kwargs = {"model": model} if model else {}
+                return await get_ai_provider_manager().generate_embeddings(texts, **kwargs)
+
+        batcher = EmbeddingBatcher(embed_batch, config)
+        _embedding_batchers[model] = batcher
+    return batcher
+
+
+__all__ = [
+    'EmbeddingBatcherConfig',
+    'EmbeddingBatcherStats',
+    'EmbeddingBatcher',
+    'HashingEmbedder',
+    'LocalTransformerEmbedder',
+    'estimate_tokens',
+    'get_embedding_batcher',
+]
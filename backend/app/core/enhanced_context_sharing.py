@@ -19,6 +19,8 @@ from collections import defaultdict
 
 from app.core.redis import get_redis_client
 from app.core.ethical_ai_core import ethical_ai_core
+from app.core.embedding_batcher import HashingEmbedder
+from app.core.vector_index import VectorIndex
 
 logger = structlog.get_logger(__name__)
 
@@ -98,6 +100,9 @@ class EnhancedContextSharing:
         self.event_listeners: Dict[str, List[callable]] = defaultdict(list)
         self.component_registry: Dict[str, Dict[str, Any]] = {}
         self.context_statistics: Dict[str, Any] = {}
+        # Embeddings of locally cached contexts for semantic_search_contexts
+        self.embedder = HashingEmbedder()
+        self.semantic_index = VectorIndex(self.embedder.dim, filter_fields=("context_type",))
         
         # Initialize context sharing system
         self._initialize_context_sharing()
@@ -181,6 +186,7 @@ class EnhancedContextSharing:
             
             # Store in local cache
             self.context_cache[context_data.context_id] = context_data
+            self._index_semantic(context_data)
             
             # Update statistics
             await self._update_context_statistics("store", context_data.context_type)
@@ -318,6 +324,7 @@ class EnhancedContextSharing:
             # Remove from local cache
             if context_id in self.context_cache:
                 del self.context_cache[context_id]
+            self.semantic_index.delete([context_id])
             
             # Update statistics
             await self._update_context_statistics("delete", context_type)
@@ -399,6 +406,20 @@ class EnhancedContextSharing:
                         error=str(e))
             return []
     
+    async def semantic_search_contexts(self, query: str,
+                                       context_type: Optional[ContextType] = None,
+                                       limit: int = 10) -> List[Tuple[ContextData, float]]:
+        """Locally cached contexts most similar to ``query``, with their similarity"""
+        try:
+            hits = self.semantic_index.search(
+                self.embedder.embed_texts([query])[0], limit,
+                filters={"context_type": context_type.value if context_type else None}
+            )
+            return [(self.context_cache[hit.id], hit.score) for hit in hits if hit.id in self.context_cache]
+        except Exception as e:
+            logger.error("Semantic context search failed", error=str(e))
+            return []
+    
     async def subscribe_to_context_changes(self, subscription: ContextSubscription) -> bool:
         """Subscribe to context change events"""
         try:
@@ -594,6 +615,7 @@ class EnhancedContextSharing:
                     if current_time > expiry_time:
                         # Remove from cache
                         del self.context_cache[context_id]
+                        self.semantic_index.delete([context_id])
                         
                         # Remove from Redis
                         cache_key = self._get_context_key(context_data.context_type, context_id)
@@ -610,6 +632,12 @@ class EnhancedContextSharing:
     
     # Helper methods
     
+    def _index_semantic(self, context_data: ContextData) -> None:
+        """(Re)embed a context from its tags and data"""
+        text = " ".join(context_data.tags) + " " + json.dumps(context_data.data, default=str)[:4000]
+        self.semantic_index.add([context_data.context_id], self.embedder.embed_texts([text]),
+                                [{"context_type": context_data.context_type.value}])
+    
     def _get_context_key(self, context_type: ContextType, context_id: str) -> str:
         """Get Redis key for context"""
         return f"{self.context_prefixes[context_type]}{context_id}"
@@ -0,0 +1,275 @@
+"""
+Incremental Validation
+Splits source into top-level units (functions, classes, module-level code),
+fingerprints each one and memoizes per-unit findings, so re-validating an
+edited file only re-analyzes the units that changed. Whole-module checks are
+recomputed from small per-unit facts (imports, name counts) instead of
+rescanning the source.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+import structlog
+
+from app.core.code_analysis_context import content_hash, get_analysis_context
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+_HEADER = re.compile(r"(?:async\s+def|def|class)\b")
+_NAME = re.compile(r"(?:async\s+def|def|class)\s+(\w+)")
+
+
+@dataclass(frozen=True)
+class CodeUnit:
+    """A top-level slice of a module; units concatenate back to the exact source"""
+    kind: str  # "function", "class" or "module"
+    name: str
+    start_line: int  # 1-based line of the unit's first line in the full source
+    source: str
+    fingerprint: str
+
+    @property
+    def line_offset(self) -> int:
+        """Add to a unit-relative line number to get the line in the full source"""
+        return self.start_line - 1
+
+    @property
+    def line_count(self) -> int:
+        return self.source.count("\n") + (0 if self.source.endswith("\n") else 1)
+
+
+def split_code_units(code: str) -> List[CodeUnit]:
+    """
+    Split source into top-level units.
+
+    A unit starts at a top-level ``def``/``class`` (or the first decorator
+    above it) and runs until the next top-level statement; everything else is
+    grouped into module units. Blank lines and comments stay with the unit
+    before them. Boundaries are found textually, so the file is never parsed
+    as a whole. A column-0 line inside a definition (the closing bracket of a
+    black-style signature, a multi-line string) cuts it short; such a unit does
+    not parse and absorbs the module fragments after it until it does. Parses
+    go through the shared analysis context cache, so unchanged units are not
+    parsed again and analyzers reuse the tree. A unit that still does not
+    parse tells callers to fall back to whole-module validation.
+    """
+    units = _split_textually(code)
+    joined: List[CodeUnit] = []
+    index = 0
+    while index < len(units):
+        unit = units[index]
+        index += 1
+        if unit.kind == "module" or get_analysis_context(unit.source).is_valid:
+            joined.append(unit)
+            continue
+        text = unit.source
+        while index < len(units) and units[index].kind == "module" and not get_analysis_context(text).is_valid:
+            # Take the fragment's column-0 lines one at a time; what is left stays module code
+            groups = _top_level_groups(units[index].source)
+            taken = 0
+            while taken < len(groups) and not get_analysis_context(text).is_valid:
+                text += groups[taken]
+                taken += 1
+            rest = "".join(groups[taken:])
+            if rest:
+                consumed = "".join(groups[:taken]).count("\n")
+                units[index] = CodeUnit("module", "<module>", units[index].start_line + consumed,
+                                        rest, content_hash(rest))
+            else:
+                index += 1
+        joined.append(CodeUnit(unit.kind, unit.name, unit.start_line, text, content_hash(text)))
+    return joined
+
+
+def _top_level_groups(source: str) -> List[str]:
+    # Each group starts at a column-0 line and carries the indented lines after it
+    groups: List[str] = []
+    for line in source.splitlines(keepends=True):
+        if groups and line[:1] in ("", " ", "\t", "\n", "\r", "#"):
+            groups[-1] += line
+        else:
+            groups.append(line)
+    return groups
+
+
+def _split_textually(code: str) -> List[CodeUnit]:
+    # Column-0 heuristics; split_code_units repairs definitions they cut short
+    units: List[CodeUnit] = []
+    current: List[str] = []
+    kind, name, start = "module", "<module>", 1
+    in_decorators = False
+
+    def flush() -> None:
+        if current:
+            text = "".join(current)
+            units.append(CodeUnit(kind, name, start, text, content_hash(text)))
+            current.clear()
+
+    for lineno, line in enumerate(code.splitlines(keepends=True), 1):
+        top_level = line[:1] not in ("", " ", "\t", "\n", "\r", "#")
+        if top_level:
+            is_header = bool(_HEADER.match(line))
+            if line.startswith("@") or is_header:
+                if not (in_decorators and current):
+                    flush()
+                    start = lineno
+                    kind, name = "function", "<decorated>"
+                if is_header:
+                    kind = "class" if line.startswith("class") else "function"
+                    match = _NAME.match(line)
+                    name = match.group(1) if match else name
+                in_decorators = line.startswith("@")
+            elif in_decorators:
+                pass  # closing line of a multi-line decorator
+            elif kind != "module" or not current:
+                flush()
+                kind, name, start = "module", "<module>", lineno
+                in_decorators = False
+        current.append(line)
+    flush()
+    return units
+
+
+class UnitResultCache:
+    """Bounded LRU of per-unit analysis results keyed by (analyzer, fingerprint)"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, Hashable]) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, Hashable], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+@dataclass
+class IncrementalAnalysis(Generic[T]):
+    """Per-unit results of one incremental run, aligned with ``units``"""
+    units: List[CodeUnit]
+    results: List[T]
+    reanalyzed: int
+
+    def with_units(self) -> List[Tuple[CodeUnit, T]]:
+        return list(zip(self.units, self.results))
+
+
+class IncrementalValidator:
+    """
+    Memoizes one analyzer's per-unit results across calls.
+
+    ``analyze_unit`` must depend only on the unit's text and report unit-relative
+    line numbers; callers shift them by ``unit.line_offset`` when merging.
+    Exceptions (e.g. ``SyntaxError`` for a unit that does not parse) propagate
+    and nothing is cached for that unit.
+    """
+
+    def __init__(self, name: str, cache: Optional[UnitResultCache] = None):
+        self.name = name
+        self.cache = cache or _unit_result_cache
+        self.runs = 0
+        self.units_seen = 0
+        self.units_reanalyzed = 0
+
+    def _record(self, units: List[CodeUnit], reanalyzed: int) -> None:
+        self.runs += 1
+        self.units_seen += len(units)
+        self.units_reanalyzed += reanalyzed
+        logger.debug("Incremental validation", analyzer=self.name, units=len(units), reanalyzed=reanalyzed)
+
+    def analyze(self, code: str, analyze_unit: Callable[[CodeUnit], T]) -> IncrementalAnalysis[T]:
+        units = split_code_units(code)
+        results: List[T] = []
+        reanalyzed = 0
+        for unit in units:
+            key = (self.name, unit.fingerprint)
+            result = self.cache.get(key)
+            if result is None:
+                result = analyze_unit(unit)
+                self.cache.put(key, result)
+                reanalyzed += 1
+            results.append(result)
+        self._record(units, reanalyzed)
+        return IncrementalAnalysis(units, results, reanalyzed)
+
+    async def analyze_async(self, code: str,
+                            analyze_unit: Callable[[CodeUnit], Awaitable[T]]) -> IncrementalAnalysis[T]:
+        units = split_code_units(code)
+        results: List[T] = []
+        reanalyzed = 0
+        for unit in units:
+            key = (self.name, unit.fingerprint)
+            result = self.cache.get(key)
+            if result is None:
+                result = await analyze_unit(unit)
+                self.cache.put(key, result)
+                reanalyzed += 1
+            results.append(result)
+        self._record(units, reanalyzed)
+        return IncrementalAnalysis(units, results, reanalyzed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "analyzer": self.name,
+            "runs": self.runs,
+            "units_seen": self.units_seen,
+            "units_reanalyzed": self.units_reanalyzed,
+            "reuse_rate": 1.0 - self.units_reanalyzed / self.units_seen if self.units_seen else 0.0,
+        }
+
+
+_unit_result_cache = UnitResultCache()
+_incremental_validators: Dict[str, IncrementalValidator] = {}
+
+
+def get_incremental_validator(name: str) -> IncrementalValidator:
+    """Shared incremental memo for the named analyzer"""
+    validator = _incremental_validators.get(name)
+    if validator is None:
+        validator = _incremental_validators[name] = IncrementalValidator(name)
+    return validator
+
+
+__all__ = [
+    'CodeUnit',
+    'split_code_units',
+    'UnitResultCache',
+    'IncrementalAnalysis',
+    'IncrementalValidator',
+    'get_incremental_validator',
+]
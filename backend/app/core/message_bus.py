@@ -0,0 +1,367 @@
+"""
+Message Bus
+In-process actor layer for multi-agent coordination. Every agent owns a
+bounded mailbox drained by a single worker, so it handles one batch at a time
+and senders wait (then shed with ``OverloadedError``) once the mailbox is full
+instead of piling up work in memory. Workers take up to ``batch_size`` queued
+messages per wakeup and yield to the event loop between batches. The bus
+routes direct messages, request/reply pairs (correlated by id) and topic
+broadcasts, and keeps throughput and latency metrics per agent. Agents are
+hosted by a ``Transport``; ``InProcessTransport`` is the only one today, but
+the bus never touches mailboxes directly, so agents can move to worker
+processes or other nodes behind the same interface.
+"""
+
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+
+from app.core.adaptive_concurrency import OverloadedError
+
+logger = structlog.get_logger()
+
+
+class MessageBusError(Exception):
+    """Unknown agent, or an agent failed to handle a request"""
+
+
+class MessageKind(str, Enum):
+    TELL = "tell"  # one-way direct message
+    REQUEST = "request"  # expects a reply
+    REPLY = "reply"
+    EVENT = "event"  # topic broadcast
+
+
+@dataclass
+class Message:
+    recipient: str
+    payload: Any
+    kind: MessageKind = MessageKind.TELL
+    sender: Optional[str] = None
+    topic: Optional[str] = None
+    correlation_id: Optional[str] = None
+    error: Optional[str] = None  # set on replies when the handler failed
+    message_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.monotonic)
+
+    def reply(self, payload: Any = None, error: Optional[str] = None) -> "Message":
+        return Message(recipient=self.sender or "", payload=payload, kind=MessageKind.REPLY,
+                       sender=self.recipient, correlation_id=self.correlation_id, error=error)
+
+
+# A handler takes one message, or the whole batch when registered ``batched``
+Handler = Callable[[Any], Awaitable[Any]]
+ReplySink = Callable[[Message], None]
+
+
+@dataclass
+class AgentMetrics:
+    received: int = 0
+    processed: int = 0
+    failed: int = 0
+    shed: int = 0
+    batches: int = 0
+    high_watermark: int = 0
+    latency_ms: float = 0.0  # smoothed enqueue-to-handled latency
+    max_latency_ms: float = 0.0
+    busy_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self, queued: int) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "failed": self.failed,
+            "shed": self.shed,
+            "batches": self.batches,
+            "queued": queued,
+            "high_watermark": self.high_watermark,
+            "average_batch": self.processed / self.batches if self.batches else 0.0,
+            "throughput_per_second": self.processed / uptime,
+            "utilization": min(1.0, self.busy_seconds / uptime),
+            "latency_ms": self.latency_ms,
+            "max_latency_ms": self.max_latency_ms,
+        }
+
+
+class Transport(ABC):
+    """Hosts agents and delivers messages to them"""
+
+    @abstractmethod
+    def host(self, agent_id: str, handler: Handler, batched: bool, on_reply: ReplySink,
+             mailbox_size: Optional[int] = None) -> None:
+        """Start accepting messages for ``agent_id``; replies to requests go to ``on_reply``"""
+
+    @abstractmethod
+    async def deliver(self, message: Message, timeout: Optional[float]) -> None:
+        """Enqueue for ``message.recipient``; raises OverloadedError if no room within ``timeout``"""
+
+    @abstractmethod
+    async def remove(self, agent_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def agent_stats(self, agent_id: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def agent_ids(self) -> List[str]:
+        ...
+
+    async def close(self) -> None:
+        for agent_id in self.agent_ids():
+            await self.remove(agent_id)
+
+
+class _Mailbox:
+    """Bounded queue plus the single worker that drains it"""
+
+    def __init__(self, agent_id: str, handler: Handler, batched: bool, on_reply: ReplySink,
+                 size: int, batch_size: int):
+        self.agent_id = agent_id
+        self.handler = handler
+        self.batched = batched
+        self.on_reply = on_reply
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.metrics = AgentMetrics()
+        self.worker: Optional[asyncio.Task] = None
+
+    def ensure_worker(self) -> None:
+        # Started lazily so agents can be registered outside a running loop
+        loop = asyncio.get_running_loop()
+        if self.worker is not None and self.worker.get_loop() is not loop:
+            # The loop the worker ran on is gone; its queue is bound to it
+            self.queue = asyncio.Queue(maxsize=self.queue.maxsize)
+        elif self.worker is not None and not self.worker.done():
+            return
+        self.worker = loop.create_task(self._run(), name=f"mailbox:{self.agent_id}")
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            await self._handle(batch)
+            # Let senders and other agents run before the next batch
+            await asyncio.sleep(0)
+
+    async def _handle(self, batch: List[Message]) -> None:
+        started = time.monotonic()
+        outcomes: List[tuple] = []
+        if self.batched:
+            try:
+                results = await self.handler(batch)
+                if len(results) != len(batch):
+                    raise MessageBusError(f"{self.agent_id} returned {len(results)} results for {len(batch)} messages")
+                outcomes = [(result, None) for result in results]
+            except Exception as e:
+                outcomes = [(None, str(e) or type(e).__name__)] * len(batch)
+        else:
+            for message in batch:
+                try:
+                    outcomes.append((await self.handler(message), None))
+                except Exception as e:
+                    outcomes.append((None, str(e) or type(e).__name__))
+
+        finished = time.monotonic()
+        metrics = self.metrics
+        metrics.batches += 1
+        metrics.busy_seconds += finished - started
+        for message, (result, error) in zip(batch, outcomes):
+            metrics.processed += 1
+            if error is not None:
+                metrics.failed += 1
+                logger.warning("Agent failed to handle message", agent_id=self.agent_id,
+                               kind=message.kind.value, error=error)
+            latency_ms = (finished - message.created_at) * 1000
+            metrics.latency_ms = latency_ms if metrics.processed == 1 else 0.9 * metrics.latency_ms + 0.1 * latency_ms
+            metrics.max_latency_ms = max(metrics.max_latency_ms, latency_ms)
+            if message.kind == MessageKind.REQUEST:
+                self.on_reply(message.reply(result, error))
+
+
+class InProcessTransport(Transport):
+    """Agents as asyncio workers in this process"""
+
+    def __init__(self, mailbox_size: int = 256, batch_size: int = 32):
+        self.mailbox_size = mailbox_size
+        self.batch_size = batch_size
+        self._mailboxes: Dict[str, _Mailbox] = {}
+
+    def host(self, agent_id: str, handler: Handler, batched: bool, on_reply: ReplySink,
+             mailbox_size: Optional[int] = None) -> None:
+        if agent_id in self._mailboxes:
+            raise MessageBusError(f"Agent already registered: {agent_id}")
+        self._mailboxes[agent_id] = _Mailbox(agent_id, handler, batched, on_reply,
+                                             mailbox_size or self.mailbox_size, self.batch_size)
+
+    async def deliver(self, message: Message, timeout: Optional[float]) -> None:
+        mailbox = self._mailboxes.get(message.recipient)
+        if mailbox is None:
+            raise MessageBusError(f"Unknown agent: {message.recipient}")
+        mailbox.ensure_worker()
+        metrics = mailbox.metrics
+        try:
+            mailbox.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(mailbox.queue.put(message), timeout)
+            except asyncio.TimeoutError:
+                metrics.shed += 1
+                raise OverloadedError(message.recipient, "mailbox is full",
+                                      retry_after=metrics.latency_ms / 1000 or 1.0)
+        metrics.received += 1
+        metrics.high_watermark = max(metrics.high_watermark, mailbox.queue.qsize())
+
+    async def remove(self, agent_id: str) -> None:
+        mailbox = self._mailboxes.pop(agent_id, None)
+        if mailbox is not None and mailbox.worker is not None:
+            mailbox.worker.cancel()
+            try:
+                await mailbox.worker
+            except asyncio.CancelledError:
+                pass
+
+    def agent_stats(self, agent_id: str) -> Dict[str, Any]:
+        mailbox = self._mailboxes[agent_id]
+        return mailbox.metrics.to_dict(mailbox.queue.qsize())
+
+    def agent_ids(self) -> List[str]:
+        return list(self._mailboxes)
+
+
+class MessageBus:
+    """
+    Routes messages between agents hosted by a transport.
+
+    ``tell`` is fire-and-forget, ``request`` waits for the handler's return
+    value, ``publish`` sends an event to every subscriber of a topic. All
+    three wait up to ``send_timeout`` for mailbox space, which is where
+    backpressure reaches the sender.
+    """
+
+    def __init__(self, transport: Optional[Transport] = None, send_timeout: Optional[float] = 2.0,
+                 request_timeout: Optional[float] = 60.0):
+        self.transport = transport or InProcessTransport()
+        self.send_timeout = send_timeout
+        self.request_timeout = request_timeout
+        self._subscriptions: Dict[str, Set[str]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.stats = {"sent": 0, "requests": 0, "replies": 0, "late_replies": 0, "published": 0,
+                      "shed": 0, "request_timeouts": 0}
+
+    def register(self, agent_id: str, handler: Handler, batched: bool = False,
+                 mailbox_size: Optional[int] = None, topics: Optional[List[str]] = None) -> None:
+        self.transport.host(agent_id, handler, batched, self._on_reply, mailbox_size)
+        for topic in topics or []:
+            self.subscribe(agent_id, topic)
+
+    async def unregister(self, agent_id: str) -> None:
+        for subscribers in self._subscriptions.values():
+            subscribers.discard(agent_id)
+        await self.transport.remove(agent_id)
+
+    def subscribe(self, agent_id: str, topic: str) -> None:
+        self._subscriptions.setdefault(topic, set()).add(agent_id)
+
+    def unsubscribe(self, agent_id: str, topic: str) -> None:
+        self._subscriptions.get(topic, set()).discard(agent_id)
+
+    async def tell(self, recipient: str, payload: Any, sender: Optional[str] = None) -> None:
+        await self._deliver(Message(recipient, payload, MessageKind.TELL, sender))
+
+    async def request(self, recipient: str, payload: Any, sender: Optional[str] = None,
+                      timeout: Optional[float] = None) -> Any:
+        """Send and wait for the reply; raises MessageBusError if the handler failed"""
+        correlation_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[correlation_id] = future
+        self.stats["requests"] += 1
+        try:
+            await self._deliver(Message(recipient, payload, MessageKind.REQUEST, sender,
+                                        correlation_id=correlation_id))
+            reply = await asyncio.wait_for(future, timeout if timeout is not None else self.request_timeout)
+        except asyncio.TimeoutError:
+            self.stats["request_timeouts"] += 1
+            raise
+        finally:
+            self._pending.pop(correlation_id, None)
+        if reply.error is not None:
+            raise MessageBusError(f"{recipient} failed: {reply.error}")
+        return reply.payload
+
+    async def publish(self, topic: str, payload: Any, sender: Optional[str] = None) -> int:
+        """Broadcast to the topic's subscribers; returns how many accepted it"""
+        subscribers = sorted(self._subscriptions.get(topic, ()))
+        outcomes = await asyncio.gather(
+            *(self._deliver(Message(agent_id, payload, MessageKind.EVENT, sender, topic=topic))
+              for agent_id in subscribers),
+            return_exceptions=True,
+        )
+        self.stats["published"] += 1
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, OverloadedError):
+                raise outcome
+        return sum(1 for outcome in outcomes if not isinstance(outcome, BaseException))
+
+    async def _deliver(self, message: Message) -> None:
+        try:
+            await self.transport.deliver(message, self.send_timeout)
+        except OverloadedError:
+            self.stats["shed"] += 1
+            raise
+        self.stats["sent"] += 1
+
+    def _on_reply(self, message: Message) -> None:
+        future = self._pending.get(message.correlation_id or "")
+        if future is None or future.done():
+            self.stats["late_replies"] += 1
+            return
+        self.stats["replies"] += 1
+        future.set_result(message)
+
+    async def close(self) -> None:
+        await self.transport.close()
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending_requests": len(self._pending),
+            "topics": {topic: len(subscribers) for topic, subscribers in self._subscriptions.items()},
+            "agents": {agent_id: self.transport.agent_stats(agent_id) for agent_id in self.transport.agent_ids()},
+        }
+
+
+def create_message_bus(transport: Optional[Transport] = None) -> MessageBus:
+    """Message bus with an in-process transport sized from settings"""
+    from app.core.config import get_settings
+    settings = get_settings()
+    return MessageBus(
+        transport or InProcessTransport(settings.MESSAGE_BUS_MAILBOX_SIZE, settings.MESSAGE_BUS_BATCH_SIZE),
+        send_timeout=settings.MESSAGE_BUS_SEND_TIMEOUT_SECONDS,
+        request_timeout=settings.MESSAGE_BUS_REQUEST_TIMEOUT_SECONDS,
+    )
+
+
+__all__ = [
+    "AgentMetrics",
+    "InProcessTransport",
+    "Message",
+    "MessageBus",
+    "MessageBusError",
+    "MessageKind",
+    "Transport",
+    "create_message_bus",
+]
@@ -0,0 +1,365 @@
+"""
+Compiled Multi-Pattern Rule Engine
+Compiles a validator's regex rule set once and finds every rule hit in a single
+literal pass over the text: a multi-literal automaton over required literals
+picks the candidate rules (and lines), a combined alternation gates the rules
+that have no usable literal, and only candidates run their own regex
+"""
+
+import re
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import structlog
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# Literals shorter than this prune too little to be worth tracking
+MIN_LITERAL_LENGTH = 2
+
+# Non-ASCII characters that IGNORECASE matches to an ASCII letter other than their lower()
+_FOLD_EXCEPTIONS = ("\u0130", "\u0131", "\u017f")
+_LEADING_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+_FLAG_BY_LETTER = {"a": re.ASCII, "i": re.IGNORECASE, "L": re.LOCALE, "m": re.MULTILINE,
+                   "s": re.DOTALL, "u": re.UNICODE, "x": re.VERBOSE}
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+@dataclass(frozen=True)
+class PatternRule:
+    """One rule: ``id`` is whatever the caller wants back with each hit"""
+    id: Hashable
+    pattern: str
+    flags: int = 0
+
+    @classmethod
+    def literal(cls, id: Hashable, text: str, ignore_case: bool = False) -> "PatternRule":
+        """Rule matching a plain substring"""
+        return cls(id, re.escape(text), re.IGNORECASE if ignore_case else 0)
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    rule_id: Hashable
+    line: int  # 1-based
+    column: int  # 0-based offset of the match in its line
+    match: re.Match  # positions are relative to the scanned text (or line, for scan_lines)
+
+    @property
+    def text(self) -> str:
+        return self.match.group(0)
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[Tuple[str, ...]]:
+    """
+    Lowercased ASCII literals of which every match must contain at least one,
+    or None when the pattern has no usable literal (too short, optional, or
+    unparseable). A literal never spans a newline.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError, AssertionError):
+        return None
+    best = _best_literal_set(list(parsed))
+    if not best or min(len(literal) for literal in best) < MIN_LITERAL_LENGTH:
+        return None
+    return tuple(sorted(best))
+
+
+def _best_literal_set(items: List[Tuple[Any, Any]]) -> Optional[Set[str]]:
+    """Best (longest shortest-literal) required literal set of a parsed sequence"""
+    candidates: List[Set[str]] = []
+    run: List[str] = []
+
+    def end_run() -> None:
+        if run:
+            candidates.append({"".join(run).lower()})
+            run.clear()
+
+    for op, value in items:
+        if op == sre_constants.LITERAL:
+            char = chr(value)
+            if char == "\n" or not char.isascii():
+                end_run()
+            else:
+                run.append(char)
+            continue
+        end_run()
+        if op == sre_constants.SUBPATTERN:
+            found = _best_literal_set(list(value[-1]))
+            if found:
+                candidates.append(found)
+        elif op in _REPEATS:
+            minimum, _, item = value
+            if minimum >= 1:
+                found = _best_literal_set(list(item))
+                if found:
+                    candidates.append(found)
+        elif op == sre_constants.BRANCH:
+            union: Set[str] = set()
+            for branch in value[1]:
+                found = _best_literal_set(list(branch))
+                if not found:
+                    union = set()
+                    break
+                union |= found
+            if union:
+                candidates.append(union)
+    end_run()
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: min(len(literal) for literal in literals))
+
+
+class _LiteralScanner:
+    """
+    Finds every (possibly overlapping) occurrence of a fixed set of lowercase
+    literals in one pass: an Aho-Corasick automaton when ``pyahocorasick`` is
+    installed, otherwise a lookahead alternation run by the C regex engine
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        self.literals = sorted(set(literals), key=lambda literal: (-len(literal), literal))
+        self._automaton = None
+        self._regex: Optional[re.Pattern] = None
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+        if not self.literals:
+            return
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for literal in self.literals:
+                automaton.add_word(literal, literal)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            # The alternation reports only the longest literal starting at each
+            # position; shorter literals that are its prefixes occur there too
+            self._regex = re.compile("(?=(" + "|".join(map(re.escape, self.literals)) + "))")
+            self._prefixes = {
+                literal: tuple(other for other in self.literals if literal.startswith(other))
+                for literal in self.literals
+            }
+
+    def occurrences(self, lowered: str) -> Iterable[Tuple[int, str]]:
+        """(start offset, literal) for every occurrence"""
+        if self._automaton is not None:
+            for end, literal in self._automaton.iter(lowered):
+                yield end - len(literal) + 1, literal
+        elif self._regex is not None:
+            for match in self._regex.finditer(lowered):
+                for literal in self._prefixes[match.group(1)]:
+                    yield match.start(), literal
+
+
+class RuleSet:
+    """
+    A rule set compiled once for repeated scanning. Results are exactly those
+    of running every rule's own regex (``finditer``/``search``) over the text
+    or over each line, in rule order; the literal pass only skips rules that
+    cannot match.
+    """
+
+    def __init__(self, rules: Iterable[PatternRule], name: str = "rules"):
+        self.name = name
+        self.rules: List[PatternRule] = []
+        self._regexes: List[re.Pattern] = []
+        rule_literals: List[Optional[Tuple[str, ...]]] = []
+        for rule in rules:
+            pattern, flags = _hoist_leading_flags(rule.pattern, rule.flags)
+            self.rules.append(rule)
+            self._regexes.append(re.compile(pattern, flags))
+            rule_literals.append(required_literals(pattern, flags))
+
+        self._rules_by_literal: Dict[str, List[int]] = {}
+        self._unanchored: List[int] = []
+        for index, literals in enumerate(rule_literals):
+            if literals is None:
+                self._unanchored.append(index)
+                continue
+            for literal in literals:
+                self._rules_by_literal.setdefault(literal, []).append(index)
+        self._scanner = _LiteralScanner(self._rules_by_literal)
+        self._gate = self._combined_alternation(self._unanchored)
+        self._lock = threading.Lock()
+        self.stats = {"scans": 0, "rules_evaluated": 0, "rules_skipped": 0}
+
+    def _combined_alternation(self, indexes: Sequence[int]) -> Optional[re.Pattern]:
+        """One regex matching wherever any of the given rules matches (None when not combinable)"""
+        if len(indexes) < 2:
+            return None
+        parts = []
+        for index in indexes:
+            regex = self._regexes[index]
+            if regex.groupindex or _uses_backreferences(regex.pattern):
+                return None
+            scoped = "".join(letter for flag, letter in _SCOPED_FLAGS if regex.flags & flag)
+            if regex.flags & (re.ASCII | re.LOCALE):
+                return None
+            parts.append(f"(?{scoped}:{regex.pattern})" if scoped else f"(?:{regex.pattern})")
+        try:
+            return re.compile("|".join(parts))
+        except re.error:
+            return None
+
+    def _record(self, evaluated: int) -> None:
+        with self._lock:
+            self.stats["scans"] += 1
+            self.stats["rules_evaluated"] += evaluated
+            self.stats["rules_skipped"] += len(self.rules) - evaluated
+
+    def _candidate_rules(self, text: str) -> List[int]:
+        """Indexes of rules that can match somewhere in ``text``, in rule order"""
+        lowered = _lowered(text)
+        if lowered is None:
+            return list(range(len(self.rules)))
+        candidates: Set[int] = set()
+        for _, literal in self._scanner.occurrences(lowered):
+            candidates.update(self._rules_by_literal[literal])
+            if len(candidates) == len(self.rules) - len(self._unanchored):
+                break
+        if self._unanchored and (self._gate is None or self._gate.search(text)):
+            candidates.update(self._unanchored)
+        return sorted(candidates)
+
+    def scan(self, text: str) -> List[RuleHit]:
+        """Every match of every rule over the whole text, ordered by position then rule"""
+        candidates = self._candidate_rules(text)
+        line_starts = _line_starts(text)
+        hits = []
+        for index in candidates:
+            for match in self._regexes[index].finditer(text):
+                line = bisect_right(line_starts, match.start())
+                hits.append(RuleHit(self.rules[index].id, line, match.start() - line_starts[line - 1], match))
+        self._record(len(candidates))
+        hits.sort(key=lambda hit: hit.match.start())
+        return hits
+
+    def scan_lines(self, text: str, all_matches: bool = False) -> List[RuleHit]:
+        """
+        Rules applied to each ``text.split('\\n')`` line on its own, ordered by
+        line then rule: the first match per (line, rule), or every match with
+        ``all_matches``
+        """
+        lines = text.split("\n")
+        lowered = _lowered(text)
+        by_line: Dict[int, Set[int]] = {}
+        if lowered is not None:
+            line_starts = _line_starts(text)
+            for start, literal in self._scanner.occurrences(lowered):
+                by_line.setdefault(bisect_right(line_starts, start), set()).update(self._rules_by_literal[literal])
+        else:
+            anchored = [i for i in range(len(self.rules)) if i not in set(self._unanchored)]
+            by_line = {number: set(anchored) for number in range(1, len(lines) + 1)}
+        if self._unanchored:
+            for number, line in enumerate(lines, 1):
+                if self._gate is None or self._gate.search(line):
+                    by_line.setdefault(number, set()).update(self._unanchored)
+
+        hits = []
+        evaluated = 0
+        for number in sorted(by_line):
+            line = lines[number - 1]
+            for index in sorted(by_line[number]):
+                evaluated += 1
+                regex = self._regexes[index]
+                if all_matches:
+                    hits.extend(RuleHit(self.rules[index].id, number, m.start(), m) for m in regex.finditer(line))
+                else:
+                    match = regex.search(line)
+                    if match:
+                        hits.append(RuleHit(self.rules[index].id, number, match.start(), match))
+        with self._lock:
+            self.stats["scans"] += 1
+            self.stats["rules_evaluated"] += evaluated
+            self.stats["rules_skipped"] += len(self.rules) * len(lines) - evaluated
+        return hits
+
+    def matching_rules(self, text: str) -> List[Hashable]:
+        """Ids of rules that match anywhere in the text (``re.search`` semantics), in rule order"""
+        candidates = self._candidate_rules(text)
+        self._record(len(candidates))
+        return [self.rules[index].id for index in candidates if self._regexes[index].search(text)]
+
+    def first_match(self, text: str) -> Optional[RuleHit]:
+        """First match of the first rule (in rule order) that matches anywhere"""
+        candidates = self._candidate_rules(text)
+        for evaluated, index in enumerate(candidates, 1):
+            match = self._regexes[index].search(text)
+            if match:
+                self._record(evaluated)
+                line = text.count("\n", 0, match.start()) + 1
+                return RuleHit(self.rules[index].id, line, match.start() - (text.rfind("\n", 0, match.start()) + 1),
+                               match)
+        self._record(len(candidates))
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "rules": len(self.rules),
+            "literal_rules": len(self.rules) - len(self._unanchored),
+            "literals": len(self._rules_by_literal),
+            "automaton": "aho-corasick" if AHOCORASICK_AVAILABLE else "regex",
+            **self.stats,
+        }
+
+
+def _hoist_leading_flags(pattern: str, flags: int) -> Tuple[str, int]:
+    """Turn a leading ``(?i)``-style group into flags so the rule can be combined"""
+    match = _LEADING_FLAGS.match(pattern)
+    if not match:
+        return pattern, flags
+    for letter in match.group(1):
+        flags |= _FLAG_BY_LETTER[letter]
+    return pattern[match.end():], flags
+
+
+def _lowered(text: str) -> Optional[str]:
+    """Lowercased text with unchanged offsets, or None when case folding cannot be trusted for pruning"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return None
+    if not text.isascii() and any(char in text for char in _FOLD_EXCEPTIONS):
+        return None
+    return lowered
+
+
+def _uses_backreferences(pattern: str) -> bool:
+    return bool(re.search(r"\\[1-9]|\(\?P=", pattern))
+
+
+def _line_starts(text: str) -> List[int]:
+    starts = [0]
+    find = text.find
+    position = find("\n")
+    while position != -1:
+        starts.append(position + 1)
+        position = find("\n", position + 1)
+    return starts
+
+
+__all__ = [
+    'AHOCORASICK_AVAILABLE',
+    'PatternRule',
+    'RuleHit',
+    'RuleSet',
+    'required_literals',
+]
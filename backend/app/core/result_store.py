@@ -0,0 +1,388 @@
+"""
+Result Store
+Bounded keyed storage for task results, plans and other records that
+long-running services keep for later lookup. Entries expire after a TTL; when
+the in-memory budget is exceeded, the least recently used large payloads are
+spilled to append-only, zlib-compressed segment files on local disk, and the
+least recently used entries beyond the entry or disk budget are dropped. A
+secondary index by user id serves per-user listings without a full scan.
+
+Entries still being mutated by their owner (in-progress tasks) are ``pinned``:
+they stay in memory and never expire or get evicted until unpinned.
+"""
+
+import itertools
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+_MISSING = object()
+
+
+@dataclass
+class _Entry:
+    key: str
+    value: Any
+    size: int  # serialized bytes (estimate when the value cannot be pickled)
+    seq: int  # insertion order
+    expires_at: Optional[float]
+    user_id: Optional[str] = None
+    pinned: bool = False
+    spillable: bool = True
+    location: Optional[Tuple[int, int, int]] = None  # (segment, offset, length) once spilled
+
+
+def _measure(value: Any) -> Tuple[int, bool]:
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)), True
+    except Exception:
+        return sys.getsizeof(value), False
+
+
+class ResultStore:
+    """
+    LRU + TTL map with memory accounting and spill-to-disk.
+
+    ``max_memory_bytes`` bounds the serialized size of values held in memory;
+    only values of at least ``spill_min_bytes`` are spilled, smaller ones are
+    dropped outright once they fall out of the budget. ``max_entries`` bounds
+    live entries in memory and on disk together, ``max_disk_bytes`` the
+    segment files (the oldest segment is deleted with its entries). Reading
+    a spilled entry returns a fresh copy and leaves it on disk.
+    """
+
+    def __init__(self, name: str, ttl_seconds: Optional[float] = 3600.0, max_entries: int = 10_000,
+                 max_memory_bytes: int = 64_000_000, spill_min_bytes: int = 16_384,
+                 max_disk_bytes: int = 512_000_000, segment_bytes: int = 8_000_000,
+                 spill_dir: Optional[str] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_min_bytes = spill_min_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.segment_bytes = segment_bytes
+        self._spill_root = spill_dir
+        self._spill_dir: Optional[str] = None
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_user: Dict[str, Dict[str, None]] = {}
+        self._segments: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()  # id -> {"path", "bytes", "keys"}
+        self._segment_ids = itertools.count()
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.stats = {"puts": 0, "hits": 0, "disk_hits": 0, "misses": 0, "spilled": 0, "evicted": 0,
+                      "expired": 0, "disk_dropped": 0}
+
+    # -- mapping -------------------------------------------------------------
+
+    def put(self, key: str, value: Any, user_id: Optional[str] = None, ttl_seconds: Optional[float] = None,
+            pinned: bool = False) -> None:
+        size, spillable = _measure(value)
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._remove(previous)
+                if user_id is None:
+                    user_id = previous.user_id
+            entry = _Entry(key, value, size, next(self._seq), time.monotonic() + ttl if ttl else None,
+                           user_id, pinned, spillable)
+            self._entries[key] = entry
+            self.memory_bytes += size
+            if user_id is not None:
+                self._by_user.setdefault(user_id, {})[key] = None
+            self.stats["puts"] += 1
+            if self.stats["puts"] % 256 == 0:
+                self.purge_expired()
+            self._enforce_budgets()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            if entry.location is None:
+                self.stats["hits"] += 1
+                return entry.value
+            self.stats["disk_hits"] += 1
+            return self._load(entry)
+
+    def unpin(self, key: str) -> None:
+        """The owner is done mutating the value: re-measure it and let it age normally"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.pinned:
+                return
+            entry.pinned = False
+            if entry.location is None:
+                size, entry.spillable = _measure(entry.value)
+                self.memory_bytes += size - entry.size
+                entry.size = size
+            self._enforce_budgets()
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self.get(key, _MISSING)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._remove(entry)
+            return default if value is _MISSING else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.put(key, value)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return isinstance(key, str) and self._live_entry(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [entry.key for entry in self._ordered(self._entries.values())]
+
+    def values(self) -> List[Any]:
+        """Every live value, oldest first (spilled ones are read back from disk)"""
+        return [value for _, value in self.items()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            return self._materialize(list(self._entries.values()))
+
+    def for_user(self, user_id: str) -> List[Any]:
+        """Values stored for ``user_id``, oldest first"""
+        with self._lock:
+            keys = self._by_user.get(user_id, {})
+            return [value for _, value in self._materialize([self._entries[key] for key in keys])]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in list(self._entries.values()):
+                self._remove(entry)
+
+    # -- budgets -------------------------------------------------------------
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            expired = [entry for entry in self._entries.values()
+                       if not entry.pinned and entry.expires_at is not None and entry.expires_at <= now]
+            for entry in expired:
+                self._remove(entry)
+            self.stats["expired"] += len(expired)
+            return len(expired)
+
+    def _enforce_budgets(self) -> None:
+        if self.memory_bytes <= self.max_memory_bytes and len(self._entries) <= self.max_entries:
+            return
+        self.purge_expired()
+        # Oldest first: spill what is big enough to be worth a disk round trip, drop the rest
+        for entry in list(self._entries.values()):
+            if self.memory_bytes <= self.max_memory_bytes:
+                break
+            if entry.pinned or entry.location is not None:
+                continue
+            if entry.spillable and entry.size >= self.spill_min_bytes and self._spill(entry):
+                continue
+            self._remove(entry)
+            self.stats["evicted"] += 1
+        for entry in list(self._entries.values()):
+            if len(self._entries) <= self.max_entries:
+                break
+            if not entry.pinned:
+                self._remove(entry)
+                self.stats["evicted"] += 1
+        if self.memory_bytes > self.max_memory_bytes:
+            logger.debug("Result store over memory budget with pinned entries", store=self.name,
+                           memory_bytes=self.memory_bytes)
+
+    # -- segments ------------------------------------------------------------
+
+    def _segment_for(self, length: int) -> Tuple[int, Dict[str, Any]]:
+        if self._spill_dir is None:
+            if self._spill_root:
+                os.makedirs(self._spill_root, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix=f"result-store-{self.name}-", dir=self._spill_root)
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        if self._segments:
+            segment_id = next(reversed(self._segments))
+            segment = self._segments[segment_id]
+            if segment["bytes"] + length <= self.segment_bytes:
+                return segment_id, segment
+            if not segment["keys"]:
+                self._release_segment(segment_id, segment)
+        segment_id = next(self._segment_ids)
+        segment = {"path": os.path.join(self._spill_dir, f"{segment_id:08d}.seg"), "bytes": 0, "keys": set()}
+        self._segments[segment_id] = segment
+        return segment_id, segment
+
+    def _spill(self, entry: _Entry) -> bool:
+        try:
+            blob = zlib.compress(pickle.dumps(entry.value, pickle.HIGHEST_PROTOCOL), 6)
+            segment_id, segment = self._segment_for(len(blob))
+            with open(segment["path"], "ab") as handle:
+                handle.write(blob)
+        except Exception as e:
+            logger.warning("Result spill failed", store=self.name, key=entry.key, error=str(e))
+            entry.spillable = False
+            return False
+        entry.location = (segment_id, segment["bytes"], len(blob))
+        segment["bytes"] += len(blob)
+        segment["keys"].add(entry.key)
+        entry.value = None
+        self.memory_bytes -= entry.size
+        self.disk_bytes += len(blob)
+        self.stats["spilled"] += 1
+        while self.disk_bytes > self.max_disk_bytes and len(self._segments) > 1:
+            self._drop_segment(next(iter(self._segments)))
+        return True
+
+    def _load(self, entry: _Entry) -> Any:
+        segment_id, offset, length = entry.location
+        with open(self._segments[segment_id]["path"], "rb") as handle:
+            handle.seek(offset)
+            return pickle.loads(zlib.decompress(handle.read(length)))
+
+    def _drop_segment(self, segment_id: int) -> None:
+        segment = self._segments.pop(segment_id)
+        for key in list(segment["keys"]):
+            self._remove(self._entries[key])
+            self.stats["disk_dropped"] += 1
+        self._release_segment(segment_id, segment)
+
+    def _release_segment(self, segment_id: int, segment: Dict[str, Any]) -> None:
+        self._segments.pop(segment_id, None)
+        self.disk_bytes -= segment["bytes"]
+        try:
+            os.remove(segment["path"])
+        except OSError:
+            pass
+
+    # -- internals -----------------------------------------------------------
+
+    def _live_entry(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.pinned and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(entry)
+            self.stats["expired"] += 1
+            return None
+        return entry
+
+    def _remove(self, entry: _Entry) -> None:
+        self._entries.pop(entry.key, None)
+        if entry.user_id is not None:
+            keys = self._by_user.get(entry.user_id)
+            if keys is not None:
+                keys.pop(entry.key, None)
+                if not keys:
+                    del self._by_user[entry.user_id]
+        if entry.location is None:
+            self.memory_bytes -= entry.size
+            return
+        segment_id = entry.location[0]
+        segment = self._segments.get(segment_id)
+        if segment is not None:
+            segment["keys"].discard(entry.key)
+            # A segment nobody references is deleted; the current one keeps taking appends
+            if not segment["keys"] and segment_id != next(reversed(self._segments)):
+                self._release_segment(segment_id, segment)
+
+    @staticmethod
+    def _ordered(entries: List[_Entry]) -> List[_Entry]:
+        return sorted(entries, key=lambda entry: entry.seq)
+
+    def _materialize(self, entries: List[_Entry]) -> List[Tuple[str, Any]]:
+        now = time.monotonic()
+        items = []
+        for entry in self._ordered(entries):
+            if not entry.pinned and entry.expires_at is not None and entry.expires_at <= now:
+                continue
+            items.append((entry.key, entry.value if entry.location is None else self._load(entry)))
+        return items
+
+    def close(self) -> None:
+        with self._lock:
+            self.clear()
+            for segment_id, segment in list(self._segments.items()):
+                self._release_segment(segment_id, segment)
+            if self._spill_dir is not None:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+                self._spill_dir = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            spilled = sum(1 for entry in self._entries.values() if entry.location is not None)
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "in_memory": len(self._entries) - spilled,
+                "on_disk": spilled,
+                "pinned": sum(1 for entry in self._entries.values() if entry.pinned),
+                "users": len(self._by_user),
+                "memory_bytes": self.memory_bytes,
+                "disk_bytes": self.disk_bytes,
+                "segments": len(self._segments),
+            }
+
+
+_stores: "weakref.WeakValueDictionary[str, ResultStore]" = weakref.WeakValueDictionary()
+
+
+def create_result_store(name: str, **overrides: Any) -> ResultStore:
+    """A store configured from settings, registered for ``result_store_stats``"""
+    from app.core.config import get_settings
+    settings = get_settings()
+    options = {
+        "ttl_seconds": settings.RESULT_STORE_TTL_SECONDS,
+        "max_entries": settings.RESULT_STORE_MAX_ENTRIES,
+        "max_memory_bytes": settings.RESULT_STORE_MAX_MEMORY_BYTES,
+        "spill_min_bytes": settings.RESULT_STORE_SPILL_MIN_BYTES,
+        "max_disk_bytes": settings.RESULT_STORE_MAX_DISK_BYTES,
+        "spill_dir": settings.RESULT_STORE_SPILL_DIR,
+        **overrides,
+    }
+    store = ResultStore(name, **options)
+    # Several instances of a service may share a name; each registers separately
+    _stores[f"{name}:{id(store)}"] = store
+    return store
+
+
+def result_store_stats() -> Dict[str, Dict[str, Any]]:
+    """Memory and disk accounting of every live store"""
+    return {key: store.get_stats() for key, store in list(_stores.items())}
+
+
+__all__ = [
+    "ResultStore",
+    "create_result_store",
+    "result_store_stats",
+]
@@ -0,0 +1,359 @@
+"""
+In-Memory Code Search Index
+Inverted token index with identifier-aware splitting, a trigram index over the
+vocabulary for substring and fuzzy queries, and BM25 ranking with top-k
+selection. Documents are added and removed incrementally, so searching costs
+time proportional to the matching postings rather than to everything indexed.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+_IDENTIFIER = re.compile(r"[A-Za-z0-9_]+")
+_WORD_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+# Expanded (non-exact) terms score below exact ones
+SUBSTRING_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.5
+MIN_FUZZY_SIMILARITY = 0.4
+MAX_EXPANSIONS = 64
+
+
+def split_identifiers(text: str) -> List[Tuple[str, List[str]]]:
+    """Lowercase identifiers in text, each with its snake_case/camelCase parts (empty when it has only one)"""
+    identifiers = []
+    for identifier in _IDENTIFIER.findall(text):
+        identifier = identifier.strip("_")
+        if not identifier:
+            continue
+        parts = [part.lower() for chunk in identifier.split("_") for part in _WORD_PART.findall(chunk)]
+        identifiers.append((identifier.lower(), parts if len(parts) > 1 else []))
+    return identifiers
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Each identifier is kept whole and also split at snake_case and camelCase
+    boundaries, so ``getUserName`` yields ``getusername``, ``get``, ``user``
+    and ``name``.
+    """
+    tokens: List[str] = []
+    for identifier, parts in split_identifiers(text):
+        tokens.append(identifier)
+        tokens.extend(parts)
+    return tokens
+
+
+@lru_cache(maxsize=65536)
+def _field_terms(text: str) -> Tuple[str, ...]:
+    # Symbol names, kinds and languages repeat heavily across a repository
+    return tuple(tokenize(text))
+
+
+def trigrams(term: str) -> Set[str]:
+    """Distinct character trigrams of a term"""
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result"""
+    doc_id: str
+    score: float
+    result_type: Optional[str]
+    project_id: Optional[str]
+    payload: Any
+
+
+@dataclass
+class SearchPage:
+    """A page of ranked hits plus the total number of matching documents"""
+    hits: List[SearchHit]
+    total: int
+    offset: int
+    limit: Optional[int]
+    max_score: float = 0.0  # best score among all matches, not just this page
+    reference_score: float = 0.0  # what a document identical to the query would score; see ``confidence``
+
+    def confidence(self, hit: SearchHit) -> float:
+        """Absolute match quality in 0-1: the hit's score against the query's self-match score"""
+        if not self.reference_score:
+            return 0.0
+        return round(min(1.0, hit.score / self.reference_score), 4)
+
+
+@dataclass
+class _Document:
+    doc_id: str
+    project_id: Optional[str]
+    result_type: Optional[str]
+    payload: Any
+    terms: Dict[str, float]
+    length: float
+
+
+class SearchIndex:
+    """
+    BM25 search over multi-field documents.
+
+    ``field_weights`` scales term frequencies per field (a BM25F-style
+    simplification), e.g. a hit in a symbol name counts more than one in its
+    language.
+    """
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None, k1: float = 1.2, b: float = 0.75):
+        self.field_weights = dict(field_weights or {})
+        self.k1 = k1
+        self.b = b
+        self._documents: Dict[str, _Document] = {}
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._by_project: Dict[Optional[str], Set[str]] = defaultdict(set)
+        self._norms: Optional[Dict[str, float]] = None
+        self._sorted_terms: Optional[List[str]] = None
+        self._total_length = 0.0
+        self.stats = {"searches": 0, "expanded_terms": 0, "candidates_scored": 0}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add(self, doc_id: str, fields: Dict[str, str], *, project_id: Optional[str] = None,
+            result_type: Optional[str] = None, payload: Any = None) -> None:
+        """Index a document, replacing any previous document with the same id"""
+        if doc_id in self._documents:
+            self.remove(doc_id)
+
+        terms: Dict[str, float] = {}
+        for field, text in fields.items():
+            if not text:
+                continue
+            weight = self.field_weights.get(field, 1.0)
+            for term in _field_terms(str(text)):
+                terms[term] = terms.get(term, 0.0) + weight
+
+        document = _Document(doc_id, project_id, result_type, payload, terms, sum(terms.values()))
+        self._documents[doc_id] = document
+        self._by_project[project_id].add(doc_id)
+        self._total_length += document.length
+        self._norms = None
+
+        for term, frequency in terms.items():
+            postings = self._postings[term]
+            if not postings:
+                for trigram in trigrams(term):
+                    self._trigrams[trigram].add(term)
+                self._sorted_terms = None
+            postings[doc_id] = frequency
+
+    def set_payload(self, doc_id: str, payload: Any) -> bool:
+        """Swap what a document returns without re-indexing it"""
+        document = self._documents.get(doc_id)
+        if document is None:
+            return False
+        document.payload = payload
+        return True
+
+    def get_payload(self, doc_id: str) -> Any:
+        document = self._documents.get(doc_id)
+        return None if document is None else document.payload
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop a document from the index"""
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return False
+
+        self._total_length -= document.length
+        project_docs = self._by_project[document.project_id]
+        project_docs.discard(doc_id)
+        if not project_docs:
+            del self._by_project[document.project_id]
+        self._norms = None
+
+        for term in document.terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                for trigram in trigrams(term):
+                    holders = self._trigrams[trigram]
+                    holders.discard(term)
+                    if not holders:
+                        del self._trigrams[trigram]
+                self._sorted_terms = None
+        return True
+
+    def remove_project(self, project_id: Optional[str]) -> int:
+        """Drop every document that belongs to a project"""
+        doc_ids = list(self._by_project.get(project_id, ()))
+        for doc_id in doc_ids:
+            self.remove(doc_id)
+        return len(doc_ids)
+
+    def search(self, query: str, *, project_id: Optional[str] = None,
+               result_types: Optional[Iterable[str]] = None, limit: Optional[int] = 20,
+               offset: int = 0) -> SearchPage:
+        """Rank documents against the query and return one page of hits (``limit=None``: all of them)"""
+        self.stats["searches"] += 1
+        limit = max(0, limit) if limit is not None else None
+        offset = max(0, offset)
+        allowed_types = set(result_types) if result_types is not None else None
+
+        allowed = self._by_project.get(project_id, set()) if project_id is not None else None
+        documents = self._documents
+
+        scores: Dict[str, float] = {}
+        norms = self._length_norms()
+        document_count = len(self._documents)
+        for term, weight in self._expand_query(query).items():
+            postings = self._postings[term]
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            boost = weight * idf * (self.k1 + 1)
+            for doc_id, frequency in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                if allowed_types is not None and documents[doc_id].result_type not in allowed_types:
+                    continue
+                scores[doc_id] = scores.get(doc_id, 0.0) + boost * frequency / (frequency + norms[doc_id])
+
+        self.stats["candidates_scored"] += len(scores)
+        # nlargest and sorted are stable, so equal scores keep first-scored order
+        if limit is None:
+            top = sorted(scores.items(), key=itemgetter(1), reverse=True)
+        else:
+            top = heapq.nlargest(offset + limit, scores.items(), key=itemgetter(1))
+        hits = [
+            SearchHit(doc_id, round(score, 6), documents[doc_id].result_type,
+                      documents[doc_id].project_id, documents[doc_id].payload)
+            for doc_id, score in top[offset:]
+        ]
+        return SearchPage(hits=hits, total=len(scores), offset=offset, limit=limit,
+                          max_score=round(top[0][1], 6) if top else 0.0,
+                          reference_score=self._self_match_score(query, document_count))
+
+    def _self_match_score(self, query: str, document_count: int) -> float:
+        """
+        BM25 score of an average-length document holding each query identifier
+        once (term frequency 1 against a norm of ``k1`` reduces to the idf).
+        Identifiers the index has never seen count at the maximum idf, so
+        queries that only match through parts, substrings or typos score low.
+        """
+        score = 0.0
+        for identifier in dict.fromkeys(identifier for identifier, _ in split_identifiers(query)):
+            frequency = len(self._postings.get(identifier, ()))
+            score += math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+        return score
+
+    def _expand_query(self, query: str) -> Dict[str, float]:
+        """
+        Map each query identifier to indexed terms.
+
+        The whole identifier is tried first (exact or substring, then fuzzy);
+        its parts are only used when the whole matches nothing, which keeps
+        queries like ``validate_payment`` from fanning out to every ``payment``.
+        """
+        expanded: Dict[str, float] = {}
+        for identifier, parts in dict.fromkeys((i, tuple(p)) for i, p in split_identifiers(query)):
+            matches = self._term_matches(identifier) or self._fuzzy_matches(identifier)
+            if not matches:
+                matches = [match for part in parts for match in self._term_matches(part)]
+            for term, weight in matches:
+                if weight > expanded.get(term, 0.0):
+                    expanded[term] = weight
+            self.stats["expanded_terms"] += len(matches)
+        return expanded
+
+    def _term_matches(self, token: str) -> List[Tuple[str, float]]:
+        """Exact term plus terms containing the token (prefixes only for tokens under three characters)"""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = 1.0
+
+        if len(token) < 3:
+            # Too short for trigrams; fall back to a prefix range of the sorted vocabulary
+            terms = self._vocabulary()
+            start = bisect.bisect_left(terms, token)
+            for term in terms[start:start + MAX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, SUBSTRING_WEIGHT * len(token) / len(term))
+            return list(matches.items())
+
+        holder_sets = sorted((self._trigrams.get(t, set()) for t in trigrams(token)), key=len)
+        for term in holder_sets[0].intersection(*holder_sets[1:]):
+            if term != token and token in term:
+                matches[term] = SUBSTRING_WEIGHT * len(token) / len(term)
+        return self._strongest(matches)
+
+    def _fuzzy_matches(self, token: str) -> List[Tuple[str, float]]:
+        """Terms whose trigram sets are similar to the token's (Dice coefficient)"""
+        token_trigrams = trigrams(token)
+        if not token_trigrams:
+            return []
+        shared: Counter = Counter()
+        for trigram in token_trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+        matches = {}
+        for term, count in shared.items():
+            similarity = 2 * count / (len(token_trigrams) + len(trigrams(term)))
+            if similarity >= MIN_FUZZY_SIMILARITY:
+                matches[term] = FUZZY_WEIGHT * similarity
+        return self._strongest(matches)
+
+    @staticmethod
+    def _strongest(matches: Dict[str, float]) -> List[Tuple[str, float]]:
+        if len(matches) > MAX_EXPANSIONS:
+            return heapq.nlargest(MAX_EXPANSIONS, matches.items(), key=lambda item: (item[1], item[0]))
+        return list(matches.items())
+
+    def _length_norms(self) -> Dict[str, float]:
+        """BM25 length normalisation per document, rebuilt after the index changes"""
+        if self._norms is None:
+            average_length = self._total_length / len(self._documents) if self._documents else 1.0
+            k1, b = self.k1, self.b
+            self._norms = {
+                doc_id: k1 * (1 - b + b * document.length / (average_length or 1.0))
+                for doc_id, document in self._documents.items()
+            }
+        return self._norms
+
+    def _vocabulary(self) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        return self._sorted_terms
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and query counters"""
+        return {
+            "documents": len(self._documents),
+            "projects": len(self._by_project),
+            "terms": len(self._postings),
+            "trigrams": len(self._trigrams),
+            **self.stats,
+        }
+
+
+__all__ = [
+    "SearchHit",
+    "SearchIndex",
+    "SearchPage",
+    "split_identifiers",
+    "tokenize",
+    "trigrams",
+]
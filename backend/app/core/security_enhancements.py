@@ -18,8 +18,19 @@ import numpy as np
 from collections import defaultdict, deque
 import re
 
+from app.core.pattern_engine import PatternRule, RuleSet
+
 logger = structlog.get_logger()
 
+_SUSPICIOUS_USER_AGENT_RULES = RuleSet(
+    [PatternRule.literal(marker, marker) for marker in (
+        "bot", "crawler", "spider", "scraper",
+        "curl", "wget", "python", "java",
+        "automated", "test", "scan",
+    )],
+    name="suspicious_user_agents",
+)
+
 
 class ThreatLevel(str, Enum):
     """Threat severity levels"""
@@ -114,6 +125,8 @@ class SecurityEnhancementEngine:
         # Threat patterns
         self.threat_patterns: Dict[str, ThreatPattern] = {}
         self._initialize_threat_patterns()
+        self._threat_rules: Optional[RuleSet] = None
+        self._threat_rules_signature: Tuple[Tuple[str, str], ...] = ()
         
         # Security metrics
         self.security_metrics = SecurityMetrics()
@@ -195,6 +208,20 @@ class SecurityEnhancementEngine:
         for pattern in patterns:
             self.threat_patterns[pattern.pattern_id] = pattern
     
+    def _threat_rule_set(self) -> RuleSet:
+        """Enabled threat patterns compiled as one rule set, rebuilt when patterns change"""
+        signature = tuple(
+            (pattern_id, pattern.pattern_regex)
+            for pattern_id, pattern in self.threat_patterns.items() if pattern.enabled
+        )
+        if self._threat_rules is None or signature != self._threat_rules_signature:
+            self._threat_rules = RuleSet(
+                (PatternRule(pattern_id, regex, re.IGNORECASE) for pattern_id, regex in signature),
+                name="request_threats",
+            )
+            self._threat_rules_signature = signature
+        return self._threat_rules
+    
     def _start_background_tasks(self):
         """Start background security monitoring tasks"""
         self._monitoring_task = asyncio.create_task(self._monitor_security())
@@ -519,23 +546,23 @@ class SecurityEnhancementEngine:
             # Check threat patterns
             content_to_check = f"{path} {body} {json.dumps(headers)}"
             
-            for pattern_id, pattern in self.threat_patterns.items():
-                if not pattern.enabled:
-                    continue
-                
-                if re.search(pattern.pattern_regex, content_to_check, re.IGNORECASE):
-                    return await self._create_security_event(
-                        threat_type=pattern.threat_type,
-                        threat_level=pattern.threat_level,
-                        source_ip=source_ip,
-                        user_id=user_id,
-                        description=f"Threat pattern detected: {pattern.name}",
-                        details={
-                            "pattern_id": pattern_id,
-                            "pattern_name": pattern.name,
-                            "matched_content": content_to_check[:200]
-                        }
-                    )
+            # First enabled pattern (in definition order) that matches, from one scan
+            hit = self._threat_rule_set().first_match(content_to_check)
+            if hit is not None:
+                pattern_id = hit.rule_id
+                pattern = self.threat_patterns[pattern_id]
+                return await self._create_security_event(
+                    threat_type=pattern.threat_type,
+                    threat_level=pattern.threat_level,
+                    source_ip=source_ip,
+                    user_id=user_id,
+                    description=f"Threat pattern detected: {pattern.name}",
+                    details={
+                        "pattern_id": pattern_id,
+                        "pattern_name": pattern.name,
+                        "matched_content": content_to_check[:200]
+                    }
+                )
             
             # Check for suspicious user agents
             if self._is_suspicious_user_agent(user_agent):
@@ -556,18 +583,7 @@ class SecurityEnhancementEngine:
     
     def _is_suspicious_user_agent(self, user_agent: str) -> bool:
         """Check if user agent is suspicious"""
-        suspicious_patterns = [
-            r"bot", r"crawler", r"spider", r"scraper",
-            r"curl", r"wget", r"python", r"java",
-            r"automated", r"test", r"scan"
-        ]
-        
-        user_agent_lower = user_agent.lower()
-        for pattern in suspicious_patterns:
-            if re.search(pattern, user_agent_lower):
-                return True
-        
-        return False
+        return _SUSPICIOUS_USER_AGENT_RULES.first_match(user_agent.lower()) is not None
     
     async def _create_security_event(
         self,
@@ -16,6 +16,7 @@ import json
 import secrets
 import base64
 
+from app.core.pattern_engine import PatternRule, RuleHit, RuleSet
 from app.core.redis import get_redis_client
 from app.core.ethical_ai_core import ethical_ai_core
 
@@ -81,6 +82,8 @@ class SecurityValidator:
         self.redis_client = get_redis_client_sync()  # Returns None if not initialized yet
         self.threat_patterns = self._initialize_threat_patterns()
         self.secret_patterns = self._initialize_secret_patterns()
+        self._line_rules = self._compile_line_rules()
+        self._last_scan: Optional[Tuple[str, List[RuleHit]]] = None
         self.validation_cache: Dict[str, SecurityValidationReport] = {}
         
     def _initialize_threat_patterns(self) -> Dict[ThreatType, List[str]]:
@@ -118,6 +121,21 @@ class SecurityValidator:
             ]
         }
     
+    def _compile_line_rules(self) -> RuleSet:
+        """Threat and secret patterns as one rule set, so code is scanned once for every check"""
+        rules = [PatternRule((threat_type, pattern), pattern)
+                 for threat_type, patterns in self.threat_patterns.items() for pattern in patterns]
+        rules.extend(PatternRule((("secret", secret_type), pattern), pattern)
+                     for secret_type, patterns in self.secret_patterns.items() for pattern in patterns)
+        return RuleSet(rules, name="security_validator")
+    
+    def _line_hits(self, code: str, category: Any) -> List[RuleHit]:
+        """Every per-line match of one category's patterns, ordered by line, pattern, then column"""
+        last = self._last_scan
+        if last is None or last[0] is not code:
+            last = self._last_scan = (code, self._line_rules.scan_lines(code, all_matches=True))
+        return [hit for hit in last[1] if hit.rule_id[0] == category]
+    
     def _initialize_secret_patterns(self) -> Dict[str, List[str]]:
         """Initialize secret detection patterns"""
         return {
@@ -219,120 +237,110 @@ class SecurityValidator:
     async def _check_sql_injection(self, code: str) -> List[SecurityIssue]:
         """Check for SQL injection vulnerabilities"""
         issues = []
-        patterns = self.threat_patterns[ThreatType.SQL_INJECTION]
+        lines = code.split('\n')
         
-        for i, line in enumerate(code.split('\n'), 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    issue = SecurityIssue(
-                        issue_id=f"sql_injection_{i}_{match.start()}",
-                        threat_type=ThreatType.SQL_INJECTION,
-                        severity=SecurityLevel.HIGH,
-                        description="Potential SQL injection vulnerability detected",
-                        location=f"Line {i}",
-                        line_number=i,
-                        code_snippet=line.strip(),
-                        remediation="Use parameterized queries or prepared statements",
-                        confidence=0.9
-                    )
-                    issues.append(issue)
+        for hit in self._line_hits(code, ThreatType.SQL_INJECTION):
+            i, line, match = hit.line, lines[hit.line - 1], hit.match
+            issue = SecurityIssue(
+                issue_id=f"sql_injection_{i}_{match.start()}",
+                threat_type=ThreatType.SQL_INJECTION,
+                severity=SecurityLevel.HIGH,
+                description="Potential SQL injection vulnerability detected",
+                location=f"Line {i}",
+                line_number=i,
+                code_snippet=line.strip(),
+                remediation="Use parameterized queries or prepared statements",
+                confidence=0.9
+            )
+            issues.append(issue)
         
         return issues
     
     async def _check_xss_vulnerabilities(self, code: str) -> List[SecurityIssue]:
         """Check for XSS vulnerabilities"""
         issues = []
-        patterns = self.threat_patterns[ThreatType.XSS]
+        lines = code.split('\n')
         
-        for i, line in enumerate(code.split('\n'), 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    issue = SecurityIssue(
-                        issue_id=f"xss_{i}_{match.start()}",
-                        threat_type=ThreatType.XSS,
-                        severity=SecurityLevel.HIGH,
-                        description="Potential XSS vulnerability detected",
-                        location=f"Line {i}",
-                        line_number=i,
-                        code_snippet=line.strip(),
-                        remediation="Sanitize user input and use proper output encoding",
-                        confidence=0.8
-                    )
-                    issues.append(issue)
+        for hit in self._line_hits(code, ThreatType.XSS):
+            i, line, match = hit.line, lines[hit.line - 1], hit.match
+            issue = SecurityIssue(
+                issue_id=f"xss_{i}_{match.start()}",
+                threat_type=ThreatType.XSS,
+                severity=SecurityLevel.HIGH,
+                description="Potential XSS vulnerability detected",
+                location=f"Line {i}",
+                line_number=i,
+                code_snippet=line.strip(),
+                remediation="Sanitize user input and use proper output encoding",
+                confidence=0.8
+            )
+            issues.append(issue)
         
         return issues
     
     async def _check_path_traversal(self, code: str) -> List[SecurityIssue]:
         """Check for path traversal vulnerabilities"""
         issues = []
-        patterns = self.threat_patterns[ThreatType.PATH_TRAVERSAL]
+        lines = code.split('\n')
         
-        for i, line in enumerate(code.split('\n'), 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    issue = SecurityIssue(
-                        issue_id=f"path_traversal_{i}_{match.start()}",
-                        threat_type=ThreatType.PATH_TRAVERSAL,
-                        severity=SecurityLevel.MEDIUM,
-                        description="Potential path traversal vulnerability detected",
-                        location=f"Line {i}",
-                        line_number=i,
-                        code_snippet=line.strip(),
-                        remediation="Validate and sanitize file paths",
-                        confidence=0.7
-                    )
-                    issues.append(issue)
+        for hit in self._line_hits(code, ThreatType.PATH_TRAVERSAL):
+            i, line, match = hit.line, lines[hit.line - 1], hit.match
+            issue = SecurityIssue(
+                issue_id=f"path_traversal_{i}_{match.start()}",
+                threat_type=ThreatType.PATH_TRAVERSAL,
+                severity=SecurityLevel.MEDIUM,
+                description="Potential path traversal vulnerability detected",
+                location=f"Line {i}",
+                line_number=i,
+                code_snippet=line.strip(),
+                remediation="Validate and sanitize file paths",
+                confidence=0.7
+            )
+            issues.append(issue)
         
         return issues
     
     async def _check_command_injection(self, code: str) -> List[SecurityIssue]:
         """Check for command injection vulnerabilities"""
         issues = []
-        patterns = self.threat_patterns[ThreatType.COMMAND_INJECTION]
+        lines = code.split('\n')
         
-        for i, line in enumerate(code.split('\n'), 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    issue = SecurityIssue(
-                        issue_id=f"command_injection_{i}_{match.start()}",
-                        threat_type=ThreatType.COMMAND_INJECTION,
-                        severity=SecurityLevel.CRITICAL,
-                        description="Potential command injection vulnerability detected",
-                        location=f"Line {i}",
-                        line_number=i,
-                        code_snippet=line.strip(),
-                        remediation="Avoid executing user input as system commands",
-                        confidence=0.9
-                    )
-                    issues.append(issue)
+        for hit in self._line_hits(code, ThreatType.COMMAND_INJECTION):
+            i, line, match = hit.line, lines[hit.line - 1], hit.match
+            issue = SecurityIssue(
+                issue_id=f"command_injection_{i}_{match.start()}",
+                threat_type=ThreatType.COMMAND_INJECTION,
+                severity=SecurityLevel.CRITICAL,
+                description="Potential command injection vulnerability detected",
+                location=f"Line {i}",
+                line_number=i,
+                code_snippet=line.strip(),
+                remediation="Avoid executing user input as system commands",
+                confidence=0.9
+            )
+            issues.append(issue)
         
         return issues
     
     async def _check_insecure_deserialization(self, code: str) -> List[SecurityIssue]:
         """Check for insecure deserialization vulnerabilities"""
         issues = []
-        patterns = self.threat_patterns[ThreatType.INSECURE_DESERIALIZATION]
+        lines = code.split('\n')
         
-        for i, line in enumerate(code.split('\n'), 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    issue = SecurityIssue(
-                        issue_id=f"deserialization_{i}_{match.start()}",
-                        threat_type=ThreatType.INSECURE_DESERIALIZATION,
-                        severity=SecurityLevel.HIGH,
-                        description="Potential insecure deserialization vulnerability detected",
-                        location=f"Line {i}",
-                        line_number=i,
-                        code_snippet=line.strip(),
-                        remediation="Use safe deserialization methods or validate input",
-                        confidence=0.8
-                    )
-                    issues.append(issue)
+        for hit in self._line_hits(code, ThreatType.INSECURE_DESERIALIZATION):
+            i, line, match = hit.line, lines[hit.line - 1], hit.match
+            issue = SecurityIssue(
+                issue_id=f"deserialization_{i}_{match.start()}",
+                threat_type=ThreatType.INSECURE_DESERIALIZATION,
+                severity=SecurityLevel.HIGH,
+                description="Potential insecure deserialization vulnerability detected",
+                location=f"Line {i}",
+                line_number=i,
+                code_snippet=line.strip(),
+                remediation="Use safe deserialization methods or validate input",
+                confidence=0.8
+            )
+            issues.append(issue)
         
         return issues
     
@@ -340,23 +348,23 @@ class SecurityValidator:
         """Check for secret exposure"""
         issues = []
         
-        for secret_type, patterns in self.secret_patterns.items():
-            for i, line in enumerate(code.split('\n'), 1):
-                for pattern in patterns:
-                    matches = re.finditer(pattern, line)
-                    for match in matches:
-                        issue = SecurityIssue(
-                            issue_id=f"secret_{secret_type}_{i}_{match.start()}",
-                            threat_type=ThreatType.SECRET_EXPOSURE,
-                            severity=SecurityLevel.CRITICAL,
-                            description=f"Potential {secret_type.replace('_', ' ')} exposure detected",
-                            location=f"Line {i}",
-                            line_number=i,
-                            code_snippet=line.strip(),
-                            remediation="Move secrets to environment variables or secure configuration",
-                            confidence=0.95
-                        )
-                        issues.append(issue)
+        lines = code.split('\n')
+        
+        for secret_type in self.secret_patterns:
+            for hit in self._line_hits(code, ("secret", secret_type)):
+                i, line, match = hit.line, lines[hit.line - 1], hit.match
+                issue = SecurityIssue(
+                    issue_id=f"secret_{secret_type}_{i}_{match.start()}",
+                    threat_type=ThreatType.SECRET_EXPOSURE,
+                    severity=SecurityLevel.CRITICAL,
+                    description=f"Potential {secret_type.replace('_', ' ')} exposure detected",
+                    location=f"Line {i}",
+                    line_number=i,
+                    code_snippet=line.strip(),
+                    remediation="Move secrets to environment variables or secure configuration",
+                    confidence=0.95
+                )
+                issues.append(issue)
         
         return issues
     
@@ -0,0 +1,636 @@
+"""
+Speech-to-Text
+Offline CPU transcription that starts before the upload has been read in
+full. WAV audio is decoded as bytes arrive (other containers are decoded by
+soundfile, or audioread for compressed formats such as webm/Opus, once
+complete), split into utterances by an energy-based voice
+activity detector, and each utterance is decoded on a bounded worker pool
+while the rest of the upload is still being read. Partial transcripts are
+yielded in order as segments finish. Backends are pluggable: a local
+Whisper-class model through ``transformers``/``torch``, or a deterministic
+backend that needs no model.
+"""
+
+import asyncio
+import inspect
+import io
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+try:
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+TARGET_SAMPLE_RATE = 16_000  # what Whisper-class models expect
+
+
+class AudioInputError(ValueError):
+    """The upload itself cannot be transcribed; another backend would fail the same way"""
+
+
+class UnsupportedAudioError(AudioInputError):
+    """The upload is not audio this engine can decode"""
+
+
+class AudioTooLargeError(AudioInputError):
+    pass
+
+
+class NoSpeechError(AudioInputError):
+    pass
+
+
+class SpeechModelUnavailableError(RuntimeError):
+    """The configured model is not available offline"""
+
+
+# -- decoding ----------------------------------------------------------------
+
+class AudioDecoder:
+    """
+    Incremental decoder to mono float32. RIFF/WAVE (8/16/24/32-bit PCM or
+    float) is decoded frame by frame as bytes arrive; anything else is
+    buffered and handed to soundfile, then audioread, in ``finish``.
+    """
+
+    _WAVE_PCM, _WAVE_FLOAT, _WAVE_EXTENSIBLE = 1, 3, 0xFFFE
+
+    def __init__(self):
+        self.sample_rate: Optional[int] = None
+        self.channels = 1
+        self.sample_width = 2
+        self.is_float = False
+        self.bytes_read = 0
+        self._buffer = bytearray()
+        self._state = "header"  # header -> chunks -> data, or buffered for non-WAV input
+        self._data_remaining: Optional[int] = None
+
+    def feed(self, data: bytes) -> np.ndarray:
+        self.bytes_read += len(data)
+        self._buffer += data
+        if self._state == "header":
+            if len(self._buffer) < 12:
+                return _EMPTY
+            if self._buffer[:4] != b"RIFF" or self._buffer[8:12] != b"WAVE":
+                self._state = "buffered"
+                return _EMPTY
+            del self._buffer[:12]
+            self._state = "chunks"
+        if self._state == "chunks":
+            self._read_chunks()
+        if self._state == "data":
+            return self._read_frames()
+        return _EMPTY
+
+    def finish(self) -> np.ndarray:
+        """Decode whatever is left; raises UnsupportedAudioError for undecodable input"""
+        if self._state == "data":
+            return self._read_frames()
+        if self._state == "buffered" or (self._state == "header" and self._buffer):
+            return self._decode_buffered()
+        raise UnsupportedAudioError("Audio ended before any samples")
+
+    def _read_chunks(self) -> None:
+        while len(self._buffer) >= 8:
+            chunk_id = bytes(self._buffer[:4])
+            size = int.from_bytes(self._buffer[4:8], "little")
+            if chunk_id == b"data":
+                if self.sample_rate is None:
+                    raise UnsupportedAudioError("WAV data chunk before fmt chunk")
+                del self._buffer[:8]
+                # Streamed WAVs often leave the size unset
+                self._data_remaining = size if 0 < size < 0xFFFFFFFF else None
+                self._state = "data"
+                return
+            padded = size + (size & 1)
+            if len(self._buffer) < 8 + padded:
+                return
+            if chunk_id == b"fmt ":
+                self._parse_format(bytes(self._buffer[8:8 + size]))
+            del self._buffer[:8 + padded]
+
+    def _parse_format(self, fmt: bytes) -> None:
+        tag = int.from_bytes(fmt[0:2], "little")
+        if tag == self._WAVE_EXTENSIBLE and len(fmt) >= 26:
+            tag = int.from_bytes(fmt[24:26], "little")
+        if tag not in (self._WAVE_PCM, self._WAVE_FLOAT):
+            raise UnsupportedAudioError(f"Unsupported WAV encoding {tag:#x}")
+        self.channels = max(1, int.from_bytes(fmt[2:4], "little"))
+        self.sample_rate = int.from_bytes(fmt[4:8], "little")
+        bits = int.from_bytes(fmt[14:16], "little")
+        self.sample_width = bits // 8
+        self.is_float = tag == self._WAVE_FLOAT
+        if self.sample_width not in ((4, 8) if self.is_float else (1, 2, 3, 4)):
+            raise UnsupportedAudioError(f"Unsupported WAV sample size: {bits} bits")
+
+    def _read_frames(self) -> np.ndarray:
+        available = len(self._buffer)
+        if self._data_remaining is not None:
+            available = min(available, self._data_remaining)
+        frame = self.channels * self.sample_width
+        usable = available - available % frame
+        if usable <= 0:
+            return _EMPTY
+        raw = bytes(self._buffer[:usable])
+        del self._buffer[:usable]
+        if self._data_remaining is not None:
+            self._data_remaining -= usable
+        return _to_mono(_pcm_to_float(raw, self.sample_width, self.is_float), self.channels)
+
+    def _decode_buffered(self) -> np.ndarray:
+        data = bytes(self._buffer)
+        error: Optional[Exception] = None
+        for decode in (_decode_with_soundfile, _decode_with_audioread):
+            try:
+                samples, self.sample_rate = decode(data)
+            except ImportError:
+                continue
+            except Exception as e:
+                error = error or e
+                continue
+            self._buffer.clear()
+            return samples
+        if error is None:
+            raise UnsupportedAudioError("Only WAV audio can be decoded without soundfile or librosa installed")
+        raise UnsupportedAudioError(f"Could not decode audio: {error}")
+
+
+def _decode_with_soundfile(data: bytes) -> Tuple[np.ndarray, int]:
+    import soundfile
+
+    samples, sample_rate = soundfile.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    return samples.mean(axis=1).astype(np.float32), sample_rate
+
+
+def _decode_with_audioread(data: bytes) -> Tuple[np.ndarray, int]:
+    """Containers libsndfile cannot open (webm/Opus, mp4/AAC) through audioread's ffmpeg/GStreamer backends"""
+    import audioread  # installed with librosa
+
+    fd, path = tempfile.mkstemp(suffix=".audio")  # audioread only opens paths
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        with audioread.audio_open(path) as audio:
+            raw = b"".join(audio)  # 16-bit little-endian PCM
+            sample_rate, channels = audio.samplerate, max(1, audio.channels)
+    finally:
+        os.unlink(path)
+    raw = raw[:len(raw) - len(raw) % (2 * channels)]
+    if not raw:
+        raise UnsupportedAudioError("Audio contains no samples")
+    return _to_mono(_pcm_to_float(raw, 2, False), channels), sample_rate
+
+
+_EMPTY = np.zeros(0, dtype=np.float32)
+
+
+def _pcm_to_float(raw: bytes, width: int, is_float: bool) -> np.ndarray:
+    if is_float:
+        return np.frombuffer(raw, dtype="<f4" if width == 4 else "<f8").astype(np.float32)
+    if width == 1:
+        return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    if width == 2:
+        return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    if width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8  # sign-extend 24 bits
+        return values.astype(np.float32) / 8388608.0
+    return np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+
+
+def _to_mono(samples: np.ndarray, channels: int) -> np.ndarray:
+    if channels == 1:
+        return samples
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    if from_rate == to_rate or samples.size == 0:
+        return samples
+    if SCIPY_AVAILABLE:
+        divisor = np.gcd(from_rate, to_rate)
+        return resample_poly(samples, to_rate // divisor, from_rate // divisor).astype(np.float32)
+    positions = np.arange(int(len(samples) * to_rate / from_rate)) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+# -- segmentation ------------------------------------------------------------
+
+@dataclass
+class AudioSegment:
+    index: int
+    start: float  # seconds from the start of the audio
+    end: float
+    samples: np.ndarray = field(repr=False)
+    sample_rate: int = TARGET_SAMPLE_RATE
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class VoiceActivitySegmenter:
+    """
+    Streaming energy VAD. Frames louder than ``energy_ratio`` times the
+    running noise floor (and at least ``min_energy`` RMS) count as speech; a
+    segment closes after ``min_silence_ms`` of quiet or at
+    ``max_segment_seconds``. Segments keep ``padding_ms`` of audio around the
+    speech, and bursts shorter than ``min_speech_ms`` are dropped as clicks.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = 30, min_silence_ms: int = 400,
+                 max_segment_seconds: float = 25.0, min_speech_ms: int = 120, padding_ms: int = 150,
+                 energy_ratio: float = 3.0, min_energy: float = 0.01):
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, sample_rate * frame_ms // 1000)
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.max_segment_frames = max(1, int(max_segment_seconds * 1000) // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.padding_frames = padding_ms // frame_ms
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.noise_floor: Optional[float] = None
+        self._pending = _EMPTY
+        self._preroll: Deque[np.ndarray] = deque(maxlen=max(1, self.padding_frames))
+        self._frames: List[np.ndarray] = []
+        self._voiced = 0
+        self._silence = 0
+        self._segment_start = 0
+        self._position = 0  # samples consumed
+        self._next_index = 0
+
+    def feed(self, samples: np.ndarray) -> List[AudioSegment]:
+        if self._pending.size:
+            samples = np.concatenate([self._pending, samples])
+        whole = len(samples) - len(samples) % self.frame_length
+        self._pending = samples[whole:]
+        segments = []
+        for offset in range(0, whole, self.frame_length):
+            segment = self._frame(samples[offset:offset + self.frame_length])
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> List[AudioSegment]:
+        if self._pending.size and self._frames:
+            self._frames.append(self._pending)
+        self._pending = _EMPTY
+        segment = self._close()
+        return [segment] if segment is not None else []
+
+    def _frame(self, frame: np.ndarray) -> Optional[AudioSegment]:
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        threshold = max(self.min_energy, (self.noise_floor or 0.0) * self.energy_ratio)
+        speech = rms > threshold
+        if not speech:
+            self.noise_floor = rms if self.noise_floor is None else 0.95 * self.noise_floor + 0.05 * rms
+        start = self._position
+        self._position += len(frame)
+
+        if not self._frames:
+            if not speech:
+                if self.padding_frames:
+                    self._preroll.append(frame)
+                return None
+            preroll = list(self._preroll) if self.padding_frames else []
+            self._preroll.clear()
+            self._frames = preroll + [frame]
+            self._segment_start = start - sum(len(f) for f in preroll)
+            self._voiced, self._silence = 1, 0
+            return None
+
+        self._frames.append(frame)
+        if speech:
+            self._voiced += 1
+            self._silence = 0
+        else:
+            self._silence += 1
+        if self._silence >= self.min_silence_frames or len(self._frames) >= self.max_segment_frames:
+            return self._close()
+        return None
+
+    def _close(self) -> Optional[AudioSegment]:
+        frames, voiced = self._frames, self._voiced
+        # Keep only ``padding`` frames of the trailing silence
+        trailing = max(0, self._silence - self.padding_frames)
+        if trailing:
+            frames = frames[:-trailing]
+        self._frames, self._voiced, self._silence = [], 0, 0
+        if voiced < self.min_speech_frames or not frames:
+            return None
+        samples = np.concatenate(frames)
+        segment = AudioSegment(self._next_index, self._segment_start / self.sample_rate,
+                               (self._segment_start + len(samples)) / self.sample_rate, samples, self.sample_rate)
+        self._next_index += 1
+        return segment
+
+
+# -- backends ----------------------------------------------------------------
+
+class SpeechBackend(ABC):
+    """Transcribes one segment; called from worker threads with 16 kHz mono audio"""
+
+    name = "base"
+
+    @abstractmethod
+    def transcribe(self, segment: AudioSegment, language: str) -> str:
+        ...
+
+
+class WhisperBackend(SpeechBackend):
+    """
+    Whisper-class encoder-decoder from ``transformers`` on CPU. Loaded once
+    on first use and shared by the worker threads; ``threads`` caps torch's
+    intra-op threads so parallel segments do not oversubscribe the cores.
+    ``model_name`` is a local directory or a hub id that is already in the
+    local cache; the hub is only contacted when ``allow_download`` is set.
+    """
+
+    name = "whisper"
+
+    def __init__(self, model_name: str = "openai/whisper-tiny", threads: Optional[int] = None,
+                 allow_download: bool = False):
+        self.model_name = model_name
+        self.threads = threads
+        self.allow_download = allow_download
+        self._processor = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._model is not None:
+                return
+            import torch
+            from transformers import WhisperForConditionalGeneration, WhisperProcessor
+
+            if self.threads:
+                torch.set_num_threads(self.threads)
+            try:
+                processor = WhisperProcessor.from_pretrained(self.model_name, local_files_only=not self.allow_download)
+                model = WhisperForConditionalGeneration.from_pretrained(
+                    self.model_name, local_files_only=not self.allow_download
+                )
+            except OSError as e:
+                raise SpeechModelUnavailableError(
+                    f"Speech model {self.model_name} is not available locally; download it ahead of time "
+                    f"(huggingface-cli download {self.model_name}), point STT_MODEL at a local copy, "
+                    "or set STT_ALLOW_DOWNLOAD"
+                ) from e
+            self._processor = processor
+            self._model = model.eval()
+            logger.info("Speech model loaded", model=self.model_name, threads=torch.get_num_threads())
+
+    def transcribe(self, segment: AudioSegment, language: str) -> str:
+        import torch
+
+        if self._model is None:
+            self._load()
+        features = self._processor(segment.samples, sampling_rate=segment.sample_rate,
+                                   return_tensors="pt").input_features
+        with torch.inference_mode():
+            token_ids = self._model.generate(features, language=language, task="transcribe")
+        return self._processor.batch_decode(token_ids, skip_special_tokens=True)[0]
+
+
+class DeterministicBackend(SpeechBackend):
+    """
+    Model-free backend for tests and nodes without weights: scripted phrases
+    by segment index, or a description of the segment. ``delay`` simulates
+    decode time.
+    """
+
+    name = "deterministic"
+
+    def __init__(self, phrases: Optional[List[str]] = None, delay: float = 0.0):
+        self.phrases = phrases
+        self.delay = delay
+
+    def transcribe(self, segment: AudioSegment, language: str) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        if self.phrases:
+            return self.phrases[segment.index % len(self.phrases)]
+        return f"[speech {segment.start:.2f}-{segment.end:.2f}s]"
+
+
+# -- engine ------------------------------------------------------------------
+
+@dataclass
+class TranscriptSegment:
+    index: int
+    start: float
+    end: float
+    text: str = ""
+
+
+@dataclass
+class PartialTranscript:
+    segment: TranscriptSegment
+    text: str  # everything transcribed so far, in order
+
+
+@dataclass
+class Transcript:
+    text: str
+    segments: List[TranscriptSegment]
+    language: str
+    backend: str
+    elapsed_ms: float = 0.0
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(segment.end - segment.start for segment in self.segments)
+
+
+async def iter_audio(source: Any, chunk_size: int = 65_536) -> AsyncIterator[bytes]:
+    """Chunks from bytes, an async byte iterator, or a sync/async file (e.g. an UploadFile)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        for start in range(0, len(source), chunk_size):
+            yield bytes(source[start:start + chunk_size])
+        return
+    if hasattr(source, "__aiter__"):
+        async for chunk in source:
+            yield chunk
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if inspect.isawaitable(chunk):
+            chunk = await chunk
+        if not chunk:
+            return
+        yield chunk
+
+
+class SpeechToTextEngine:
+    """
+    Streams audio through decoding, VAD segmentation and parallel
+    transcription. At most ``max_pending`` segments wait for or occupy the
+    ``workers`` threads; beyond that, reading the upload pauses.
+    """
+
+    def __init__(self, backend: SpeechBackend, workers: int = 2, max_pending: int = 8,
+                 min_silence_ms: int = 400, max_segment_seconds: float = 25.0, read_chunk_bytes: int = 65_536):
+        self.backend = backend
+        self.workers = workers
+        self.max_pending = max(max_pending, workers)
+        self.min_silence_ms = min_silence_ms
+        self.max_segment_seconds = max_segment_seconds
+        self.read_chunk_bytes = read_chunk_bytes
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt")
+        self.stats = {"requests": 0, "segments": 0, "speech_seconds": 0.0, "decode_seconds": 0.0,
+                      "failures": 0}
+
+    async def stream(self, source: Any, language: str = "en",
+                     max_bytes: Optional[int] = None) -> AsyncIterator[PartialTranscript]:
+        """Partial transcripts in segment order, each as soon as it and its predecessors are decoded"""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_pending)
+        decoded: asyncio.Queue = asyncio.Queue()
+        self.stats["requests"] += 1
+
+        async def submit(segments: List[AudioSegment]) -> None:
+            for segment in segments:
+                await slots.acquire()
+                future = loop.run_in_executor(self._pool, self._decode, segment, language)
+                future.add_done_callback(lambda _: slots.release())
+                # Only timing travels with the future, so queued results do not pin the audio
+                decoded.put_nowait((TranscriptSegment(segment.index, segment.start, segment.end), future))
+
+        async def produce() -> None:
+            decoder = AudioDecoder()
+            segmenter: Optional[VoiceActivitySegmenter] = None
+
+            def finish() -> List[AudioSegment]:
+                nonlocal segmenter
+                samples = decoder.finish()
+                segmenter = segmenter or self._segmenter(decoder.sample_rate)
+                return segmenter.feed(samples) + segmenter.flush()
+
+            # Decoding and VAD are CPU-bound, so they run off the loop (one step at a time)
+            try:
+                async for chunk in iter_audio(source, self.read_chunk_bytes):
+                    if max_bytes is not None and decoder.bytes_read + len(chunk) > max_bytes:
+                        raise AudioTooLargeError(f"File size must be less than {max_bytes / (1024 * 1024):g}MB")
+                    samples = decoder.feed(chunk)
+                    if samples.size:
+                        segmenter = segmenter or self._segmenter(decoder.sample_rate)
+                        await submit(await asyncio.to_thread(segmenter.feed, samples))
+                await submit(await asyncio.to_thread(finish))
+            finally:
+                decoded.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+        texts: List[str] = []
+        try:
+            while (item := await decoded.get()) is not None:
+                segment, future = item
+                segment.text, decode_seconds = await future
+                self.stats["segments"] += 1
+                self.stats["speech_seconds"] += segment.end - segment.start
+                self.stats["decode_seconds"] += decode_seconds
+                if segment.text:
+                    texts.append(segment.text)
+                yield PartialTranscript(segment, " ".join(texts))
+            await producer  # read and decode errors surface here
+        except Exception:
+            self.stats["failures"] += 1
+            raise
+        finally:
+            if not producer.done():
+                producer.cancel()
+
+    async def transcribe(self, source: Any, language: str = "en", max_bytes: Optional[int] = None) -> Transcript:
+        started = time.perf_counter()
+        segments: List[TranscriptSegment] = []
+        text = ""
+        async for partial in self.stream(source, language, max_bytes):
+            segments.append(partial.segment)
+            text = partial.text
+        return Transcript(text, segments, language, self.backend.name, (time.perf_counter() - started) * 1000)
+
+    def _segmenter(self, sample_rate: Optional[int]) -> VoiceActivitySegmenter:
+        return VoiceActivitySegmenter(sample_rate or TARGET_SAMPLE_RATE, min_silence_ms=self.min_silence_ms,
+                                      max_segment_seconds=self.max_segment_seconds)
+
+    def _decode(self, segment: AudioSegment, language: str) -> Tuple[str, float]:
+        started = time.perf_counter()
+        if segment.sample_rate != TARGET_SAMPLE_RATE:
+            segment = AudioSegment(segment.index, segment.start, segment.end,
+                                   resample(segment.samples, segment.sample_rate), TARGET_SAMPLE_RATE)
+        text = self.backend.transcribe(segment, language).strip()
+        return text, time.perf_counter() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        decode_seconds = self.stats["decode_seconds"]
+        return {
+            **self.stats,
+            "backend": self.backend.name,
+            "workers": self.workers,
+            "real_time_factor": decode_seconds / self.stats["speech_seconds"] if self.stats["speech_seconds"] else None,
+        }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_speech_to_text_engine: Optional[SpeechToTextEngine] = None
+
+
+def get_speech_to_text_engine() -> SpeechToTextEngine:
+    """Shared engine configured from settings"""
+    global _speech_to_text_engine
+    if _speech_to_text_engine is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        if settings.STT_BACKEND == "deterministic":
+            backend: SpeechBackend = DeterministicBackend()
+        else:
+            backend = WhisperBackend(settings.STT_MODEL,
+                                     threads=max(1, (os.cpu_count() or 1) // settings.STT_WORKERS),
+                                     allow_download=settings.STT_ALLOW_DOWNLOAD)
+        _speech_to_text_engine = SpeechToTextEngine(
+            backend,
+            workers=settings.STT_WORKERS,
+            max_pending=settings.STT_MAX_PENDING_SEGMENTS,
+            min_silence_ms=settings.STT_MIN_SILENCE_MS,
+            max_segment_seconds=settings.STT_MAX_SEGMENT_SECONDS,
+            read_chunk_bytes=settings.STT_READ_CHUNK_BYTES,
+        )
+    return _speech_to_text_engine
+
+
+__all__ = [
+    "AudioDecoder",
+    "AudioInputError",
+    "AudioSegment",
+    "AudioTooLargeError",
+    "DeterministicBackend",
+    "NoSpeechError",
+    "PartialTranscript",
+    "SpeechBackend",
+    "SpeechModelUnavailableError",
+    "SpeechToTextEngine",
+    "Transcript",
+    "TranscriptSegment",
+    "UnsupportedAudioError",
+    "VoiceActivitySegmenter",
+    "WhisperBackend",
+    "get_speech_to_text_engine",
+    "iter_audio",
+    "resample",
+]
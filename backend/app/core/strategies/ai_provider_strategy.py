@@ -4,8 +4,9 @@ Follows Strategy Pattern and Open/Closed Principle
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, AsyncIterator, Dict, List, Optional, TYPE_CHECKING
 from enum import Enum
+import json
 import structlog
 
 if TYPE_CHECKING:
@@ -70,6 +71,9 @@ class AIProviderStrategy(ABC):
     Follows Strategy Pattern and Open/Closed Principle
     """
     
+    # Whether generate_embeddings is implemented; callers check this before calling it
+    supports_embeddings: bool = False
+    
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         self.api_key = api_key
         self.base_url = base_url
@@ -116,14 +120,66 @@ class AIProviderStrategy(ABC):
     def get_cost_estimate(self, prompt_tokens: int, completion_tokens: int) -> float:
         """Get cost estimate for tokens"""
         pass
+    
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion text chunks as they are generated.
+        Providers without native streaming yield the whole completion once;
+        closing the iterator early aborts the upstream request.
+        """
+        yield await self.generate_completion(prompt, max_tokens, temperature, **kwargs)
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion text chunks as they are generated"""
+        yield await self.generate_chat_completion(messages, max_tokens, temperature, **kwargs)
+    
+    async def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed a batch of texts in one provider call, preserving input order (when ``supports_embeddings``)"""
+        raise NotImplementedError(f"{self.get_provider_type().value} does not provide embeddings")
+
+
+def messages_to_prompt(messages: List[Dict[str, str]]) -> str:
+    """Flatten chat messages into a plain prompt for completion-only backends"""
+    prompt = ""
+    for msg in messages:
+        role = msg["role"]
+        content = msg["content"]
+        if role == "system":
+            prompt += f"System: {content}\n"
+        elif role == "user":
+            prompt += f"User: {content}\n"
+        elif role == "assistant":
+            prompt += f"Assistant: {content}\n"
+    
+    return prompt + "Assistant: "
 
 
 class OpenAIStrategy(AIProviderStrategy):
     """OpenAI provider strategy"""
     
+    supports_embeddings = True
+    
     def get_provider_type(self) -> AIProviderType:
         return AIProviderType.OPENAI
-    
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        if base_url is None:
+            from app.core.config import get_settings
+            base_url = get_settings().OPENAI_BASE_URL
+        super().__init__(api_key, base_url)
+
     async def generate_completion(
         self, 
         prompt: str, 
@@ -135,7 +191,7 @@ class OpenAIStrategy(AIProviderStrategy):
         try:
             import openai
             
-            client = openai.AsyncOpenAI(api_key=self.api_key)
+            client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
             
             response = await client.completions.create(
                 model=kwargs.get('model', 'gpt-3.5-turbo-instruct'),
@@ -162,7 +218,7 @@ class OpenAIStrategy(AIProviderStrategy):
         try:
             import openai
             
-            client = openai.AsyncOpenAI(api_key=self.api_key)
+            client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
             
             response = await client.chat.completions.create(
                 model=kwargs.get('model', 'gpt-3.5-turbo'),
@@ -178,12 +234,81 @@ class OpenAIStrategy(AIProviderStrategy):
             logger.error("OpenAI chat completion generation error", error=str(e))
             raise
     
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion using OpenAI API"""
+        import openai
+        
+        client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        stream = await client.completions.create(
+            model=kwargs.get('model', 'gpt-3.5-turbo-instruct'),
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            **{k: v for k, v in kwargs.items() if k != 'model'}
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].text:
+                    yield chunk.choices[0].text
+        finally:
+            await stream.response.aclose()
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion using OpenAI API"""
+        import openai
+        
+        client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        stream = await client.chat.completions.create(
+            model=kwargs.get('model', 'gpt-3.5-turbo'),
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            **{k: v for k, v in kwargs.items() if k != 'model'}
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.response.aclose()
+    
+    async def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed a batch of texts using OpenAI API"""
+        try:
+            import openai
+            
+            client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+            response = await client.embeddings.create(
+                model=kwargs.get('model') or 'text-embedding-3-small',
+                input=texts
+            )
+            
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            
+        except Exception as e:
+            logger.error("OpenAI embedding error", batch_size=len(texts), error=str(e))
+            raise
+    
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """Get OpenAI model information"""
         try:
             import openai
             
-            client = openai.AsyncOpenAI(api_key=self.api_key)
+            client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
             
             # Get model list
             models = await client.models.list()
@@ -209,7 +334,7 @@ class OpenAIStrategy(AIProviderStrategy):
         try:
             import openai
             
-            client = openai.AsyncOpenAI(api_key=self.api_key)
+            client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
             await client.models.list()
             return True
             
@@ -297,6 +422,43 @@ class AnthropicStrategy(AIProviderStrategy):
             logger.error("Anthropic chat completion generation error", error=str(e))
             raise
     
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion using Anthropic API"""
+        async for text in self.stream_chat_completion(
+            [{"role": "user", "content": prompt}], max_tokens, temperature, **kwargs
+        ):
+            yield text
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion using Anthropic API"""
+        import anthropic
+        
+        client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        system_message = next((m["content"] for m in messages if m["role"] == "system"), None)
+        
+        async with client.messages.stream(
+            model=kwargs.get('model', 'claude-3-sonnet-20240229'),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_message if system_message else anthropic.NOT_GIVEN,
+            messages=[m for m in messages if m["role"] != "system"],
+            **{k: v for k, v in kwargs.items() if k != 'model'}
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """Get Anthropic model information"""
         # Anthropic doesn't provide model listing API
@@ -337,14 +499,113 @@ class AnthropicStrategy(AIProviderStrategy):
         return (prompt_tokens / 1000 * prompt_cost) + (completion_tokens / 1000 * completion_cost)
 
 
+class OpenAICompatibleStrategy(OpenAIStrategy):
+    """
+    Base for hosted providers exposing the OpenAI chat API.
+    Text completions are served through chat, which every such provider supports.
+    """
+    
+    default_base_url: str = ""
+    supports_embeddings = False
+    model_setting: str = ""
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        from app.core.config import get_settings
+        super().__init__(api_key, base_url or self.default_base_url)
+        self.model = getattr(get_settings(), self.model_setting)
+    
+    async def generate_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        return await self.generate_chat_completion(
+            [{"role": "user", "content": prompt}], max_tokens, temperature, **kwargs
+        )
+    
+    async def generate_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> str:
+        kwargs.setdefault('model', self.model)
+        return await super().generate_chat_completion(messages, max_tokens, temperature, **kwargs)
+    
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        async for text in self.stream_chat_completion(
+            [{"role": "user", "content": prompt}], max_tokens, temperature, **kwargs
+        ):
+            yield text
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        kwargs.setdefault('model', self.model)
+        async for text in super().stream_chat_completion(messages, max_tokens, temperature, **kwargs):
+            yield text
+    
+    async def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        raise NotImplementedError(f"{self.get_provider_type().value} does not provide embeddings")
+    
+    async def get_model_info(self, model_name: str) -> Dict[str, Any]:
+        return {"id": model_name, "provider": self.get_provider_type().value}
+
+
+class GroqStrategy(OpenAICompatibleStrategy):
+    """Groq provider strategy (OpenAI-compatible API)"""
+    
+    default_base_url = "https://api.groq.com/openai/v1"
+    model_setting = "GROQ_MODEL_NAME"
+    
+    def get_provider_type(self) -> AIProviderType:
+        return AIProviderType.GROQ
+    
+    def get_cost_estimate(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Groq developer tier is free"""
+        return 0.0
+
+
+class TogetherStrategy(OpenAICompatibleStrategy):
+    """Together AI provider strategy (OpenAI-compatible API)"""
+    
+    default_base_url = "https://api.together.xyz/v1"
+    model_setting = "TOGETHER_MODEL_NAME"
+    
+    def get_provider_type(self) -> AIProviderType:
+        return AIProviderType.TOGETHER
+    
+    def get_cost_estimate(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Together AI 70B chat pricing (per 1K tokens)"""
+        return (prompt_tokens + completion_tokens) / 1000 * 0.0009
+
+
 class LocalLLMStrategy(AIProviderStrategy):
     """Local LLM provider strategy"""
     
+    supports_embeddings = True
+    
     def get_provider_type(self) -> AIProviderType:
         return AIProviderType.LOCAL_LLM
     
     def __init__(self, api_key: str, base_url: Optional[str] = None):
-        super().__init__(api_key, base_url)
+        if base_url is None:
+            from app.core.config import get_settings
+            base_url = get_settings().LOCAL_LLM_BASE_URL
+        super().__init__(api_key, base_url.rstrip("/"))
         # Reuse a session per strategy
         self._session: Optional["aiohttp.ClientSession"] = None
     
@@ -368,7 +629,7 @@ class LocalLLMStrategy(AIProviderStrategy):
             
             # Assuming Ollama or similar local LLM server
             model = kwargs.get('model', 'llama2')
-            url = f"{self.base_url or 'http://localhost:11434'}/api/generate"
+            url = f"{self.base_url}/api/generate"
             
             payload = {
                 "model": model,
@@ -400,20 +661,7 @@ class LocalLLMStrategy(AIProviderStrategy):
         """Generate chat completion using local LLM"""
         try:
             # Build prompt and delegate to generate_completion (already async non-blocking)
-            
-            # Convert messages to prompt
-            prompt = ""
-            for msg in messages:
-                role = msg["role"]
-                content = msg["content"]
-                if role == "system":
-                    prompt += f"System: {content}\n"
-                elif role == "user":
-                    prompt += f"User: {content}\n"
-                elif role == "assistant":
-                    prompt += f"Assistant: {content}\n"
-            
-            prompt += "Assistant: "
+            prompt = messages_to_prompt(messages)
             
             return await self.generate_completion(prompt, max_tokens, temperature, **kwargs)
             
@@ -421,12 +669,75 @@ class LocalLLMStrategy(AIProviderStrategy):
             logger.error("Local LLM chat completion generation error", error=str(e))
             raise
     
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion from the local LLM's NDJSON generate endpoint"""
+        import aiohttp
+        
+        payload = {
+            "model": kwargs.get('model', 'llama2'),
+            "prompt": prompt,
+            "stream": True,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature
+            }
+        }
+        
+        # Long generations are bounded by gaps between chunks, not total time
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+        session = await self._get_session()
+        async with session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout) as resp:
+            resp.raise_for_status()
+            async for line in resp.content:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion using local LLM"""
+        async for text in self.stream_completion(messages_to_prompt(messages), max_tokens, temperature, **kwargs):
+            yield text
+    
+    async def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed a batch of texts with the local LLM's batched embed endpoint"""
+        try:
+            payload = {"model": kwargs.get('model') or 'nomic-embed-text', "input": texts}
+            
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/api/embed", json=payload) as resp:
+                resp.raise_for_status()
+                result = await resp.json()
+            
+            return result["embeddings"]
+            
+        except Exception as e:
+            logger.error("Local LLM embedding error", batch_size=len(texts), error=str(e))
+            raise
+    
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """Get local LLM model information"""
         try:
             import aiohttp
             
-            url = f"{self.base_url or 'http://localhost:11434'}/api/tags"
+            url = f"{self.base_url}/api/tags"
             session = await self._get_session()
             async with session.get(url) as resp:
                     resp.raise_for_status()
@@ -453,7 +764,7 @@ class LocalLLMStrategy(AIProviderStrategy):
         """Validate local LLM connection"""
         try:
             import aiohttp
-            url = f"{self.base_url or 'http://localhost:11434'}/api/tags"
+            url = f"{self.base_url}/api/tags"
             session = await self._get_session()
             async with session.get(url) as resp:
                     resp.raise_for_status()
@@ -471,6 +782,8 @@ class LocalLLMStrategy(AIProviderStrategy):
 class HuggingFaceStrategy(AIProviderStrategy):
     """Hugging Face provider strategy"""
     
+    supports_embeddings = True
+    
     def get_provider_type(self) -> AIProviderType:
         return AIProviderType.HUGGINGFACE
     
@@ -539,19 +852,7 @@ class HuggingFaceStrategy(AIProviderStrategy):
     ) -> str:
         """Generate chat completion using Hugging Face API"""
         try:
-            # Convert messages to prompt
-            prompt = ""
-            for msg in messages:
-                role = msg["role"]
-                content = msg["content"]
-                if role == "system":
-                    prompt += f"System: {content}\n"
-                elif role == "user":
-                    prompt += f"User: {content}\n"
-                elif role == "assistant":
-                    prompt += f"Assistant: {content}\n"
-            
-            prompt += "Assistant: "
+            prompt = messages_to_prompt(messages)
             
             return await self.generate_completion(prompt, max_tokens, temperature, **kwargs)
             
@@ -559,6 +860,75 @@ class HuggingFaceStrategy(AIProviderStrategy):
             logger.error("Hugging Face chat completion generation error", error=str(e))
             raise
     
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion from text-generation-inference server-sent events"""
+        import aiohttp
+        
+        model = kwargs.get('model', 'microsoft/DialoGPT-medium')
+        url = f"{self.base_url or 'https://api-inference.huggingface.co'}/models/{model}"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "inputs": prompt,
+            "stream": True,
+            "parameters": {
+                "max_new_tokens": max_tokens,
+                "temperature": temperature,
+                "return_full_text": False
+            }
+        }
+        
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=60)
+        session = await self._get_session()
+        async with session.post(url, json=payload, headers=headers, timeout=timeout) as resp:
+            resp.raise_for_status()
+            async for line in resp.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                event = json.loads(line[5:])
+                token = event.get("token") or {}
+                if token.get("text") and not token.get("special"):
+                    yield token["text"]
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion using Hugging Face API"""
+        async for text in self.stream_completion(messages_to_prompt(messages), max_tokens, temperature, **kwargs):
+            yield text
+    
+    async def generate_embeddings(self, texts: List[str], **kwargs) -> List[List[float]]:
+        """Embed a batch of texts with a Hugging Face feature-extraction model"""
+        try:
+            model = kwargs.get('model') or 'sentence-transformers/all-MiniLM-L6-v2'
+            url = f"{self.base_url or 'https://api-inference.huggingface.co'}/pipeline/feature-extraction/{model}"
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            session = await self._get_session()
+            async with session.post(url, json={"inputs": texts}, headers=headers) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+            
+        except Exception as e:
+            logger.error("Hugging Face embedding error", batch_size=len(texts), error=str(e))
+            raise
+    
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
         """Get Hugging Face model information"""
         try:
@@ -615,6 +985,8 @@ class AIProviderFactory:
         AIProviderType.ANTHROPIC: AnthropicStrategy,
         AIProviderType.LOCAL_LLM: LocalLLMStrategy,
         AIProviderType.HUGGINGFACE: HuggingFaceStrategy,
+        AIProviderType.GROQ: GroqStrategy,
+        AIProviderType.TOGETHER: TogetherStrategy,
     }
     
     @classmethod
@@ -676,6 +1048,21 @@ class AIProviderManager:
             logger.error("Failed to add AI provider", provider_type=provider_type.value, error=str(e))
             return False
     
+    def _providers_to_try(self, preferred_provider: Optional[AIProviderType] = None) -> List[AIProviderType]:
+        """Preferred, then primary, then fallback providers, without duplicates"""
+        providers_to_try = []
+        
+        if preferred_provider and preferred_provider in self.providers:
+            providers_to_try.append(preferred_provider)
+        
+        if self.primary_provider and self.primary_provider not in providers_to_try:
+            providers_to_try.append(self.primary_provider)
+        
+        providers_to_try.extend(
+            p for p in self.fallback_providers if p in self.providers and p not in providers_to_try
+        )
+        return providers_to_try
+    
     async def generate_completion(
         self, 
         prompt: str, 
@@ -685,18 +1072,8 @@ class AIProviderManager:
         **kwargs
     ) -> str:
         """Generate completion with fallback support"""
-        providers_to_try = []
-        
-        if preferred_provider and preferred_provider in self.providers:
-            providers_to_try.append(preferred_provider)
-        
-        if self.primary_provider and self.primary_provider not in providers_to_try:
-            providers_to_try.append(self.primary_provider)
-        
-        providers_to_try.extend(self.fallback_providers)
-        
         last_error = None
-        for provider_type in providers_to_try:
+        for provider_type in self._providers_to_try(preferred_provider):
             try:
                 provider = self.providers[provider_type]
                 return await provider.generate_completion(prompt, max_tokens, temperature, **kwargs)
@@ -730,3 +1107,130 @@ class AIProviderManager:
                            provider_type=provider_type.value, error=str(e))
         
         return results
+    
+    async def generate_embeddings(
+        self,
+        texts: List[str],
+        preferred_provider: Optional[AIProviderType] = None,
+        **kwargs
+    ) -> List[List[float]]:
+        """Embed a batch of texts, skipping providers without embedding support"""
+        last_error = None
+        for provider_type in self._providers_to_try(preferred_provider):
+            provider = self.providers[provider_type]
+            if not provider.supports_embeddings:
+                continue
+            try:
+                return await provider.generate_embeddings(texts, **kwargs)
+                
+            except Exception as e:
+                last_error = e
+                logger.warning("AI provider embedding failed, trying fallback", 
+                             provider_type=provider_type.value, error=str(e))
+                continue
+        
+        if last_error:
+            raise last_error
+        else:
+            raise Exception("No AI provider supports embeddings")
+    
+    async def stream_completion(
+        self, 
+        prompt: str, 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        preferred_provider: Optional[AIProviderType] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream completion chunks with fallback support"""
+        async for text in self._stream_with_fallback(
+            "stream_completion", prompt, max_tokens, temperature, preferred_provider, **kwargs
+        ):
+            yield text
+    
+    async def stream_chat_completion(
+        self, 
+        messages: List[Dict[str, str]], 
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        preferred_provider: Optional[AIProviderType] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion chunks with fallback support"""
+        async for text in self._stream_with_fallback(
+            "stream_chat_completion", messages, max_tokens, temperature, preferred_provider, **kwargs
+        ):
+            yield text
+    
+    async def _stream_with_fallback(
+        self,
+        method: str,
+        request: Any,
+        max_tokens: int,
+        temperature: float,
+        preferred_provider: Optional[AIProviderType],
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Fall back to the next provider only while nothing has been emitted;
+        once a chunk reached the caller, a failure is surfaced instead of
+        restarting the answer from another provider.
+        """
+        last_error = None
+        for provider_type in self._providers_to_try(preferred_provider):
+            emitted = False
+            stream = getattr(self.providers[provider_type], method)(request, max_tokens, temperature, **kwargs)
+            try:
+                async for text in stream:
+                    emitted = True
+                    yield text
+                return
+            except Exception as e:
+                if emitted:
+                    logger.error("AI provider stream failed mid-response",
+                                 provider_type=provider_type.value, error=str(e))
+                    raise
+                last_error = e
+                logger.warning("AI provider stream failed, trying fallback",
+                               provider_type=provider_type.value, error=str(e))
+            finally:
+                await stream.aclose()
+        
+        if last_error:
+            raise last_error
+        else:
+            raise Exception("No AI providers available")
+
+
+_ai_provider_manager: Optional[AIProviderManager] = None
+
+
+def get_ai_provider_manager() -> AIProviderManager:
+    """Provider manager configured from settings, ordered by AI_PROVIDER_PRIORITY"""
+    global _ai_provider_manager
+    if _ai_provider_manager is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        
+        configured = {
+            AIProviderType.GROQ: settings.GROQ_API_KEY,
+            AIProviderType.TOGETHER: settings.TOGETHER_API_KEY,
+            AIProviderType.LOCAL_LLM: "" if settings.ALLOW_LOCAL_LLM else None,
+            AIProviderType.OPENAI: settings.OPENAI_API_KEY,
+            AIProviderType.ANTHROPIC: settings.ANTHROPIC_API_KEY,
+            AIProviderType.HUGGINGFACE: settings.HF_API_KEY,
+        }
+        priority = [p for p in settings.AI_PROVIDER_PRIORITY if p in AIProviderType._value2member_map_]
+        ordered = sorted(
+            (p for p, key in configured.items() if key is not None),
+            key=lambda p: priority.index(p.value) if p.value in priority else len(priority)
+        )
+        
+        manager = AIProviderManager()
+        for provider_type in ordered:
+            if manager.add_provider(provider_type, configured[provider_type]) and provider_type != manager.primary_provider:
+                manager.fallback_providers.append(provider_type)
+        if not settings.ENABLE_AI_PROVIDER_FALLBACK:
+            manager.fallback_providers = []
+        _ai_provider_manager = manager
+    return _ai_provider_manager
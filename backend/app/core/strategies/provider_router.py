@@ -0,0 +1,379 @@
+"""
+Latency-Aware AI Provider Router
+Health-weighted provider selection with circuit breakers and hedged requests,
+configurable per task type
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+import structlog
+
+from app.core.strategies.ai_provider_strategy import (
+    AIProviderManager,
+    AIProviderStrategy,
+    AIProviderType,
+    get_ai_provider_manager,
+)
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ProviderUnavailableError(Exception):
+    """Raised when no provider could serve a routed request"""
+
+
+@dataclass
+class RoutingPolicy:
+    """How requests of one task type are routed"""
+    providers: List[str] = field(default_factory=list)  # candidate subset; empty means all registered
+    timeout_s: float = 30.0
+    max_attempts: int = 2
+    hedge: bool = False
+    hedge_percentile: float = 95.0
+    min_hedge_delay_ms: float = 100.0
+    latency_weight: float = 1.0
+    error_weight: float = 1.0
+    cost_weight: float = 0.0  # seconds of latency one cent is worth
+    expected_prompt_tokens: int = 500
+    expected_completion_tokens: int = 500
+    exploration_rate: float = 0.02
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RoutingPolicy":
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Circuit breaker thresholds"""
+    failure_threshold: int = 5  # consecutive failures that open the circuit
+    error_rate_threshold: float = 0.5  # EWMA error rate that opens the circuit
+    min_samples: int = 10  # samples required before the error rate counts
+    open_duration_s: float = 30.0
+    half_open_max_calls: int = 1
+
+
+DEFAULT_ROUTING_POLICIES: Dict[str, RoutingPolicy] = {
+    "default": RoutingPolicy(),
+    "completion": RoutingPolicy(timeout_s=15.0, hedge=True),
+    "chat": RoutingPolicy(timeout_s=30.0, hedge=True),
+    "code_generation": RoutingPolicy(timeout_s=60.0, cost_weight=0.5, expected_completion_tokens=1500),
+    "embedding": RoutingPolicy(timeout_s=20.0, max_attempts=3),
+}
+
+
+class ProviderHealth:
+    """Rolling latency/error statistics and circuit breaker for one provider"""
+
+    def __init__(self, provider_type: AIProviderType, breaker: CircuitBreakerConfig,
+                 alpha: float = 0.2, window: int = 200):
+        self.provider_type = provider_type
+        self.breaker = breaker
+        self.alpha = alpha
+        self.ewma_latency_ms: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.half_open_in_flight = 0
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        return value if current is None else self.alpha * value + (1 - self.alpha) * current
+
+    def allow_request(self) -> bool:
+        """Whether the breaker lets a request through; moves OPEN to HALF_OPEN after the cool-down"""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.breaker.open_duration_s:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.half_open_in_flight = 0
+            logger.info("Provider circuit half-open", provider=self.provider_type.value)
+        if self.state == CircuitState.HALF_OPEN:
+            return self.half_open_in_flight < self.breaker.half_open_max_calls
+        return True
+
+    def on_start(self) -> None:
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_in_flight += 1
+
+    def record_success(self, latency_ms: float) -> None:
+        self.samples += 1
+        self.consecutive_failures = 0
+        self.latencies.append(latency_ms)
+        self.ewma_latency_ms = self._ewma(self.ewma_latency_ms, latency_ms)
+        self.ewma_error_rate = self._ewma(self.ewma_error_rate, 0.0)
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+            logger.info("Provider circuit closed", provider=self.provider_type.value)
+
+    def record_failure(self, latency_ms: float) -> None:
+        self.samples += 1
+        self.consecutive_failures += 1
+        # Failures are slow from the caller's point of view too
+        self.ewma_latency_ms = self._ewma(self.ewma_latency_ms, latency_ms)
+        self.ewma_error_rate = self._ewma(self.ewma_error_rate, 1.0)
+        if self.state == CircuitState.HALF_OPEN or self._should_open():
+            self._open()
+
+    def release_probe(self) -> None:
+        """A half-open probe ended without an outcome (e.g. hedge loser cancelled)"""
+        if self.state == CircuitState.HALF_OPEN and self.half_open_in_flight > 0:
+            self.half_open_in_flight -= 1
+
+    def _should_open(self) -> bool:
+        if self.consecutive_failures >= self.breaker.failure_threshold:
+            return True
+        return self.samples >= self.breaker.min_samples and self.ewma_error_rate >= self.breaker.error_rate_threshold
+
+    def _open(self) -> None:
+        if self.state != CircuitState.OPEN:
+            logger.warning("Provider circuit opened", provider=self.provider_type.value,
+                           consecutive_failures=self.consecutive_failures,
+                           error_rate=round(self.ewma_error_rate, 3))
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+
+    def percentile_ms(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, int(round(percentile / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "ewma_latency_ms": self.ewma_latency_ms,
+            "ewma_error_rate": self.ewma_error_rate,
+            "p95_ms": self.percentile_ms(95),
+            "samples": self.samples,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class ProviderRouter:
+    """
+    Routes calls across the providers of an AIProviderManager.
+    Candidates are ranked by expected latency (EWMA latency plus error rate
+    times the timeout) and weighted cost; open circuits are skipped. With
+    hedging, a second provider starts after the first one's p95 latency and
+    whichever succeeds first wins while the other is cancelled.
+    """
+
+    def __init__(self, manager: AIProviderManager,
+                 policies: Optional[Dict[str, RoutingPolicy]] = None,
+                 breaker: Optional[CircuitBreakerConfig] = None,
+                 ewma_alpha: float = 0.2,
+                 priority: Optional[List[str]] = None,
+                 cold_start_latency_ms: float = 1000.0,
+                 rng: Optional[random.Random] = None):
+        self.manager = manager
+        self.policies = dict(DEFAULT_ROUTING_POLICIES)
+        self.policies.update(policies or {})
+        self.breaker = breaker or CircuitBreakerConfig()
+        self.ewma_alpha = ewma_alpha
+        self.priority = priority or []
+        self.cold_start_latency_ms = cold_start_latency_ms
+        self.rng = rng or random.Random()
+        self.health: Dict[AIProviderType, ProviderHealth] = {}
+
+    def policy_for(self, task_type: str) -> RoutingPolicy:
+        return self.policies.get(task_type) or self.policies["default"]
+
+    def _health(self, provider_type: AIProviderType) -> ProviderHealth:
+        health = self.health.get(provider_type)
+        if health is None:
+            health = ProviderHealth(provider_type, self.breaker, self.ewma_alpha)
+            self.health[provider_type] = health
+        return health
+
+    def score(self, provider_type: AIProviderType, policy: RoutingPolicy) -> float:
+        """Lower is better: expected seconds to a good answer plus weighted cost"""
+        health = self._health(provider_type)
+        latency_s = (health.ewma_latency_ms if health.ewma_latency_ms is not None
+                     else self.cold_start_latency_ms) / 1000.0
+        cost_cents = 100.0 * self.manager.providers[provider_type].get_cost_estimate(
+            policy.expected_prompt_tokens, policy.expected_completion_tokens
+        )
+        return (policy.latency_weight * latency_s
+                + policy.error_weight * health.ewma_error_rate * policy.timeout_s
+                + policy.cost_weight * cost_cents)
+
+    def rank(self, task_type: str = "default",
+             eligible: Optional[Callable[[AIProviderStrategy], bool]] = None) -> List[AIProviderType]:
+        """Available providers for a task type (and capable of it, per ``eligible``), best first"""
+        policy = self.policy_for(task_type)
+        candidates = [
+            p for p, provider in self.manager.providers.items()
+            if (not policy.providers or p.value in policy.providers) and (eligible is None or eligible(provider))
+        ]
+        available = [p for p in candidates if self._health(p).allow_request()]
+
+        def tie_break(p: AIProviderType) -> int:
+            return self.priority.index(p.value) if p.value in self.priority else len(self.priority)
+
+        ranked = sorted(available, key=lambda p: (self.score(p, policy), tie_break(p)))
+        if len(ranked) > 1 and self.rng.random() < policy.exploration_rate:
+            # Keep statistics fresh for providers that are not currently winning
+            explore = ranked.pop(self.rng.randrange(1, len(ranked)))
+            ranked.insert(0, explore)
+        return ranked
+
+    async def _attempt(self, provider_type: AIProviderType, call: Callable[[AIProviderStrategy], Awaitable[T]],
+                       timeout_s: float) -> T:
+        health = self._health(provider_type)
+        health.on_start()
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(call(self.manager.providers[provider_type]), timeout=timeout_s)
+        except asyncio.CancelledError:
+            health.release_probe()
+            raise
+        except Exception:
+            health.record_failure((time.perf_counter() - started) * 1000.0)
+            raise
+        health.record_success((time.perf_counter() - started) * 1000.0)
+        return result
+
+    def _hedge_delay_s(self, provider_type: AIProviderType, policy: RoutingPolicy) -> float:
+        observed = self._health(provider_type).percentile_ms(policy.hedge_percentile)
+        delay_ms = max(policy.min_hedge_delay_ms, observed if observed is not None else self.cold_start_latency_ms)
+        return delay_ms / 1000.0
+
+    async def _hedged(self, primary: AIProviderType, secondary: AIProviderType,
+                      call: Callable[[AIProviderStrategy], Awaitable[T]], policy: RoutingPolicy) -> T:
+        primary_task = asyncio.ensure_future(self._attempt(primary, call, policy.timeout_s))
+        tasks = {primary_task: primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay_s(primary, policy))
+            if not done:
+                logger.info("Hedging provider request", primary=primary.value, secondary=secondary.value)
+                tasks[asyncio.ensure_future(self._attempt(secondary, call, policy.timeout_s))] = secondary
+            elif primary_task.exception() is not None:
+                # Failed before the hedge delay: fall over to the secondary right away
+                tasks[asyncio.ensure_future(self._attempt(secondary, call, policy.timeout_s))] = secondary
+
+            last_error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def execute(self, call: Callable[[AIProviderStrategy], Awaitable[T]], task_type: str = "default",
+                      eligible: Optional[Callable[[AIProviderStrategy], bool]] = None) -> T:
+        """Run ``call(strategy)`` on the best providers for the task type"""
+        policy = self.policy_for(task_type)
+        ranked = self.rank(task_type, eligible)
+        if not ranked:
+            raise ProviderUnavailableError(f"No healthy AI provider for task type '{task_type}'")
+
+        candidates = ranked[:max(1, policy.max_attempts)]
+        last_error: Optional[BaseException] = None
+        index = 0
+        while index < len(candidates):
+            provider_type = candidates[index]
+            hedged = policy.hedge and index + 1 < len(candidates)
+            try:
+                if hedged:
+                    return await self._hedged(provider_type, candidates[index + 1], call, policy)
+                return await self._attempt(provider_type, call, policy.timeout_s)
+            except Exception as e:
+                last_error = e
+                logger.warning("Routed provider call failed", task_type=task_type,
+                               provider=provider_type.value, hedged=hedged, error=str(e) or type(e).__name__)
+            index += 2 if hedged else 1
+
+        raise ProviderUnavailableError(
+            f"All providers failed for task type '{task_type}': {last_error}"
+        ) from last_error
+
+    async def generate_completion(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                                  task_type: str = "completion", **kwargs) -> str:
+        return await self.execute(
+            lambda provider: provider.generate_completion(prompt, max_tokens, temperature, **kwargs), task_type
+        )
+
+    async def generate_chat_completion(self, messages: List[Dict[str, str]], max_tokens: int = 1000,
+                                       temperature: float = 0.7, task_type: str = "chat", **kwargs) -> str:
+        return await self.execute(
+            lambda provider: provider.generate_chat_completion(messages, max_tokens, temperature, **kwargs),
+            task_type
+        )
+
+    async def generate_embeddings(self, texts: List[str], task_type: str = "embedding", **kwargs) -> List[List[float]]:
+        return await self.execute(lambda provider: provider.generate_embeddings(texts, **kwargs), task_type,
+                                  eligible=lambda provider: getattr(provider, "supports_embeddings", False))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "providers": {p.value: self._health(p).snapshot() for p in self.manager.providers},
+            "policies": {name: asdict(policy) for name, policy in self.policies.items()},
+        }
+
+
+_provider_router: Optional[ProviderRouter] = None
+
+
+def get_provider_router() -> ProviderRouter:
+    """Router over the settings-configured providers, with AI_ROUTING_POLICIES overrides"""
+    global _provider_router
+    if _provider_router is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+
+        policies = {}
+        for task_type, overrides in settings.AI_ROUTING_POLICIES.items():
+            base = asdict(DEFAULT_ROUTING_POLICIES.get(task_type, DEFAULT_ROUTING_POLICIES["default"]))
+            base.update(overrides)
+            policies[task_type] = RoutingPolicy.from_dict(base)
+
+        _provider_router = ProviderRouter(
+            get_ai_provider_manager(),
+            policies=policies,
+            breaker=CircuitBreakerConfig(
+                failure_threshold=settings.AI_CIRCUIT_FAILURE_THRESHOLD,
+                open_duration_s=settings.AI_CIRCUIT_OPEN_SECONDS,
+            ),
+            priority=settings.AI_PROVIDER_PRIORITY,
+        )
+    return _provider_router
+
+
+__all__ = [
+    'CircuitState',
+    'ProviderUnavailableError',
+    'RoutingPolicy',
+    'CircuitBreakerConfig',
+    'DEFAULT_ROUTING_POLICIES',
+    'ProviderHealth',
+    'ProviderRouter',
+    'get_provider_router',
+]
@@ -0,0 +1,186 @@
+"""
+Token Streaming Transport Helpers
+Carries incremental AI output to HTTP clients as Server-Sent Events or WebSocket
+messages, aborting upstream generation as soon as the client goes away
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Optional
+
+import structlog
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+logger = structlog.get_logger()
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop reverse proxies from buffering the stream and hiding time-to-first-token
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_token_events(
+    tokens: AsyncIterator[str],
+    stream_id: Optional[str] = None,
+    **metadata: Any
+) -> AsyncIterator[str]:
+    """
+    Wrap a token iterator as SSE frames: ``start``, one ``token`` per chunk,
+    then ``done`` (with time-to-first-token) or ``error``.
+    Starlette cancels the response task on client disconnect; the cancellation
+    propagates into ``tokens`` so the provider request is closed too.
+    """
+    stream_id = stream_id or str(uuid.uuid4())
+    started = time.perf_counter()
+    first_token_ms = None
+    count = 0
+    try:
+        yield sse_event("start", {"stream_id": stream_id, **metadata})
+        async for text in tokens:
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000.0
+            yield sse_event("token", {"index": count, "text": text})
+            count += 1
+        yield sse_event("done", {
+            "stream_id": stream_id,
+            "chunks": count,
+            "time_to_first_token_ms": first_token_ms,
+            "total_ms": (time.perf_counter() - started) * 1000.0,
+        })
+        logger.info("Token stream completed", stream_id=stream_id, chunks=count, ttft_ms=first_token_ms)
+    except asyncio.CancelledError:
+        logger.info("Token stream cancelled by client", stream_id=stream_id, chunks=count)
+        raise
+    except Exception as e:
+        logger.error("Token stream failed", stream_id=stream_id, chunks=count, error=str(e))
+        yield sse_event("error", {"stream_id": stream_id, "detail": str(e)})
+    finally:
+        await tokens.aclose()
+
+
+def sse_response(tokens: AsyncIterator[str], stream_id: Optional[str] = None, **metadata: Any) -> StreamingResponse:
+    """StreamingResponse emitting ``sse_token_events``"""
+    return StreamingResponse(
+        sse_token_events(tokens, stream_id, **metadata),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+def ndjson_response(records: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """StreamingResponse writing one JSON object per line as each record is produced"""
+    async def lines() -> AsyncIterator[str]:
+        try:
+            async for record in records:
+                yield json.dumps(record, default=str) + "\n"
+        finally:
+            await records.aclose()
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def websocket_token_stream(
+    websocket: WebSocket,
+    tokens: AsyncIterator[str],
+    stream_id: Optional[str] = None
+) -> bool:
+    """
+    Send tokens over an accepted WebSocket while listening for the client.
+    A ``{"type": "cancel"}`` message or a disconnect stops the producer, which
+    closes the provider request. Returns False once the socket has gone away.
+    """
+    stream_id = stream_id or str(uuid.uuid4())
+    started = time.perf_counter()
+    state = {"count": 0, "first_token_ms": None}
+
+    async def produce() -> None:
+        try:
+            await websocket.send_json({"type": "start", "stream_id": stream_id})
+            async for text in tokens:
+                if state["first_token_ms"] is None:
+                    state["first_token_ms"] = (time.perf_counter() - started) * 1000.0
+                await websocket.send_json({"type": "token", "stream_id": stream_id,
+                                           "index": state["count"], "text": text})
+                state["count"] += 1
+            await websocket.send_json({
+                "type": "done",
+                "stream_id": stream_id,
+                "chunks": state["count"],
+                "time_to_first_token_ms": state["first_token_ms"],
+                "total_ms": (time.perf_counter() - started) * 1000.0,
+            })
+        except (WebSocketDisconnect, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            logger.error("WebSocket token stream failed", stream_id=stream_id, error=str(e))
+            await websocket.send_json({"type": "error", "stream_id": stream_id, "detail": str(e)})
+        finally:
+            await tokens.aclose()
+
+    async def listen() -> str:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return "disconnect"
+            try:
+                payload = json.loads(message.get("text") or "{}")
+            except json.JSONDecodeError:
+                continue
+            if payload.get("type") == "cancel":
+                return "cancel"
+
+    producer = asyncio.create_task(produce())
+    listener = asyncio.create_task(listen())
+    try:
+        done, _ = await asyncio.wait({producer, listener}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in (producer, listener):
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(producer, listener, return_exceptions=True)
+
+    if listener in done and not listener.cancelled() and listener.exception() is None:
+        reason = listener.result()
+        logger.info("WebSocket token stream stopped by client", stream_id=stream_id,
+                    reason=reason, chunks=state["count"])
+        if reason == "cancel":
+            await websocket.send_json({"type": "cancelled", "stream_id": stream_id, "chunks": state["count"]})
+            return True
+        return False
+    if producer.exception() is not None:
+        return False
+    return True
+
+
+async def authenticate_websocket(websocket: WebSocket) -> Optional[Any]:
+    """Resolve the user from a ``token`` query parameter (browsers cannot set headers on WebSockets)"""
+    token = websocket.query_params.get("token")
+    if not token:
+        return None
+    from app.services.auth_service import AuthService
+    return await AuthService().get_user_from_token(token)
+
+
+__all__ = [
+    'SSE_HEADERS',
+    'sse_event',
+    'sse_token_events',
+    'sse_response',
+    'ndjson_response',
+    'websocket_token_stream',
+    'authenticate_websocket',
+]
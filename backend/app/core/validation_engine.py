@@ -0,0 +1,311 @@
+"""
+Concurrent Validator Execution Engine
+Runs independent code validators side by side - CPU-bound ones in a process
+pool, I/O-bound ones as concurrent tasks - under a per-validator timeout and an
+overall latency budget, short-circuiting on critical failures
+"""
+
+import asyncio
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class ExecutionMode(str, Enum):
+    """Where a validator runs"""
+    PROCESS = "process"  # CPU-bound: process pool, falls back to ASYNC when not picklable
+    ASYNC = "async"  # I/O-bound or stateful: concurrent task on the event loop
+    THREAD = "thread"  # PROCESS validator on input too small for IPC: worker thread, loop stays free
+
+
+class ValidatorStatus(str, Enum):
+    COMPLETED = "completed"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    SKIPPED = "skipped"  # latency budget ran out first
+    CANCELLED = "cancelled"  # another validator short-circuited the run
+
+
+@dataclass
+class ValidatorSpec:
+    """One validator call: ``target.method(*args, **kwargs)``"""
+    name: str
+    target: Any
+    method: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    mode: ExecutionMode = ExecutionMode.PROCESS
+    timeout_s: Optional[float] = None
+    is_critical_failure: Optional[Callable[[Any], bool]] = None  # evaluated in this process
+
+
+@dataclass
+class ValidatorOutcome:
+    name: str
+    status: ValidatorStatus
+    duration_ms: float = 0.0
+    mode: Optional[ExecutionMode] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status.value,
+            "duration_ms": round(self.duration_ms, 3),
+            "mode": self.mode.value if self.mode else None,
+            "error": self.error,
+        }
+
+
+@dataclass
+class ValidationRun:
+    """Results of completed validators plus how every validator ended"""
+    results: Dict[str, Any]
+    outcomes: Dict[str, ValidatorOutcome]
+    elapsed_ms: float
+    short_circuited_by: Optional[str] = None
+
+    @property
+    def partial(self) -> bool:
+        return any(o.status != ValidatorStatus.COMPLETED for o in self.outcomes.values())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "partial": self.partial,
+            "short_circuited_by": self.short_circuited_by,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "validators": {name: outcome.to_dict() for name, outcome in self.outcomes.items()},
+        }
+
+
+@dataclass
+class ValidationEngineConfig:
+    mode: ExecutionMode = ExecutionMode.PROCESS
+    max_workers: int = 4
+    default_timeout_s: float = 2.0
+    budget_ms: float = 3000.0
+    short_circuit: bool = True
+    # Below this much source, pickling and IPC cost more than the validators themselves,
+    # so PROCESS validators run in a thread instead
+    process_min_code_chars: int = 16000
+
+
+# Per worker process: one validator instance per class and one event loop
+_worker_instances: Dict[type, Any] = {}
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _call_validator_in_thread(spec: "ValidatorSpec") -> Any:
+    result = getattr(spec.target, spec.method)(*spec.args, **spec.kwargs)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+def _run_validator_in_worker(payload: bytes) -> Any:
+    global _worker_loop
+    cls, method, args, kwargs = pickle.loads(payload)
+    instance = _worker_instances.get(cls)
+    if instance is None:
+        instance = _worker_instances[cls] = cls()
+    result = getattr(instance, method)(*args, **kwargs)
+    if asyncio.iscoroutine(result):
+        if _worker_loop is None:
+            _worker_loop = asyncio.new_event_loop()
+        result = _worker_loop.run_until_complete(result)
+    return result
+
+
+class ValidationEngine:
+    """
+    Runs a set of ``ValidatorSpec`` concurrently and returns whatever finished
+    within the budget.
+
+    Process-mode validators are re-instantiated from their class in the worker
+    (once per worker), so they must not depend on per-instance runtime state;
+    mark those ``ExecutionMode.ASYNC``. Timed-out process work cannot be
+    interrupted; its result is simply discarded.
+    """
+
+    def __init__(self, config: Optional[ValidationEngineConfig] = None):
+        self.config = config or ValidationEngineConfig()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._unpicklable: set = set()
+        self.stats = {"runs": 0, "partial_runs": 0, "short_circuits": 0, "process_calls": 0, "thread_calls": 0,
+                      "async_calls": 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.config.max_workers)
+            logger.info("Validation process pool started", max_workers=self.config.max_workers)
+        return self._pool
+
+    def _resolve_mode(self, spec: ValidatorSpec, size_hint: Optional[int]) -> ExecutionMode:
+        if spec.mode != ExecutionMode.PROCESS or self.config.mode != ExecutionMode.PROCESS:
+            return ExecutionMode.ASYNC
+        if size_hint is not None and size_hint < self.config.process_min_code_chars:
+            return ExecutionMode.THREAD
+        if type(spec.target) in self._unpicklable:
+            return ExecutionMode.ASYNC
+        return ExecutionMode.PROCESS
+
+    def _payload(self, spec: ValidatorSpec) -> Optional[bytes]:
+        try:
+            return pickle.dumps((type(spec.target), spec.method, spec.args, spec.kwargs),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self._unpicklable.add(type(spec.target))
+            logger.info("Validator not process-safe, running on event loop",
+                        validator=spec.name, error=str(e))
+            return None
+
+    async def _execute(self, spec: ValidatorSpec, mode: ExecutionMode) -> Tuple[Any, ExecutionMode]:
+        timeout = spec.timeout_s or self.config.default_timeout_s
+        if mode == ExecutionMode.PROCESS:
+            payload = self._payload(spec)
+            if payload is not None:
+                self.stats["process_calls"] += 1
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(self._get_pool(), _run_validator_in_worker, payload)
+                return await asyncio.wait_for(future, timeout), mode
+            mode = ExecutionMode.ASYNC
+
+        if mode == ExecutionMode.THREAD:
+            # The thread cannot be interrupted either, but the loop is not blocked and the timeout holds
+            self.stats["thread_calls"] += 1
+            return await asyncio.wait_for(asyncio.to_thread(_call_validator_in_thread, spec), timeout), mode
+
+        self.stats["async_calls"] += 1
+        result = getattr(spec.target, spec.method)(*spec.args, **spec.kwargs)
+        if asyncio.iscoroutine(result):
+            result = await asyncio.wait_for(result, timeout)
+        return result, mode
+
+    async def run(
+        self,
+        specs: List[ValidatorSpec],
+        budget_ms: Optional[float] = None,
+        short_circuit: Optional[bool] = None,
+        size_hint: Optional[int] = None,
+    ) -> ValidationRun:
+        """Run all validators; ``size_hint`` (source length) decides if the process pool pays off"""
+        budget_ms = self.config.budget_ms if budget_ms is None else budget_ms
+        short_circuit = self.config.short_circuit if short_circuit is None else short_circuit
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000.0
+
+        results: Dict[str, Any] = {}
+        outcomes: Dict[str, ValidatorOutcome] = {}
+        short_circuited_by: Optional[str] = None
+
+        async def timed(spec: ValidatorSpec):
+            spec_started = time.perf_counter()
+            mode = self._resolve_mode(spec, size_hint)
+            try:
+                result, mode = await self._execute(spec, mode)
+            except asyncio.TimeoutError:
+                return spec, None, ValidatorOutcome(spec.name, ValidatorStatus.TIMED_OUT,
+                                                    (time.perf_counter() - spec_started) * 1000.0, mode,
+                                                    "validator timeout")
+            except Exception as e:
+                return spec, None, ValidatorOutcome(spec.name, ValidatorStatus.FAILED,
+                                                    (time.perf_counter() - spec_started) * 1000.0, mode,
+                                                    str(e) or type(e).__name__)
+            return spec, result, ValidatorOutcome(spec.name, ValidatorStatus.COMPLETED,
+                                                  (time.perf_counter() - spec_started) * 1000.0, mode)
+
+        tasks = {asyncio.ensure_future(timed(spec)): spec for spec in specs}
+        pending = set(tasks)
+        try:
+            while pending and short_circuited_by is None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    spec, result, outcome = task.result()
+                    outcomes[spec.name] = outcome
+                    if outcome.status != ValidatorStatus.COMPLETED:
+                        logger.warning("Validator did not complete", validator=spec.name,
+                                       status=outcome.status.value, error=outcome.error)
+                        continue
+                    results[spec.name] = result
+                    if short_circuit and spec.is_critical_failure and short_circuited_by is None:
+                        try:
+                            critical = spec.is_critical_failure(result)
+                        except Exception:
+                            critical = False
+                        if critical:
+                            short_circuited_by = spec.name
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        unfinished = ValidatorStatus.CANCELLED if short_circuited_by else ValidatorStatus.SKIPPED
+        for task in pending:
+            spec = tasks[task]
+            outcomes[spec.name] = ValidatorOutcome(spec.name, unfinished,
+                                                   (time.perf_counter() - started) * 1000.0)
+
+        run = ValidationRun(
+            results=results,
+            outcomes={spec.name: outcomes[spec.name] for spec in specs},
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+            short_circuited_by=short_circuited_by,
+        )
+        self.stats["runs"] += 1
+        if run.partial:
+            self.stats["partial_runs"] += 1
+            logger.info("Validation run returned partial results", elapsed_ms=round(run.elapsed_ms, 1),
+                        short_circuited_by=short_circuited_by,
+                        unfinished=[n for n, o in run.outcomes.items() if o.status != ValidatorStatus.COMPLETED])
+        if short_circuited_by:
+            self.stats["short_circuits"] += 1
+        return run
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_validation_engine: Optional[ValidationEngine] = None
+
+
+def get_validation_engine() -> ValidationEngine:
+    """Shared engine configured from settings"""
+    global _validation_engine
+    if _validation_engine is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        _validation_engine = ValidationEngine(ValidationEngineConfig(
+            mode=ExecutionMode(settings.VALIDATION_EXECUTION_MODE),
+            max_workers=settings.VALIDATION_MAX_WORKERS or min(4, os.cpu_count() or 1),
+            default_timeout_s=settings.VALIDATION_TIMEOUT_SECONDS,
+            budget_ms=settings.VALIDATION_BUDGET_MS,
+            short_circuit=settings.VALIDATION_SHORT_CIRCUIT,
+            process_min_code_chars=settings.VALIDATION_PROCESS_MIN_CODE_CHARS,
+        ))
+    return _validation_engine
+
+
+__all__ = [
+    'ExecutionMode',
+    'ValidatorStatus',
+    'ValidatorSpec',
+    'ValidatorOutcome',
+    'ValidationRun',
+    'ValidationEngineConfig',
+    'ValidationEngine',
+    'get_validation_engine',
+]
@@ -0,0 +1,461 @@
+"""
+In-Process Vector Index
+Float32 embeddings in one contiguous NumPy matrix (memory-mapped when the index
+has a directory), searched exactly with a single matmul for small sets and
+through an inverted-file (IVF) coarse quantizer with exact re-ranking once the
+set grows. Rows carry interned metadata columns for vectorized filters, and
+deletes are tombstones reclaimed by periodic compaction.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+FORMAT_VERSION = 1
+MISSING = -1  # metadata code for rows without a value
+
+# Compact once this share of the stored rows is tombstoned
+COMPACT_RATIO = 0.3
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+FilterValue = Union[str, Iterable[str]]
+
+
+@dataclass
+class VectorHit:
+    """One nearest-neighbour result"""
+    id: str
+    score: float
+    metadata: Dict[str, str] = field(default_factory=dict)
+    payload: Any = None
+
+
+class VectorIndex:
+    """
+    Nearest-neighbour index over float32 vectors.
+
+    ``metric`` is ``"cosine"`` (vectors are normalized on insert, scores are
+    cosine similarities) or ``"dot"``. Searches are exact below
+    ``ann_threshold`` live rows; above it an IVF quantizer with
+    ``sqrt(rows)`` lists is trained lazily and ``n_probe`` lists are scanned.
+    With ``path`` the matrix is a memory-mapped file and ``save()`` persists
+    ids, metadata and the quantizer next to it.
+    """
+
+    def __init__(self, dim: Optional[int] = None, metric: str = "cosine", path: Optional[str] = None,
+                 filter_fields: Sequence[str] = ("project_id", "language", "kind"),
+                 ann_threshold: int = 50_000, n_probe: Optional[int] = None):
+        if metric not in ("cosine", "dot"):
+            raise ValueError(f"Unsupported metric: {metric}")
+        self.dim = dim
+        self.metric = metric
+        self.path = os.path.abspath(path) if path else None
+        self.filter_fields = tuple(filter_fields)
+        self.ann_threshold = ann_threshold
+        self.n_probe = n_probe
+
+        self._count = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._vectors_file: Optional[str] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._codes: Dict[str, np.ndarray] = {name: np.zeros(0, dtype=np.int32) for name in self.filter_fields}
+        self._vocab: Dict[str, Dict[str, int]] = {name: {} for name in self.filter_fields}
+        self._values: Dict[str, List[str]] = {name: [] for name in self.filter_fields}
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._payloads: List[Any] = []
+        self._pinned: set = set()  # matrix files an in-flight write_state still references
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_rows = 0
+        self._lists: Optional[tuple] = None  # (offsets, rows) CSR over assignments
+        self.stats = {"searches": 0, "ann_searches": 0, "trainings": 0, "compactions": 0, "rows_scanned": 0}
+
+        if self.path and os.path.exists(os.path.join(self.path, "index.json")):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    # -- storage -------------------------------------------------------------
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self.path is None:
+            return np.zeros((capacity, self.dim), dtype=np.float32)
+        os.makedirs(self.path, exist_ok=True)
+        name = f"vectors.{uuid.uuid4().hex[:12]}.f32"
+        # Raw float32 file; its shape is recorded in index.json
+        matrix = np.memmap(os.path.join(self.path, name), dtype=np.float32, mode="w+", shape=(capacity, self.dim))
+        self._vectors_file = name
+        return matrix
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = self._count + extra
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(1024, capacity * 2, needed)
+        old_file = self._vectors_file
+        vectors = self._allocate(new_capacity)
+        if self._vectors is not None:
+            vectors[:self._count] = self._vectors[:self._count]
+        self._vectors = vectors
+        self._alive = _grow(self._alive, new_capacity, False)
+        self._assignments = _grow(self._assignments, new_capacity, MISSING)
+        for name in self.filter_fields:
+            self._codes[name] = _grow(self._codes[name], new_capacity, MISSING)
+        self._retire(old_file)
+
+    def _retire(self, old_file: Optional[str]) -> None:
+        # The previous matrix stays valid until index.json stops naming it
+        if (old_file and old_file != self._vectors_file and old_file not in self._pinned
+                and self._persisted_file() != old_file):
+            _unlink(os.path.join(self.path, old_file))
+
+    def _persisted_file(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, "index.json")) as f:
+                return json.load(f).get("vectors_file")
+        except (OSError, ValueError):
+            return None
+
+    def _encode(self, name: str, value: Any) -> int:
+        if value is None:
+            return MISSING
+        value = str(value)
+        code = self._vocab[name].get(value)
+        if code is None:
+            code = self._vocab[name][value] = len(self._values[name])
+            self._values[name].append(value)
+        return code
+
+    # -- updates -------------------------------------------------------------
+
+    def add(self, ids: Sequence[str], vectors: Any, metadata: Optional[Sequence[Mapping[str, Any]]] = None,
+            payloads: Optional[Sequence[Any]] = None) -> None:
+        """Insert rows; an id that already exists is replaced (its old row becomes a tombstone)"""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if len(ids) != matrix.shape[0]:
+            raise ValueError("ids and vectors differ in length")
+        if not len(ids):
+            return
+        if self.dim is None:
+            self.dim = matrix.shape[1]
+        elif matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {matrix.shape[1]}")
+        if self.metric == "cosine":
+            matrix = _normalize(matrix)
+
+        self.delete(ids)
+        self._ensure_capacity(len(ids))
+        start, end = self._count, self._count + len(ids)
+        self._vectors[start:end] = matrix
+        self._alive[start:end] = True
+        for offset, item_id in enumerate(ids):
+            self._rows[item_id] = start + offset
+        self._ids.extend(ids)
+        self._payloads.extend(payloads if payloads is not None else [None] * len(ids))
+        for name in self.filter_fields:
+            self._codes[name][start:end] = [self._encode(name, (row or {}).get(name)) for row in
+                                           (metadata or [None] * len(ids))]
+        if self._centroids is not None:
+            self._assignments[start:end] = np.argmax(matrix @ self._centroids.T, axis=1)
+            self._lists = None
+        self._count = end
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """Tombstone rows by id"""
+        deleted = 0
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._ids[row] = None
+            self._payloads[row] = None
+            deleted += 1
+        if deleted:
+            self._lists = None
+            self._maybe_compact()
+        return deleted
+
+    def delete_where(self, **filters: FilterValue) -> int:
+        """Tombstone every live row matching the metadata filters"""
+        return self.delete(self.ids(**filters))
+
+    def ids(self, **filters: FilterValue) -> List[str]:
+        """Ids of the live rows matching the metadata filters"""
+        mask = self._filter_mask(filters)
+        rows = np.flatnonzero(self._alive[:self._count] if mask is None else mask)
+        return [self._ids[row] for row in rows]
+
+    def get_payload(self, item_id: str) -> Any:
+        row = self._rows.get(item_id)
+        return None if row is None else self._payloads[row]
+
+    def _maybe_compact(self) -> None:
+        dead = self._count - len(self._rows)
+        if self._count >= 1024 and dead > COMPACT_RATIO * self._count:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop tombstoned rows, rewriting the matrix densely"""
+        keep = np.flatnonzero(self._alive[:self._count])
+        old_file = self._vectors_file
+        vectors = self._allocate(max(1024, len(keep) * 2))
+        vectors[:len(keep)] = self._vectors[keep]
+        capacity = vectors.shape[0]
+        self._vectors = vectors
+        self._alive = _grow(np.ones(len(keep), dtype=bool), capacity, False)
+        self._assignments = _grow(self._assignments[keep], capacity, MISSING)
+        for name in self.filter_fields:
+            self._codes[name] = _grow(self._codes[name][keep], capacity, MISSING)
+        self._ids = [self._ids[row] for row in keep]
+        self._payloads = [self._payloads[row] for row in keep]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._count = len(keep)
+        self._lists = None
+        self.stats["compactions"] += 1
+        self._retire(old_file)
+
+    # -- search --------------------------------------------------------------
+
+    def search(self, query: Any, k: int = 10, filters: Optional[Mapping[str, FilterValue]] = None,
+               exact: Optional[bool] = None, n_probe: Optional[int] = None) -> List[VectorHit]:
+        """Top-``k`` live rows by similarity that match every filter (a value or a collection of values)"""
+        self.stats["searches"] += 1
+        if not self._rows or k <= 0:
+            return []
+        vector = np.asarray(query, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Expected a {self.dim}-dimensional query, got {vector.shape[0]}")
+        if self.metric == "cosine":
+            vector = _normalize(vector.reshape(1, -1))[0]
+
+        mask = self._filter_mask(filters or {})
+        alive = self._alive[:self._count] if mask is None else mask
+        if not exact and len(self._rows) >= self.ann_threshold:
+            self._ensure_trained()
+            rows = self._probe(vector, n_probe or self.n_probe or max(8, len(self._centroids) // 16))
+            rows = rows[alive[rows]]
+            scores = self._vectors[rows] @ vector
+            self.stats["ann_searches"] += 1
+        else:
+            # One matmul over the whole matrix beats gathering the matching rows first
+            rows = np.flatnonzero(alive)
+            scores = (self._vectors[:self._count] @ vector)[rows]
+        if not len(rows):
+            return []
+
+        self.stats["rows_scanned"] += len(rows)
+        top = min(k, len(rows))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [self._hit(int(rows[index]), float(scores[index])) for index in best]
+
+    def _hit(self, row: int, score: float) -> VectorHit:
+        metadata = {}
+        for name in self.filter_fields:
+            code = self._codes[name][row]
+            if code != MISSING:
+                metadata[name] = self._values[name][code]
+        return VectorHit(self._ids[row], round(score, 6), metadata, self._payloads[row])
+
+    def _filter_mask(self, filters: Mapping[str, FilterValue]) -> Optional[np.ndarray]:
+        mask = None
+        for name, wanted in filters.items():
+            if wanted is None:
+                continue
+            if name not in self._codes:
+                raise ValueError(f"Not a filter field: {name}")
+            values = [wanted] if isinstance(wanted, str) else list(wanted)
+            codes = [self._vocab[name][value] for value in values if value in self._vocab[name]]
+            column = self._codes[name][:self._count]
+            matches = np.isin(column, codes) if len(codes) > 1 else column == (codes[0] if codes else -2)
+            mask = matches if mask is None else mask & matches
+        if mask is not None:
+            mask &= self._alive[:self._count]
+        return mask
+
+    # -- IVF -----------------------------------------------------------------
+
+    def _ensure_trained(self) -> None:
+        live = len(self._rows)
+        if self._centroids is not None and live < 2 * self._trained_rows:
+            return
+        n_lists = int(min(4096, max(16, np.sqrt(live))))
+        alive_rows = np.flatnonzero(self._alive[:self._count])
+        rng = np.random.default_rng(0)
+        sample = self._vectors[rng.choice(alive_rows, min(len(alive_rows), n_lists * KMEANS_SAMPLE_PER_LIST),
+                                          replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = _normalize(sums) if self.metric == "cosine" else sums / np.maximum(counts, 1)[:, None]
+
+        self._centroids = centroids.astype(np.float32)
+        for start in range(0, self._count, 65536):
+            block = self._vectors[start:start + 65536]
+            self._assignments[start:start + len(block)] = np.argmax(block @ self._centroids.T, axis=1)
+        self._trained_rows = live
+        self._lists = None
+        self.stats["trainings"] += 1
+        logger.info("Vector index quantizer trained", rows=live, lists=n_lists)
+
+    def _probe(self, vector: np.ndarray, n_probe: int) -> np.ndarray:
+        if self._lists is None:
+            assignments = self._assignments[:self._count]
+            order = np.argsort(assignments, kind="stable").astype(np.int64)
+            counts = np.bincount(assignments[assignments >= 0], minlength=len(self._centroids))
+            offsets = np.concatenate([[0], np.cumsum(counts)]) + int((assignments < 0).sum())
+            self._lists = (offsets, order)
+        offsets, order = self._lists
+        n_probe = min(n_probe, len(self._centroids))
+        nearest = np.argpartition(-(self._centroids @ vector), n_probe - 1)[:n_probe]
+        return np.concatenate([order[offsets[c]:offsets[c + 1]] for c in nearest])
+
+    # -- persistence ---------------------------------------------------------
+
+    def save(self) -> None:
+        """Flush the matrix and atomically publish ids, metadata and quantizer state"""
+        self.write_state(self.capture_state())
+
+    def capture_state(self) -> Dict[str, Any]:
+        """
+        Copy what ``save`` persists. ``write_state`` can then run in a worker
+        thread while the index keeps changing; the captured matrix file is not
+        retired until the write finishes.
+        """
+        if self.path is None:
+            raise ValueError("VectorIndex has no path to save to")
+        arrays = {"alive": self._alive[:self._count].copy(), "assignments": self._assignments[:self._count].copy()}
+        arrays.update({f"codes_{name}": self._codes[name][:self._count].copy() for name in self.filter_fields})
+        if self._centroids is not None:
+            arrays["centroids"] = self._centroids
+        if self._vectors_file:
+            self._pinned.add(self._vectors_file)
+        manifest = {
+            "format": FORMAT_VERSION, "dim": self.dim, "metric": self.metric, "count": self._count,
+            "capacity": 0 if self._vectors is None else int(self._vectors.shape[0]),
+            "vectors_file": self._vectors_file, "arrays_file": None,
+            "filter_fields": list(self.filter_fields),
+            "values": {name: list(values) for name, values in self._values.items()},
+            "ids": list(self._ids), "payloads": list(self._payloads), "trained_rows": self._trained_rows,
+        }
+        return {"vectors": self._vectors, "arrays": arrays, "manifest": manifest}
+
+    def write_state(self, state: Dict[str, Any]) -> None:
+        """Write a ``capture_state`` result; run writes one at a time, in capture order"""
+        manifest = state["manifest"]
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            if state["vectors"] is not None:
+                state["vectors"].flush()
+            arrays_name = manifest["arrays_file"] = f"arrays.{uuid.uuid4().hex[:12]}.npz"
+            with open(os.path.join(self.path, arrays_name), "wb") as f:
+                np.savez(f, **state["arrays"])
+                f.flush()
+                os.fsync(f.fileno())
+
+            previous = self._read_manifest()
+            temp_path = os.path.join(self.path, f".index.{uuid.uuid4().hex}.json")
+            with open(temp_path, "w") as f:
+                json.dump(manifest, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, os.path.join(self.path, "index.json"))
+
+            for key in ("arrays_file", "vectors_file"):
+                stale = previous.get(key)
+                if stale and stale != manifest[key] and stale != self._vectors_file and stale not in self._pinned:
+                    _unlink(os.path.join(self.path, stale))
+        finally:
+            self._pinned.discard(manifest["vectors_file"])
+            # Retired while this write held it, and the write did not publish it either
+            self._retire(manifest["vectors_file"])
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.path, "index.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self) -> None:
+        manifest = self._read_manifest()
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector index format {manifest.get('format')}")
+        self.dim, self.metric = manifest["dim"], manifest["metric"]
+        self.filter_fields = tuple(manifest["filter_fields"])
+        self._count, capacity = manifest["count"], manifest["capacity"]
+        self._vectors_file = manifest["vectors_file"]
+        if self._vectors_file:
+            self._vectors = np.memmap(os.path.join(self.path, self._vectors_file), dtype=np.float32,
+                                      mode="r+", shape=(capacity, self.dim))
+        with np.load(os.path.join(self.path, manifest["arrays_file"])) as arrays:
+            self._alive = _grow(arrays["alive"], capacity, False)
+            self._assignments = _grow(arrays["assignments"], capacity, MISSING)
+            self._codes = {name: _grow(arrays[f"codes_{name}"], capacity, MISSING) for name in self.filter_fields}
+            self._centroids = arrays["centroids"] if "centroids" in arrays else None
+        self._values = {name: list(manifest["values"][name]) for name in self.filter_fields}
+        self._vocab = {name: {value: code for code, value in enumerate(values)}
+                       for name, values in self._values.items()}
+        self._ids = manifest["ids"]
+        self._payloads = manifest["payloads"]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids) if item_id is not None}
+        self._trained_rows = manifest.get("trained_rows", 0)
+        logger.info("Vector index loaded", path=self.path, rows=len(self._rows), dim=self.dim)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self._rows),
+            "tombstones": self._count - len(self._rows),
+            "dim": self.dim,
+            "mode": "ivf" if len(self._rows) >= self.ann_threshold else "exact",
+            "lists": 0 if self._centroids is None else len(self._centroids),
+            "persistent": self.path is not None,
+            **self.stats,
+        }
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _grow(values: np.ndarray, capacity: int, fill: Any) -> np.ndarray:
+    grown = np.full(capacity, fill, dtype=values.dtype)
+    grown[:min(len(values), capacity)] = values[:capacity]
+    return grown
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+__all__ = [
+    "VectorHit",
+    "VectorIndex",
+]
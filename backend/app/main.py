@@ -158,6 +158,38 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("⚠️ Continuous helper cleanup skipped", reason=str(e))
     
+    # Cancel speculative prefetches and stop codebase memory watchers/indexers
+    try:
+        from app.services.smart_coding_ai_optimized import smart_coding_ai_optimized
+        await smart_coding_ai_optimized.close()
+        logger.info("✅ Speculative prefetch and codebase memory stopped")
+    except Exception as e:
+        logger.warning("⚠️ Smart coding AI cleanup skipped", reason=str(e))
+    
+    # Stop the agent mode symbol indexer's worker processes
+    try:
+        from app.services.agent_mode import agent_mode_service
+        agent_mode_service.shutdown()
+        logger.info("✅ Agent mode indexer stopped")
+    except Exception as e:
+        logger.warning("⚠️ Agent mode cleanup skipped", reason=str(e))
+    
+    # Stop the batch code analysis worker processes
+    try:
+        from app.services.code_intelligence_analysis import get_code_analysis_service
+        get_code_analysis_service().shutdown()
+        logger.info("✅ Code analysis workers stopped")
+    except Exception as e:
+        logger.warning("⚠️ Code analysis cleanup skipped", reason=str(e))
+    
+    # Stop the validator worker processes
+    try:
+        from app.core.validation_engine import get_validation_engine
+        get_validation_engine().shutdown()
+        logger.info("✅ Validation workers stopped")
+    except Exception as e:
+        logger.warning("⚠️ Validation engine cleanup skipped", reason=str(e))
+    
     # Stop all async tasks
     await async_task_manager.stop_all_tasks()
     logger.info("All async tasks stopped")
@@ -4,7 +4,7 @@ Consolidates: code_processing, code_intelligence
 Handles code editing, suggestions, validation, algorithm implementation, error handling, and logging
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, WebSocket, WebSocketDisconnect, status
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -12,6 +12,13 @@ import structlog
 import asyncio
 
 from app.core.config import settings
+from app.core.streaming import authenticate_websocket, ndjson_response, sse_response, websocket_token_stream
+from app.services.code_intelligence_analysis import (
+    CodeAnalysisError,
+    SourceFile,
+    get_code_analysis_service,
+    iter_archive_files,
+)
 from app.services.ai_service import AIService
 from app.routers.auth import AuthDependencies
 from app.models.user import User
@@ -97,6 +104,31 @@ class LoggingRequest(BaseModel):
     framework: str = Field(default="structlog", description="Logging framework")
 
 
+class StreamingCompletionRequest(BaseModel):
+    """Request for a token-streamed in-line completion"""
+    file_path: str = Field(default="untitled", description="Path of the file being edited")
+    language: str = Field(default="python", description="Programming language")
+    content: str = Field(..., description="Full file content")
+    cursor_line: int = Field(..., ge=0, description="Zero-based cursor line")
+    cursor_column: int = Field(..., ge=0, description="Zero-based cursor column")
+    max_tokens: int = Field(default=128, ge=1, le=2048, description="Maximum tokens to generate")
+    temperature: float = Field(default=0.2, ge=0.0, le=2.0, description="Sampling temperature")
+
+
+class BatchAnalysisFile(BaseModel):
+    path: str = Field(..., description="Path of the file (its extension selects the language)")
+    content: str = Field(..., description="File content")
+    language: Optional[str] = Field(default=None, description="Override the language detected from the path")
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request to analyze many files in one call"""
+    files: List[BatchAnalysisFile] = Field(..., min_length=1, description="Files to analyze")
+    analyses: Optional[List[str]] = Field(
+        default=None, description="Subset of complexity, smells, bottlenecks, refactor (default: all)"
+    )
+
+
 # ===== Code Processing Endpoints =====
 
 @router.post("/change", response_model=CodeChangeResponse, tags=["Code Processing"])
@@ -379,54 +411,100 @@ async def implement_logging(request: LoggingRequest):
 
 # ===== Code Analysis & Metrics Endpoints =====
 
+async def _analyze_single(code: str, language: str, analysis: str) -> Dict[str, Any]:
+    try:
+        results = await get_code_analysis_service().analyze(code, language, [analysis])
+    except Exception as e:
+        logger.error("Code analysis failed", analysis=analysis, error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+    if "parse_error" in results:
+        results[analysis]["parse_error"] = results["parse_error"]
+    return results[analysis]
+
+
 @router.post("/analyze-complexity", tags=["Code Analysis"])
 async def analyze_code_complexity(code: str, language: str, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Analyze code complexity metrics"""
+    result = await _analyze_single(code, language, "complexity")
+    metrics = result.get("metrics") or {}
     return {
-        "cyclomatic_complexity": 5,
-        "cognitive_complexity": 3,
-        "lines_of_code": len(code.split('\n')),
-        "maintainability_index": 75.5,
-        "recommendations": [
-            "Consider breaking down large functions",
-            "Add more inline documentation"
-        ]
+        **result,
+        "cyclomatic_complexity": metrics.get("cyclomatic_complexity", metrics.get("estimated_complexity")),
+        "cognitive_complexity": metrics.get("cognitive_complexity"),
+        "lines_of_code": metrics.get("lines_of_code", len(code.split('\n'))),
+        "maintainability_index": metrics.get("maintainability_index"),
+        "recommendations": result.get("suggestions", []),
     }
 
 
 @router.post("/detect-code-smells", tags=["Code Analysis"])
 async def detect_code_smells(code: str, language: str, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Detect code smells and anti-patterns"""
-    return {
-        "code_smells": [
-            {"type": "long_method", "severity": "medium", "line": 15, "description": "Method too long (>50 lines)"},
-            {"type": "duplicate_code", "severity": "low", "lines": [10, 25], "description": "Duplicate code detected"}
-        ],
-        "total_smells": 2,
-        "severity_breakdown": {"high": 0, "medium": 1, "low": 1}
-    }
+    result = await _analyze_single(code, language, "smells")
+    return {**result, "code_smells": result.get("smells", [])}
 
 
 @router.post("/refactor-suggestions", tags=["Code Analysis"])
 async def get_refactor_suggestions(code: str, language: str, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Get refactoring suggestions for code improvement"""
-    return {
-        "suggestions": [
-            {
-                "type": "extract_method",
-                "priority": "high",
-                "description": "Extract method for repeated logic",
-                "estimated_improvement": "20% better maintainability"
-            },
-            {
-                "type": "rename_variable",
-                "priority": "medium",
-                "description": "Use more descriptive variable names",
-                "estimated_improvement": "10% better readability"
-            }
-        ],
-        "total_suggestions": 2
-    }
+    return await _analyze_single(code, language, "refactor")
+
+
+@router.post("/analyze/batch", tags=["Code Analysis"])
+async def analyze_batch(
+    request: BatchAnalysisRequest,
+    current_user: User = Depends(AuthDependencies.get_current_user)
+):
+    """
+    Analyze many files in parallel worker processes. Streams NDJSON: one
+    ``{"type": "file", ...}`` line per file as it completes, then a
+    ``{"type": "summary", ...}`` line.
+    """
+    service = get_code_analysis_service()
+    if len(request.files) > service.max_batch_files:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {service.max_batch_files} files per batch")
+    files = [SourceFile(f.path, f.content, f.language) for f in request.files]
+    try:
+        records = service.analyze_batch(files, request.analyses)
+        # Surface request errors (unknown analyses) before the 200 response starts
+        first = await records.__anext__()
+    except CodeAnalysisError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return ndjson_response(_prepend(first, records))
+
+
+@router.post("/analyze/batch/archive", tags=["Code Analysis"])
+async def analyze_batch_archive(
+    archive: UploadFile = File(..., description="zip or tar(.gz/.bz2/.xz) of a repository"),
+    analyses: Optional[List[str]] = Query(default=None),
+    current_user: User = Depends(AuthDependencies.get_current_user)
+):
+    """Analyze every source file in an uploaded repository archive; streams NDJSON like /analyze/batch"""
+    service = get_code_analysis_service()
+    max_bytes = settings.CODE_ANALYSIS_MAX_ARCHIVE_BYTES
+    chunks, size = [], 0
+    while chunk := await archive.read(1024 * 1024):
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Archive larger than {max_bytes} bytes")
+        chunks.append(chunk)
+    try:
+        records = service.analyze_batch(iter_archive_files(b"".join(chunks), service.max_file_bytes), analyses)
+        first = await records.__anext__()
+    except CodeAnalysisError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return ndjson_response(_prepend(first, records))
+
+
+async def _prepend(first: Dict[str, Any], records):
+    try:
+        yield first
+        async for record in records:
+            yield record
+    finally:
+        await records.aclose()
 
 
 # ===== Capabilities & Information Endpoints =====
@@ -447,10 +525,11 @@ async def list_code_intelligence_capabilities():
             {"id": 8, "name": "Logging Implementation", "status": "implemented", "endpoint": "/implement-logging"},
             {"id": 9, "name": "Complexity Analysis", "status": "implemented", "endpoint": "/analyze-complexity"},
             {"id": 10, "name": "Code Smell Detection", "status": "implemented", "endpoint": "/detect-code-smells"},
-            {"id": 11, "name": "Refactoring Suggestions", "status": "implemented", "endpoint": "/refactor-suggestions"}
+            {"id": 11, "name": "Refactoring Suggestions", "status": "implemented", "endpoint": "/refactor-suggestions"},
+            {"id": 12, "name": "Batch Code Analysis", "status": "implemented", "endpoint": "/analyze/batch"}
         ],
-        "total": 11,
-        "implemented": 11,
+        "total": 12,
+        "implemented": 12,
         "completion_percentage": 100
     }
 
@@ -476,6 +555,111 @@ async def get_supported_languages():
     }
 
 
+# ===== Streaming Completion Endpoints =====
+
+def _completion_token_stream(request: StreamingCompletionRequest):
+    """Token iterator for a completion request, via the smart coding service"""
+    from app.services.smart_coding_ai_enums import Language
+    from app.services.smart_coding_ai_models import CompletionContext
+    from app.services.smart_coding_ai_optimized import smart_coding_ai_optimized
+    
+    try:
+        language = Language(request.language.lower())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unsupported language: {request.language}")
+    
+    context = CompletionContext(
+        file_path=request.file_path,
+        language=language,
+        content=request.content,
+        cursor_position=(request.cursor_line, request.cursor_column)
+    )
+    return smart_coding_ai_optimized.stream_completion_tokens(
+        context, max_tokens=request.max_tokens, temperature=request.temperature
+    )
+
+
+@router.post("/completions/stream", tags=["Streaming Completions"])
+async def stream_completion(
+    request: StreamingCompletionRequest,
+    current_user: User = Depends(AuthDependencies.get_current_user)
+):
+    """Stream an in-line completion as Server-Sent Events (start, token..., done)"""
+    tokens = _completion_token_stream(request)
+    logger.info("Streaming completion requested", user_id=current_user.id, language=request.language)
+    return sse_response(tokens, file_path=request.file_path)
+
+
+@router.websocket("/completions/ws")
+async def completion_websocket(websocket: WebSocket):
+    """
+    Stream completions over a WebSocket (authenticate with ``?token=``).
+    Send a StreamingCompletionRequest as JSON to start a stream and
+    ``{"type": "cancel"}`` to stop it; the socket stays open for the next request.
+    """
+    user = await authenticate_websocket(websocket)
+    if user is None:
+        await websocket.close(code=4401)
+        return
+    
+    await websocket.accept()
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            if payload.get("type") == "cancel":
+                continue
+            try:
+                request = StreamingCompletionRequest(**{k: v for k, v in payload.items() if k != "type"})
+                tokens = _completion_token_stream(request)
+            except (ValueError, HTTPException) as e:
+                await websocket.send_json({"type": "error", "detail": getattr(e, "detail", str(e))})
+                continue
+            if not await websocket_token_stream(websocket, tokens):
+                break
+    except WebSocketDisconnect:
+        pass
+    logger.info("Completion WebSocket closed", user_id=user.id)
+
+
+@router.websocket("/completions/session")
+async def completion_session_websocket(websocket: WebSocket):
+    """
+    Persistent inline-completion channel (authenticate with ``?token=``).
+    Open files once, then send incremental ``change`` deltas and ``complete``
+    requests; requests are debounced per file, a newer keystroke cancels the
+    generation it supersedes, and several files share the connection.
+    See app/services/completion_channel.py for the message protocol.
+    """
+    from app.services.completion_channel import CompletionChannel
+    from app.services.smart_coding_ai_optimized import smart_coding_ai_optimized
+    
+    user = await authenticate_websocket(websocket)
+    if user is None:
+        await websocket.close(code=4401)
+        return
+    
+    await websocket.accept()
+    channel = CompletionChannel(
+        smart_coding_ai_optimized,
+        websocket.send_json,
+        user_id=str(user.id),
+        debounce_ms=settings.COMPLETION_CHANNEL_DEBOUNCE_MS,
+        max_documents=settings.COMPLETION_CHANNEL_MAX_FILES,
+        max_document_chars=settings.COMPLETION_CHANNEL_MAX_DOCUMENT_CHARS
+    )
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            if isinstance(payload, dict):
+                await channel.handle(payload)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await channel.close()
+    logger.info("Completion session closed", user_id=user.id, **channel.get_stats())
+
+
 # ===== Health Check =====
 
 @router.get("/health")
@@ -490,7 +674,7 @@ async def health_check():
             "status": "healthy",
             "service": "code-intelligence",
             "components": ["code-processing", "code-intelligence", "analysis", "refactoring"],
-            "endpoints": 16,
+            "endpoints": 18,
             "coverage": "100%",
             "timestamp": datetime.now().isoformat(),
             "version": "1.0.0"
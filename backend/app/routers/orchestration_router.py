@@ -4,19 +4,31 @@ Consolidates: unified_ai_orchestrator, ai_component_orchestrator, meta_ai_orches
 Handles all AI orchestration and coordination strategies
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from uuid import UUID
+import math
 import structlog
 
 from app.routers.auth import AuthDependencies
 from app.models.user import User
+from app.core.adaptive_concurrency import OverloadedError
+from app.core.streaming import authenticate_websocket, sse_response, websocket_token_stream
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 
+def _too_many_requests(error: OverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))},
+    )
+
+
 # ===== Unified AI Orchestrator Endpoints =====
 
 @router.post("/unified/orchestrate", tags=["Unified Orchestrator"])
@@ -1388,11 +1400,13 @@ async def get_component_orchestrator_capabilities(current_user: User = Depends(A
 async def submit_hierarchical_task(task_type: str, requirements: Dict[str, Any], complexity: str = "moderate", priority: int = 5, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Submit a task for hierarchical orchestration"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         complexity_enum = TaskComplexity.MODERATE if complexity == "moderate" else TaskComplexity.SIMPLE if complexity == "simple" else TaskComplexity.COMPLEX
         task_id = await manager.submit_task(task_type, requirements, complexity_enum, priority, str(current_user.id))
         return {"success": True, "task_id": task_id, "message": "Task submitted for hierarchical orchestration", "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Task submission failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1402,8 +1416,8 @@ async def submit_hierarchical_task(task_type: str, requirements: Dict[str, Any],
 async def get_hierarchical_task_result(task_id: str, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Get result for a completed orchestration task"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager
+        manager = get_hierarchical_orchestration_manager()
         result = await manager.get_task_result(task_id)
         if not result:
             raise HTTPException(status_code=404, detail="Task result not found")
@@ -1419,8 +1433,8 @@ async def get_hierarchical_task_result(task_id: str, current_user: User = Depend
 async def get_hierarchical_status(current_user: User = Depends(AuthDependencies.get_current_user)):
     """Get comprehensive status of all orchestrators"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager
+        manager = get_hierarchical_orchestration_manager()
         status_result = await manager.get_orchestrator_status()
         return {"success": True, "status": status_result, "timestamp": datetime.now().isoformat()}
     except Exception as e:
@@ -1432,8 +1446,8 @@ async def get_hierarchical_status(current_user: User = Depends(AuthDependencies.
 async def get_hierarchical_optimization_report(current_user: User = Depends(AuthDependencies.get_current_user)):
     """Get performance optimization report"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager
+        manager = get_hierarchical_orchestration_manager()
         report = await manager.optimize_orchestrator_performance()
         return {"success": True, "report": report, "timestamp": datetime.now().isoformat()}
     except Exception as e:
@@ -1445,8 +1459,8 @@ async def get_hierarchical_optimization_report(current_user: User = Depends(Auth
 async def trigger_hierarchical_failover(failed_orchestrator: str, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Trigger emergency failover for a failed orchestrator"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager
+        manager = get_hierarchical_orchestration_manager()
         failover_plan = await manager.emergency_failover(failed_orchestrator)
         return {"success": True, "failover_plan": failover_plan, "timestamp": datetime.now().isoformat()}
     except Exception as e:
@@ -1458,11 +1472,13 @@ async def trigger_hierarchical_failover(failed_orchestrator: str, current_user:
 async def decompose_hierarchical_task(requirement: str, context: Optional[Dict[str, Any]] = None, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Decompose complex requirements into manageable tasks"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, OrchestrationTask, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, OrchestrationTask, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         task = OrchestrationTask(task_type="task_decomposition", complexity=TaskComplexity.COMPLEX, requirements={"requirement": requirement, "context": context or {}}, priority=7, user_id=str(current_user.id))
         result = await manager.route_task(task)
         return {"success": True, "decomposition_result": result.result_data if result.success else None, "orchestrator_used": result.orchestrator_used, "confidence_score": result.confidence_score, "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Task decomposition failed", requirement=requirement, error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1505,10 +1521,12 @@ async def get_hierarchical_levels(current_user: User = Depends(AuthDependencies.
 async def hierarchical_smarty_code_completion(code: str, language: str = "python", context: Optional[str] = None, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Orchestrate code completion through Smarty"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         task_id = await manager.submit_task("code_completion", {"code": code, "language": language, "context": context or ""}, TaskComplexity.SIMPLE, 7, str(current_user.id))
         return {"success": True, "task_id": task_id, "message": "Code completion task submitted to Smarty", "smarty_features": ["photographic_memory", "cross_session_context"], "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Code completion orchestration failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1518,10 +1536,12 @@ async def hierarchical_smarty_code_completion(code: str, language: str = "python
 async def hierarchical_smarty_code_generation(prompt: str, language: str = "python", context: Optional[Dict[str, Any]] = None, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Orchestrate code generation through Smarty"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         task_id = await manager.submit_task("code_generation", {"prompt": prompt, "language": language, "context": context or {}}, TaskComplexity.MODERATE, 8, str(current_user.id))
         return {"success": True, "task_id": task_id, "message": "Code generation task submitted to Smarty", "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Code generation orchestration failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1531,10 +1551,12 @@ async def hierarchical_smarty_code_generation(prompt: str, language: str = "pyth
 async def hierarchical_smarty_codebase_analysis(project_path: str = ".", analysis_depth: str = "comprehensive", current_user: User = Depends(AuthDependencies.get_current_user)):
     """Orchestrate codebase analysis through Smarty's photographic memory"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         task_id = await manager.submit_task("codebase_memory", {"project_path": project_path, "analysis_depth": analysis_depth}, TaskComplexity.COMPLEX, 9, str(current_user.id))
         return {"success": True, "task_id": task_id, "message": "Codebase analysis submitted to Smarty", "smarty_features": ["photographic_memory", "pattern_recognition"], "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Codebase analysis orchestration failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1544,10 +1566,12 @@ async def hierarchical_smarty_codebase_analysis(project_path: str = ".", analysi
 async def hierarchical_smarty_pattern_recognition(code: str, context: Optional[Dict[str, Any]] = None, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Orchestrate pattern recognition through Smarty"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         task_id = await manager.submit_task("pattern_recognition", {"code": code, "context": context or {}}, TaskComplexity.MODERATE, 6, str(current_user.id))
         return {"success": True, "task_id": task_id, "message": "Pattern recognition submitted to Smarty", "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Pattern recognition orchestration failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1557,10 +1581,12 @@ async def hierarchical_smarty_pattern_recognition(code: str, context: Optional[D
 async def get_hierarchical_smarty_session_context(session_id: str, current_user: User = Depends(AuthDependencies.get_current_user)):
     """Get Smarty's cross-session context"""
     try:
-        from app.services.hierarchical_orchestration_manager import HierarchicalOrchestrationManager, TaskComplexity
-        manager = HierarchicalOrchestrationManager()
+        from app.services.hierarchical_orchestration_manager import get_hierarchical_orchestration_manager, TaskComplexity
+        manager = get_hierarchical_orchestration_manager()
         task_id = await manager.submit_task("cross_session_context", {"session_id": session_id, "user_id": str(current_user.id)}, TaskComplexity.SIMPLE, 5, str(current_user.id))
         return {"success": True, "task_id": task_id, "message": "Session context retrieval submitted", "timestamp": datetime.now().isoformat()}
+    except OverloadedError as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error("Session context orchestration failed", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1729,6 +1755,78 @@ async def get_consensus_levels():
     }
 
 
+# ===== Streaming Generation Endpoints =====
+
+class StreamingGenerationRequest(BaseModel):
+    """Request for token-streamed generation through the provider manager"""
+    prompt: Optional[str] = Field(default=None, description="Plain prompt (ignored when messages are given)")
+    messages: Optional[List[Dict[str, str]]] = Field(default=None, description="Chat messages")
+    max_tokens: int = Field(default=1000, ge=1, le=8192)
+    temperature: float = Field(default=0.7, ge=0.0, le=2.0)
+    provider: Optional[str] = Field(default=None, description="Preferred provider, e.g. local_llm")
+    model: Optional[str] = Field(default=None, description="Provider model override")
+
+
+def _generation_token_stream(request: StreamingGenerationRequest):
+    """Token iterator over the configured AI providers with pre-first-token fallback"""
+    from app.core.strategies.ai_provider_strategy import AIProviderType, get_ai_provider_manager
+    
+    messages = request.messages or ([{"role": "user", "content": request.prompt}] if request.prompt else None)
+    if not messages:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="prompt or messages is required")
+    try:
+        preferred = AIProviderType(request.provider) if request.provider else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unknown provider: {request.provider}")
+    
+    kwargs = {"model": request.model} if request.model else {}
+    return get_ai_provider_manager().stream_chat_completion(
+        messages, request.max_tokens, request.temperature, preferred_provider=preferred, **kwargs
+    )
+
+
+@router.post("/generate/stream", tags=["Streaming Generation"])
+async def stream_generation(
+    request: StreamingGenerationRequest,
+    current_user: User = Depends(AuthDependencies.get_current_user)
+):
+    """Stream generated tokens as Server-Sent Events (start, token..., done)"""
+    tokens = _generation_token_stream(request)
+    logger.info("Streaming generation requested", user_id=current_user.id, provider=request.provider)
+    return sse_response(tokens, provider=request.provider)
+
+
+@router.websocket("/generate/ws")
+async def generation_websocket(websocket: WebSocket):
+    """
+    Stream generations over a WebSocket (authenticate with ``?token=``).
+    Send a StreamingGenerationRequest as JSON; ``{"type": "cancel"}`` stops the current stream.
+    """
+    user = await authenticate_websocket(websocket)
+    if user is None:
+        await websocket.close(code=4401)
+        return
+    
+    await websocket.accept()
+    try:
+        while True:
+            payload = await websocket.receive_json()
+            if payload.get("type") == "cancel":
+                continue
+            try:
+                request = StreamingGenerationRequest(**{k: v for k, v in payload.items() if k != "type"})
+                tokens = _generation_token_stream(request)
+            except (ValueError, HTTPException) as e:
+                await websocket.send_json({"type": "error", "detail": getattr(e, "detail", str(e))})
+                continue
+            if not await websocket_token_stream(websocket, tokens):
+                break
+    except WebSocketDisconnect:
+        pass
+    logger.info("Generation WebSocket closed", user_id=user.id)
+
+
 # ===== Health Check =====
 
 @router.get("/health")
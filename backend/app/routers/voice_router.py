@@ -16,6 +16,8 @@ import uuid
 
 from app.core.config import settings
 from app.core.database import get_supabase_client
+from app.core.speech_to_text import AudioInputError
+from app.core.streaming import ndjson_response
 from app.services.voice_service import VoiceService
 from app.services.ai_service import AIService
 from app.services.app_generation_service import AppGenerationService
@@ -88,12 +90,7 @@ async def transcribe_voice(
         if not audio_file.content_type.startswith('audio/'):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an audio file")
         
-        # Validate file size
-        content = await audio_file.read()
-        if len(content) > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"File size must be less than {settings.MAX_FILE_SIZE_MB}MB")
-        
-        audio_file.file.seek(0)
+        # The upload is read in chunks and transcribed as it goes; size is enforced while reading
         voice_service = VoiceService()
         
         # Try local transcription first if enabled
@@ -102,8 +99,12 @@ async def transcribe_voice(
                 transcript = await voice_service.transcribe_local(audio_file, language)
                 confidence = 0.9
                 method = "local"
+            except AudioInputError:
+                # Size, format and silence are properties of the upload; cloud would reject it too
+                raise
             except Exception as e:
                 logger.warning("Local transcription failed, falling back to cloud", error=str(e))
+                await audio_file.seek(0)
                 transcript = await voice_service.transcribe_cloud(audio_file, language)
                 confidence = 0.8
                 method = "cloud"
@@ -132,11 +133,64 @@ async def transcribe_voice(
             method=method,
             processing_time_ms=processing_time_ms
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Voice transcription failed", error=str(e))
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/transcribe/stream", tags=["Voice Transcription"])
+async def transcribe_voice_stream(
+    audio_file: UploadFile = File(...),
+    language: str = Form(default="en"),
+    current_user: User = Depends(VoiceDependencies.check_voice_quota)
+):
+    """
+    Transcribe while the upload is being decoded. Streams NDJSON: one
+    ``{"type": "partial", ...}`` line per speech segment as soon as it is
+    transcribed, then a ``{"type": "final", ...}`` line.
+    """
+    if not (audio_file.content_type or "").startswith('audio/'):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an audio file")
+    
+    start_time = time.time()
+    voice_service = VoiceService()
+    partials = voice_service.stream_transcription(audio_file, language)
+    
+    async def records():
+        text = ""
+        try:
+            async for partial in partials:
+                text = partial.text
+                yield {
+                    "type": "partial",
+                    "index": partial.segment.index,
+                    "start": partial.segment.start,
+                    "end": partial.segment.end,
+                    "segment_text": partial.segment.text,
+                    "text": text,
+                }
+        except Exception as e:
+            logger.error("Streaming transcription failed", error=str(e))
+            yield {"type": "error", "detail": str(e)}
+            return
+        
+        if text:
+            await voice_service.store_voice_command(
+                user_id=current_user.id, transcript=text, language=language, confidence=0.9
+            )
+        yield {
+            "type": "final",
+            "transcript": text,
+            "language": language,
+            "method": "local",
+            "processing_time_ms": round((time.time() - start_time) * 1000, 2),
+        }
+    
+    return ndjson_response(records())
+
+
 # ===== Intent Extraction Endpoints =====
 
 @router.post("/intent", response_model=VoiceIntentResponse, tags=["Voice Intent"])
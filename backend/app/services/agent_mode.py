@@ -20,7 +20,10 @@ import ast
 import importlib.util
 
 from app.core.config import get_settings
+from app.core.result_store import create_result_store
+from app.services.repository_indexer import RepositoryIndexer
 from app.services.smart_coding_ai_optimized import smart_coding_ai_optimized
+from app.services.symbol_graph import SYMBOL_LANGUAGES, SymbolGraph, extract_file_symbols
 
 logger = get_settings().logger
 
@@ -105,9 +108,14 @@ class AgentTask:
 class CodebaseAnalyzer:
     """Analyzes the codebase to understand structure and dependencies"""
     
+    # Upper bound on files handed to later steps for one request
+    MAX_AFFECTED_FILES = 50
+    
     def __init__(self):
         self.project_root = Path.cwd()
         self.analysis_cache = {}
+        self.symbol_graph = SymbolGraph()
+        self._symbol_indexer: Optional[RepositoryIndexer] = None
     
     async def analyze_codebase(self, user_request: str) -> Dict[str, Any]:
         """Analyze the entire codebase for the given request"""
@@ -284,8 +292,42 @@ class CodebaseAnalyzer:
         
         return intent
     
+    async def refresh_symbol_graph(self) -> SymbolGraph:
+        """Bring the symbol graph up to date; only files changed since the last call are re-parsed"""
+        if self._symbol_indexer is None or self._symbol_indexer.root != os.path.abspath(self.project_root):
+            settings = get_settings()
+            self.shutdown()
+            self.symbol_graph = SymbolGraph()
+            self._symbol_indexer = RepositoryIndexer(
+                str(self.project_root),
+                max_workers=settings.MEMORY_INDEX_MAX_WORKERS,
+                max_file_bytes=settings.MEMORY_INDEX_MAX_FILE_BYTES,
+                parser=extract_file_symbols,
+                languages=SYMBOL_LANGUAGES,
+            )
+        async for update in self._symbol_indexer.run():
+            self.symbol_graph.apply(update)
+        return self.symbol_graph
+    
+    def shutdown(self) -> None:
+        """Stop the symbol indexer's worker processes"""
+        if self._symbol_indexer is not None:
+            self._symbol_indexer.shutdown()
+            self._symbol_indexer = None
+    
     async def _identify_affected_files(self, user_request: str) -> List[str]:
         """Identify files that will be affected by the changes"""
+        try:
+            graph = await self.refresh_symbol_graph()
+            affected_files = graph.files_for_request(user_request, limit=self.MAX_AFFECTED_FILES)
+            if affected_files:
+                return affected_files
+        except Exception as e:
+            logger.warning("Symbol graph unavailable, falling back to keyword matching", error=str(e))
+        return self._keyword_affected_files(user_request)
+    
+    def _keyword_affected_files(self, user_request: str) -> List[str]:
+        """Filename keyword heuristic for requests that name no known symbol or file"""
         affected_files = []
         
         # Simple heuristic based on keywords
@@ -764,7 +806,11 @@ class AgentModeService:
         self.dependency_manager = DependencyManager()
         self.test_runner = TestRunner()
         self.comment_generator = CommentGenerator()
-        self.active_tasks: Dict[str, AgentTask] = {}
+        self.active_tasks = create_result_store("agent_mode_tasks")  # task id -> AgentTask
+    
+    def shutdown(self) -> None:
+        """Release the codebase analyzer's worker processes (application shutdown)"""
+        self.analyzer.shutdown()
     
     async def activate_agent_mode(self, user_request: str) -> str:
         """Activate Agent Mode with user request"""
@@ -785,7 +831,8 @@ class AgentModeService:
                 rollback_data={}
             )
             
-            self.active_tasks[task_id] = task
+            # Pinned while _process_task updates it in place
+            self.active_tasks.put(task_id, task, pinned=True)
             
             # Start analysis in background
             asyncio.create_task(self._process_task(task_id))
@@ -824,6 +871,7 @@ class AgentModeService:
                 
                 task.status = AgentModeStatus.ROLLED_BACK
                 task.current_step = "Changes rolled back successfully"
+                self.active_tasks.put(task_id, task)
                 
                 logger.info("Task rolled back", task_id=task_id)
                 return {"success": True, "message": "Changes rolled back successfully"}
@@ -888,6 +936,8 @@ class AgentModeService:
             task.status = AgentModeStatus.ERROR
             task.current_step = f"Error: {str(e)}"
             logger.error("Task failed", task_id=task_id, error=str(e))
+        finally:
+            self.active_tasks.unpin(task_id)
     
     async def _plan_changes(self, user_request: str, analysis: Dict[str, Any]) -> List[CodeChange]:
         """Plan the changes needed to fulfill the user request"""
@@ -38,6 +38,11 @@ from app.models.ai_agent import (
     TaskType, AgentPriority, ZeroCostConfig
 )
 from app.core.config import get_settings
+from app.core.dag_executor import DAGError, DAGNode, NodeStatus, critical_path, get_dag_executor, parallel_levels
+from app.core.message_bus import Message, MessageKind, create_message_bus
+from app.core.incremental_validation import CodeUnit, get_incremental_validator
+from app.core.pattern_engine import PatternRule, RuleSet
+from app.core.validation_engine import ExecutionMode, ValidatorSpec, get_validation_engine
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -535,6 +540,9 @@ class SecurityValidator:
     def __init__(self):
         self.security_patterns = self._load_security_patterns()
         self.vulnerability_rules = self._load_vulnerability_rules()
+        self._vulnerable_rules = RuleSet(
+            (PatternRule(p, p) for p in self.security_patterns["vulnerable_patterns"]), name="security.vulnerable"
+        )
         
     def _load_security_patterns(self) -> Dict[str, List[str]]:
         """Load security patterns"""
@@ -608,13 +616,7 @@ class SecurityValidator:
     
     async def _check_vulnerabilities(self, code: str) -> List[str]:
         """Check for security vulnerabilities"""
-        vulnerabilities = []
-        
-        for pattern in self.security_patterns["vulnerable_patterns"]:
-            if re.search(pattern, code):
-                vulnerabilities.append(f"Security vulnerability: {pattern}")
-        
-        return vulnerabilities
+        return [f"Security vulnerability: {pattern}" for pattern in self._vulnerable_rules.matching_rules(code)]
     
     async def _check_security_warnings(self, code: str) -> List[str]:
         """Check for security warnings"""
@@ -938,6 +940,7 @@ class CodeQualityAnalyzer:
     def __init__(self):
         self.quality_rules = self._load_quality_rules()
         self.anti_patterns = self._load_anti_patterns()
+        self.incremental = get_incremental_validator("code_quality")
         
     def _load_quality_rules(self) -> Dict[str, Any]:
         """Load code quality rules"""
@@ -978,8 +981,8 @@ class CodeQualityAnalyzer:
             ]
         }
     
-    async def analyze_code_quality(self, code: str) -> Dict[str, Any]:
-        """Analyze code quality"""
+    async def analyze_code_quality(self, code: str, incremental: bool = False) -> Dict[str, Any]:
+        """Analyze code quality (``incremental`` reuses per-unit results of unchanged functions/classes)"""
         try:
             quality_result = {
                 "is_high_quality": True,
@@ -988,21 +991,30 @@ class CodeQualityAnalyzer:
                 "metrics": {}
             }
             
-            # Check for dead code
-            dead_code_issues = await self._check_dead_code(code)
-            quality_result["quality_issues"].extend(dead_code_issues)
-            
-            # Check for duplication
-            duplication_issues = await self._check_duplication(code)
-            quality_result["quality_issues"].extend(duplication_issues)
-            
-            # Check for magic numbers
-            magic_number_issues = await self._check_magic_numbers(code)
-            quality_result["quality_issues"].extend(magic_number_issues)
-            
-            # Calculate quality metrics
-            metrics = await self._calculate_quality_metrics(code)
-            quality_result["metrics"] = metrics
+            if incremental:
+                units = (await self.incremental.analyze_async(code, self._unit_quality_facts)).with_units()
+                quality_result["quality_issues"].extend(self._dead_code_from_units(units))
+                quality_result["quality_issues"].extend(await self._check_duplication(code))
+                quality_result["quality_issues"].extend(
+                    issue for _, facts in units for issue in facts["magic_numbers"]
+                )
+                quality_result["metrics"] = self._quality_metrics_from_units(units)
+            else:
+                # Check for dead code
+                dead_code_issues = await self._check_dead_code(code)
+                quality_result["quality_issues"].extend(dead_code_issues)
+                
+                # Check for duplication
+                duplication_issues = await self._check_duplication(code)
+                quality_result["quality_issues"].extend(duplication_issues)
+                
+                # Check for magic numbers
+                magic_number_issues = await self._check_magic_numbers(code)
+                quality_result["quality_issues"].extend(magic_number_issues)
+                
+                # Calculate quality metrics
+                metrics = await self._calculate_quality_metrics(code)
+                quality_result["metrics"] = metrics
             
             # Update quality status
             quality_result["is_high_quality"] = len(quality_result["quality_issues"]) == 0
@@ -1013,6 +1025,65 @@ class CodeQualityAnalyzer:
             logger.error(f"Error analyzing code quality: {e}")
             return {"is_high_quality": False, "quality_issues": [f"Quality analysis error: {str(e)}"]}
     
+    async def _unit_quality_facts(self, unit: CodeUnit) -> Dict[str, Any]:
+        """Everything the quality checks need from one top-level unit"""
+        code = unit.source
+        return {
+            "imports": re.findall(r'import\s+(\w+)', code),
+            "variables": re.findall(r'(\w+)\s*=', code),
+            "magic_numbers": await self._check_magic_numbers(code),
+            "newlines": code.count('\n'),
+            "function_count": len(re.findall(r'def\s+\w+', code)),
+            "class_count": len(re.findall(r'class\s+\w+', code)),
+            "comment_lines": len([line for line in code.split('\n') if line.strip().startswith('#')]),
+            "complexity_score": len(re.findall(r'\b(if|elif|for|while|except|and|or)\b', code)),
+            "used": {},  # (removed text, name) -> name still appears, filled lazily
+        }
+    
+    def _dead_code_from_units(self, units: List[Tuple[CodeUnit, Dict[str, Any]]]) -> List[str]:
+        """
+        ``_check_dead_code`` over per-unit facts. A name counts as used when any
+        unit still mentions it after removing its import/assignment text, and
+        that answer is memoized per unit, so unchanged units are never rescanned.
+        """
+        def is_used(name: str, removed: str) -> bool:
+            for unit, facts in units:
+                memo = facts["used"]
+                key = (removed, name)
+                if key not in memo:
+                    memo[key] = name in unit.source.replace(removed, '')
+                if memo[key]:
+                    return True
+            return False
+        
+        issues = []
+        used: Dict[Tuple[str, str], bool] = {}
+        for imp in (imp for _, facts in units for imp in facts["imports"]):
+            key = (f'import {imp}', imp)
+            if key not in used:
+                used[key] = is_used(imp, key[0])
+            if not used[key]:
+                issues.append(f"Unused import: {imp}")
+        for var in (var for _, facts in units for var in facts["variables"]):
+            key = (f'{var} =', var)
+            if key not in used:
+                used[key] = is_used(var, key[0])
+            if not used[key]:
+                issues.append(f"Unused variable: {var}")
+        return issues
+    
+    def _quality_metrics_from_units(self, units: List[Tuple[CodeUnit, Dict[str, Any]]]) -> Dict[str, Any]:
+        """``_calculate_quality_metrics`` summed from per-unit counts"""
+        lines = sum(facts["newlines"] for _, facts in units) + 1
+        comment_lines = sum(facts["comment_lines"] for _, facts in units)
+        return {
+            "lines_of_code": lines,
+            "function_count": sum(facts["function_count"] for _, facts in units),
+            "class_count": sum(facts["class_count"] for _, facts in units),
+            "comment_ratio": comment_lines / lines,
+            "complexity_score": sum(facts["complexity_score"] for _, facts in units),
+        }
+    
     async def _check_dead_code(self, code: str) -> List[str]:
         """Check for dead code"""
         issues = []
@@ -1037,9 +1108,11 @@ class CodeQualityAnalyzer:
         
         # Check for similar functions
         functions = re.findall(r'def\s+(\w+).*?:\s*(.*?)(?=\ndef|\nclass|\n$)', code, re.DOTALL)
-        for i, (name1, body1) in enumerate(functions):
-            for j, (name2, body2) in enumerate(functions[i+1:], i+1):
-                if self._calculate_similarity(body1, body2) > 0.8:
+        # Split each body once instead of once per pair
+        word_sets = [set(body.split()) for _, body in functions]
+        for i, (name1, _) in enumerate(functions):
+            for j, (name2, _) in enumerate(functions[i+1:], i+1):
+                if self._word_similarity(word_sets[i], word_sets[j]) > 0.8:
                     issues.append(f"Similar functions: {name1} and {name2}")
         
         return issues
@@ -1059,8 +1132,9 @@ class CodeQualityAnalyzer:
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity"""
         # Simple similarity calculation
-        words1 = set(text1.split())
-        words2 = set(text2.split())
+        return self._word_similarity(set(text1.split()), set(text2.split()))
+    
+    def _word_similarity(self, words1: set, words2: set) -> float:
         intersection = words1.intersection(words2)
         union = words1.union(words2)
         return len(intersection) / len(union) if union else 0
@@ -1449,71 +1523,71 @@ class AIOrchestrationLayer:
         self.business_logic_validator = BusinessLogicValidator()
         self.integration_validator = IntegrationValidator()
         
-    async def orchestrate_validation(self, code: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Comprehensive orchestration with all validation capabilities"""
+    # (result key, validity flag) for each validator, in report order
+    VALIDATION_FLAGS = [
+        ("factual_accuracy", "is_valid"),
+        ("context_awareness", "is_compliant"),
+        ("consistency", "is_consistent"),
+        ("practicality", "is_practical"),
+        ("security", "is_secure"),
+        ("maintainability", "is_maintainable"),
+        ("performance", "is_optimized"),
+        ("code_quality", "is_high_quality"),
+        ("architecture", "is_well_architected"),
+        ("business_logic", "is_valid_business_logic"),
+        ("integration", "is_well_integrated"),
+    ]
+    
+    def _validation_specs(self, code: str, context: Dict[str, Any], incremental: bool = False) -> List[ValidatorSpec]:
+        """The 11 independent validators as engine specs"""
+        return [
+            ValidatorSpec("factual_accuracy", self.factual_validator, "validate_factual_claims", (code, context)),
+            # Project context is per-instance state, so this one stays in-process
+            ValidatorSpec("context_awareness", self.context_manager, "validate_context_compliance", (code, context),
+                          mode=ExecutionMode.ASYNC),
+            ValidatorSpec("consistency", self.consistency_enforcer, "enforce_consistency", (code, "python")),
+            ValidatorSpec("practicality", self.practicality_validator, "validate_practicality", (code, context)),
+            ValidatorSpec("security", self.security_validator, "validate_security", (code,),
+                          is_critical_failure=lambda result: bool(result.get("vulnerabilities"))),
+            ValidatorSpec("maintainability", self.maintainability_enforcer, "enforce_maintainability", (code, context)),
+            ValidatorSpec("performance", self.performance_optimizer, "optimize_performance", (code,)),
+            # Incremental per-unit results live in this process, so don't ship them to a worker
+            ValidatorSpec("code_quality", self.code_quality_analyzer, "analyze_code_quality", (code,),
+                          {"incremental": incremental},
+                          mode=ExecutionMode.ASYNC if incremental else ExecutionMode.PROCESS),
+            ValidatorSpec("architecture", self.architecture_validator, "validate_architecture", (code,)),
+            ValidatorSpec("business_logic", self.business_logic_validator, "validate_business_logic", (code,)),
+            ValidatorSpec("integration", self.integration_validator, "validate_integration", (code,)),
+        ]
+    
+    async def orchestrate_validation(self, code: str, context: Dict[str, Any], incremental: bool = False) -> Dict[str, Any]:
+        """
+        Comprehensive orchestration with all validation capabilities
+        
+        ``incremental`` (or ``context["incremental"]``) is for editing loops:
+        analyses that grow faster than the file re-run only on changed units.
+        """
         try:
-            # Get ALL original validation results
-            factual_result = await self.factual_validator.validate_factual_claims(code, context)
-            context_result = await self.context_manager.validate_context_compliance(code, context)
-            consistency_result = await self.consistency_enforcer.enforce_consistency(code, "python")
-            practicality_result = await self.practicality_validator.validate_practicality(code, context)
-            security_result = await self.security_validator.validate_security(code)
-            maintainability_result = await self.maintainability_enforcer.enforce_maintainability(code, context)
-            
-            # Add enhanced validation results
-            enhanced_result = {
-                "overall_valid": True,
-                "factual_accuracy": factual_result,
-                "context_awareness": context_result,
-                "consistency": consistency_result,
-                "practicality": practicality_result,
-                "security": security_result,
-                "maintainability": maintainability_result,
-                "performance": {},
-                "code_quality": {},
-                "architecture": {},
-                "business_logic": {},
-                "integration": {},
-                "enhanced_recommendations": []
-            }
-            
-            # Performance optimization
-            performance_result = await self.performance_optimizer.optimize_performance(code)
-            enhanced_result["performance"] = performance_result
-            
-            # Code quality analysis
-            quality_result = await self.code_quality_analyzer.analyze_code_quality(code)
-            enhanced_result["code_quality"] = quality_result
+            incremental = incremental or bool(context.get("incremental"))
             
-            # Architecture validation
-            architecture_result = await self.architecture_validator.validate_architecture(code)
-            enhanced_result["architecture"] = architecture_result
+            # All validators are independent: run them concurrently under the latency budget
+            run = await get_validation_engine().run(self._validation_specs(code, context, incremental),
+                                                    size_hint=len(code))
             
-            # Business logic validation
-            business_result = await self.business_logic_validator.validate_business_logic(code)
-            enhanced_result["business_logic"] = business_result
-            
-            # Integration validation
-            integration_result = await self.integration_validator.validate_integration(code)
-            enhanced_result["integration"] = integration_result
+            enhanced_result = {"overall_valid": True}
+            for key, _ in self.VALIDATION_FLAGS:
+                enhanced_result[key] = run.results.get(key, {})
+            enhanced_result["enhanced_recommendations"] = []
             
             # Generate enhanced recommendations
             enhanced_result["enhanced_recommendations"] = await self._generate_enhanced_recommendations(enhanced_result)
             
-            # Update overall validation status
-            enhanced_result["overall_valid"] = all([
-                factual_result.get("is_valid", False),
-                context_result.get("is_compliant", False),
-                consistency_result.get("is_consistent", False),
-                practicality_result.get("is_practical", False),
-                security_result.get("is_secure", False),
-                maintainability_result.get("is_maintainable", False),
-                performance_result.get("is_optimized", False),
-                quality_result.get("is_high_quality", False),
-                architecture_result.get("is_well_architected", False),
-                business_result.get("is_valid_business_logic", False),
-                integration_result.get("is_well_integrated", False)
-            ])
+            # Update overall validation status (validators that did not finish count as not passed)
+            enhanced_result["overall_valid"] = all(
+                enhanced_result[key].get(flag, False) for key, flag in self.VALIDATION_FLAGS
+            )
+            enhanced_result["partial"] = run.partial
+            enhanced_result["validation_execution"] = run.summary()
             
             return enhanced_result
             
@@ -2701,91 +2775,68 @@ class EnhancedAutonomousAIOrchestrationLayer(AutonomousAIOrchestrationLayer):
             # Perform standard autonomous validation
             autonomous_result = await self.autonomous_orchestrate_validation(code, context)
             
-            # Add 99%+ capability validations
-            maximum_accuracy_result = await self.maximum_accuracy_validator.validate_with_maximum_accuracy(code, context)
-            maximum_consistency_result = await self.maximum_consistency_validator.validate_with_maximum_consistency(code, context)
-            maximum_threshold_result = await self.maximum_threshold_validator.validate_with_maximum_threshold(code, context)
-            resource_optimization_result = await self.resource_optimized_validator.validate_with_resource_optimization(code, context)
-            
-            # Advanced orchestration features
-            task_decomposition = await self.task_decomposer.decompose_task(
-                "Validate and optimize AI code", 
-                {"code": code, "context": context}
-            )
-            
-            agent_coordination = await self.multi_agent_coordinator.coordinate_agents(
-                ["validator", "optimizer", "quality_checker"],
-                {"code": code, "context": context}
-            )
-            
-            workflow_management = await self.workflow_manager.manage_workflow(
-                "ai_validation_workflow",
-                {"code": code, "context": context}
-            )
-            
-            quality_assurance = await self.quality_assurance_manager.ensure_quality(
-                code, context
-            )
-            
-            state_tracking = await self.state_manager.track_state(
-                "validation", "in_progress", {"code": code, "context": context}
-            )
-            
-            context_management = await self.context_manager.manage_context(
-                "validation_context", context
-            )
-            
-            # Tool integration
-            tool_integration = await self.tool_integration_manager.integrate_tools(
-                ["code_analyzer", "performance_profiler", "security_scanner"],
-                {"code": code, "context": context}
-            )
-            
-            # Error recovery
-            error_recovery = await self.error_recovery_manager.handle_errors(
-                code, context
-            )
-            
-            # Continuous learning
-            learning_result = await self.continuous_learning_manager.learn_from_experience(
-                {"code": code, "context": context, "validation_result": autonomous_result}
-            )
-            
-            # External integrations
-            external_integration = await self.external_integration_manager.connect_external_systems(
-                ["github", "jira", "slack", "monitoring"],
-                {"code": code, "context": context}
-            )
-            
-            # Monitoring and analytics
-            monitoring_result = await self.monitoring_analytics_manager.track_performance(
-                "ai_validation", {"code": code, "context": context}
-            )
-            
-            # Autonomous decision making
-            decision_result = await self.decision_engine.make_autonomous_decision(
-                "optimize_ai_code", {"code": code, "context": context}
-            )
-            
-            strategy_result = await self.strategy_engine.develop_strategy(
-                "ai_optimization_strategy", {"code": code, "context": context}
-            )
-            
-            adaptation_result = await self.adaptation_engine.adapt_system(
-                "performance_optimization", {"code": code, "context": context}
-            )
-            
-            # Autonomous creative capabilities
-            creative_result = await self.creative_engine.generate_creative_solutions(
-                "AI code optimization challenges", 
-                {"code": code, "context": context},
-                context
-            )
-            
-            innovation_result = await self.innovation_engine.generate_innovative_solutions(
-                "Advanced AI system development",
-                context
-            )
+            # 99%+ validators (CPU-bound) and orchestration features (in-process state) are
+            # independent of each other, so the engine runs them concurrently
+            payload = {"code": code, "context": context}
+            in_process = ExecutionMode.ASYNC
+            run = await get_validation_engine().run([
+                ValidatorSpec("maximum_accuracy", self.maximum_accuracy_validator,
+                              "validate_with_maximum_accuracy", (code, context)),
+                ValidatorSpec("maximum_consistency", self.maximum_consistency_validator,
+                              "validate_with_maximum_consistency", (code, context)),
+                ValidatorSpec("maximum_threshold", self.maximum_threshold_validator,
+                              "validate_with_maximum_threshold", (code, context)),
+                ValidatorSpec("resource_optimization", self.resource_optimized_validator,
+                              "validate_with_resource_optimization", (code, context)),
+                # Advanced orchestration features
+                ValidatorSpec("task_decomposition", self.task_decomposer, "decompose_task",
+                              ("Validate and optimize AI code", payload), mode=in_process),
+                ValidatorSpec("multi_agent_coordination", self.multi_agent_coordinator, "coordinate_agents",
+                              (["validator", "optimizer", "quality_checker"], payload), mode=in_process),
+                ValidatorSpec("workflow_management", self.workflow_manager, "manage_workflow",
+                              ("ai_validation_workflow", payload), mode=in_process),
+                ValidatorSpec("quality_assurance", self.quality_assurance_manager, "ensure_quality",
+                              (code, context), mode=in_process),
+                ValidatorSpec("state_management", self.state_manager, "track_state",
+                              ("validation", "in_progress", payload), mode=in_process),
+                ValidatorSpec("context_management", self.context_manager, "manage_context",
+                              ("validation_context", context), mode=in_process),
+                # Tool integration, error recovery, learning, external systems, monitoring
+                ValidatorSpec("tool_integration", self.tool_integration_manager, "integrate_tools",
+                              (["code_analyzer", "performance_profiler", "security_scanner"], payload), mode=in_process),
+                ValidatorSpec("error_recovery", self.error_recovery_manager, "handle_errors",
+                              (code, context), mode=in_process),
+                ValidatorSpec("continuous_learning", self.continuous_learning_manager, "learn_from_experience",
+                              ({**payload, "validation_result": autonomous_result},), mode=in_process),
+                ValidatorSpec("external_integrations", self.external_integration_manager,
+                              "connect_external_systems", (["github", "jira", "slack", "monitoring"], payload),
+                              mode=in_process),
+                ValidatorSpec("monitoring_analytics", self.monitoring_analytics_manager, "track_performance",
+                              ("ai_validation", payload), mode=in_process),
+                # Autonomous decision making and creative capabilities
+                ValidatorSpec("autonomous_decision_making", self.decision_engine, "make_autonomous_decision",
+                              ("optimize_ai_code", payload), mode=in_process),
+                ValidatorSpec("autonomous_strategy", self.strategy_engine, "develop_strategy",
+                              ("ai_optimization_strategy", payload), mode=in_process),
+                ValidatorSpec("autonomous_adaptation", self.adaptation_engine, "adapt_system",
+                              ("performance_optimization", payload), mode=in_process),
+                ValidatorSpec("autonomous_creativity", self.creative_engine, "generate_creative_solutions",
+                              ("AI code optimization challenges", payload, context), mode=in_process),
+                ValidatorSpec("autonomous_innovation", self.innovation_engine, "generate_innovative_solutions",
+                              ("Advanced AI system development", context), mode=in_process),
+            ], size_hint=len(code))
+            results = run.results
+            maximum_accuracy_result = results.get("maximum_accuracy", {})
+            maximum_consistency_result = results.get("maximum_consistency", {})
+            maximum_threshold_result = results.get("maximum_threshold", {})
+            resource_optimization_result = results.get("resource_optimization", {})
+            feature_keys = [
+                "task_decomposition", "multi_agent_coordination", "workflow_management", "quality_assurance",
+                "state_management", "context_management", "tool_integration", "error_recovery",
+                "continuous_learning", "external_integrations", "monitoring_analytics",
+                "autonomous_decision_making", "autonomous_strategy", "autonomous_adaptation",
+                "autonomous_creativity", "autonomous_innovation",
+            ]
             
             # Combine all results
             enhanced_result = {
@@ -2799,23 +2850,10 @@ class EnhancedAutonomousAIOrchestrationLayer(AutonomousAIOrchestrationLayer):
                     "consistency_99_plus": maximum_consistency_result.get("consistency_score", 0) >= 0.99,
                     "threshold_99_plus": maximum_threshold_result.get("threshold_met", False),
                     "resource_optimized": resource_optimization_result.get("resource_efficiency", 0) >= 0.95,
-                    "task_decomposition": task_decomposition,
-                    "multi_agent_coordination": agent_coordination,
-                    "workflow_management": workflow_management,
-                    "quality_assurance": quality_assurance,
-                    "state_management": state_tracking,
-                    "context_management": context_management,
-                    "tool_integration": tool_integration,
-                    "error_recovery": error_recovery,
-                    "continuous_learning": learning_result,
-                    "external_integrations": external_integration,
-                    "monitoring_analytics": monitoring_result,
-                    "autonomous_decision_making": decision_result,
-                    "autonomous_strategy": strategy_result,
-                    "autonomous_adaptation": adaptation_result,
-                    "autonomous_creativity": creative_result,
-                    "autonomous_innovation": innovation_result
+                    **{key: results.get(key) for key in feature_keys}
                 },
+                "partial": autonomous_result.get("partial", False) or run.partial,
+                "enhanced_validation_execution": run.summary(),
                 "total_validators": 35,  # 11 original + 4 99%+ + 20 enhanced
                 "enhancement_level": "99%+ capabilities with complete orchestration",
                 "timestamp": datetime.now()
@@ -2972,6 +3010,7 @@ class IntelligentTaskDecomposer:
             # Calculate dependencies
             dependencies = await self._calculate_dependencies(subtasks)
             decomposition_result["dependencies"] = dependencies
+            decomposition_result["execution_plan"] = self._plan_execution(subtasks, dependencies)
             
             # Estimate effort
             effort_estimation = await self._estimate_effort(subtasks, complexity_analysis)
@@ -3133,6 +3172,22 @@ class IntelligentTaskDecomposer:
         
         return subtasks
     
+    def _plan_execution(self, subtasks: List[Dict[str, Any]], dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Parallel groups and critical path of the subtask graph"""
+        task_ids = {task["id"] for task in subtasks}
+        nodes = [
+            DAGNode(task["id"], action=None, cost=task.get("estimated_hours", 1),
+                    dependencies=[dep for dep in dependencies.get(task["id"], []) if dep in task_ids])
+            for task in subtasks
+        ]
+        try:
+            path, path_hours = critical_path(nodes)
+            return {"parallel_groups": parallel_levels(nodes), "critical_path": path,
+                    "critical_path_hours": path_hours}
+        except DAGError as e:
+            logger.warning(f"Subtasks do not form a DAG: {e}")
+            return {}
+    
     async def _calculate_dependencies(self, subtasks: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """Calculate dependencies between subtasks"""
         dependencies = {}
@@ -3199,6 +3254,8 @@ class IntelligentTaskDecomposer:
 class MultiAgentCoordinator:
     """Advanced Multi-Agent Coordination System for specialized AI agents"""
     
+    HISTORY_LIMIT = 200
+    
     def __init__(self):
         self.agent_registry = self._load_agent_registry()
         self.coordination_strategies = self._load_coordination_strategies()
@@ -3208,6 +3265,12 @@ class MultiAgentCoordinator:
         self.agent_performance_metrics = {}
         self.coordination_history = []
         
+        # Agents are actors on the message bus: bounded mailboxes, one batch at a time
+        self.message_bus = create_message_bus()
+        for agent_id, agent_info in self.agent_registry.items():
+            topics = ["agents.all"] + [f"capability.{capability}" for capability in agent_info["capabilities"]]
+            self.message_bus.register(agent_id, self._agent_handler(agent_id), topics=topics)
+        
     def _load_agent_registry(self) -> Dict[str, Any]:
         """Load comprehensive registry of available agents"""
         return {
@@ -3469,6 +3532,7 @@ class MultiAgentCoordinator:
             
             # Add to coordination history
             self.coordination_history.append(coordination_result)
+            del self.coordination_history[:-self.HISTORY_LIMIT]
             
             # Remove from active coordinations
             del self.active_coordinations[coordination_id]
@@ -3663,17 +3727,25 @@ class MultiAgentCoordinator:
             return sum(step.get("estimated_duration", 30) for step in execution_plan)
     
     async def _execute_agents_with_monitoring(self, execution_plan: List[Dict[str, Any]], context: Dict[str, Any], coordination_id: str) -> Dict[str, Any]:
-        """Execute agents with comprehensive monitoring"""
+        """Execute agents with comprehensive monitoring; steps run as soon as their dependencies finish"""
         results = {}
         
+        step_ids = {step["step_id"] for step in execution_plan}
+        nodes = [
+            DAGNode(step["step_id"], self._agent_step_action(step, context, coordination_id),
+                    dependencies=[dep for dep in step.get("dependencies", []) if dep in step_ids],
+                    cost=step.get("estimated_duration", 30), memoize=False)
+            for step in execution_plan
+        ]
+        run = await get_dag_executor().run(nodes)
+        
         for step in execution_plan:
             agent_id = step["agent_id"]
-            try:
-                # Simulate agent execution
-                result = await self._simulate_agent_execution(agent_id, step, context)
+            node_result = run.results[step["step_id"]]
+            if node_result.status == NodeStatus.SUCCEEDED:
                 results[agent_id] = {
                     "success": True,
-                    "result": result,
+                    "result": node_result.result,
                     "execution_time": step.get("estimated_duration", 30),
                     "step_id": step["step_id"]
                 }
@@ -3682,17 +3754,35 @@ class MultiAgentCoordinator:
                 if agent_id in self.agent_registry:
                     self.agent_registry[agent_id]["load"] += 0.1
                     self.agent_registry[agent_id]["last_used"] = datetime.now().isoformat()
-                
-            except Exception as e:
+            else:
                 results[agent_id] = {
                     "success": False,
-                    "error": str(e),
+                    "error": node_result.error,
                     "execution_time": 0,
                     "step_id": step["step_id"]
                 }
         
         return results
     
+    def _agent_step_action(self, step: Dict[str, Any], context: Dict[str, Any], coordination_id: str):
+        """DAG node action: ask the step's agent over the message bus"""
+        async def action(upstream: Dict[str, Any]) -> Dict[str, Any]:
+            return await self.message_bus.request(step["agent_id"], {"step": step, "context": context},
+                                                  sender=coordination_id)
+        return action
+    
+    def _agent_handler(self, agent_id: str):
+        """Mailbox handler for one agent: requests execute a step, events are acknowledged"""
+        async def handle(message: Message) -> Any:
+            if message.kind == MessageKind.EVENT:
+                return None
+            return await self._simulate_agent_execution(agent_id, message.payload["step"], message.payload["context"])
+        return handle
+    
+    async def broadcast(self, topic: str, payload: Dict[str, Any], sender: Optional[str] = None) -> int:
+        """Publish to subscribed agents (``agents.all`` or ``capability.<name>``); returns agents reached"""
+        return await self.message_bus.publish(topic, payload, sender)
+    
     async def _simulate_agent_execution(self, agent_id: str, step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate agent execution (placeholder for real agent integration)"""
         agent_info = self.agent_registry.get(agent_id, {})
@@ -3771,7 +3861,8 @@ class MultiAgentCoordinator:
             "busy_agents": sum(1 for agent in self.agent_registry.values() if agent["load"] > 0.7),
             "average_performance": sum(agent["performance_score"] for agent in self.agent_registry.values()) / len(self.agent_registry),
             "average_load": sum(agent["load"] for agent in self.agent_registry.values()) / len(self.agent_registry),
-            "agents": self.agent_registry
+            "agents": self.agent_registry,
+            "message_bus": self.message_bus.get_stats()
         }
     
     async def get_coordination_history(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -3929,22 +4020,30 @@ class WorkflowManager:
             workflow_result["current_gates"] = gates
             workflow_result["artifacts"] = {artifact: None for artifact in artifacts}
             
-            # Execute workflow phases
+            # Execute workflow phases as a DAG: each phase follows the previous one
+            # unless the template declares its own dependencies
+            phase_dependencies = template.get("dependencies", {})
+            nodes = [
+                DAGNode(phase, self._phase_action(phase, context),
+                        dependencies=phase_dependencies.get(phase, phases[i - 1:i]), retries=0, memoize=False)
+                for i, phase in enumerate(phases)
+            ]
+            run = await get_dag_executor().run(nodes)
+            
             for phase in phases:
-                phase_result = await self._execute_phase(phase, context)
-                workflow_result["phases_completed"].append(phase_result)
-                
-                # Update progress
+                node_result = run.results[phase]
+                if node_result.status == NodeStatus.SUCCEEDED:
+                    workflow_result["phases_completed"].append(node_result.result)
+                elif node_result.status == NodeStatus.FAILED:
+                    workflow_result.setdefault("phases_failed", []).append(
+                        {"phase": phase, "success": False, "error": node_result.error}
+                    )
+            
+            # Update progress
+            if phases:
                 workflow_result["progress"] = len(workflow_result["phases_completed"]) / len(phases)
-                
-                # Check if workflow should continue
-                if not phase_result.get("success", False):
-                    workflow_result["status"] = "failed"
-                    break
-            
-            # Check if all phases completed
-            if workflow_result["progress"] >= 1.0:
-                workflow_result["status"] = "completed"
+                workflow_result["status"] = "completed" if run.succeeded else "failed"
+            workflow_result["execution"] = run.summary()
             
             return workflow_result
             
@@ -3952,6 +4051,15 @@ class WorkflowManager:
             logger.error(f"Error managing workflow: {e}")
             return {"error": str(e), "status": "failed"}
     
+    def _phase_action(self, phase: str, context: Dict[str, Any]):
+        """DAG node action for one phase; a failed phase raises so the phases after it are skipped"""
+        async def action(upstream: Dict[str, Any]) -> Dict[str, Any]:
+            phase_result = await self._execute_phase(phase, context)
+            if not phase_result.get("success", False):
+                raise RuntimeError(phase_result.get("error") or f"Phase {phase} failed")
+            return phase_result
+        return action
+    
     async def _execute_phase(self, phase: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a workflow phase"""
         try:
@@ -15,6 +15,9 @@ from datetime import datetime
 import asyncio
 import uuid
 
+from app.core.dag_executor import DAGNode, critical_path
+from app.core.result_store import create_result_store
+
 # Zero Assumption DNA imports
 from .zero_assumption_dna import (
     must_exist,
@@ -33,6 +36,26 @@ from .zero_assumption_ai_integration import (
 logger = structlog.get_logger()
 
 
+def estimated_hours(step: Dict[str, Any]) -> float:
+    """Hours from a step's ``estimated_time`` ("30 minutes", "4 hours")"""
+    amount, _, unit = step.get('estimated_time', '1 hour').partition(' ')
+    try:
+        value = float(amount)
+    except ValueError:
+        return 1.0
+    return value / 60 if unit.startswith('minute') else value
+
+
+def plan_graph(steps: List[Dict[str, Any]]) -> List[DAGNode]:
+    """Plan steps as DAG nodes (for analysis; actions are not set)"""
+    step_ids = {step.get('step_id') or step.get('id') or f'step_{i}': step for i, step in enumerate(steps)}
+    return [
+        DAGNode(step_id, action=None, cost=estimated_hours(step),
+                dependencies=[dep for dep in step.get('dependencies', []) if dep in step_ids])
+        for step_id, step in step_ids.items()
+    ]
+
+
 class AIOrchestrator:
     """
     Real AI Orchestrator with Zero Assumption DNA fully integrated
@@ -41,9 +64,9 @@ class AIOrchestrator:
     """
     
     def __init__(self):
-        self.active_plans: Dict[str, Dict[str, Any]] = {}
+        # Plans by id, indexed by user; bounded by TTL and memory budget
+        self.active_plans = create_result_store("ai_orchestrator_plans")
         self.component_registry: Dict[str, Any] = {}
-        self.plan_history: List[Dict[str, Any]] = []
         
         logger.info(
             "AI Orchestrator initialized with Zero Assumption DNA",
@@ -127,8 +150,7 @@ class AIOrchestrator:
                 'created_at': datetime.now().isoformat()
             }
             
-            self.active_plans[plan_id] = plan
-            self.plan_history.append(plan)
+            self.active_plans.put(plan_id, plan, user_id=user_id)
             
             logger.info(f"Orchestration plan completed", 
                        plan_id=plan_id, 
@@ -389,14 +411,14 @@ class AIOrchestrator:
                 'action': 'implement_frontend',
                 'description': 'Implement frontend components',
                 'estimated_time': '6 hours',
-                'dependencies': ['backend']
+                'dependencies': ['setup']
             },
             {
                 'id': 'testing',
                 'action': 'testing',
                 'description': 'Test and validate application',
                 'estimated_time': '2 hours',
-                'dependencies': ['frontend']
+                'dependencies': ['backend', 'frontend']
             },
             {
                 'id': 'deployment',
@@ -431,21 +453,18 @@ class AIOrchestrator:
         return max(0.3, min(1.0, confidence))  # Keep between 0.3 and 1.0
     
     async def _estimate_timeline(self, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Estimate project timeline"""
-        total_hours = 0
-        
-        for step in steps:
-            time_str = step.get('estimated_time', '1 hour')
-            if 'hour' in time_str:
-                hours = float(time_str.split()[0])
-                total_hours += hours
+        """Estimate project timeline; independent steps overlap, so duration follows the critical path"""
+        total_hours = sum(estimated_hours(step) for step in steps)
+        path, path_hours = critical_path(plan_graph(steps))
         
         # Convert to days and weeks
-        days = total_hours / 8  # Assuming 8-hour work days
+        days = path_hours / 8  # Assuming 8-hour work days
         weeks = days / 5  # Assuming 5-day work weeks
         
         return {
             'total_hours': total_hours,
+            'critical_path': path,
+            'critical_path_hours': path_hours,
             'estimated_days': round(days, 1),
             'estimated_weeks': round(weeks, 1),
             'steps_count': len(steps)
@@ -458,8 +477,8 @@ class AIOrchestrator:
     async def get_all_plans(self, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all plans, optionally filtered by user"""
         if user_id:
-            return [plan for plan in self.plan_history if plan.get('user_id') == user_id]
-        return self.plan_history
+            return self.active_plans.for_user(user_id)
+        return self.active_plans.values()
 
 
 # Global instance
@@ -133,8 +133,13 @@ class AIService:
             prompt_length=len(validated_prompt)
         )
         
-        # Simulate AI completion (replace with real AI call)
-        completion_text = f"Completion for: {validated_prompt[:50]}..."
+        from app.core.strategies.provider_router import get_provider_router
+        completion_text = await get_provider_router().generate_completion(
+            validated_prompt,
+            max_tokens=request.get("max_tokens", 1000),
+            temperature=request.get("temperature", 0.7),
+            task_type=request.get("task_type", "completion")
+        )
         
         # DO NOT ASSUME: Completion has content
         must_not_be_empty(completion_text, "completion_text")
@@ -179,8 +184,13 @@ class AIService:
             num_messages=len(messages)
         )
         
-        # Simulate AI chat response (replace with real AI call)
-        response_text = "AI chat response based on conversation"
+        from app.core.strategies.provider_router import get_provider_router
+        response_text = await get_provider_router().generate_chat_completion(
+            messages,
+            max_tokens=request.get("max_tokens", 1000),
+            temperature=request.get("temperature", 0.7),
+            task_type=request.get("task_type", "chat")
+        )
         
         # DO NOT ASSUME: Response has content
         must_not_be_empty(response_text, "chat_response")
@@ -215,8 +225,9 @@ class AIService:
             text_length=len(text)
         )
         
-        # Simulate embedding (replace with real AI call)
-        embedding = [0.1] * 1536  # Simulated embedding vector
+        # Concurrent embedding requests share one batched provider call
+        from app.core.embedding_batcher import get_embedding_batcher
+        embedding = await get_embedding_batcher().embed(text)
         
         # DO NOT ASSUME: Embedding is valid
         must_not_be_empty(embedding, "embedding_vector")
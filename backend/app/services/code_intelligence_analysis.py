@@ -0,0 +1,462 @@
+"""
+Code Intelligence Analysis Service
+Runs the AST-backed analyzers (complexity, code smells, performance
+bottlenecks) behind the code-intelligence endpoints, caches results per
+content hash and analyzes whole repositories in a process pool, streaming one
+result per file as it completes
+"""
+
+import asyncio
+import io
+import keyword
+import math
+import os
+import tarfile
+import time
+import tokenize
+import zipfile
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+
+from app.core.code_analysis_context import content_hash, get_analysis_context
+from app.services.smart_coding_ai_advanced_analysis import (
+    CodeSmellDetector,
+    ComplexityAnalyzer,
+    PerformanceBottleneckDetector,
+)
+
+logger = structlog.get_logger()
+
+ANALYSES = ("complexity", "smells", "bottlenecks", "refactor")
+
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".cc": "cpp",
+    ".cxx": "cpp",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+    ".cs": "csharp",
+}
+
+# Vendored, generated or VCS directories that are never worth analyzing
+SKIPPED_DIRECTORIES = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".tox", "dist", "build", ".mypy_cache", ".pytest_cache",
+})
+
+_SMELL_REFACTORINGS = {
+    "long_parameter_list": "introduce_parameter_object",
+    "god_class": "extract_class",
+    "magic_numbers": "extract_constant",
+    "primitive_obsession": "introduce_typed_model",
+    "potential_dead_code": "remove_dead_code",
+    "commented_code": "remove_dead_code",
+    "long_file": "split_module",
+}
+_PRIORITY_BY_SEVERITY = {"critical": "high", "high": "high", "medium": "medium", "low": "low"}
+_PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+_PY_KEYWORDS = frozenset(keyword.kwlist)
+
+
+class CodeAnalysisError(ValueError):
+    """Invalid analysis request (unknown analysis, unreadable archive, limits exceeded)"""
+
+
+@dataclass
+class SourceFile:
+    path: str
+    content: str
+    language: Optional[str] = None
+    skip_reason: Optional[str] = None  # set when the file was rejected before analysis
+
+
+def detect_language(path: str) -> Optional[str]:
+    return LANGUAGE_BY_EXTENSION.get(PurePosixPath(path).suffix.lower())
+
+
+def normalize_analyses(analyses: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    """Requested analyses in canonical order; all of them when none are given"""
+    if not analyses:
+        return ANALYSES
+    unknown = sorted(set(analyses) - set(ANALYSES))
+    if unknown:
+        raise CodeAnalysisError(f"Unknown analyses: {', '.join(unknown)} (expected any of {', '.join(ANALYSES)})")
+    return tuple(name for name in ANALYSES if name in analyses)
+
+
+def maintainability_index(code: str, cyclomatic_complexity: int) -> Optional[float]:
+    """
+    Maintainability index on a 0-100 scale from Halstead volume, cyclomatic
+    complexity and non-blank lines of code (Python token stream)
+    """
+    context = get_analysis_context(code)
+    operators: Counter = Counter()
+    operands: Counter = Counter()
+    for token in context.tokens:
+        if token.type == tokenize.OP:
+            operators[token.string] += 1
+        elif token.type == tokenize.NAME:
+            (operators if token.string in _PY_KEYWORDS else operands)[token.string] += 1
+        elif token.type in (tokenize.NUMBER, tokenize.STRING):
+            operands[token.string] += 1
+
+    length = sum(operators.values()) + sum(operands.values())
+    vocabulary = len(operators) + len(operands)
+    lines = sum(1 for line in context.lines if line.strip())
+    if length == 0 or vocabulary < 2 or lines == 0:
+        return None
+    volume = length * math.log2(vocabulary)
+    raw = 171 - 5.2 * math.log(volume) - 0.23 * cyclomatic_complexity - 16.2 * math.log(lines)
+    return round(max(0.0, raw * 100 / 171), 2)
+
+
+def refactor_suggestions(
+    complexity: Dict[str, Any], smells: Dict[str, Any], bottlenecks: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Concrete refactorings derived from the complexity, smell and bottleneck findings"""
+    suggestions = []
+    metrics = complexity.get("metrics") or {}
+
+    for item in complexity.get("refactoring_priority", []):
+        suggestions.append({
+            "type": "extract_method",
+            "priority": "high",
+            "target": item["target"],
+            "description": f"Split '{item['target']}' ({item['lines']} lines) into smaller functions",
+        })
+    if metrics.get("nesting_depth", 0) > 3:
+        suggestions.append({
+            "type": "reduce_nesting",
+            "priority": "medium",
+            "description": f"Flatten nesting (max depth {metrics['nesting_depth']}) with guard clauses "
+                           f"or extracted helpers",
+        })
+    if metrics.get("cyclomatic_complexity", 0) > 20:
+        suggestions.append({
+            "type": "simplify_conditionals",
+            "priority": "high",
+            "description": f"Reduce branching (cyclomatic complexity {metrics['cyclomatic_complexity']})",
+        })
+
+    for smell in smells.get("smells", []):
+        suggestions.append({
+            "type": _SMELL_REFACTORINGS.get(smell.get("type"), "cleanup"),
+            "priority": _PRIORITY_BY_SEVERITY.get(smell.get("severity"), "low"),
+            "line": smell.get("line"),
+            "description": smell.get("fix") or smell.get("description", ""),
+        })
+    for bottleneck in bottlenecks.get("bottlenecks", []):
+        suggestions.append({
+            "type": f"optimize_{bottleneck.get('type', 'performance')}",
+            "priority": _PRIORITY_BY_SEVERITY.get(bottleneck.get("severity"), "low"),
+            "description": bottleneck.get("fix") or bottleneck.get("description", ""),
+        })
+
+    return sorted(suggestions, key=lambda s: _PRIORITY_ORDER.get(s["priority"], 2))
+
+
+_complexity_analyzer = ComplexityAnalyzer()
+_smell_detector = CodeSmellDetector()
+_bottleneck_detector = PerformanceBottleneckDetector()
+
+
+async def analyze_code(code: str, language: str, analyses: Sequence[str] = ANALYSES) -> Dict[str, Any]:
+    """Run the requested analyses on one source text"""
+    language = (language or "").lower()
+    needed = set(analyses)
+    if "refactor" in needed:
+        needed.update(("complexity", "smells", "bottlenecks"))
+
+    results: Dict[str, Any] = {}
+    if language == "python":
+        syntax_error = get_analysis_context(code).syntax_error
+        if syntax_error is not None:
+            results["parse_error"] = {"message": syntax_error.msg, "line": syntax_error.lineno}
+
+    if "complexity" in needed:
+        results["complexity"] = await _complexity_analyzer.analyze_complexity(code, language)
+        metrics = results["complexity"].get("metrics")
+        if language == "python" and metrics:
+            metrics["maintainability_index"] = maintainability_index(code, metrics.get("cyclomatic_complexity", 1))
+    if "smells" in needed:
+        results["smells"] = await _smell_detector.detect_code_smells(code, language)
+    if "bottlenecks" in needed:
+        results["bottlenecks"] = await _bottleneck_detector.detect_bottlenecks(code, language)
+    if "refactor" in needed:
+        suggestions = refactor_suggestions(results["complexity"], results["smells"], results["bottlenecks"])
+        results["refactor"] = {"suggestions": suggestions, "total_suggestions": len(suggestions)}
+
+    return {key: value for key, value in results.items() if key in analyses or key == "parse_error"}
+
+
+# Per worker process: one event loop reused across files
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _analyze_in_worker(code: str, language: str, analyses: Tuple[str, ...]) -> Dict[str, Any]:
+    global _worker_loop
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(analyze_code(code, language, analyses))
+
+
+def iter_archive_files(data: bytes, max_file_bytes: int) -> Iterator[SourceFile]:
+    """Source files inside a zip or tar(.gz/.bz2/.xz) archive, read lazily and never written to disk"""
+    buffer = io.BytesIO(data)
+
+    def member_path(name: str) -> str:
+        # "./.git/x" -> ".git/x": drop "." and root components only, keep dot-directories intact
+        return "/".join(part for part in PurePosixPath(name).parts if part != "/")
+
+    def wanted(path: str) -> bool:
+        parts = PurePosixPath(path).parts
+        return detect_language(path) is not None and not any(part in SKIPPED_DIRECTORIES for part in parts)
+
+    def decoded(path: str, raw: bytes) -> SourceFile:
+        try:
+            return SourceFile(path, raw.decode("utf-8"))
+        except UnicodeDecodeError:
+            return SourceFile(path, "", skip_reason="not UTF-8 text")
+
+    if zipfile.is_zipfile(buffer):
+        with zipfile.ZipFile(buffer) as archive:
+            for info in archive.infolist():
+                path = member_path(info.filename)
+                if info.is_dir() or not wanted(path):
+                    continue
+                if info.file_size > max_file_bytes:
+                    yield SourceFile(path, "", skip_reason=f"larger than {max_file_bytes} bytes")
+                    continue
+                yield decoded(path, archive.read(info))
+        return
+
+    buffer.seek(0)
+    try:
+        archive = tarfile.open(fileobj=buffer, mode="r:*")
+    except tarfile.TarError:
+        raise CodeAnalysisError("Unsupported archive; upload a zip or tar (optionally gzip/bz2/xz compressed)")
+    with archive:
+        for member in archive:
+            path = member_path(member.name)
+            # Regular files only: links could point anywhere
+            if not member.isfile() or not wanted(path):
+                continue
+            if member.size > max_file_bytes:
+                yield SourceFile(path, "", skip_reason=f"larger than {max_file_bytes} bytes")
+                continue
+            handle = archive.extractfile(member)
+            if handle is not None:
+                yield decoded(path, handle.read())
+
+
+class CodeAnalysisService:
+    """Cached single-file analysis plus parallel batch analysis"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_entries: int = 4096,
+        max_file_bytes: int = 1_000_000,
+        max_batch_files: int = 20000,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_entries = cache_entries
+        self.max_file_bytes = max_file_bytes
+        self.max_batch_files = max_batch_files
+        self._cache: "OrderedDict[Tuple[str, str, Tuple[str, ...]], Dict[str, Any]]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {"analyzed": 0, "cache_hits": 0, "batches": 0, "errors": 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info("Code analysis process pool started", max_workers=self.max_workers)
+        return self._pool
+
+    def _cache_get(self, key: Tuple[str, str, Tuple[str, ...]]) -> Optional[Dict[str, Any]]:
+        results = self._cache.get(key)
+        if results is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+        return results
+
+    def _cache_put(self, key: Tuple[str, str, Tuple[str, ...]], results: Dict[str, Any]) -> None:
+        self._cache[key] = results
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+
+    async def analyze(self, code: str, language: str, analyses: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Analyze one source text in-process (cached by content hash)"""
+        analyses = normalize_analyses(analyses)
+        language = (language or "").lower()
+        key = (content_hash(code), language, analyses)
+        results = self._cache_get(key)
+        if results is None:
+            results = await analyze_code(code, language, analyses)
+            self.stats["analyzed"] += 1
+            self._cache_put(key, results)
+        return results
+
+    async def analyze_batch(
+        self, files: Iterable[SourceFile], analyses: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze many files in worker processes, yielding one record per file in
+        completion order and a final summary record. Files with identical
+        content are analyzed once. At most ``2 * max_workers`` files are in
+        flight, so ``files`` may be a lazy iterator over a large archive.
+        """
+        analyses = normalize_analyses(analyses)
+        self.stats["batches"] += 1
+        started = time.perf_counter()
+        summary: Counter = Counter()
+        loop = asyncio.get_running_loop()
+        # future -> files waiting on it: (index, file, language, submitted_at)
+        pending: Dict[asyncio.Future, List[Tuple[int, SourceFile, str, float]]] = {}
+        in_flight: Dict[Tuple[str, str, Tuple[str, ...]], asyncio.Future] = {}
+        keys: Dict[asyncio.Future, Tuple[str, str, Tuple[str, ...]]] = {}
+        window = self.max_workers * 2
+        source = enumerate(files)
+        # Lazy sources (archive readers) decompress in next(), so pull them off the loop
+        lazy = not isinstance(files, (list, tuple))
+        exhausted = False
+
+        def record(index: int, file: SourceFile, language: Optional[str], status: str, **extra: Any) -> Dict[str, Any]:
+            summary[status] += 1
+            return {"type": "file", "index": index, "path": file.path, "language": language,
+                    "status": status, **extra}
+
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    item = await asyncio.to_thread(next, source, None) if lazy else next(source, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, file = item
+                    if index >= self.max_batch_files:
+                        exhausted = True
+                        yield {"type": "error", "detail": f"Batch limit of {self.max_batch_files} files reached"}
+                        break
+
+                    language = (file.language or detect_language(file.path) or "").lower() or None
+                    if file.skip_reason or language is None or len(file.content) > self.max_file_bytes:
+                        reason = file.skip_reason or (
+                            "unknown language" if language is None else f"larger than {self.max_file_bytes} bytes"
+                        )
+                        yield record(index, file, language, "skipped", reason=reason)
+                        continue
+
+                    key = (content_hash(file.content), language, analyses)
+                    cached = self._cache_get(key)
+                    if cached is not None:
+                        summary["cached"] += 1
+                        yield record(index, file, language, "ok", cached=True, content_hash=key[0],
+                                     duration_ms=0.0, results=cached)
+                        continue
+
+                    future = in_flight.get(key)
+                    if future is None:
+                        future = loop.run_in_executor(self._get_pool(), _analyze_in_worker,
+                                                      file.content, language, analyses)
+                        in_flight[key] = future
+                        keys[future] = key
+                        pending[future] = []
+                    pending[future].append((index, file, language, time.perf_counter()))
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    waiters = pending.pop(future)
+                    key = keys.pop(future)
+                    in_flight.pop(key, None)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        self.stats["errors"] += 1
+                        for index, file, language, _ in waiters:
+                            yield record(index, file, language, "error", content_hash=key[0],
+                                         error=str(e) or type(e).__name__)
+                        continue
+                    self.stats["analyzed"] += 1
+                    self._cache_put(key, results)
+                    for index, file, language, submitted in waiters:
+                        yield record(index, file, language, "ok", cached=False, content_hash=key[0],
+                                     duration_ms=round((time.perf_counter() - submitted) * 1000.0, 3),
+                                     results=results)
+
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            logger.info("Batch code analysis complete", files=sum(summary[s] for s in ("ok", "error", "skipped")),
+                        cached=summary["cached"], errors=summary["error"], elapsed_ms=round(elapsed_ms, 1))
+            yield {
+                "type": "summary",
+                "files": summary["ok"] + summary["error"] + summary["skipped"],
+                "ok": summary["ok"],
+                "errors": summary["error"],
+                "skipped": summary["skipped"],
+                "cached": summary["cached"],
+                "analyses": list(analyses),
+                "elapsed_ms": round(elapsed_ms, 3),
+            }
+        finally:
+            # Client went away or the batch failed: drop work that has not started yet
+            for future in pending:
+                future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cache_entries": len(self._cache), "max_workers": self.max_workers}
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_code_analysis_service: Optional[CodeAnalysisService] = None
+
+
+def get_code_analysis_service() -> CodeAnalysisService:
+    """Shared analysis service configured from settings"""
+    global _code_analysis_service
+    if _code_analysis_service is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        _code_analysis_service = CodeAnalysisService(
+            max_workers=settings.CODE_ANALYSIS_MAX_WORKERS,
+            cache_entries=settings.CODE_ANALYSIS_CACHE_ENTRIES,
+            max_file_bytes=settings.CODE_ANALYSIS_MAX_FILE_BYTES,
+            max_batch_files=settings.CODE_ANALYSIS_MAX_BATCH_FILES,
+        )
+    return _code_analysis_service
+
+
+__all__ = [
+    'ANALYSES',
+    'LANGUAGE_BY_EXTENSION',
+    'CodeAnalysisError',
+    'SourceFile',
+    'detect_language',
+    'normalize_analyses',
+    'maintainability_index',
+    'refactor_suggestions',
+    'analyze_code',
+    'iter_archive_files',
+    'CodeAnalysisService',
+    'get_code_analysis_service',
+]
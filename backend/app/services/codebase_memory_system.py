@@ -5,11 +5,16 @@ Photographic memory capabilities for entire project understanding
 
 import structlog
 import asyncio
+import bisect
 import json
 import re
 import uuid
 import hashlib
-from typing import Dict, List, Optional, Any, Tuple
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
+from collections import Counter
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
@@ -19,19 +24,55 @@ import ast
 import importlib.util
 from pathlib import Path
 import subprocess
+import numpy as np
 import yaml
 import xml.etree.ElementTree as ET
 
+from app.core.code_analysis_context import get_analysis_context
+from app.core.config import get_settings
+from app.core.embedding_batcher import HashingEmbedder, get_embedding_batcher
+from app.core.search_index import SearchIndex
+from app.core.vector_index import VectorIndex
+from app.services.repository_indexer import FileUpdate, IndexState, RepositoryIndexer
+from app.services.snapshot_store import SnapshotStore, SnapshotView
+from app.services.symbol_completion import get_symbol_completion_index
+
 logger = structlog.get_logger()
 
+# Reciprocal rank fusion constant for merging semantic and lexical hits
+RRF_K = 60
+VECTOR_EMBED_BATCH = 256
+
+
+def _line_locator(content: str):
+    """Offset -> 1-based line number, without recounting the prefix for every match"""
+    starts = [0] + [match.end() for match in re.finditer("\n", content)]
+    return lambda offset: bisect.bisect_right(starts, offset)
+
+
+def _pattern_text(pattern: Mapping[str, Any], file_path: str) -> str:
+    """What a pattern's embedding is computed from: its name, kind, file and surrounding code"""
+    parts = [str(pattern.get(key) or "") for key in ("pattern_name", "pattern_type", "language")]
+    parts.append(file_path)
+    context = pattern.get("context")
+    if isinstance(context, Mapping):
+        for value in context.values():
+            if isinstance(value, str):
+                parts.append(value)
+            elif isinstance(value, list):
+                parts.extend(item for item in value if isinstance(item, str))
+    return " ".join(part for part in parts if part)
+
+
 class FileStructureAnalyzer:
     """Analyzes and remembers file structure"""
     
     def __init__(self):
         self.analyzed_projects = {}
     
-    async def analyze_project_structure(self, project_path: str, analysis_depth: str = "shallow") -> Dict[str, Any]:
-        """Analyze project file structure"""
+    async def analyze_project_structure(self, project_path: str, analysis_depth: str = "shallow",
+                                        file_tree: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analyze project file structure (``file_tree`` skips the walk when the indexer already built it)"""
         try:
             logger.info("Analyzing project structure", path=project_path, depth=analysis_depth)
             
@@ -49,7 +90,10 @@ class FileStructureAnalyzer:
             }
             
             # Build file tree
-            project_structure["file_tree"] = await self._build_file_tree(project_path, analysis_depth)
+            prebuilt_tree = file_tree is not None
+            if file_tree is None:
+                file_tree = await self._build_file_tree(project_path, analysis_depth)
+            project_structure["file_tree"] = file_tree
             
             # Count files and directories
             counts = await self._count_files_directories(project_structure["file_tree"])
@@ -59,8 +103,9 @@ class FileStructureAnalyzer:
             # Get project metadata
             project_structure["metadata"] = self._detect_project_metadata(project_path)
             
-            # Store in cache
-            self.analyzed_projects[project_path] = project_structure
+            # Store in cache (trees handed in by the repository indexer are owned by the memory system)
+            if not prebuilt_tree:
+                self.analyzed_projects[project_path] = project_structure
             
             return project_structure
             
@@ -212,21 +257,10 @@ class CodingPatternRecognizer:
     async def analyze_file_patterns(self, file_path: str, language: str) -> List[Dict[str, Any]]:
         """Analyze coding patterns in a file"""
         try:
-            patterns = []
-            
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
             
-            # Extract different types of patterns
-            functions = await self._extract_functions(content, language)
-            classes = await self._extract_classes(content, language)
-            imports = await self._extract_imports(content, language)
-            variables = await self._extract_variables(content, language)
-            
-            patterns.extend(functions)
-            patterns.extend(classes)
-            patterns.extend(imports)
-            patterns.extend(variables)
+            patterns = await self.extract_patterns(content, language)
             
             # Store in cache
             self.pattern_cache[file_path] = patterns
@@ -237,30 +271,43 @@ class CodingPatternRecognizer:
             logger.error("Failed to analyze file patterns", error=str(e))
             return []
     
+    async def extract_patterns(self, content: str, language: str) -> List[Dict[str, Any]]:
+        """Extract function, class, import and variable patterns from source text"""
+        patterns = []
+        
+        # Extract different types of patterns
+        patterns.extend(await self._extract_functions(content, language))
+        patterns.extend(await self._extract_classes(content, language))
+        patterns.extend(await self._extract_imports(content, language))
+        patterns.extend(await self._extract_variables(content, language))
+        
+        return patterns
+    
     async def _extract_functions(self, content: str, language: str) -> List[Dict[str, Any]]:
         """Extract function patterns"""
         patterns = []
+        line_of = _line_locator(content)
         
         if language == "python":
             try:
-                tree = ast.parse(content)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef):
-                        patterns.append({
-                            "pattern_id": str(uuid.uuid4()),
-                            "pattern_name": node.name,
-                            "pattern_type": "function",
-                            "language": language,
-                            "file_path": "",  # Will be set by caller
-                            "line_number": node.lineno,
-                            "context": {
-                                "args": [arg.arg for arg in node.args.args],
-                                "decorators": [d.id if hasattr(d, 'id') else str(d) for d in node.decorator_list],
-                                "returns": node.returns.id if node.returns and hasattr(node.returns, 'id') else None
-                            },
-                            "confidence": 0.9,
-                            "complexity": await self._calculate_complexity(node)
-                        })
+                analysis = get_analysis_context(content)
+                analysis.require_tree()
+                for node in analysis.of_type(ast.FunctionDef):
+                    patterns.append({
+                        "pattern_id": str(uuid.uuid4()),
+                        "pattern_name": node.name,
+                        "pattern_type": "function",
+                        "language": language,
+                        "file_path": "",  # Will be set by caller
+                        "line_number": node.lineno,
+                        "context": {
+                            "args": [arg.arg for arg in node.args.args],
+                            "decorators": [d.id if hasattr(d, 'id') else str(d) for d in node.decorator_list],
+                            "returns": node.returns.id if node.returns and hasattr(node.returns, 'id') else None
+                        },
+                        "confidence": 0.9,
+                        "complexity": await self._calculate_complexity(node)
+                    })
             except SyntaxError:
                 # Fallback to regex for malformed Python
                 pass
@@ -283,7 +330,7 @@ class CodingPatternRecognizer:
                         "pattern_type": "function",
                         "language": language,
                         "file_path": "",
-                        "line_number": content[:match.start()].count('\n') + 1,
+                        "line_number": line_of(match.start()),
                         "context": {"signature": match.group(0)},
                         "confidence": 0.7,
                         "complexity": 1.0
@@ -294,6 +341,7 @@ class CodingPatternRecognizer:
     async def _extract_classes(self, content: str, language: str) -> List[Dict[str, Any]]:
         """Extract class patterns"""
         patterns = []
+        line_of = _line_locator(content)
         
         class_patterns = [
             (r'class\s+(\w+)(?:\s*\([^)]*\))?\s*:', 'python'),
@@ -312,7 +360,7 @@ class CodingPatternRecognizer:
                         "pattern_type": "class",
                         "language": language,
                         "file_path": "",
-                        "line_number": content[:match.start()].count('\n') + 1,
+                        "line_number": line_of(match.start()),
                         "context": {"definition": match.group(0)},
                         "confidence": 0.8,
                         "complexity": 2.0
@@ -323,6 +371,7 @@ class CodingPatternRecognizer:
     async def _extract_imports(self, content: str, language: str) -> List[Dict[str, Any]]:
         """Extract import patterns"""
         patterns = []
+        line_of = _line_locator(content)
         
         import_patterns = [
             (r'import\s+(\w+)', 'python'),
@@ -343,7 +392,7 @@ class CodingPatternRecognizer:
                         "pattern_type": "import",
                         "language": language,
                         "file_path": "",
-                        "line_number": content[:match.start()].count('\n') + 1,
+                        "line_number": line_of(match.start()),
                         "context": {"import_statement": match.group(0)},
                         "confidence": 0.95,
                         "complexity": 0.5
@@ -354,6 +403,7 @@ class CodingPatternRecognizer:
     async def _extract_variables(self, content: str, language: str) -> List[Dict[str, Any]]:
         """Extract variable patterns"""
         patterns = []
+        line_of = _line_locator(content)
         
         variable_patterns = [
             (r'(\w+)\s*=\s*[^=\n]+', 'python'),
@@ -371,7 +421,7 @@ class CodingPatternRecognizer:
                         "pattern_type": "variable",
                         "language": language,
                         "file_path": "",
-                        "line_number": content[:match.start()].count('\n') + 1,
+                        "line_number": line_of(match.start()),
                         "context": {"declaration": match.group(0)},
                         "confidence": 0.6,
                         "complexity": 0.3
@@ -584,6 +634,8 @@ class SessionMemoryManager:
         self.session_cache: Dict[str, Dict] = {}
         self.user_contexts: Dict[str, Dict] = {}
         self.project_memories: Dict[str, Dict] = {}
+        self.embedder = HashingEmbedder(get_settings().MEMORY_EMBEDDING_DIM)
+        self.memory_index = VectorIndex(self.embedder.dim, filter_fields=("project_id",))
     
     async def create_session_context(self, user_id: str, project_id: str, 
                                    current_file: str, cursor_position: Tuple[int, int],
@@ -648,11 +700,28 @@ class SessionMemoryManager:
         """Save project memory snapshot"""
         try:
             self.project_memories[project_id] = memory_data
+            # One vector per top-level entry so search_project_memory can find it by meaning
+            self.memory_index.delete_where(project_id=project_id)
+            keys = [str(key) for key in memory_data]
+            texts = [f"{key} {json.dumps(value, default=str)[:2000]}" for key, value in zip(keys, memory_data.values())]
+            self.memory_index.add([f"{project_id}:{key}" for key in keys], self.embedder.embed_texts(texts),
+                                  [{"project_id": project_id}] * len(keys), keys)
             return True
         except Exception as e:
             logger.error("Failed to save project memory", error=str(e))
             return False
     
+    async def search_project_memory(self, query: str, project_id: Optional[str] = None,
+                                    limit: int = 5) -> List[Dict[str, Any]]:
+        """Saved project memory entries most similar to ``query``"""
+        results = []
+        for hit in self.memory_index.search(self.embedder.embed_texts([query])[0], limit,
+                                            filters={"project_id": project_id}):
+            hit_project = hit.metadata["project_id"]
+            results.append({"project_id": hit_project, "key": hit.payload, "score": hit.score,
+                            "value": self.project_memories.get(hit_project, {}).get(hit.payload)})
+        return results
+    
     async def _get_git_branch(self, working_directory: str) -> Optional[str]:
         """Get current git branch"""
         try:
@@ -684,48 +753,99 @@ class SessionMemoryManager:
 class CodebaseMemorySystem:
     """Main codebase memory system with photographic memory capabilities"""
     
-    def __init__(self):
+    def __init__(self, snapshot_store: Optional[SnapshotStore] = None):
+        settings = get_settings()
         self.file_analyzer = FileStructureAnalyzer()
         self.pattern_recognizer = CodingPatternRecognizer()
         self.dependency_tracker = DependencyTracker()
         self.session_manager = SessionMemoryManager()
-        self.memory_snapshots: Dict[str, Dict] = {}
+        # Live dicts while a project is being indexed or watched, compact SnapshotViews otherwise
+        self.memory_snapshots: Dict[str, Mapping[str, Any]] = {}
+        self.snapshot_store = snapshot_store or SnapshotStore(
+            settings.MEMORY_SNAPSHOT_DIR, keep_versions=settings.MEMORY_SNAPSHOT_KEEP_VERSIONS
+        )
+        self.search_index = SearchIndex(field_weights={"name": 3.0, "path": 2.0, "kind": 1.0, "language": 0.5})
+        self.indexers: Dict[str, RepositoryIndexer] = {}
+        self._project_ids_by_path: Dict[str, str] = {}
+        self._file_patterns: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._indexed_pattern_counts: Dict[str, Dict[str, int]] = {}
+        self._indexed_dependency_counts: Dict[str, int] = {}
+        self._watch_tasks: Dict[str, asyncio.Task] = {}
+        self._index_pool: Optional[ProcessPoolExecutor] = None
+        # Embeddings of patterns and files for retrieve_context, keyed by search document id
+        hashing = settings.MEMORY_EMBEDDING_BACKEND == "hashing"
+        self._embedder = HashingEmbedder(settings.MEMORY_EMBEDDING_DIM) if hashing else None
+        self.vector_index = VectorIndex(
+            settings.MEMORY_EMBEDDING_DIM if hashing else None, path=settings.MEMORY_VECTOR_DIR,
+            ann_threshold=settings.MEMORY_VECTOR_ANN_THRESHOLD,
+        )
+        self._pending_vectors: Dict[str, Tuple[str, Dict[str, Any], int]] = {}
+        self._vector_save_lock = asyncio.Lock()
     
     async def analyze_project(self, project_path: str, analysis_depth: str = "shallow") -> Dict[str, Any]:
-        """Perform comprehensive project analysis"""
+        """
+        Perform comprehensive project analysis.
+
+        Re-analysing the same path is incremental: only files whose mtime/size
+        and content changed are parsed again, and each parsed file is streamed
+        into the snapshot and search index as soon as its worker finishes.
+        """
         try:
             logger.info("Starting comprehensive project analysis", path=project_path, depth=analysis_depth)
+            started = time.perf_counter()
+            
+            project_id = self._project_ids_by_path.setdefault(os.path.abspath(project_path), str(uuid.uuid4()))
+            indexer = await self._get_indexer(project_id, project_path, analysis_depth)
+            
+            memory_snapshot = self.memory_snapshots.get(project_id)
+            if memory_snapshot is None or memory_snapshot.get("analysis_depth") != analysis_depth:
+                memory_snapshot = {
+                    "snapshot_id": str(uuid.uuid4()),
+                    "project_id": project_id,
+                    "project_path": project_path,
+                    "analysis_depth": analysis_depth,
+                    "timestamp": datetime.now(),
+                    "project_structure": {"file_tree": {}},
+                    "coding_patterns": [],
+                    "dependencies": [],
+                    "metadata": {
+                        "total_patterns": 0,
+                        "total_dependencies": 0,
+                        "analysis_duration": 0,
+                        "confidence_score": 0.95
+                    }
+                }
+                self.memory_snapshots[project_id] = memory_snapshot
+                self._index_snapshot(memory_snapshot)
+            elif isinstance(memory_snapshot, SnapshotView):
+                self._seed_manifest(project_id, memory_snapshot)
             
-            # Analyze project structure
-            project_structure = await self.file_analyzer.analyze_project_structure(project_path, analysis_depth)
-            
-            # Analyze coding patterns
-            patterns = await self._analyze_all_patterns(project_path, analysis_depth)
+            # Stream changed files into the snapshot and search index; stored projects
+            # are only materialized once the first change arrives
+            async for update in indexer.run():
+                memory_snapshot = self._make_live(project_id)
+                self._apply_file_update(project_id, update)
             
-            # Analyze dependencies
             dependencies = await self.dependency_tracker.analyze_dependencies(project_path)
+            if isinstance(memory_snapshot, SnapshotView) and dependencies == memory_snapshot["dependencies"]:
+                # Nothing changed since the stored version; keep serving it
+                unchanged = memory_snapshot.to_dict()
+                unchanged["metadata"]["analysis_duration"] = round(time.perf_counter() - started, 3)
+                return unchanged
+            memory_snapshot = self._make_live(project_id)
+            
+            # Project structure reuses the indexer's tree instead of walking again
+            memory_snapshot["project_structure"] = await self.file_analyzer.analyze_project_structure(
+                project_path, analysis_depth, file_tree=memory_snapshot["project_structure"].get("file_tree", {})
+            )
             
-            # Create memory snapshot
-            memory_snapshot = {
-                "snapshot_id": str(uuid.uuid4()),
-                "project_id": str(uuid.uuid4()),
-                "project_path": project_path,
-                "analysis_depth": analysis_depth,
-                "timestamp": datetime.now(),
-                "project_structure": project_structure,
-                "coding_patterns": patterns,
-                "dependencies": dependencies,
-                "metadata": {
-                    "total_patterns": len(patterns),
-                    "total_dependencies": len(dependencies),
-                    "analysis_duration": 0,  # Will be calculated
-                    "confidence_score": 0.95
-                }
-            }
+            memory_snapshot["dependencies"] = dependencies
+            self._index_dependencies(project_id, dependencies)
             
-            # Store snapshot
-            project_id = memory_snapshot["project_id"]
-            self.memory_snapshots[project_id] = memory_snapshot
+            self._finish_index_pass(project_id)
+            memory_snapshot["snapshot_id"] = str(uuid.uuid4())
+            memory_snapshot["metadata"]["analysis_duration"] = round(time.perf_counter() - started, 3)
+            await self._publish(project_id)
             
             return memory_snapshot
             
@@ -733,156 +853,430 @@ class CodebaseMemorySystem:
             logger.error("Failed to analyze project", error=str(e))
             return {}
     
-    async def _analyze_all_patterns(self, project_path: str, analysis_depth: str) -> List[Dict[str, Any]]:
-        """Analyze patterns in all relevant files"""
-        try:
-            all_patterns = []
-            path_obj = Path(project_path)
-            
-            # Get files to analyze based on depth
-            if analysis_depth == "shallow":
-                # Only analyze Python files in the root directory
-                files_to_analyze = list(path_obj.glob("*.py"))
-            else:
-                # Analyze all Python files recursively
-                files_to_analyze = list(path_obj.rglob("*.py"))
-            
-            # Limit to reasonable number of files
-            files_to_analyze = files_to_analyze[:50]  # Max 50 files
-            
-            for file_path in files_to_analyze:
-                try:
-                    patterns = await self.pattern_recognizer.analyze_file_patterns(str(file_path), "python")
-                    # Set file path for all patterns
-                    for pattern in patterns:
-                        pattern["file_path"] = str(file_path)
-                    all_patterns.extend(patterns)
-                except Exception as e:
-                    logger.warning(f"Failed to analyze file {file_path}: {e}")
-                    continue
-            
-            return all_patterns
-            
-        except Exception as e:
-            logger.error("Failed to analyze all patterns", error=str(e))
-            return []
+    async def _get_indexer(self, project_id: str, project_path: str, analysis_depth: str) -> RepositoryIndexer:
+        """Indexer (and manifest) kept per project; shallow analysis only lists the top level"""
+        max_depth = 0 if analysis_depth == "shallow" else None
+        indexer = self.indexers.get(project_id)
+        if indexer is None or indexer.max_depth != max_depth:
+            await self.stop_watching(project_id)
+            settings = get_settings()
+            if self._index_pool is None:
+                self._index_pool = ProcessPoolExecutor(max_workers=settings.MEMORY_INDEX_MAX_WORKERS)
+            indexer = RepositoryIndexer(
+                project_path,
+                max_workers=settings.MEMORY_INDEX_MAX_WORKERS,
+                max_file_bytes=settings.MEMORY_INDEX_MAX_FILE_BYTES,
+                max_depth=max_depth,
+                executor=self._index_pool,
+            )
+            self.indexers[project_id] = indexer
+        return indexer
     
-    async def search_memory(self, query: str, project_id: Optional[str] = None, 
-                          result_type: Optional[str] = None) -> List[Dict]:
-        """Search through codebase memory"""
-        results = []
-        
-        try:
-            # Search through all projects or specific project
-            projects_to_search = [project_id] if project_id else list(self.memory_snapshots.keys())
-            
-            for pid in projects_to_search:
-                if pid in self.memory_snapshots:
-                    snapshot = self.memory_snapshots[pid]
-                    
-                    # Search patterns
-                    if not result_type or result_type == "pattern":
-                        pattern_results = await self._search_patterns(query, snapshot.get("coding_patterns", []))
-                        results.extend(pattern_results)
-                    
-                    # Search dependencies
-                    if not result_type or result_type == "dependency":
-                        dep_results = await self._search_dependencies(query, snapshot.get("dependencies", []))
-                        results.extend(dep_results)
-                    
-                    # Search file structure
-                    if not result_type or result_type == "file":
-                        file_results = await self._search_files(query, snapshot.get("project_structure", {}))
-                        results.extend(file_results)
-            
-            # Sort by confidence
-            results.sort(key=lambda x: x.get("confidence", 0), reverse=True)
-            
-        except Exception as e:
-            logger.error(f"Failed to search memory: {e}")
+    def _apply_file_update(self, project_id: str, update: FileUpdate) -> None:
+        """Merge one indexer update into the project's snapshot and the search index"""
+        snapshot = self.memory_snapshots[project_id]
+        file_tree = snapshot["project_structure"].setdefault("file_tree", {})
+        file_patterns = self._file_patterns.setdefault(project_id, {})
         
-        return results
-    
-    async def _search_patterns(self, query: str, patterns: List[Dict]) -> List[Dict]:
-        """Search through coding patterns"""
-        results = []
-        query_lower = query.lower()
+        if update.status == "removed":
+            file_tree.pop(update.path, None)
+            file_patterns.pop(update.path, None)
+            self._index_file(project_id, update.path, None, [])
+            return
         
-        for pattern in patterns:
-            confidence = 0.0
-            
-            # Check pattern name
-            if query_lower in pattern.get("pattern_name", "").lower():
-                confidence += 0.8
-            
-            # Check pattern type
-            if query_lower in pattern.get("pattern_type", "").lower():
-                confidence += 0.6
-            
-            # Check language
-            if query_lower in pattern.get("language", "").lower():
-                confidence += 0.4
-            
-            if confidence > 0.3:
-                pattern["confidence"] = confidence
-                results.append(pattern)
+        entry = update.entry
+        modified = datetime.fromtimestamp(entry.mtime_ns / 1e9)
+        if entry.is_dir:
+            file_tree[update.path] = {"type": "directory", "modified": modified}
+        else:
+            file_tree[update.path] = {
+                "type": "file",
+                "size": entry.size,
+                "modified": modified,
+                "extension": os.path.splitext(update.path)[1]
+            }
+            if update.skipped:
+                file_tree[update.path]["skipped"] = update.skipped
         
-        return results
+        if update.skipped:
+            file_patterns.pop(update.path, None)
+        elif update.patterns or update.path in file_patterns:
+            if update.path not in file_patterns:
+                snapshot["coding_patterns"].extend(update.patterns)
+            file_patterns[update.path] = update.patterns
+        self._index_file(project_id, update.path, file_tree[update.path], update.patterns)
     
-    async def _search_dependencies(self, query: str, dependencies: List[Dict]) -> List[Dict]:
-        """Search through dependencies"""
-        results = []
-        query_lower = query.lower()
-        
-        for dep in dependencies:
-            confidence = 0.0
-            
-            # Check dependency name
-            if query_lower in dep.get("name", "").lower():
-                confidence += 0.9
-            
-            # Check dependency type
-            if query_lower in dep.get("type", "").lower():
-                confidence += 0.5
-            
-            # Check language
-            if query_lower in dep.get("language", "").lower():
-                confidence += 0.3
-            
-            if confidence > 0.3:
-                dep["confidence"] = confidence
-                results.append(dep)
-        
-        return results
+    def _finish_index_pass(self, project_id: str) -> None:
+        """Rebuild the flat pattern list once replaced and removed files are settled"""
+        snapshot = self.memory_snapshots[project_id]
+        file_patterns = self._file_patterns.get(project_id, {})
+        snapshot["coding_patterns"] = [
+            pattern for path in sorted(file_patterns) for pattern in file_patterns[path]
+        ]
+        snapshot["timestamp"] = datetime.now()
+        snapshot["metadata"]["total_patterns"] = len(snapshot["coding_patterns"])
+        snapshot["metadata"]["total_dependencies"] = len(snapshot.get("dependencies", []))
     
-    async def _search_files(self, query: str, project_structure: Dict[str, Any]) -> List[Dict]:
-        """Search through file structure"""
-        results = []
-        query_lower = query.lower()
-        
-        file_tree = project_structure.get("file_tree", {})
+    def _make_live(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Materialize a stored project back into mutable dicts for an indexing pass"""
+        snapshot = self.memory_snapshots.get(project_id)
+        if not isinstance(snapshot, SnapshotView):
+            return snapshot
+        self._seed_manifest(project_id, snapshot)
+        live = snapshot.to_dict()
+        self.memory_snapshots[project_id] = live
+        file_patterns: Dict[str, List[Dict[str, Any]]] = {}
+        for pattern in live["coding_patterns"]:
+            file_patterns.setdefault(pattern.get("file_path") or "", []).append(pattern)
+        self._file_patterns[project_id] = file_patterns
+        self._attach_payloads(project_id, live)
+        return live
+    
+    def _seed_manifest(self, project_id: str, snapshot: SnapshotView) -> None:
+        # After a restart the stored manifest keeps the first pass incremental
+        indexer = self.indexers.get(project_id)
+        if indexer is not None and not indexer.manifest and \
+                indexer.max_depth == (0 if snapshot.get("analysis_depth") == "shallow" else None):
+            indexer.manifest = snapshot.manifest()
+    
+    async def _publish(self, project_id: str) -> None:
+        """Persist a new snapshot version; idle projects are then served from the compact view"""
+        snapshot = self.memory_snapshots[project_id]
+        indexer = self.indexers.get(project_id)
+        manifest = dict(indexer.manifest) if indexer is not None else None
+        view = await asyncio.to_thread(self.snapshot_store.save, snapshot, manifest)
+        if not self._is_watching(project_id) and self.memory_snapshots.get(project_id) is snapshot:
+            self._go_cold(project_id, view)
+        await self._flush_vectors()
+        if self.vector_index.path is not None:
+            # Capture on the loop, write (fsync, JSON) in a thread; the lock keeps writes in capture order
+            async with self._vector_save_lock:
+                await asyncio.to_thread(self.vector_index.write_state, self.vector_index.capture_state())
+    
+    def _go_cold(self, project_id: str, view: SnapshotView) -> None:
+        self.memory_snapshots[project_id] = view
+        self._file_patterns.pop(project_id, None)
+        self._attach_payloads(project_id, view)
+    
+    def _attach_payloads(self, project_id: str, snapshot: Mapping[str, Any]) -> None:
+        """Point the project's search documents at ``snapshot`` (row references for views)"""
+        cold = isinstance(snapshot, SnapshotView)
+        positions: Counter = Counter()
+        if cold:
+            payloads = [(file_path or "", ("pattern", index))
+                        for index, file_path in enumerate(snapshot.pattern_file_paths())]
+        else:
+            payloads = [(pattern.get("file_path") or "", pattern) for pattern in snapshot.get("coding_patterns", [])]
+        for file_path, payload in payloads:
+            self.search_index.set_payload(f"{project_id}:pattern:{file_path}:{positions[file_path]}", payload)
+            positions[file_path] += 1
         
+        if cold:
+            for index, file_path in enumerate(snapshot.file_paths()):
+                self.search_index.set_payload(f"{project_id}:file:{file_path}", ("file", index))
+        else:
+            file_tree = snapshot.get("project_structure", {}).get("file_tree", {})
+            for file_path, file_data in file_tree.items():
+                self.search_index.set_payload(
+                    f"{project_id}:file:{file_path}",
+                    {"file_path": file_path, "type": "file", "file_data": file_data},
+                )
+        for position, dep in enumerate(snapshot.get("dependencies", [])):
+            self.search_index.set_payload(f"{project_id}:dependency:{position}", dep)
+    
+    def _resolve_payload(self, project_id: str, payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, tuple):
+            return payload
+        view = self.memory_snapshots[project_id]
+        kind, index = payload
+        if kind == "pattern":
+            return view.pattern(index)
+        return {"file_path": view.file_path(index), "type": "file", "file_data": view.file_data(index)}
+    
+    async def load_persisted_projects(self) -> int:
+        """Restore projects saved by a previous process into memory and the search index"""
+        loaded = 0
+        for project_id in self.snapshot_store.project_ids():
+            if project_id in self.memory_snapshots:
+                continue
+            try:
+                view = await asyncio.to_thread(self.snapshot_store.load, project_id)
+            except Exception as e:
+                logger.warning("Failed to load memory snapshot", project_id=project_id, error=str(e))
+                continue
+            if view is None:
+                continue
+            self._index_snapshot(view.to_dict())
+            self._go_cold(project_id, view)
+            if view.get("project_path"):
+                self._project_ids_by_path[os.path.abspath(view["project_path"])] = project_id
+            loaded += 1
+        logger.info("Memory snapshots restored", restored=loaded, **self.snapshot_store.get_stats())
+        return loaded
+    
+    def _is_watching(self, project_id: str) -> bool:
+        task = self._watch_tasks.get(project_id)
+        return task is not None and not task.done()
+    
+    async def start_watching(self, project_id: str, interval: Optional[float] = None) -> bool:
+        """Keep an analyzed project's memory current as files change"""
+        indexer = self.indexers.get(project_id)
+        if indexer is None:
+            return False
+        if not self._is_watching(project_id):
+            self._make_live(project_id)
+            interval = interval or get_settings().MEMORY_INDEX_WATCH_INTERVAL_SECONDS
+            self._watch_tasks[project_id] = asyncio.create_task(self._watch_project(project_id, indexer, interval))
+        return True
+    
+    async def _watch_project(self, project_id: str, indexer: RepositoryIndexer, interval: float) -> None:
+        try:
+            async for updates in indexer.watch(interval):
+                for update in updates:
+                    self._apply_file_update(project_id, update)
+                self._finish_index_pass(project_id)
+                await self._publish(project_id)
+                logger.info("Project memory updated", project_id=project_id, files=len(updates))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Project watch stopped", project_id=project_id, error=str(e))
+    
+    async def stop_watching(self, project_id: str) -> bool:
+        """Stop the watch loop for a project"""
+        task = self._watch_tasks.pop(project_id, None)
+        if task is None:
+            return False
+        task.cancel()
+        # Every watch batch was published, so the stored version is current
+        view = await asyncio.to_thread(self.snapshot_store.load, project_id)
+        if view is not None and not self._is_watching(project_id) and \
+                not isinstance(self.memory_snapshots.get(project_id), SnapshotView):
+            self._go_cold(project_id, view)
+        return True
+    
+    def get_indexing_progress(self, project_id: str) -> Dict[str, Any]:
+        """Progress of the project's current (or last) indexing pass"""
+        indexer = self.indexers.get(project_id)
+        if indexer is None:
+            return {"state": IndexState.IDLE.value, "watching": False}
+        return {**indexer.get_stats(), "watching": self._is_watching(project_id)}
+    
+    def shutdown(self) -> None:
+        """Stop watchers and the indexing process pool"""
+        for task in self._watch_tasks.values():
+            task.cancel()
+        self._watch_tasks.clear()
+        if self._index_pool is not None:
+            self._index_pool.shutdown(wait=False, cancel_futures=True)
+            self._index_pool = None
+    
+    async def store_snapshot(self, snapshot: Dict[str, Any]) -> SnapshotView:
+        """Store a project snapshot, (re)index it for search_memory and persist it as the next version"""
+        project_id = snapshot["project_id"]
+        self.memory_snapshots[project_id] = snapshot
+        self._index_snapshot(snapshot)
+        view = await asyncio.to_thread(self.snapshot_store.save, snapshot)
+        if not self._is_watching(project_id) and self.memory_snapshots.get(project_id) is snapshot:
+            self._go_cold(project_id, view)
+        return view
+
+    def _index_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        project_id = snapshot["project_id"]
+        self.search_index.remove_project(project_id)
+        get_symbol_completion_index(project_id).clear_files()
+        self._indexed_pattern_counts.pop(project_id, None)
+        self._indexed_dependency_counts.pop(project_id, None)
+
+        file_patterns: Dict[str, List[Dict[str, Any]]] = {}
+        for pattern in snapshot.get("coding_patterns", []):
+            file_patterns.setdefault(pattern.get("file_path") or "", []).append(pattern)
+        self._file_patterns[project_id] = file_patterns
+
+        file_tree = snapshot.get("project_structure", {}).get("file_tree", {})
         for file_path, file_data in file_tree.items():
-            confidence = 0.0
-            
-            # Check file name
-            if query_lower in file_path.lower():
-                confidence += 0.8
-            
-            # Check file extension
-            if query_lower in file_data.get("extension", "").lower():
-                confidence += 0.6
-            
-            if confidence > 0.3:
-                results.append({
-                    "file_path": file_path,
-                    "confidence": confidence,
-                    "type": "file",
-                    "file_data": file_data
+            self._index_file(project_id, file_path, file_data, file_patterns.get(file_path, []))
+        for file_path, patterns in file_patterns.items():
+            if file_path not in file_tree:
+                self._index_file(project_id, file_path, None, patterns)
+        self._index_dependencies(project_id, snapshot.get("dependencies", []))
+        # Vectors persisted for documents that no longer exist
+        for doc_id in self.vector_index.ids(project_id=project_id):
+            if doc_id not in self.search_index:
+                self._forget_vector(doc_id)
+
+    def _index_file(self, project_id: str, file_path: str, file_data: Optional[Dict[str, Any]],
+                    patterns: List[Dict[str, Any]]) -> None:
+        """Replace one file's documents; ``file_data=None`` drops the file entry itself"""
+        counts = self._indexed_pattern_counts.setdefault(project_id, {})
+        for position in range(counts.pop(file_path, 0)):
+            doc_id = f"{project_id}:pattern:{file_path}:{position}"
+            self.search_index.remove(doc_id)
+            if position >= len(patterns):
+                self._forget_vector(doc_id)
+
+        for position, pattern in enumerate(patterns):
+            doc_id = f"{project_id}:pattern:{file_path}:{position}"
+            self.search_index.add(
+                doc_id,
+                {
+                    "name": pattern.get("pattern_name", ""),
+                    "kind": pattern.get("pattern_type", ""),
+                    "language": pattern.get("language", ""),
+                },
+                project_id=project_id, result_type="pattern", payload=pattern,
+            )
+            self._queue_vector(doc_id, _pattern_text(pattern, file_path), {
+                "project_id": project_id, "language": pattern.get("language"), "kind": pattern.get("pattern_type"),
+            })
+        if patterns:
+            counts[file_path] = len(patterns)
+        get_symbol_completion_index(project_id).update_file(
+            file_path, [(pattern.get("pattern_name"), pattern.get("pattern_type")) for pattern in patterns]
+        )
+
+        file_id = f"{project_id}:file:{file_path}"
+        if file_data is None or file_data.get("type") != "file":
+            self._forget_vector(file_id)
+        else:
+            self._queue_vector(file_id, file_path, {"project_id": project_id, "kind": "file"})
+        if file_data is None:
+            self.search_index.remove(file_id)
+        else:
+            self.search_index.add(
+                file_id,
+                {"path": file_path, "kind": file_data.get("extension", "")},
+                project_id=project_id, result_type="file",
+                payload={"file_path": file_path, "type": "file", "file_data": file_data},
+            )
+
+    def _queue_vector(self, doc_id: str, text: str, metadata: Dict[str, Any]) -> None:
+        # Texts are embedded in batches on the next flush; unchanged ones keep their vector
+        checksum = zlib.crc32(text.encode("utf-8"))
+        if self.vector_index.get_payload(doc_id) == checksum:
+            self._pending_vectors.pop(doc_id, None)
+        else:
+            self._pending_vectors[doc_id] = (text, metadata, checksum)
+
+    def _forget_vector(self, doc_id: str) -> None:
+        self._pending_vectors.pop(doc_id, None)
+        self.vector_index.delete([doc_id])
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        if self._embedder is None:
+            return np.asarray(await get_embedding_batcher().embed_many(texts), dtype=np.float32)
+        if len(texts) > 64:
+            return await asyncio.to_thread(self._embedder.embed_texts, texts)
+        return self._embedder.embed_texts(texts)
+
+    async def _flush_vectors(self) -> None:
+        """Embed every queued pattern and file and add them to the vector index"""
+        pending, self._pending_vectors = self._pending_vectors, {}
+        doc_ids = list(pending)
+        for start in range(0, len(doc_ids), VECTOR_EMBED_BATCH):
+            batch = doc_ids[start:start + VECTOR_EMBED_BATCH]
+            try:
+                vectors = await self._embed([pending[doc_id][0] for doc_id in batch])
+            except Exception as e:
+                logger.warning("Failed to embed memory documents", documents=len(doc_ids) - start, error=str(e))
+                for doc_id in doc_ids[start:]:
+                    self._pending_vectors.setdefault(doc_id, pending[doc_id])
+                return
+            # Documents re-queued or dropped while embedding are left to their newer state
+            keep = [i for i, doc_id in enumerate(batch)
+                    if doc_id in self.search_index and doc_id not in self._pending_vectors]
+            self.vector_index.add([batch[i] for i in keep], vectors[keep],
+                                  [pending[batch[i]][1] for i in keep], [pending[batch[i]][2] for i in keep])
+
+    def _index_dependencies(self, project_id: str, dependencies: List[Dict[str, Any]]) -> None:
+        for position in range(self._indexed_dependency_counts.pop(project_id, 0)):
+            self.search_index.remove(f"{project_id}:dependency:{position}")
+        for position, dep in enumerate(dependencies):
+            self.search_index.add(
+                f"{project_id}:dependency:{position}",
+                {"name": dep.get("name", ""), "kind": dep.get("type", ""), "language": dep.get("language", "")},
+                project_id=project_id, result_type="dependency", payload=dep,
+            )
+        self._indexed_dependency_counts[project_id] = len(dependencies)
+
+    async def search_memory(self, query: str, project_id: Optional[str] = None,
+                          result_type: Optional[Union[str, List[str]]] = None,
+                          limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Search through codebase memory; every match unless ``limit`` is given"""
+        page = await self.search_memory_page(query, project_id, result_type, limit, offset)
+        return page["results"]
+
+    async def search_memory_page(self, query: str, project_id: Optional[str] = None,
+                                 result_type: Optional[Union[str, List[str]]] = None,
+                                 limit: Optional[int] = 50, offset: int = 0) -> Dict[str, Any]:
+        """
+        Ranked, paginated search. Results are copies carrying ``score`` (BM25)
+        and ``confidence`` (score against the query's self-match score, 0-1,
+        so comparable across queries); the stored snapshots are not modified.
+        """
+        result_types = [result_type] if isinstance(result_type, str) else result_type
+        page = {"results": [], "total": 0, "offset": offset, "limit": limit}
+
+        try:
+            hits = self.search_index.search(
+                query, project_id=project_id, result_types=result_types, limit=limit, offset=offset
+            )
+            page["total"] = hits.total
+            page["results"] = [
+                {**self._resolve_payload(hit.project_id, hit.payload),
+                 "result_type": hit.result_type, "project_id": hit.project_id, "score": hit.score,
+                 "confidence": hits.confidence(hit)}
+                for hit in hits.hits
+            ]
+        except Exception as e:
+            logger.error(f"Failed to search memory: {e}")
+
+        return page
+    
+    async def retrieve_context(self, query: str, project_id: Optional[str] = None, limit: int = 8,
+                               language: Optional[str] = None,
+                               kinds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Patterns and files to put in a prompt for ``query``: nearest neighbours
+        from the vector index and BM25 hits, merged by reciprocal rank fusion.
+        ``kinds`` filters by pattern type (``"function"``, ``"class"``, ...,
+        or ``"file"``).
+        """
+        candidates = max(limit * 4, 20)
+        fused: Counter = Counter()
+        try:
+            await self._flush_vectors()
+            if len(self.vector_index):
+                query_vector = (await self._embed([query]))[0]
+                hits = self.vector_index.search(query_vector, candidates, filters={
+                    "project_id": project_id, "language": language, "kind": kinds,
                 })
-        
+                for rank, hit in enumerate(hits):
+                    fused[hit.id] += 1.0 / (RRF_K + rank + 1)
+        except Exception as e:
+            logger.warning("Semantic memory search failed", error=str(e))
+
+        lexical = self.search_index.search(query, project_id=project_id, result_types=["pattern", "file"],
+                                           limit=candidates)
+        rank = 0
+        for hit in lexical.hits:
+            result = self._resolve_payload(hit.project_id, hit.payload)
+            kind = "file" if hit.result_type == "file" else result.get("pattern_type")
+            if (kinds and kind not in kinds) or (language and result.get("language") != language):
+                continue
+            fused[hit.doc_id] += 1.0 / (RRF_K + rank + 1)
+            rank += 1
+
+        results = []
+        for doc_id, score in fused.most_common(limit):
+            hit_project, result_type, _ = doc_id.split(":", 2)
+            payload = self.search_index.get_payload(doc_id)
+            if payload is None:
+                continue
+            results.append({**self._resolve_payload(hit_project, payload), "result_type": result_type,
+                            "project_id": hit_project, "score": round(score, 6)})
         return results
-    
+
     async def get_memory_status(self) -> Dict[str, Any]:
         """Get memory system status"""
         try:
@@ -911,6 +1305,10 @@ class CodebaseMemorySystem:
                     (snapshot.get("timestamp", datetime.min) for snapshot in self.memory_snapshots.values()),
                     default=datetime.min
                 ),
+                "search_index": self.search_index.get_stats(),
+                "snapshot_store": self.snapshot_store.get_stats(),
+                "vector_index": {**self.vector_index.get_stats(), "pending": len(self._pending_vectors)},
+                "indexing": {project_id: self.get_indexing_progress(project_id) for project_id in self.indexers},
                 "cache_hit_rate": 0.95,
                 "performance_score": 0.98,
                 "timestamp": datetime.now()
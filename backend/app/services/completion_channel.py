@@ -0,0 +1,288 @@
+"""
+Completion Channel
+Persistent, multiplexed inline-completion protocol for one editor connection.
+The client opens documents once and then sends incremental edits; completion
+requests are debounced per file, and a newer keystroke cancels any generation
+it supersedes. Transport-agnostic: the WebSocket endpoint feeds decoded
+messages to ``handle`` and passes its ``send_json`` as the sender.
+
+Client messages (positions are ``[line, column]`` with a 1-based line and a
+0-based column, like ``CompletionContext.cursor_position``)::
+
+    {"type": "open", "file_path", "language", "content", "version"?, "project_id"?, "cursor"?}
+    {"type": "change", "file_path", "version", "changes": [{"start", "end", "text"}, ...]}
+    {"type": "complete", "file_path", "cursor", "request_id"?, "stream"?}
+    {"type": "cancel", "file_path"?}
+    {"type": "close", "file_path"}
+
+Server messages: ``opened``, ``completion`` (``partial`` while streaming),
+``cancelled``, ``resync`` (the client must re-``open`` the file) and ``error``.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.core.completion_cache import cursor_offset
+from app.services.smart_coding_ai_enums import Language
+from app.services.smart_coding_ai_models import CompletionContext, InlineCompletion
+
+logger = structlog.get_logger()
+
+Sender = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class ChannelError(ValueError):
+    """A client message the channel cannot act on"""
+
+
+@dataclass
+class _Document:
+    file_path: str
+    language: Language
+    content: str
+    version: int
+    project_id: Optional[str] = None
+    pending: Optional[asyncio.Task] = None
+    request_id: Optional[str] = None
+
+
+def _position(value: Any) -> Tuple[int, int]:
+    try:
+        line, column = value
+        return int(line), int(column)
+    except (TypeError, ValueError):
+        raise ChannelError(f"Invalid position: {value!r}")
+
+
+def apply_changes(content: str, changes: List[Dict[str, Any]]) -> str:
+    """
+    Apply edits in order, each replacing ``start``..``end`` with ``text``
+    in the document produced by the previous one. A change without a range
+    replaces the whole document.
+    """
+    for change in changes:
+        text = change.get("text", "")
+        if "start" not in change:
+            content = text
+            continue
+        start = cursor_offset(content, *_position(change["start"]))
+        end = cursor_offset(content, *_position(change.get("end", change["start"])))
+        if end < start:
+            raise ChannelError("Change range ends before it starts")
+        content = content[:start] + text + content[end:]
+    return content
+
+
+def completion_payload(completion: InlineCompletion) -> Dict[str, Any]:
+    return {
+        "completion_id": completion.completion_id,
+        "text": completion.text,
+        "completion_type": completion.completion_type,
+        "confidence": completion.confidence,
+        "start": [completion.start_line, completion.start_column],
+        "end": [completion.end_line, completion.end_column],
+        "description": completion.description,
+    }
+
+
+class CompletionChannel:
+    """
+    Completion state of one connection: open documents by path, at most one
+    pending generation per document. ``engine`` provides ``get_inline_completion``
+    and ``get_streaming_completion`` (the optimized smart coding service).
+    """
+
+    def __init__(self, engine: Any, send: Sender, user_id: Optional[str] = None, debounce_ms: float = 30.0,
+                 max_documents: int = 32, max_document_chars: int = 2_000_000):
+        self.engine = engine
+        self.user_id = user_id
+        self.debounce_ms = debounce_ms
+        self.max_documents = max_documents
+        self.max_document_chars = max_document_chars
+        self.documents: Dict[str, _Document] = {}
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        self.stats = {"requests": 0, "completions": 0, "superseded": 0, "cancelled": 0, "resyncs": 0,
+                      "delta_bytes": 0, "errors": 0}
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        async with self._send_lock:
+            await self._send(message)
+
+    async def handle(self, message: Dict[str, Any]) -> None:
+        """Act on one client message; protocol errors are reported to the client"""
+        handlers = {
+            "open": self._open,
+            "change": self._change,
+            "complete": self._complete,
+            "cancel": self._cancel,
+            "close": self._close_document,
+        }
+        handler = handlers.get(message.get("type"))
+        try:
+            if handler is None:
+                raise ChannelError(f"Unknown message type: {message.get('type')!r}")
+            await handler(message)
+        except (TypeError, ValueError) as e:  # ChannelError or a malformed field
+            self.stats["errors"] += 1
+            await self.send({"type": "error", "file_path": message.get("file_path"), "detail": str(e)})
+
+    def _document(self, message: Dict[str, Any]) -> _Document:
+        document = self.documents.get(message.get("file_path"))
+        if document is None:
+            raise ChannelError(f"File is not open: {message.get('file_path')!r}")
+        return document
+
+    def _check_size(self, content: str) -> None:
+        if len(content) > self.max_document_chars:
+            raise ChannelError("Document exceeds the channel size limit")
+
+    # -- documents -----------------------------------------------------------
+
+    async def _open(self, message: Dict[str, Any]) -> None:
+        file_path = message.get("file_path")
+        if not file_path:
+            raise ChannelError("file_path is required")
+        try:
+            language = Language(str(message.get("language", "python")).lower())
+        except ValueError:
+            raise ChannelError(f"Unsupported language: {message.get('language')}")
+        content = message.get("content") or ""
+        self._check_size(content)
+
+        previous = self.documents.pop(file_path, None)
+        if previous is not None:
+            self._supersede(previous)
+        elif len(self.documents) >= self.max_documents:
+            raise ChannelError(f"At most {self.max_documents} files can be open per connection")
+        document = _Document(file_path, language, content, int(message.get("version", 0)), message.get("project_id"))
+        self.documents[file_path] = document
+        await self.send({"type": "opened", "file_path": file_path, "version": document.version})
+
+        if self.user_id is not None and hasattr(self.engine, "record_file_access"):
+            cursor = _position(message["cursor"]) if message.get("cursor") else None
+            await self.engine.record_file_access(self.user_id, file_path, document.project_id, cursor)
+
+    async def _change(self, message: Dict[str, Any]) -> None:
+        document = self._document(message)
+        self._supersede(document)
+        version = int(message.get("version", document.version + 1))
+        if version != document.version + 1:
+            # A delta was lost or reordered; applying this one would corrupt the document
+            self.stats["resyncs"] += 1
+            del self.documents[document.file_path]
+            await self.send({"type": "resync", "file_path": document.file_path, "version": document.version})
+            return
+        changes = message.get("changes") or []
+        content = apply_changes(document.content, changes)
+        self._check_size(content)
+        document.content = content
+        document.version = version
+        self.stats["delta_bytes"] += sum(len(change.get("text", "")) for change in changes)
+
+    async def _close_document(self, message: Dict[str, Any]) -> None:
+        document = self.documents.pop(message.get("file_path"), None)
+        if document is not None:
+            self._supersede(document)
+
+    # -- completions ---------------------------------------------------------
+
+    async def _complete(self, message: Dict[str, Any]) -> None:
+        document = self._document(message)
+        if "version" in message and int(message["version"]) != document.version:
+            raise ChannelError(f"Stale completion request for version {message['version']}")
+        self._supersede(document)
+        self.stats["requests"] += 1
+        context = CompletionContext(
+            file_path=document.file_path,
+            language=document.language,
+            content=document.content,
+            cursor_position=_position(message.get("cursor")),
+            project_context={"project_id": document.project_id} if document.project_id else None
+        )
+        request_id = message.get("request_id") or str(uuid.uuid4())
+        document.request_id = request_id
+        document.pending = asyncio.create_task(
+            self._generate(document, context, request_id, bool(message.get("stream")))
+        )
+
+    def _supersede(self, document: _Document) -> None:
+        # Newer input for the file makes the pending completion stale
+        if document.pending is not None and not document.pending.done():
+            document.pending.cancel()
+            self.stats["superseded"] += 1
+        document.pending = None
+
+    async def _generate(self, document: _Document, context: CompletionContext, request_id: str,
+                        stream: bool) -> None:
+        streams = getattr(self.engine, "streaming_completions", {})
+        try:
+            # Debounce: a keystroke within the window cancels this task before any work starts
+            await asyncio.sleep(self.debounce_ms / 1000)
+            streams[request_id] = {"file_path": document.file_path, "user_id": self.user_id,
+                                   "started": time.time()}
+            base = {"type": "completion", "file_path": document.file_path, "request_id": request_id,
+                    "version": document.version}
+            if stream:
+                last = None
+                async for completion in self.engine.get_streaming_completion(context):
+                    if last is not None:
+                        await self.send({**base, "partial": True, "completion": completion_payload(last)})
+                    last = completion
+                if last is None:
+                    raise RuntimeError("No completion produced")
+                completion = last
+            else:
+                completion = await self.engine.get_inline_completion(context)
+            self.stats["completions"] += 1
+            await self.send({**base, "partial": False, "completion": completion_payload(completion)})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error("Channel completion failed", file_path=document.file_path, error=str(e))
+            await self.send({"type": "error", "file_path": document.file_path, "request_id": request_id,
+                             "detail": str(e)})
+        finally:
+            streams.pop(request_id, None)
+
+    async def _cancel(self, message: Dict[str, Any]) -> None:
+        file_path = message.get("file_path")
+        documents = [self._document(message)] if file_path else list(self.documents.values())
+        for document in documents:
+            if document.pending is not None and not document.pending.done():
+                document.pending.cancel()
+                self.stats["cancelled"] += 1
+                await self.send({"type": "cancelled", "file_path": document.file_path,
+                                 "request_id": document.request_id})
+            document.pending = None
+
+    async def close(self) -> None:
+        """Cancel every pending generation (the connection went away)"""
+        tasks = [document.pending for document in self.documents.values()
+                 if document.pending is not None and not document.pending.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.documents.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "open_documents": len(self.documents),
+            "in_flight": sum(1 for document in self.documents.values()
+                             if document.pending is not None and not document.pending.done()),
+        }
+
+
+__all__ = [
+    "ChannelError",
+    "CompletionChannel",
+    "apply_changes",
+    "completion_payload",
+]
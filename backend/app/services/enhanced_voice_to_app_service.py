@@ -18,6 +18,7 @@ import io
 from app.services.smarty_ai_orchestrator import smarty_ai_orchestrator, OrchestrationMode, CodeGenerationStrategy
 from app.services.smarty_agent_integration import smarty_agent_integration, AgentSmartyMode, AgentCodeCapability
 from app.core.config import settings
+from app.core.speech_to_text import NoSpeechError, get_speech_to_text_engine
 
 logger = structlog.get_logger(__name__)
 
@@ -181,17 +182,16 @@ class EnhancedVoiceToAppService:
             return response
 
     async def _transcribe_audio_inline(self, audio_file, language: str = "en") -> str:
-        """Inline audio transcription (migrated from VoiceService)"""
+        """Offline transcription; the file is read, segmented and decoded in chunks"""
         try:
-            # Mock implementation - in production, integrate with Whisper or similar
-            mock_transcripts = {
-                "en": "Create a todo app with add, edit, and delete functionality",
-                "hi": "एक टूडू ऐप बनाएं जिसमें जोड़ने, संपादित करने और हटाने की सुविधा हो",
-                "ta": "செய்ய வேண்டியவை பட்டியல் செயலியை உருவாக்குங்கள்",
-                "te": "టూడూ యాప్‌ను సృష్టించండి",
-                "bn": "একটি টুডু অ্যাপ তৈরি করুন",
-            }
-            return mock_transcripts.get(language, mock_transcripts["en"])
+            transcript = await get_speech_to_text_engine().transcribe(
+                audio_file, language, max_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024
+            )
+            if not transcript.text:
+                raise NoSpeechError("No speech detected in audio")
+            logger.info("Audio transcribed", backend=transcript.backend, segments=len(transcript.segments),
+                        speech_seconds=round(transcript.speech_seconds, 2), elapsed_ms=round(transcript.elapsed_ms, 1))
+            return transcript.text
         except Exception as e:
             logger.error("Audio transcription failed", error=str(e))
             raise
@@ -206,7 +206,7 @@ class EnhancedVoiceToAppService:
             # Convert bytes to file-like object
             audio_file = io.BytesIO(request.audio_data)
             
-            # Transcribe audio inline (mock implementation for now)
+            # Transcribe audio inline
             transcript = await self._transcribe_audio_inline(
                 audio_file, request.language
             )
@@ -821,6 +821,11 @@ class VoiceService:
         """Transcribe audio using local/browser processing"""
         return await self._service._transcribe_audio_inline(audio_file, language)
     
+    def stream_transcription(self, audio_file, language: str = "en"):
+        """Partial transcripts as each speech segment is decoded"""
+        return get_speech_to_text_engine().stream(audio_file, language,
+                                                  max_bytes=settings.MAX_FILE_SIZE_MB * 1024 * 1024)
+    
     async def transcribe_cloud(self, audio_file, language: str = "en") -> str:
         """Transcribe audio using cloud processing"""
         return await self._service._transcribe_audio_inline(audio_file, language)
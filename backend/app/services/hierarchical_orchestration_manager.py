@@ -15,9 +15,13 @@ from enum import Enum
 from decimal import Decimal
 import statistics
 import threading
+from contextlib import asynccontextmanager
 from concurrent.futures import ThreadPoolExecutor
 import queue
 
+from app.core.adaptive_concurrency import AdaptiveConcurrencyLimiter, OverloadedError
+from app.core.result_store import create_result_store
+
 # Import all orchestrators
 from .meta_ai_orchestrator_unified import UnifiedMetaAIOrchestrator
 from .unified_ai_component_orchestrator import UnifiedAIComponentOrchestrator
@@ -117,6 +121,30 @@ class LoadBalancingConfig:
     performance_window: int = 100  # Tasks to consider for performance metrics
     adaptive_routing_enabled: bool = True
     consensus_required_for_complexity: TaskComplexity = TaskComplexity.COMPLEX
+    # Per-orchestrator adaptive concurrency (AIMD on observed latency)
+    initial_concurrency: int = 4
+    max_concurrency: int = 10
+    max_queued_tasks: int = 16
+    queue_timeout: float = 5.0
+    latency_tolerance: float = 2.0
+
+
+# Admission priority is the task priority plus a boost for costly-to-lose work;
+# under overload the lowest admission priority is shed first
+COMPLEXITY_PRIORITY_BOOST = {
+    TaskComplexity.SIMPLE: 0,
+    TaskComplexity.MODERATE: 0,
+    TaskComplexity.COMPLEX: 1,
+    TaskComplexity.CRITICAL: 2,
+    TaskComplexity.SUPREME: 3,
+}
+
+# Strategies that fan one task out to several orchestrators
+MULTI_ORCHESTRATOR_STRATEGIES = {
+    OrchestrationStrategy.PARALLEL_PROCESSING,
+    OrchestrationStrategy.HIERARCHICAL_CASCADE,
+    OrchestrationStrategy.CONSENSUS_VALIDATION,
+}
 
 
 # ============================================================================
@@ -129,7 +157,7 @@ class HierarchicalOrchestrationManager:
     through intelligent coordination, load balancing, and hierarchical processing
     """
     
-    def __init__(self):
+    def __init__(self, load_balancing_config: Optional[LoadBalancingConfig] = None):
         # Initialize all orchestrators
         self.orchestrators = {
             OrchestrationLevel.STRATEGIC: UnifiedMetaAIOrchestrator(),
@@ -178,15 +206,31 @@ class HierarchicalOrchestrationManager:
         self.orchestrator_metrics: Dict[str, OrchestratorMetrics] = {}
         self.task_queue = queue.PriorityQueue()
         self.active_tasks: Dict[str, OrchestrationTask] = {}
-        self.task_results: Dict[str, OrchestrationResult] = {}
+        self.task_results = create_result_store("hierarchical_task_results")  # task id -> OrchestrationResult
         
         # Configuration
-        self.load_balancing_config = LoadBalancingConfig()
+        self.load_balancing_config = load_balancing_config or LoadBalancingConfig()
         
         # Threading
         self.executor = ThreadPoolExecutor(max_workers=self.load_balancing_config.max_parallel_tasks)
         self.lock = threading.Lock()
         
+        # Admission control
+        config = self.load_balancing_config
+        self.limiters: Dict[str, AdaptiveConcurrencyLimiter] = {
+            name: AdaptiveConcurrencyLimiter(
+                name,
+                initial_limit=config.initial_concurrency,
+                max_limit=config.max_concurrency,
+                max_queue=config.max_queued_tasks,
+                queue_timeout=config.queue_timeout,
+                latency_tolerance=config.latency_tolerance,
+            )
+            for name in self.orchestrator_metadata
+        }
+        self.admission_stats = {"shed": 0, "degraded": 0}
+        self._background_tasks: set = set()
+        
         # Initialize metrics
         self._initialize_orchestrator_metrics()
         
@@ -215,7 +259,7 @@ class HierarchicalOrchestrationManager:
             logger.info(f"Routing task {task.task_id} with complexity {task.complexity}")
             
             # Determine orchestration strategy
-            strategy = await self._determine_orchestration_strategy(task)
+            strategy = self._degrade_when_saturated(await self._determine_orchestration_strategy(task))
             
             # Execute based on strategy
             result = await self._execute_orchestration_strategy(task, strategy)
@@ -230,6 +274,10 @@ class HierarchicalOrchestrationManager:
             logger.info(f"Task {task.task_id} completed with strategy {strategy}")
             return result
             
+        except OverloadedError as e:
+            self.admission_stats["shed"] += 1
+            logger.warning(f"Task {task.task_id} shed", reason=str(e), priority=self._admission_priority(task))
+            raise
         except Exception as e:
             logger.error(f"Task routing failed for {task.task_id}", error=str(e))
             return OrchestrationResult(
@@ -266,6 +314,34 @@ class HierarchicalOrchestrationManager:
         
         return OrchestrationStrategy.SINGLE_ORCHESTRATOR
     
+    def _degrade_when_saturated(self, strategy: OrchestrationStrategy) -> OrchestrationStrategy:
+        """Fan-out multiplies load; a saturated system routes to one orchestrator instead"""
+        if strategy in MULTI_ORCHESTRATOR_STRATEGIES and self._is_saturated():
+            self.admission_stats["degraded"] += 1
+            return OrchestrationStrategy.SINGLE_ORCHESTRATOR
+        return strategy
+    
+    def _is_saturated(self) -> bool:
+        limiters = self.limiters.values()
+        if any(limiter.queued for limiter in limiters):
+            return True
+        return sum(limiter.load for limiter in limiters) / len(self.limiters) >= self.load_balancing_config.load_threshold
+    
+    def _admission_priority(self, task: OrchestrationTask) -> int:
+        return task.priority + COMPLEXITY_PRIORITY_BOOST.get(task.complexity, 0)
+    
+    @asynccontextmanager
+    async def _admitted(self, task: OrchestrationTask, orchestrator_name: str):
+        """Hold one of the orchestrator's concurrency slots; raises OverloadedError when shed"""
+        limiter = self.limiters[orchestrator_name]
+        metrics = self.orchestrator_metrics[orchestrator_name]
+        try:
+            async with limiter.slot(self._admission_priority(task)):
+                metrics.current_load = limiter.load
+                yield
+        finally:
+            metrics.current_load = limiter.load
+    
     async def _execute_orchestration_strategy(self, task: OrchestrationTask, strategy: OrchestrationStrategy) -> OrchestrationResult:
         """Execute the determined orchestration strategy"""
         
@@ -298,16 +374,17 @@ class HierarchicalOrchestrationManager:
         
         try:
             # Route to appropriate orchestrator method
-            if orchestrator_name == "unified_meta_ai":
-                result_data = await orchestrator.start_meta_orchestration(task)
-            elif orchestrator_name == "unified_ai_component":
-                result_data = await orchestrator.coordinate_components(task)
-            elif orchestrator_name == "swarm_ai":
-                result_data = await orchestrator.execute_swarm_task(task)
-            elif orchestrator_name == "ai_orchestration_layer":
-                result_data = await orchestrator.orchestrate_validation(task.task_type, task.requirements)
-            else:
-                result_data = await orchestrator.orchestrate_task(task)
+            async with self._admitted(task, orchestrator_name):
+                if orchestrator_name == "unified_meta_ai":
+                    result_data = await orchestrator.start_meta_orchestration(task)
+                elif orchestrator_name == "unified_ai_component":
+                    result_data = await orchestrator.coordinate_components(task)
+                elif orchestrator_name == "swarm_ai":
+                    result_data = await orchestrator.execute_swarm_task(task)
+                elif orchestrator_name == "ai_orchestration_layer":
+                    result_data = await orchestrator.orchestrate_validation(task.task_type, task.requirements)
+                else:
+                    result_data = await orchestrator.orchestrate_task(task)
             
             return OrchestrationResult(
                 task_id=task.task_id,
@@ -319,6 +396,8 @@ class HierarchicalOrchestrationManager:
                 confidence_score=0.85
             )
             
+        except OverloadedError:
+            raise
         except Exception as e:
             return OrchestrationResult(
                 task_id=task.task_id,
@@ -344,6 +423,8 @@ class HierarchicalOrchestrationManager:
             
             # Wait for all to complete
             results = await asyncio.gather(*[task[1] for task in tasks], return_exceptions=True)
+            if all(isinstance(r, OverloadedError) for r in results):
+                raise results[0]
             
             # Combine results
             combined_result = await self._combine_parallel_results(task, results, [t[0] for t in tasks])
@@ -357,6 +438,8 @@ class HierarchicalOrchestrationManager:
                 confidence_score=combined_result["confidence"]
             )
             
+        except OverloadedError:
+            raise
         except Exception as e:
             return OrchestrationResult(
                 task_id=task.task_id,
@@ -406,6 +489,8 @@ class HierarchicalOrchestrationManager:
                 confidence_score=current_result.get("confidence", 0.0)
             )
             
+        except OverloadedError:
+            raise
         except Exception as e:
             return OrchestrationResult(
                 task_id=task.task_id,
@@ -443,6 +528,8 @@ class HierarchicalOrchestrationManager:
                 consensus_reached=consensus_result["consensus_reached"]
             )
             
+        except OverloadedError:
+            raise
         except Exception as e:
             return OrchestrationResult(
                 task_id=task.task_id,
@@ -571,18 +658,19 @@ class HierarchicalOrchestrationManager:
         
         try:
             # Route to appropriate method based on orchestrator
-            if orchestrator_name == "unified_meta_ai":
-                result = await orchestrator.start_meta_orchestration(task)
-            elif orchestrator_name == "unified_ai_component":
-                result = await orchestrator.coordinate_components(task)
-            elif orchestrator_name == "swarm_ai":
-                result = await orchestrator.execute_swarm_task(task)
-            elif orchestrator_name == "smarty":
-                result = await self._execute_smarty_task(task, orchestrator)
-            elif orchestrator_name == "ai_orchestration_layer":
-                result = await orchestrator.orchestrate_validation(task.task_type, task.requirements)
-            else:
-                result = await orchestrator.orchestrate_task(task)
+            async with self._admitted(task, orchestrator_name):
+                if orchestrator_name == "unified_meta_ai":
+                    result = await orchestrator.start_meta_orchestration(task)
+                elif orchestrator_name == "unified_ai_component":
+                    result = await orchestrator.coordinate_components(task)
+                elif orchestrator_name == "swarm_ai":
+                    result = await orchestrator.execute_swarm_task(task)
+                elif orchestrator_name == "smarty":
+                    result = await self._execute_smarty_task(task, orchestrator)
+                elif orchestrator_name == "ai_orchestration_layer":
+                    result = await orchestrator.orchestrate_validation(task.task_type, task.requirements)
+                else:
+                    result = await orchestrator.orchestrate_task(task)
             
             return {
                 "success": True,
@@ -591,6 +679,8 @@ class HierarchicalOrchestrationManager:
                 "orchestrator": orchestrator_name
             }
             
+        except OverloadedError:
+            raise
         except Exception as e:
             return {
                 "success": False,
@@ -842,14 +932,32 @@ class HierarchicalOrchestrationManager:
             user_id=user_id
         )
         
+        # Fail fast (HTTP 429) instead of accepting work that would only be shed later
+        orchestrator_name, _ = await self._select_best_orchestrator(task)
+        limiter = self.limiters[orchestrator_name]
+        if limiter.would_shed(self._admission_priority(task)):
+            self.admission_stats["shed"] += 1
+            raise OverloadedError(orchestrator_name, "wait queue is full", limiter.retry_after())
+        
         self.active_tasks[task.task_id] = task
         
         # Execute task asynchronously
-        asyncio.create_task(self.route_task(task))
+        background = asyncio.create_task(self._run_submitted_task(task))
+        self._background_tasks.add(background)
+        background.add_done_callback(self._background_tasks.discard)
         
         logger.info(f"Task {task.task_id} submitted for hierarchical orchestration")
         return task.task_id
     
+    async def _run_submitted_task(self, task: OrchestrationTask) -> None:
+        try:
+            result = await self.route_task(task)
+        except OverloadedError as e:
+            result = OrchestrationResult(task_id=task.task_id, success=False, error_message=str(e))
+        finally:
+            self.active_tasks.pop(task.task_id, None)
+        self.task_results.put(task.task_id, result, user_id=task.user_id)
+    
     async def get_task_result(self, task_id: str) -> Optional[OrchestrationResult]:
         """Get result for a completed task"""
         return self.task_results.get(task_id)
@@ -861,7 +969,10 @@ class HierarchicalOrchestrationManager:
             "hierarchical_manager": {
                 "active_tasks": len(self.active_tasks),
                 "completed_tasks": len(self.task_results),
-                "load_balancing_enabled": self.load_balancing_config.adaptive_routing_enabled
+                "load_balancing_enabled": self.load_balancing_config.adaptive_routing_enabled,
+                "saturated": self._is_saturated(),
+                "result_store": self.task_results.get_stats(),
+                **self.admission_stats
             },
             "orchestrators": {}
         }
@@ -874,7 +985,8 @@ class HierarchicalOrchestrationManager:
                 "average_execution_time": metrics.average_execution_time,
                 "average_confidence": metrics.average_confidence,
                 "current_load": metrics.current_load,
-                "last_used": metrics.last_used.isoformat() if metrics.last_used else None
+                "last_used": metrics.last_used.isoformat() if metrics.last_used else None,
+                "concurrency": self.limiters[name].get_stats()
             }
         
         return status
@@ -985,6 +1097,25 @@ class HierarchicalOrchestrationManager:
 # CONVENIENCE FUNCTIONS
 # ============================================================================
 
+_hierarchical_manager: Optional[HierarchicalOrchestrationManager] = None
+
+
+def get_hierarchical_orchestration_manager() -> HierarchicalOrchestrationManager:
+    """Shared manager, so admission limits and results span requests"""
+    global _hierarchical_manager
+    if _hierarchical_manager is None:
+        from app.core.config import get_settings
+        settings = get_settings()
+        _hierarchical_manager = HierarchicalOrchestrationManager(LoadBalancingConfig(
+            initial_concurrency=settings.ORCHESTRATOR_INITIAL_CONCURRENCY,
+            max_concurrency=settings.ORCHESTRATOR_MAX_CONCURRENCY,
+            max_queued_tasks=settings.ORCHESTRATOR_MAX_QUEUED_TASKS,
+            queue_timeout=settings.ORCHESTRATOR_QUEUE_TIMEOUT_SECONDS,
+            latency_tolerance=settings.ORCHESTRATOR_LATENCY_TOLERANCE,
+        ))
+    return _hierarchical_manager
+
+
 async def create_hierarchical_orchestration_manager() -> HierarchicalOrchestrationManager:
     """Create and initialize hierarchical orchestration manager"""
     manager = HierarchicalOrchestrationManager()
@@ -15,6 +15,8 @@ from enum import Enum
 from decimal import Decimal
 import statistics
 
+from app.core.result_store import create_result_store
+
 logger = structlog.get_logger()
 
 
@@ -234,7 +236,7 @@ class UnifiedMetaAIOrchestrator:
     """Unified Meta AI Orchestrator - Supreme God of Cognomega Platform"""
     
     def __init__(self):
-        self.orchestration_tasks: Dict[str, MetaOrchestrationTask] = {}
+        self.orchestration_tasks = create_result_store("meta_orchestration_tasks")  # id -> MetaOrchestrationTask
         self.component_health: Dict[str, ComponentHealth] = {}
         self.escalation_actions: Dict[str, EscalationAction] = {}
         self.permanent_solutions: Dict[str, PermanentSolution] = {}
@@ -311,10 +313,14 @@ class UnifiedMetaAIOrchestrator:
             created_at=datetime.now()
         )
         
-        self.orchestration_tasks[orchestration_id] = task
+        # Pinned while the plan updates it in place
+        self.orchestration_tasks.put(orchestration_id, task, pinned=True)
         
         # Execute orchestration plan
-        await self._execute_orchestration_plan(orchestration_id)
+        try:
+            await self._execute_orchestration_plan(orchestration_id)
+        finally:
+            self.orchestration_tasks.unpin(orchestration_id)
         
         return {
             "orchestration_id": orchestration_id,
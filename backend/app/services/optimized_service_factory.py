@@ -20,8 +20,10 @@ from app.core.interfaces.service_interfaces import (
     IUserService, IAuthService, IAIAgentService, IAppGenerationService, IMonitoringService
 )
 from app.core.strategies.ai_provider_strategy import (
-    IAiProviderStrategy, OpenAIStrategy, HuggingFaceStrategy, LocalLLMStrategy
+    IAiProviderStrategy, OpenAIStrategy, AnthropicStrategy, HuggingFaceStrategy, LocalLLMStrategy,
+    GroqStrategy, TogetherStrategy
 )
+from app.core.strategies.provider_router import ProviderRouter, get_provider_router
 from app.core.commands.command_pattern import (
     Command, CreateUserCommand, UpdateAgentCommand, CommandInvoker
 )
@@ -168,8 +170,12 @@ class OptimizedServiceFactory:
         """Get AI provider strategy (Strategy Pattern)"""
         strategies = {
             "openai": OpenAIStrategy,
+            "anthropic": AnthropicStrategy,
+            "groq": GroqStrategy,
+            "together": TogetherStrategy,
             "huggingface": HuggingFaceStrategy,
-            "local": LocalLLMStrategy
+            "local": LocalLLMStrategy,
+            "local_llm": LocalLLMStrategy
         }
         
         strategy_class = strategies.get(provider_type.lower())
@@ -190,6 +196,10 @@ class OptimizedServiceFactory:
         api_key = api_key_map.get(provider_type.lower()) or "dev-api-key"
         return strategy_class(api_key=api_key)
     
+    def get_ai_provider_router(self) -> ProviderRouter:
+        """Get the latency-aware router across all configured AI providers"""
+        return get_provider_router()
+    
     def notify_observers(self, event_data: Dict[str, Any]):
         """Notify all observers (Observer Pattern)"""
         for observer in self.observers:
@@ -277,9 +287,9 @@ class OptimizedSmartCodingAI(OptimizedServiceBase):
         super().__init__(original_service, config, factory)
         
         # Apply Strategy Pattern for AI providers
-        self.ai_provider_strategy = None
+        self.ai_provider_router = None
         if DesignPatternType.STRATEGY in config.patterns_to_apply:
-            self.ai_provider_strategy = factory.get_ai_provider_strategy("openai")
+            self.ai_provider_router = factory.get_ai_provider_router()
         
         # Apply Observer Pattern for monitoring
         self.subject = Subject()
@@ -312,8 +322,13 @@ class OptimizedSmartCodingAI(OptimizedServiceBase):
         """Optimized code generation with strategy pattern"""
         try:
             # Use strategy pattern for AI provider selection
-            if self.ai_provider_strategy:
-                ai_response = await self.ai_provider_strategy.generate_code(prompt, language)
+            if self.ai_provider_router:
+                ai_response = await self.ai_provider_router.generate_completion(
+                    f"Write {language} code for the following request.\n\n{prompt}",
+                    max_tokens=kwargs.get("max_tokens", 1500),
+                    temperature=kwargs.get("temperature", 0.2),
+                    task_type="code_generation"
+                )
                 
                 # Enhance with original service capabilities
                 original_result = await self.original_service.generate_code(prompt, language, **kwargs)
@@ -8,11 +8,15 @@ import re
 import os
 import time
 from typing import Dict, List, Set, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 import logging
 from pathlib import Path
 
+from app.core.code_analysis_context import CodeAnalysisContext, MultiVisitor, get_analysis_context
+from app.core.incremental_validation import CodeUnit, get_incremental_validator
+from app.core.pattern_engine import PatternRule, RuleHit, RuleSet
+
 logger = logging.getLogger(__name__)
 
 class ConsistencyLevel(Enum):
@@ -71,6 +75,9 @@ class ProactiveConsistencyManager:
         self.codebase_patterns = self._load_codebase_patterns()
         self.validation_history = []
         self.auto_fix_enabled = True
+        self.incremental = get_incremental_validator("consistency")
+        self._code_rules = self._compile_code_rules()
+        self._last_scan: Optional[Tuple[str, List[RuleHit]]] = None
         
     def _load_consistency_rules(self) -> List[ConsistencyRule]:
         """Load all consistency validation rules"""
@@ -157,6 +164,23 @@ class ProactiveConsistencyManager:
             )
         ]
     
+    def _compile_code_rules(self) -> RuleSet:
+        """Textual checks as one rule set, so each code string is scanned once for all of them"""
+        rules = [PatternRule.literal(("variable", old_name), old_name) for old_name in self.variable_mappings]
+        rules.extend([
+            PatternRule(("api",), r"@router\.(get|post|put|delete|patch)\('([^']+)'\)", re.MULTILINE),
+            PatternRule(("config",), r"([A-Z_]+):\s*(str|int|bool|float|Optional\[str\])"),
+            PatternRule(("database",), r"([a-z]+_[a-z]+):\s*"),
+        ])
+        return RuleSet(rules, name="consistency")
+    
+    def _rule_hits(self, code: str, check: str) -> List[RuleHit]:
+        """Hits of one check's rules; the last code string's scan is reused across checks"""
+        last = self._last_scan
+        if last is None or last[0] is not code:
+            last = self._last_scan = (code, self._code_rules.scan(code))
+        return [hit for hit in last[1] if hit.rule_id[0] == check]
+    
     def _load_variable_mappings(self) -> Dict[str, str]:
         """Load variable name mappings for consistency"""
         return {
@@ -200,26 +224,41 @@ class ProactiveConsistencyManager:
             }
         }
     
-    def validate_code_consistency(self, code: str, file_path: str = "") -> List[InconsistencyIssue]:
+    def validate_code_consistency(self, code: str, file_path: str = "", incremental: bool = False) -> List[InconsistencyIssue]:
         """
         Validate code for consistency issues
         Returns list of issues found
+        
+        With ``incremental``, only top-level functions/classes that changed since
+        an earlier call are re-checked; findings match a full run, ordered by
+        source position within each check.
         """
         issues = []
         
         try:
-            # Parse code into AST for deep analysis
-            tree = ast.parse(code)
+            merged = None
+            if incremental:
+                try:
+                    merged = self._validate_incrementally(code, file_path)
+                except SyntaxError:
+                    pass  # A unit that does not parse on its own: report from the full parse below
             
-            # Run all consistency checks
-            issues.extend(self._check_variable_consistency(code, file_path))
-            issues.extend(self._check_import_consistency(code, file_path))
-            issues.extend(self._check_function_consistency(code, file_path, tree))
-            issues.extend(self._check_api_consistency(code, file_path))
-            issues.extend(self._check_config_consistency(code, file_path))
-            issues.extend(self._check_database_consistency(code, file_path))
-            issues.extend(self._check_error_handling_consistency(code, file_path, tree))
-            issues.extend(self._check_naming_conventions(code, file_path, tree))
+            if merged is not None:
+                issues = merged
+            else:
+                # Parse code into AST for deep analysis (shared with other analyzers)
+                context = get_analysis_context(code)
+                context.require_tree()
+                
+                # Run all consistency checks
+                issues.extend(self._check_variable_consistency(code, file_path))
+                issues.extend(self._check_import_consistency(code, file_path))
+                issues.extend(self._check_function_consistency(code, file_path, context))
+                issues.extend(self._check_api_consistency(code, file_path))
+                issues.extend(self._check_config_consistency(code, file_path))
+                issues.extend(self._check_database_consistency(code, file_path))
+                issues.extend(self._check_error_handling_consistency(code, file_path, context))
+                issues.extend(self._check_naming_conventions(code, file_path, context))
             
             # Record validation
             self.validation_history.append({
@@ -245,41 +284,84 @@ class ProactiveConsistencyManager:
         
         return issues
     
+    def _check_unit(self, unit: CodeUnit) -> Dict[str, List[InconsistencyIssue]]:
+        """Unit-local checks with unit-relative line numbers, plus the unit's import lines"""
+        code = unit.source
+        context = get_analysis_context(code)
+        context.require_tree()  # a unit that does not parse means the textual split was wrong
+        return {
+            "variable": self._check_variable_consistency(code, ""),
+            "function": self._check_function_consistency(code, "", context),
+            "api": self._check_api_consistency(code, ""),
+            "config": self._check_config_consistency(code, ""),
+            "database": self._check_database_consistency(code, ""),
+            "error_handling": self._check_error_handling_consistency(code, "", context),
+            "naming": self._check_naming_conventions(code, "", context),
+            "import_lines": self._import_lines(code),
+        }
+    
+    def _validate_incrementally(self, code: str, file_path: str) -> List[InconsistencyIssue]:
+        analysis = self.incremental.analyze(code, self._check_unit)
+        units = analysis.with_units()
+        
+        def merged(check: str) -> List[InconsistencyIssue]:
+            return [
+                replace(issue, file_path=file_path, line_number=issue.line_number + unit.line_offset)
+                for unit, checks in units
+                for issue in checks[check]
+            ]
+        
+        # Import order is a whole-module check; it only needs every unit's import lines
+        import_lines = [
+            (line_num + unit.line_offset, line)
+            for unit, checks in units
+            for line_num, line in checks["import_lines"]
+        ]
+        
+        issues = merged("variable")
+        issues.extend(self._import_order_issues(import_lines, file_path))
+        for check in ("function", "api", "config", "database", "error_handling", "naming"):
+            issues.extend(merged(check))
+        return issues
+    
     def _check_variable_consistency(self, code: str, file_path: str) -> List[InconsistencyIssue]:
         """Check variable naming consistency"""
         issues = []
         
-        # Check for inconsistent variable names
-        for old_name, new_name in self.variable_mappings.items():
-            if old_name in code:
-                lines = code.split('\n')
-                for i, line in enumerate(lines):
-                    if old_name in line:
-                        issues.append(InconsistencyIssue(
-                            type=InconsistencyType.VARIABLE_NAME_MISMATCH,
-                            level=ConsistencyLevel.CRITICAL,
-                            file_path=file_path,
-                            line_number=i + 1,
-                            description=f"Variable '{old_name}' should be '{new_name}'",
-                            expected=new_name,
-                            actual=old_name,
-                            suggested_fix=f"Replace '{old_name}' with '{new_name}'",
-                            impact="System inconsistency, potential runtime errors",
-                            auto_fixable=True
-                        ))
+        # Check for inconsistent variable names: one issue per (name, line), in mapping order
+        order = {old_name: index for index, old_name in enumerate(self.variable_mappings)}
+        found = {(hit.rule_id[1], hit.line) for hit in self._rule_hits(code, "variable")}
+        for old_name, line_number in sorted(found, key=lambda item: (order[item[0]], item[1])):
+            new_name = self.variable_mappings[old_name]
+            issues.append(InconsistencyIssue(
+                type=InconsistencyType.VARIABLE_NAME_MISMATCH,
+                level=ConsistencyLevel.CRITICAL,
+                file_path=file_path,
+                line_number=line_number,
+                description=f"Variable '{old_name}' should be '{new_name}'",
+                expected=new_name,
+                actual=old_name,
+                suggested_fix=f"Replace '{old_name}' with '{new_name}'",
+                impact="System inconsistency, potential runtime errors",
+                auto_fixable=True
+            ))
         
         return issues
     
     def _check_import_consistency(self, code: str, file_path: str) -> List[InconsistencyIssue]:
         """Check import statement consistency"""
-        issues = []
-        
-        lines = code.split('\n')
+        return self._import_order_issues(self._import_lines(code), file_path)
+    
+    def _import_lines(self, code: str) -> List[Tuple[int, str]]:
+        """(1-based line, stripped text) of every import statement line"""
         import_lines = []
-        
-        for i, line in enumerate(lines):
+        for i, line in enumerate(code.split('\n')):
             if line.strip().startswith(('import ', 'from ')):
                 import_lines.append((i + 1, line.strip()))
+        return import_lines
+    
+    def _import_order_issues(self, import_lines: List[Tuple[int, str]], file_path: str) -> List[InconsistencyIssue]:
+        issues = []
         
         # Check import order
         std_lib_imports = []
@@ -313,27 +395,26 @@ class ProactiveConsistencyManager:
         
         return issues
     
-    def _check_function_consistency(self, code: str, file_path: str, tree: ast.AST) -> List[InconsistencyIssue]:
+    def _check_function_consistency(self, code: str, file_path: str, context: CodeAnalysisContext) -> List[InconsistencyIssue]:
         """Check function definition consistency"""
         issues = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Check if database operations are async
-                if any(keyword in node.name for keyword in ['create_', 'update_', 'delete_', 'get_']):
-                    if not node.name.startswith('async def'):
-                        issues.append(InconsistencyIssue(
-                            type=InconsistencyType.FUNCTION_SIGNATURE_MISMATCH,
-                            level=ConsistencyLevel.HIGH,
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            description=f"Database operation '{node.name}' should be async",
-                            expected="async def",
-                            actual="def",
-                            suggested_fix=f"Make function '{node.name}' async",
-                            impact="Performance and consistency issues",
-                            auto_fixable=True
-                        ))
+        for node in context.of_type(ast.FunctionDef):
+            # Check if database operations are async
+            if any(keyword in node.name for keyword in ['create_', 'update_', 'delete_', 'get_']):
+                if not node.name.startswith('async def'):
+                    issues.append(InconsistencyIssue(
+                        type=InconsistencyType.FUNCTION_SIGNATURE_MISMATCH,
+                        level=ConsistencyLevel.HIGH,
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        description=f"Database operation '{node.name}' should be async",
+                        expected="async def",
+                        actual="def",
+                        suggested_fix=f"Make function '{node.name}' async",
+                        impact="Performance and consistency issues",
+                        auto_fixable=True
+                    ))
         
         return issues
     
@@ -342,10 +423,8 @@ class ProactiveConsistencyManager:
         issues = []
         
         # Check for RESTful endpoint patterns
-        endpoint_pattern = r"@router\.(get|post|put|delete|patch)\('([^']+)'\)"
-        matches = re.finditer(endpoint_pattern, code, re.MULTILINE)
-        
-        for match in matches:
+        for hit in self._rule_hits(code, "api"):
+            match = hit.match
             method = match.group(1)
             endpoint = match.group(2)
             
@@ -355,7 +434,7 @@ class ProactiveConsistencyManager:
                     type=InconsistencyType.API_ENDPOINT_MISMATCH,
                     level=ConsistencyLevel.HIGH,
                     file_path=file_path,
-                    line_number=code[:match.start()].count('\n') + 1,
+                    line_number=hit.line,
                     description=f"GET endpoint '{endpoint}' should include resource path",
                     expected="/api/v{version}/{resource}",
                     actual=endpoint,
@@ -371,10 +450,8 @@ class ProactiveConsistencyManager:
         issues = []
         
         # Check for proper typing in config classes
-        config_pattern = r"([A-Z_]+):\s*(str|int|bool|float|Optional\[str\])"
-        matches = re.finditer(config_pattern, code)
-        
-        for match in matches:
+        for hit in self._rule_hits(code, "config"):
+            match = hit.match
             var_name = match.group(1)
             var_type = match.group(2)
             
@@ -384,7 +461,7 @@ class ProactiveConsistencyManager:
                     type=InconsistencyType.CONFIG_INCONSISTENCY,
                     level=ConsistencyLevel.HIGH,
                     file_path=file_path,
-                    line_number=code[:match.start()].count('\n') + 1,
+                    line_number=hit.line,
                     description=f"Critical variable '{var_name}' should be typed as 'str'",
                     expected="str",
                     actual=var_type,
@@ -400,11 +477,8 @@ class ProactiveConsistencyManager:
         issues = []
         
         # Check for snake_case in database fields
-        db_field_pattern = r"([a-z]+_[a-z]+):\s*"
-        matches = re.finditer(db_field_pattern, code)
-        
-        for match in matches:
-            field_name = match.group(1)
+        for hit in self._rule_hits(code, "database"):
+            field_name = hit.match.group(1)
             
             # Check if field follows snake_case convention
             if not re.match(r'^[a-z]+(_[a-z]+)*$', field_name):
@@ -412,7 +486,7 @@ class ProactiveConsistencyManager:
                     type=InconsistencyType.DATABASE_SCHEMA_MISMATCH,
                     level=ConsistencyLevel.MEDIUM,
                     file_path=file_path,
-                    line_number=code[:match.start()].count('\n') + 1,
+                    line_number=hit.line,
                     description=f"Database field '{field_name}' should use snake_case",
                     expected="snake_case",
                     actual=field_name,
@@ -423,42 +497,43 @@ class ProactiveConsistencyManager:
         
         return issues
     
-    def _check_error_handling_consistency(self, code: str, file_path: str, tree: ast.AST) -> List[InconsistencyIssue]:
+    def _check_error_handling_consistency(self, code: str, file_path: str, context: CodeAnalysisContext) -> List[InconsistencyIssue]:
         """Check error handling consistency"""
         issues = []
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Check if function has proper error handling
-                has_try_except = False
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Try):
-                        has_try_except = True
-                        break
-                
-                # Critical functions should have error handling
-                if node.name.startswith(('create_', 'update_', 'delete_', 'authenticate_')):
-                    if not has_try_except:
-                        issues.append(InconsistencyIssue(
-                            type=InconsistencyType.NAMING_CONVENTION_VIOLATION,
-                            level=ConsistencyLevel.HIGH,
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            description=f"Critical function '{node.name}' should have error handling",
-                            expected="try-except block",
-                            actual="No error handling",
-                            suggested_fix="Add proper try-except error handling",
-                            impact="Unhandled exceptions, system instability",
-                            auto_fixable=False
-                        ))
+        # One pass marks every function that contains a try block
+        functions_with_try = set()
+        MultiVisitor().on(ast.Try, enter=lambda node, state: functions_with_try.update(
+            id(ancestor) for ancestor in state.ancestors if isinstance(ancestor, ast.FunctionDef)
+        )).run(context)
+        
+        for node in context.of_type(ast.FunctionDef):
+            # Check if function has proper error handling
+            has_try_except = id(node) in functions_with_try
+            
+            # Critical functions should have error handling
+            if node.name.startswith(('create_', 'update_', 'delete_', 'authenticate_')):
+                if not has_try_except:
+                    issues.append(InconsistencyIssue(
+                        type=InconsistencyType.NAMING_CONVENTION_VIOLATION,
+                        level=ConsistencyLevel.HIGH,
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        description=f"Critical function '{node.name}' should have error handling",
+                        expected="try-except block",
+                        actual="No error handling",
+                        suggested_fix="Add proper try-except error handling",
+                        impact="Unhandled exceptions, system instability",
+                        auto_fixable=False
+                    ))
         
         return issues
     
-    def _check_naming_conventions(self, code: str, file_path: str, tree: ast.AST) -> List[InconsistencyIssue]:
+    def _check_naming_conventions(self, code: str, file_path: str, context: CodeAnalysisContext) -> List[InconsistencyIssue]:
         """Check naming convention consistency"""
         issues = []
         
-        for node in ast.walk(tree):
+        for node in context.of_type(ast.FunctionDef, ast.ClassDef):
             if isinstance(node, ast.FunctionDef):
                 # Check function naming (snake_case)
                 if not re.match(r'^[a-z]+(_[a-z]+)*$', node.name):
@@ -27,11 +27,15 @@ import ast
 import re
 import inspect
 from typing import Dict, List, Any, Optional, Tuple, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import structlog
 from pathlib import Path
 
+from app.core.code_analysis_context import CodeAnalysisContext, get_analysis_context
+from app.core.incremental_validation import CodeUnit, get_incremental_validator
+from app.core.pattern_engine import PatternRule, RuleSet
+
 logger = structlog.get_logger()
 
 
@@ -74,6 +78,21 @@ class HallucinationDetection:
     confidence: float  # 0.0 to 1.0
 
 
+@dataclass
+class _UnitRealityFacts:
+    """Per-unit detections (unit-relative lines) plus facts for the whole-module checks"""
+    detections: Tuple[List[HallucinationDetection], ...]
+    imports: List[str]
+    mentions_external: bool
+    has_external_calls: bool
+    name_counts: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, source: str, name: str) -> int:
+        if name not in self.name_counts:
+            self.name_counts[name] = source.count(name)
+        return self.name_counts[name]
+
+
 @dataclass
 class RealityCheckResult:
     """Result of reality check analysis"""
@@ -88,6 +107,61 @@ class RealityCheckResult:
     summary: str
 
 
+# Line rule sets, compiled once; each detector scans its code in a single pass
+_FAKE_DATA_RULES = RuleSet([
+    PatternRule("hash_id", r'return\s+{\s*"id"\s*:\s*f?".*hash\('),
+    PatternRule("always_success", r'return\s+{\s*"status"\s*:\s*"(CREATED|COMPLETED|SUCCESS)"\s*}', re.IGNORECASE),
+    PatternRule("fake_name", r'return\s+.*"(fake|mock|stub|test)_'),
+], name="reality.fake_data")
+
+_HARDCODED_RULES = RuleSet([
+    PatternRule("credential", r'(api_key|password|token|secret)\s*=\s*"[^"]{5,}"', re.IGNORECASE),
+    PatternRule("placeholder", r'=\s*"(dev-|test-|your-|example-|placeholder-)'),
+], name="reality.hardcoded")
+_CONFIG_SOURCE = re.compile(r'(settings\.|config\.|env\.|os\.getenv)')
+
+_COMMENT_RULES = RuleSet([
+    PatternRule(explanation, pattern, re.IGNORECASE) for pattern, explanation in (
+        (r'#\s*Implementation\s+would\s+', "Comment says what WOULD be done, not what IS done"),
+        (r'#\s*This\s+should\s+', "Comment says what SHOULD happen, but no implementation"),
+        (r'#\s*TODO:\s*Implement', "TODO comment - feature not implemented"),
+        (r'#\s*FIXME', "FIXME comment - known broken code"),
+        (r'#\s*Not\s+implemented\s+yet', "Explicitly marked as not implemented"),
+    )
+], name="reality.comments")
+
+_STUB_RULES = RuleSet(
+    [PatternRule.literal(indicator, indicator, ignore_case=True)
+     for indicator in ("simplified for development", "mock implementation", "stub")],
+    name="reality.stubs",
+)
+
+_ALWAYS_TRUE_RULES = RuleSet([PatternRule("return_true", r'^\s*return\s+True\s*$')], name="reality.always_true")
+_CONDITIONAL = re.compile(r'\b(if|elif|try|except)\b')
+
+# Indicators that code should make external calls, and actual external call patterns
+_EXTERNAL_MENTION_RULES = RuleSet(
+    [PatternRule.literal(indicator, indicator, ignore_case=True) for indicator in (
+        "payment", "paypal", "razorpay", "stripe",
+        "api_call", "http", "request", "post", "get",
+        "database", "query", "insert", "update",
+    )],
+    name="reality.external_mentions",
+)
+_EXTERNAL_CALL_RULES = RuleSet(
+    [PatternRule(pattern, pattern) for pattern in (
+        r'requests\.(get|post|put|delete)',
+        r'httpx\.(get|post|put|delete)',
+        r'aiohttp\.',
+        r'supabase\.',
+        r'\.execute\(\)',
+        r'\.fetch\(',
+        r'client\.(get|post|put)',
+    )],
+    name="reality.external_calls",
+)
+
+
 class RealityCheckDNA:
     """
     Core DNA System: Reality Check
@@ -102,8 +176,19 @@ class RealityCheckDNA:
     - Has TODOs disguised as implementations
     """
     
+    # Detectors whose findings depend only on the lines/AST of one top-level unit
+    UNIT_DETECTORS = (
+        "_detect_fake_data_returns",
+        "_detect_hardcoded_values",
+        "_detect_comment_implementations",
+        "_detect_stub_patterns",
+        "_detect_perfect_structure_no_impl",
+        "_detect_always_success_pattern",
+    )
+    
     def __init__(self):
         self.hallucination_patterns = self._initialize_patterns()
+        self.incremental = get_incremental_validator("reality_check")
         logger.info("Reality Check DNA initialized - Anti-hallucination system active")
     
     def _initialize_patterns(self) -> Dict[str, Any]:
@@ -165,7 +250,8 @@ class RealityCheckDNA:
         code: str,
         file_path: str = "unknown",
         check_imports: bool = True,
-        check_external_calls: bool = True
+        check_external_calls: bool = True,
+        incremental: bool = False
     ) -> RealityCheckResult:
         """
         Main reality check: Analyze code for hallucination patterns
@@ -175,27 +261,35 @@ class RealityCheckDNA:
             file_path: Path to the file being checked
             check_imports: Whether to verify imports are real
             check_external_calls: Whether to check for actual external API calls
+            incremental: Re-analyze only the top-level functions/classes that
+                changed since an earlier check (for editing loops)
             
         Returns:
             RealityCheckResult with all detected hallucinations
         """
         logger.info("Running reality check on code", file_path=file_path)
         
-        hallucinations = []
-        
-        # Run all detection methods
-        hallucinations.extend(await self._detect_fake_data_returns(code, file_path))
-        hallucinations.extend(await self._detect_hardcoded_values(code, file_path))
-        hallucinations.extend(await self._detect_comment_implementations(code, file_path))
-        hallucinations.extend(await self._detect_stub_patterns(code, file_path))
-        hallucinations.extend(await self._detect_perfect_structure_no_impl(code, file_path))
-        hallucinations.extend(await self._detect_always_success_pattern(code, file_path))
-        
-        if check_imports:
-            hallucinations.extend(await self._detect_fake_imports(code, file_path))
+        hallucinations = None
+        if incremental:
+            try:
+                hallucinations = await self._detect_incrementally(
+                    code, file_path, check_imports, check_external_calls
+                )
+            except SyntaxError:
+                logger.debug("Unit did not parse on its own, running full reality check", file_path=file_path)
         
-        if check_external_calls:
-            hallucinations.extend(await self._detect_no_external_calls(code, file_path))
+        if hallucinations is None:
+            hallucinations = []
+            
+            # Run all detection methods
+            for detector in self.UNIT_DETECTORS:
+                hallucinations.extend(await getattr(self, detector)(code, file_path))
+            
+            if check_imports:
+                hallucinations.extend(await self._detect_fake_imports(code, file_path))
+            
+            if check_external_calls:
+                hallucinations.extend(await self._detect_no_external_calls(code, file_path))
         
         # Calculate statistics
         critical_count = sum(1 for h in hallucinations if h.severity == HallucinationSeverity.CRITICAL)
@@ -245,6 +339,67 @@ class RealityCheckDNA:
         
         return result
     
+    async def _analyze_unit(self, unit: CodeUnit) -> _UnitRealityFacts:
+        """Run the unit-local detectors and collect whole-module facts for one unit"""
+        context = get_analysis_context(unit.source)
+        context.require_tree()  # a unit that does not parse means the textual split was wrong
+        
+        detections = []
+        for detector in self.UNIT_DETECTORS:
+            detections.append(await getattr(self, detector)(unit.source, ""))
+        
+        mentions_external, has_external_calls = self._external_call_facts(unit.source)
+        return _UnitRealityFacts(
+            detections=tuple(detections),
+            imports=self._imported_names(context),
+            mentions_external=mentions_external,
+            has_external_calls=has_external_calls,
+        )
+    
+    async def _detect_incrementally(
+        self, code: str, file_path: str, check_imports: bool, check_external_calls: bool
+    ) -> List[HallucinationDetection]:
+        """
+        Same detections as a full check, merged from per-unit results.
+        
+        Line-window heuristics (enclosing function name, preceding conditionals)
+        only look inside the unit a line belongs to.
+        """
+        analysis = await self.incremental.analyze_async(code, self._analyze_unit)
+        units = analysis.with_units()
+        hallucinations = []
+        
+        for index in range(len(self.UNIT_DETECTORS)):
+            for unit, facts in units:
+                hallucinations.extend(
+                    replace(d, file_path=file_path, line_number=d.line_number + unit.line_offset)
+                    for d in facts.detections[index]
+                )
+        
+        if check_imports:
+            # Whole-module check from per-unit import lists and memoized name counts
+            for import_name in (name for _, facts in units for name in facts.imports):
+                if sum(facts.count(unit.source, import_name) for unit, facts in units) != 1:
+                    continue
+                for unit, facts in units:
+                    if f"import {import_name}" not in unit.source and f"from {import_name}" not in unit.source:
+                        continue
+                    for i, line in enumerate(unit.source.split('\n'), 1):
+                        if f"import {import_name}" in line or f"from {import_name}" in line:
+                            hallucinations.append(
+                                self._unused_import_detection(file_path, i + unit.line_offset, line, import_name)
+                            )
+                            break
+                    break
+        
+        if check_external_calls:
+            mentions_external = any(facts.mentions_external for _, facts in units)
+            has_external_calls = any(facts.has_external_calls for _, facts in units)
+            if mentions_external and not has_external_calls:
+                hallucinations.append(self._no_external_calls_detection(file_path))
+        
+        return hallucinations
+    
     async def _detect_fake_data_returns(
         self, code: str, file_path: str
     ) -> List[HallucinationDetection]:
@@ -252,9 +407,10 @@ class RealityCheckDNA:
         detections = []
         lines = code.split('\n')
         
-        for i, line in enumerate(lines, 1):
+        for hit in _FAKE_DATA_RULES.scan_lines(code):
+            i, line = hit.line, lines[hit.line - 1]
             # Check for hash-based fake IDs
-            if re.search(r'return\s+{\s*"id"\s*:\s*f?".*hash\(', line):
+            if hit.rule_id == "hash_id":
                 detections.append(HallucinationDetection(
                     pattern=HallucinationPattern.FAKE_HASH_AS_ID,
                     severity=HallucinationSeverity.CRITICAL,
@@ -268,7 +424,7 @@ class RealityCheckDNA:
                 ))
             
             # Check for always-success returns
-            if re.search(r'return\s+{\s*"status"\s*:\s*"(CREATED|COMPLETED|SUCCESS)"\s*}', line, re.IGNORECASE):
+            elif hit.rule_id == "always_success":
                 detections.append(HallucinationDetection(
                     pattern=HallucinationPattern.FAKE_DATA_RETURN,
                     severity=HallucinationSeverity.HIGH,
@@ -282,7 +438,7 @@ class RealityCheckDNA:
                 ))
             
             # Check for explicitly fake variable names in returns
-            if re.search(r'return\s+.*"(fake|mock|stub|test)_', line):
+            else:
                 detections.append(HallucinationDetection(
                     pattern=HallucinationPattern.FAKE_DATA_RETURN,
                     severity=HallucinationSeverity.CRITICAL,
@@ -304,10 +460,11 @@ class RealityCheckDNA:
         detections = []
         lines = code.split('\n')
         
-        for i, line in enumerate(lines, 1):
+        for hit in _HARDCODED_RULES.scan_lines(code):
+            i, line = hit.line, lines[hit.line - 1]
             # Check for hardcoded credentials
-            if re.search(r'(api_key|password|token|secret)\s*=\s*"[^"]{5,}"', line, re.IGNORECASE):
-                if not re.search(r'(settings\.|config\.|env\.|os\.getenv)', line):
+            if hit.rule_id == "credential":
+                if not _CONFIG_SOURCE.search(line):
                     detections.append(HallucinationDetection(
                         pattern=HallucinationPattern.HARDCODED_VALUES,
                         severity=HallucinationSeverity.CRITICAL,
@@ -321,7 +478,7 @@ class RealityCheckDNA:
                     ))
             
             # Check for dev/test placeholder values
-            if re.search(r'=\s*"(dev-|test-|your-|example-|placeholder-)', line):
+            else:
                 detections.append(HallucinationDetection(
                     pattern=HallucinationPattern.LITERAL_PLACEHOLDER,
                     severity=HallucinationSeverity.HIGH,
@@ -343,28 +500,18 @@ class RealityCheckDNA:
         detections = []
         lines = code.split('\n')
         
-        suspicious_comments = [
-            (r'#\s*Implementation\s+would\s+', "Comment says what WOULD be done, not what IS done"),
-            (r'#\s*This\s+should\s+', "Comment says what SHOULD happen, but no implementation"),
-            (r'#\s*TODO:\s*Implement', "TODO comment - feature not implemented"),
-            (r'#\s*FIXME', "FIXME comment - known broken code"),
-            (r'#\s*Not\s+implemented\s+yet', "Explicitly marked as not implemented"),
-        ]
-        
-        for i, line in enumerate(lines, 1):
-            for pattern, explanation in suspicious_comments:
-                if re.search(pattern, line, re.IGNORECASE):
-                    detections.append(HallucinationDetection(
-                        pattern=HallucinationPattern.COMMENT_INSTEAD_OF_CODE,
-                        severity=HallucinationSeverity.HIGH,
-                        file_path=file_path,
-                        line_number=i,
-                        function_name=self._get_function_name(lines, i),
-                        code_snippet=line.strip(),
-                        explanation=explanation,
-                        suggestion="Implement the actual functionality",
-                        confidence=0.85
-                    ))
+        for hit in _COMMENT_RULES.scan_lines(code):
+            detections.append(HallucinationDetection(
+                pattern=HallucinationPattern.COMMENT_INSTEAD_OF_CODE,
+                severity=HallucinationSeverity.HIGH,
+                file_path=file_path,
+                line_number=hit.line,
+                function_name=self._get_function_name(lines, hit.line),
+                code_snippet=lines[hit.line - 1].strip(),
+                explanation=hit.rule_id,
+                suggestion="Implement the actual functionality",
+                confidence=0.85
+            ))
         
         return detections
     
@@ -375,30 +522,24 @@ class RealityCheckDNA:
         detections = []
         lines = code.split('\n')
         
-        stub_indicators = ["simplified for development", "mock implementation", "stub"]
-        
-        for i, line in enumerate(lines, 1):
-            lower_line = line.lower()
+        # Lines with stub indicators, once each
+        for i in sorted({hit.line for hit in _STUB_RULES.scan_lines(code)}):
+            line = lines[i - 1]
+            # Check if it has proper warnings (logger.warning, ⚠️, STUB in docstring)
+            has_warning = any(warn in line for warn in ['logger.warning', '⚠️', 'WARNING:', 'STUB:'])
             
-            # Check if line has stub indicators
-            has_stub_indicator = any(indicator in lower_line for indicator in stub_indicators)
-            
-            if has_stub_indicator:
-                # Check if it has proper warnings (logger.warning, ⚠️, STUB in docstring)
-                has_warning = any(warn in line for warn in ['logger.warning', '⚠️', 'WARNING:', 'STUB:'])
-                
-                if not has_warning:
-                    detections.append(HallucinationDetection(
-                        pattern=HallucinationPattern.STUB_WITHOUT_WARNING,
-                        severity=HallucinationSeverity.MEDIUM,
-                        file_path=file_path,
-                        line_number=i,
-                        function_name=self._get_function_name(lines, i),
-                        code_snippet=line.strip(),
-                        explanation="Stub implementation without proper warning/logging",
-                        suggestion="Add logger.warning() or mark clearly as STUB in docstring",
-                        confidence=0.80
-                    ))
+            if not has_warning:
+                detections.append(HallucinationDetection(
+                    pattern=HallucinationPattern.STUB_WITHOUT_WARNING,
+                    severity=HallucinationSeverity.MEDIUM,
+                    file_path=file_path,
+                    line_number=i,
+                    function_name=self._get_function_name(lines, i),
+                    code_snippet=line.strip(),
+                    explanation="Stub implementation without proper warning/logging",
+                    suggestion="Add logger.warning() or mark clearly as STUB in docstring",
+                    confidence=0.80
+                ))
         
         return detections
     
@@ -409,40 +550,40 @@ class RealityCheckDNA:
         detections = []
         
         try:
-            tree = ast.parse(code)
+            context = get_analysis_context(code)
+            context.require_tree()
             
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # Check if function has perfect structure (type hints, docstring)
-                    # but trivial implementation
-                    has_docstring = ast.get_docstring(node) is not None
-                    has_type_hints = node.returns is not None or any(
-                        arg.annotation is not None for arg in node.args.args
-                    )
-                    
-                    # Check if implementation is trivial
-                    is_trivial = False
-                    if len(node.body) == 1:
-                        body = node.body[0]
-                        if isinstance(body, ast.Pass):
-                            is_trivial = True
-                        elif isinstance(body, ast.Return):
-                            if isinstance(body.value, ast.Constant):
-                                if body.value.value in [True, False, None, {}, []]:
-                                    is_trivial = True
-                    
-                    if has_docstring and has_type_hints and is_trivial:
-                        detections.append(HallucinationDetection(
-                            pattern=HallucinationPattern.PERFECT_STRUCTURE_NO_IMPL,
-                            severity=HallucinationSeverity.HIGH,
-                            file_path=file_path,
-                            line_number=node.lineno,
-                            function_name=node.name,
-                            code_snippet=f"def {node.name}(...): ...",
-                            explanation="Perfect structure (docstring, types) but trivial/no implementation",
-                            suggestion="Implement actual functionality or mark as stub",
-                            confidence=0.85
-                        ))
+            for node in context.of_type(ast.FunctionDef):
+                # Check if function has perfect structure (type hints, docstring)
+                # but trivial implementation
+                has_docstring = ast.get_docstring(node) is not None
+                has_type_hints = node.returns is not None or any(
+                    arg.annotation is not None for arg in node.args.args
+                )
+                
+                # Check if implementation is trivial
+                is_trivial = False
+                if len(node.body) == 1:
+                    body = node.body[0]
+                    if isinstance(body, ast.Pass):
+                        is_trivial = True
+                    elif isinstance(body, ast.Return):
+                        if isinstance(body.value, ast.Constant):
+                            if body.value.value in [True, False, None, {}, []]:
+                                is_trivial = True
+                
+                if has_docstring and has_type_hints and is_trivial:
+                    detections.append(HallucinationDetection(
+                        pattern=HallucinationPattern.PERFECT_STRUCTURE_NO_IMPL,
+                        severity=HallucinationSeverity.HIGH,
+                        file_path=file_path,
+                        line_number=node.lineno,
+                        function_name=node.name,
+                        code_snippet=f"def {node.name}(...): ...",
+                        explanation="Perfect structure (docstring, types) but trivial/no implementation",
+                        suggestion="Implement actual functionality or mark as stub",
+                        confidence=0.85
+                    ))
         
         except SyntaxError:
             pass  # Skip if code doesn't parse
@@ -456,28 +597,25 @@ class RealityCheckDNA:
         detections = []
         lines = code.split('\n')
         
-        for i, line in enumerate(lines, 1):
-            # Check for functions that only return True
-            if re.match(r'\s*return\s+True\s*$', line):
-                # Check if there's any conditional logic before this
-                preceding_lines = lines[max(0, i-10):i]
-                has_conditionals = any(
-                    re.search(r'\b(if|elif|try|except)\b', l)
-                    for l in preceding_lines
-                )
-                
-                if not has_conditionals:
-                    detections.append(HallucinationDetection(
-                        pattern=HallucinationPattern.ALWAYS_RETURNS_TRUE,
-                        severity=HallucinationSeverity.HIGH,
-                        file_path=file_path,
-                        line_number=i,
-                        function_name=self._get_function_name(lines, i),
-                        code_snippet=line.strip(),
-                        explanation="Function always returns True without any validation",
-                        suggestion="Add actual validation logic or error handling",
-                        confidence=0.80
-                    ))
+        # Functions that only return True
+        for hit in _ALWAYS_TRUE_RULES.scan_lines(code):
+            i = hit.line
+            # Check if there's any conditional logic before this
+            preceding_lines = lines[max(0, i-10):i]
+            has_conditionals = any(_CONDITIONAL.search(l) for l in preceding_lines)
+            
+            if not has_conditionals:
+                detections.append(HallucinationDetection(
+                    pattern=HallucinationPattern.ALWAYS_RETURNS_TRUE,
+                    severity=HallucinationSeverity.HIGH,
+                    file_path=file_path,
+                    line_number=i,
+                    function_name=self._get_function_name(lines, i),
+                    code_snippet=lines[i - 1].strip(),
+                    explanation="Function always returns True without any validation",
+                    suggestion="Add actual validation logic or error handling",
+                    confidence=0.80
+                ))
         
         return detections
     
@@ -489,16 +627,9 @@ class RealityCheckDNA:
         lines = code.split('\n')
         
         try:
-            tree = ast.parse(code)
-            imports = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
+            context = get_analysis_context(code)
+            context.require_tree()
+            imports = self._imported_names(context)
             
             # Check if imports are actually used in code
             for import_name in imports:
@@ -507,17 +638,7 @@ class RealityCheckDNA:
                     # Find line number
                     for i, line in enumerate(lines, 1):
                         if f"import {import_name}" in line or f"from {import_name}" in line:
-                            detections.append(HallucinationDetection(
-                                pattern=HallucinationPattern.PERFECT_STRUCTURE_NO_IMPL,
-                                severity=HallucinationSeverity.LOW,
-                                file_path=file_path,
-                                line_number=i,
-                                function_name="module",
-                                code_snippet=line.strip(),
-                                explanation=f"Import '{import_name}' is never used",
-                                suggestion="Remove unused import or actually use it",
-                                confidence=0.70
-                            ))
+                            detections.append(self._unused_import_detection(file_path, i, line, import_name))
                             break
         
         except SyntaxError:
@@ -525,55 +646,65 @@ class RealityCheckDNA:
         
         return detections
     
+    def _imported_names(self, context: CodeAnalysisContext) -> List[str]:
+        """Top-level names of every imported module"""
+        imports = []
+        for node in context.imports:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.append(alias.name)
+            elif node.module:
+                imports.append(node.module)
+        return imports
+    
+    def _unused_import_detection(
+        self, file_path: str, line_number: int, line: str, import_name: str
+    ) -> HallucinationDetection:
+        return HallucinationDetection(
+            pattern=HallucinationPattern.PERFECT_STRUCTURE_NO_IMPL,
+            severity=HallucinationSeverity.LOW,
+            file_path=file_path,
+            line_number=line_number,
+            function_name="module",
+            code_snippet=line.strip(),
+            explanation=f"Import '{import_name}' is never used",
+            suggestion="Remove unused import or actually use it",
+            confidence=0.70
+        )
+    
     async def _detect_no_external_calls(
         self, code: str, file_path: str
     ) -> List[HallucinationDetection]:
         """Detect if code claims to call external APIs but doesn't"""
         detections = []
         
-        # Indicators that code should make external calls
-        external_indicators = [
-            "payment", "paypal", "razorpay", "stripe",
-            "api_call", "http", "request", "post", "get",
-            "database", "query", "insert", "update"
-        ]
+        mentions_external, has_external_calls = self._external_call_facts(code)
         
-        # Actual external call patterns
-        external_calls = [
-            r'requests\.(get|post|put|delete)',
-            r'httpx\.(get|post|put|delete)',
-            r'aiohttp\.',
-            r'supabase\.',
-            r'\.execute\(\)',
-            r'\.fetch\(',
-            r'client\.(get|post|put)',
-        ]
-        
-        code_lower = code.lower()
-        
-        # Check if code mentions external operations
-        mentions_external = any(indicator in code_lower for indicator in external_indicators)
-        
-        if mentions_external:
-            # Check if code actually makes external calls
-            has_external_calls = any(re.search(pattern, code) for pattern in external_calls)
-            
-            if not has_external_calls:
-                # This is suspicious - mentions external ops but doesn't call anything
-                detections.append(HallucinationDetection(
-                    pattern=HallucinationPattern.MOCK_WITHOUT_REAL_API,
-                    severity=HallucinationSeverity.HIGH,
-                    file_path=file_path,
-                    line_number=1,
-                    function_name="module",
-                    code_snippet="(entire file)",
-                    explanation="Code mentions external operations (API, database) but makes no actual calls",
-                    suggestion="Implement actual API/database calls or mark as mock/stub",
-                    confidence=0.75
-                ))
+        if mentions_external and not has_external_calls:
+            # This is suspicious - mentions external ops but doesn't call anything
+            detections.append(self._no_external_calls_detection(file_path))
         
         return detections
     
+    def _external_call_facts(self, code: str) -> Tuple[bool, bool]:
+        """(mentions external operations, actually makes an external call)"""
+        mentions_external = _EXTERNAL_MENTION_RULES.first_match(code) is not None
+        has_external_calls = _EXTERNAL_CALL_RULES.first_match(code) is not None
+        return mentions_external, has_external_calls
+    
+    def _no_external_calls_detection(self, file_path: str) -> HallucinationDetection:
+        return HallucinationDetection(
+            pattern=HallucinationPattern.MOCK_WITHOUT_REAL_API,
+            severity=HallucinationSeverity.HIGH,
+            file_path=file_path,
+            line_number=1,
+            function_name="module",
+            code_snippet="(entire file)",
+            explanation="Code mentions external operations (API, database) but makes no actual calls",
+            suggestion="Implement actual API/database calls or mark as mock/stub",
+            confidence=0.75
+        )
+    
     def _get_function_name(self, lines: List[str], current_line: int) -> str:
         """Get the function name for a given line number"""
         # Search backwards for function definition
@@ -0,0 +1,463 @@
+"""
+Repository Indexer
+Walks a repository once with os.scandir (honouring .gitignore), keeps a
+manifest of (path, mtime, size, hash) and re-parses only the files that
+changed, in a process pool, streaming one update per file back to the caller.
+An optional watch loop (inotify via watchfiles, or polling) re-runs the
+incremental pass whenever the tree changes.
+"""
+
+import asyncio
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, Iterator, List, Optional, Pattern, Tuple
+
+import structlog
+
+from app.core.code_analysis_context import content_hash
+from app.services.code_intelligence_analysis import SKIPPED_DIRECTORIES, detect_language
+
+try:
+    from watchfiles import awatch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# Languages CodingPatternRecognizer extracts patterns from; other files are only listed
+PARSED_LANGUAGES = frozenset({"python", "javascript", "java", "cpp"})
+
+# Passes with fewer changed files than this parse in-process instead of paying pool overhead
+INLINE_PARSE_LIMIT = 32
+
+
+# ============================================================================
+# .gitignore
+# ============================================================================
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One compiled .gitignore line, scoped to the directory holding the file"""
+    base: str
+    regex: Pattern
+    negate: bool
+    directory_only: bool
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.directory_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def _glob_to_regex(pattern: str) -> str:
+    parts: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return "".join(parts)
+
+
+def compile_gitignore(text: str, base: str = "") -> List[IgnoreRule]:
+    """Compile .gitignore contents; ``base`` is the repo-relative directory of the file"""
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate or line.startswith("\\"):
+            line = line[1:]
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = _glob_to_regex(line.lstrip("/"))
+        regex = re.compile(("^" if anchored else "^(?:.*/)?") + body + "$")
+        rules.append(IgnoreRule(base, regex, negate, directory_only))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Last matching rule wins, as in git"""
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+# ============================================================================
+# SCANNING
+# ============================================================================
+
+@dataclass
+class ScanEntry:
+    path: str  # repo-relative, "/"-separated
+    is_dir: bool
+    mtime_ns: int
+    size: int
+
+
+def scan_repository(root: str, max_depth: Optional[int] = None, respect_gitignore: bool = True) -> Iterator[ScanEntry]:
+    """
+    Single os.scandir walk over ``root``.
+
+    Files are yielded at every level; directories only where the walk stops
+    descending (``max_depth``), so a shallow scan still lists them. Ignored
+    and vendored directories are pruned without being entered.
+    """
+    stack: List[Tuple[str, str, int, List[IgnoreRule]]] = [(root, "", 0, [])]
+    while stack:
+        directory, rel_dir, depth, rules = stack.pop()
+        if respect_gitignore:
+            gitignore = os.path.join(directory, ".gitignore")
+            if os.path.isfile(gitignore):
+                try:
+                    with open(gitignore, "r", encoding="utf-8", errors="ignore") as f:
+                        rules = rules + compile_gitignore(f.read(), rel_dir)
+                except OSError:
+                    pass
+
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.warning("Cannot scan directory", directory=directory, error=str(e))
+            continue
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.is_file():
+                    continue
+                if is_dir and entry.name in SKIPPED_DIRECTORIES:
+                    continue
+                if rules and is_ignored(rules, rel_path, is_dir):
+                    continue
+                stat = entry.stat(follow_symlinks=False) if is_dir else entry.stat()
+            except OSError:
+                continue
+
+            if not is_dir:
+                yield ScanEntry(rel_path, False, stat.st_mtime_ns, stat.st_size)
+            elif max_depth is not None and depth >= max_depth:
+                yield ScanEntry(rel_path, True, stat.st_mtime_ns, 0)
+            else:
+                stack.append((entry.path, rel_path, depth + 1, rules))
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+# Per worker process: one event loop and recognizer reused across files
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_recognizer = None
+
+
+def _parse_in_worker(
+    abs_path: str, rel_path: str, language: str, previous_hash: Optional[str],
+    parser: Optional[Callable[[str, str, str], Any]] = None,
+) -> Tuple[str, Any]:
+    """Hash a file and, unless its content is unchanged, extract its patterns (or run ``parser`` on it)"""
+    global _worker_loop, _worker_recognizer
+    with open(abs_path, "rb") as f:
+        content = f.read().decode("utf-8", errors="ignore")
+    digest = content_hash(content)
+    if digest == previous_hash:
+        return digest, None
+    if parser is not None:
+        return digest, parser(content, rel_path, language)
+
+    if _worker_recognizer is None:
+        from app.services.codebase_memory_system import CodingPatternRecognizer
+        _worker_recognizer = CodingPatternRecognizer()
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    patterns = _worker_loop.run_until_complete(_worker_recognizer.extract_patterns(content, language))
+    for pattern in patterns:
+        pattern["file_path"] = rel_path
+    return digest, patterns
+
+
+# ============================================================================
+# INDEXER
+# ============================================================================
+
+class IndexState(Enum):
+    IDLE = "idle"
+    SCANNING = "scanning"
+    PARSING = "parsing"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    mtime_ns: int
+    size: int
+    hash: Optional[str] = None  # content hash; only kept for parsed source files
+    language: Optional[str] = None
+    is_dir: bool = False
+
+
+@dataclass
+class FileUpdate:
+    """A file that was added, changed or removed since the previous pass"""
+    path: str
+    status: str  # "added", "changed" or "removed"
+    entry: Optional[ManifestEntry] = None
+    patterns: Any = field(default_factory=list)  # pattern dicts, or the custom parser's result
+    skipped: Optional[str] = None  # why a source file was not parsed; patterns from earlier passes are void
+
+
+@dataclass
+class IndexProgress:
+    state: IndexState = IndexState.IDLE
+    passes: int = 0
+    files_seen: int = 0
+    files_to_parse: int = 0
+    files_parsed: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    files_skipped: int = 0
+    errors: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "state": self.state.value,
+            "passes": self.passes,
+            "files_seen": self.files_seen,
+            "files_to_parse": self.files_to_parse,
+            "files_parsed": self.files_parsed,
+            "files_unchanged": self.files_unchanged,
+            "files_removed": self.files_removed,
+            "files_skipped": self.files_skipped,
+            "errors": self.errors,
+            "percent": round(100.0 * self.files_parsed / self.files_to_parse, 1) if self.files_to_parse else 100.0,
+            "elapsed_ms": round((end - self.started_at) * 1000.0, 1) if self.started_at else 0.0,
+        }
+
+
+class RepositoryIndexer:
+    """Incremental, parallel pattern index over one repository"""
+
+    def __init__(
+        self,
+        root: str,
+        max_workers: Optional[int] = None,
+        max_file_bytes: int = 1_000_000,
+        max_depth: Optional[int] = None,
+        respect_gitignore: bool = True,
+        executor: Optional[Executor] = None,
+        parser: Optional[Callable[[str, str, str], Any]] = None,
+        languages: FrozenSet[str] = PARSED_LANGUAGES,
+    ):
+        """
+        ``parser(content, rel_path, language)`` replaces pattern extraction for
+        changed files of the given ``languages``; it runs in the worker pool, so
+        it must be a picklable module-level function.
+        """
+        self.root = os.path.abspath(root)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_file_bytes = max_file_bytes
+        self.max_depth = max_depth
+        self.respect_gitignore = respect_gitignore
+        self.parser = parser
+        self.languages = languages
+        self.manifest: Dict[str, ManifestEntry] = {}
+        self.progress = IndexProgress()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._lock = asyncio.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _scan(self) -> Dict[str, ScanEntry]:
+        return {entry.path: entry for entry in scan_repository(self.root, self.max_depth, self.respect_gitignore)}
+
+    async def run(self) -> AsyncIterator[FileUpdate]:
+        """One incremental pass: yields every added, changed or removed file as soon as it is known"""
+        async with self._lock:
+            progress = self.progress = IndexProgress(
+                state=IndexState.SCANNING, passes=self.progress.passes + 1, started_at=time.time()
+            )
+            try:
+                scanned = await asyncio.to_thread(self._scan)
+                progress.files_seen = len(scanned)
+
+                for path in [path for path in self.manifest if path not in scanned]:
+                    del self.manifest[path]
+                    progress.files_removed += 1
+                    yield FileUpdate(path, "removed")
+
+                to_parse: List[Tuple[ScanEntry, str, Optional[ManifestEntry]]] = []
+                for path, scan in scanned.items():
+                    previous = self.manifest.get(path)
+                    if previous is not None and (previous.mtime_ns, previous.size) == (scan.mtime_ns, scan.size):
+                        progress.files_unchanged += 1
+                        continue
+                    language = None if scan.is_dir else detect_language(path)
+                    if language in self.languages and scan.size <= self.max_file_bytes:
+                        to_parse.append((scan, language, previous))
+                        continue
+                    skipped = None
+                    if language in self.languages:
+                        progress.files_skipped += 1
+                        skipped = f"larger than {self.max_file_bytes} bytes"
+                    entry = ManifestEntry(path, scan.mtime_ns, scan.size, None, language, scan.is_dir)
+                    self.manifest[path] = entry
+                    yield FileUpdate(path, "added" if previous is None else "changed", entry, skipped=skipped)
+
+                progress.state = IndexState.PARSING
+                progress.files_to_parse = len(to_parse)
+                async for update in self._parse(to_parse):
+                    yield update
+
+                progress.state = IndexState.COMPLETE
+            except BaseException:
+                progress.state = IndexState.FAILED
+                raise
+            finally:
+                progress.finished_at = time.time()
+                logger.info("Repository index pass finished", root=self.root, **progress.to_dict())
+
+    async def _parse(self, to_parse: List[Tuple[ScanEntry, str, Optional[ManifestEntry]]]) -> AsyncIterator[FileUpdate]:
+        progress = self.progress
+        loop = asyncio.get_running_loop()
+        inline = len(to_parse) < INLINE_PARSE_LIMIT or self.max_workers == 1
+        window = self.max_workers * 2
+        pending: Dict[asyncio.Future, Tuple[ScanEntry, str, Optional[ManifestEntry]]] = {}
+        queue = iter(to_parse)
+
+        def submit(item: Tuple[ScanEntry, str, Optional[ManifestEntry]]) -> asyncio.Future:
+            scan, language, previous = item
+            args = (os.path.join(self.root, scan.path), scan.path, language, previous.hash if previous else None,
+                    self.parser)
+            if inline:
+                return loop.create_task(asyncio.to_thread(_parse_in_worker, *args))
+            return loop.run_in_executor(self._get_executor(), _parse_in_worker, *args)
+
+        try:
+            while True:
+                for item in queue:
+                    pending[submit(item)] = item
+                    if len(pending) >= (1 if inline else window):
+                        break
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    scan, language, previous = pending.pop(future)
+                    progress.files_parsed += 1
+                    try:
+                        digest, patterns = future.result()
+                    except Exception as e:
+                        progress.errors += 1
+                        logger.warning("Failed to index file", path=scan.path, error=str(e))
+                        continue
+                    entry = ManifestEntry(scan.path, scan.mtime_ns, scan.size, digest, language)
+                    self.manifest[scan.path] = entry
+                    if patterns is None:
+                        progress.files_unchanged += 1  # touched, same content
+                        continue
+                    yield FileUpdate(scan.path, "added" if previous is None else "changed", entry, patterns)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def watch(self, interval: float = 2.0, force_polling: bool = False) -> AsyncIterator[List[FileUpdate]]:
+        """
+        Re-run the incremental pass whenever the tree changes and yield each
+        non-empty batch of updates. Uses inotify (via watchfiles) when available,
+        otherwise polls every ``interval`` seconds; the manifest keeps a poll to
+        one stat walk when nothing changed.
+        """
+        if WATCHFILES_AVAILABLE and not force_polling:
+            async for _changes in awatch(self.root, debounce=int(interval * 1000)):
+                updates = [update async for update in self.run()]
+                if updates:
+                    yield updates
+        else:
+            while True:
+                await asyncio.sleep(interval)
+                updates = [update async for update in self.run()]
+                if updates:
+                    yield updates
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "root": self.root,
+            "manifest_entries": len(self.manifest),
+            "max_workers": self.max_workers,
+            "watch_backend": "inotify" if WATCHFILES_AVAILABLE else "polling",
+            **self.progress.to_dict(),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+__all__ = [
+    "FileUpdate",
+    "IgnoreRule",
+    "IndexProgress",
+    "IndexState",
+    "INLINE_PARSE_LIMIT",
+    "ManifestEntry",
+    "PARSED_LANGUAGES",
+    "RepositoryIndexer",
+    "ScanEntry",
+    "WATCHFILES_AVAILABLE",
+    "compile_gitignore",
+    "is_ignored",
+    "scan_repository",
+]
@@ -26,6 +26,8 @@ import json
 import hashlib
 from pathlib import Path
 
+from app.core.code_analysis_context import CodeAnalysisContext, MultiVisitor, get_analysis_context
+
 logger = structlog.get_logger()
 
 
@@ -251,7 +253,7 @@ class SelfValidationEngine:
             code = await self._get_component_code(component)
             
             # Parse AST
-            ast.parse(code)
+            get_analysis_context(code).require_tree()
             
             return {
                 "passed": True,
@@ -287,13 +289,14 @@ class SelfValidationEngine:
         """Validate logic and code flow"""
         try:
             code = await self._get_component_code(component)
-            tree = ast.parse(code)
+            context = get_analysis_context(code)
+            context.require_tree()
             
             issues = []
             suggestions = []
             
             # Check for common logic issues
-            for node in ast.walk(tree):
+            for node in context.of_type(ast.FunctionDef, ast.While):
                 # Check for unreachable code
                 if isinstance(node, ast.FunctionDef):
                     if self._has_unreachable_code(node):
@@ -336,16 +339,18 @@ class SelfValidationEngine:
         """Validate performance characteristics"""
         try:
             code = await self._get_component_code(component)
-            tree = ast.parse(code)
+            context = get_analysis_context(code)
+            context.require_tree()
+            loop_depths = self._get_loop_nesting_depths(context)
             
             issues = []
             suggestions = []
             
             # Check for performance issues
-            for node in ast.walk(tree):
+            for node in context.of_type(ast.For, ast.While, ast.FunctionDef):
                 # Nested loops
                 if isinstance(node, (ast.For, ast.While)):
-                    depth = self._get_loop_nesting_depth(node)
+                    depth = loop_depths[id(node)]
                     if depth > 3:
                         issues.append({
                             "type": "high_complexity",
@@ -482,10 +487,6 @@ class SelfValidationEngine:
     def _has_unreachable_code(self, node: ast.FunctionDef) -> bool:
         """Check if function has unreachable code"""
         # Simplified check - look for code after return/raise
-        has_return = False
-        for child in ast.walk(node):
-            if isinstance(child, (ast.Return, ast.Raise)):
-                has_return = True
         return False  # Simplified for now
     
     def _may_be_infinite_loop(self, node: ast.While) -> bool:
@@ -497,13 +498,18 @@ class SelfValidationEngine:
             return not has_break
         return False
     
-    def _get_loop_nesting_depth(self, node: ast.AST) -> int:
-        """Get nesting depth of loops"""
-        depth = 0
-        for child in ast.walk(node):
-            if isinstance(child, (ast.For, ast.While)):
-                depth += 1
-        return depth
+    def _get_loop_nesting_depths(self, context: CodeAnalysisContext) -> Dict[int, int]:
+        """Loops contained in each loop (itself included), keyed by node id, in one pass"""
+        depths: Dict[int, int] = {}
+        
+        def on_loop(node, state):
+            depths[id(node)] = 1
+            for ancestor in state.ancestors:
+                if isinstance(ancestor, (ast.For, ast.While)):
+                    depths[id(ancestor)] += 1
+        
+        MultiVisitor().on((ast.For, ast.While), enter=on_loop).run(context)
+        return depths
     
     def _generate_id(self) -> str:
         """Generate unique ID"""
@@ -604,7 +610,7 @@ class SelfHealthCheckEngine:
         """Check syntax health"""
         try:
             code = await self._get_component_code(component)
-            ast.parse(code)
+            get_analysis_context(code).require_tree()
             
             return {
                 "check_type": HealthCheckType.SYNTAX,
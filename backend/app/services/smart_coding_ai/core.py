@@ -68,6 +68,7 @@ class SmartCodingAIIntegration:
             # Initialize memory system
             try:
                 self.memory_system = CodebaseMemorySystem()
+                await self.memory_system.load_persisted_projects()
                 logger.info("Memory system initialized")
             except Exception as e:
                 logger.warning("Memory system initialization failed", error=str(e))
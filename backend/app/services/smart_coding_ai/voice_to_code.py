@@ -323,11 +323,10 @@ class VoiceToCodeProcessor:
             logger.debug("Enhancing with memory context", 
                         project_id=context.project_id)
             
-            # Search memory for relevant patterns
-            memory_search = await self.smart_coding_ai.search_codebase_memory(
-                query=generated_code[:100],  # First 100 chars for relevance
-                project_id=context.project_id,
-                result_type="pattern"
+            # Semantic + lexical retrieval of the project code the request is about
+            memory_search = await self.smart_coding_ai.retrieve_memory_context(
+                query=f"{code_result.get('transcript', '')} {generated_code[:500]}",
+                project_id=context.project_id
             )
             
             # Get contextual suggestions
@@ -347,7 +346,7 @@ class VoiceToCodeProcessor:
             })
             
             logger.info("Memory enhancement completed",
-                       found_patterns=len(memory_search.get("results", [])),
+                       found_patterns=len(memory_search),
                        has_suggestions=bool(suggestions))
             
             return enhanced_result
@@ -10,6 +10,9 @@ from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
 from collections import defaultdict
 
+from app.core.code_analysis_context import CodeAnalysisContext, MultiVisitor, get_analysis_context
+from app.core.pattern_engine import PatternRule, RuleSet
+
 logger = structlog.get_logger()
 
 
@@ -49,14 +52,15 @@ class ComplexityAnalyzer:
     def _analyze_python_complexity(self, code: str) -> Dict[str, Any]:
         """Analyze Python code complexity"""
         try:
-            tree = ast.parse(code)
+            context = get_analysis_context(code)
+            context.require_tree()
             
             metrics = {
-                "cyclomatic_complexity": self._calculate_cyclomatic_complexity(tree),
-                "cognitive_complexity": self._calculate_cognitive_complexity(tree),
-                "nesting_depth": self._calculate_max_nesting_depth(tree),
-                "function_length": self._calculate_function_lengths(tree),
-                "class_complexity": self._calculate_class_complexity(tree),
+                "cyclomatic_complexity": self._calculate_cyclomatic_complexity(context),
+                "cognitive_complexity": self._calculate_cognitive_complexity(context),
+                "nesting_depth": self._calculate_max_nesting_depth(context),
+                "function_length": self._calculate_function_lengths(context),
+                "class_complexity": self._calculate_class_complexity(context),
                 "lines_of_code": len(code.split('\n')),
                 "comment_ratio": self._calculate_comment_ratio(code)
             }
@@ -66,68 +70,54 @@ class ComplexityAnalyzer:
             logger.error("Python complexity analysis failed", error=str(e))
             return {}
     
-    def _calculate_cyclomatic_complexity(self, tree) -> int:
+    def _calculate_cyclomatic_complexity(self, context: CodeAnalysisContext) -> int:
         """Calculate cyclomatic complexity"""
-        complexity = 1  # Base complexity
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.And, ast.Or)):
-                complexity += 1
-            elif isinstance(node, ast.ExceptHandler):
-                complexity += 1
-        
-        return complexity
+        # Base complexity plus one per decision point
+        return 1 + len(context.of_type(ast.If, ast.While, ast.For, ast.And, ast.Or, ast.ExceptHandler))
     
-    def _calculate_cognitive_complexity(self, tree) -> int:
+    def _calculate_cognitive_complexity(self, context: CodeAnalysisContext) -> int:
         """Calculate cognitive complexity (how hard to understand)"""
         complexity = 0
         nesting_level = 0
         
-        for node in ast.walk(tree):
+        for node in context.of_type(ast.If, ast.While, ast.For, ast.FunctionDef):
             if isinstance(node, (ast.If, ast.While, ast.For)):
                 complexity += (1 + nesting_level)
                 nesting_level += 1
-            elif isinstance(node, ast.FunctionDef):
+            else:
                 nesting_level = 0
         
         return complexity
     
-    def _calculate_max_nesting_depth(self, tree) -> int:
+    def _calculate_max_nesting_depth(self, context: CodeAnalysisContext) -> int:
         """Calculate maximum nesting depth"""
+        nesting_nodes = (ast.If, ast.While, ast.For, ast.With)
         max_depth = 0
         
-        def calculate_depth(node, current_depth=0):
+        def on_nesting_node(node, state):
             nonlocal max_depth
-            max_depth = max(max_depth, current_depth)
-            
-            for child in ast.iter_child_nodes(node):
-                if isinstance(child, (ast.If, ast.While, ast.For, ast.With)):
-                    calculate_depth(child, current_depth + 1)
-                else:
-                    calculate_depth(child, current_depth)
+            max_depth = max(max_depth, state.count_enclosing(*nesting_nodes) + 1)
         
-        calculate_depth(tree)
+        MultiVisitor().on(nesting_nodes, enter=on_nesting_node).run(context)
         return max_depth
     
-    def _calculate_function_lengths(self, tree) -> Dict[str, int]:
+    def _calculate_function_lengths(self, context: CodeAnalysisContext) -> Dict[str, int]:
         """Calculate length of each function"""
         functions = {}
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                length = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
-                functions[node.name] = length
+        for node in context.of_type(ast.FunctionDef):
+            length = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
+            functions[node.name] = length
         
         return functions
     
-    def _calculate_class_complexity(self, tree) -> Dict[str, int]:
+    def _calculate_class_complexity(self, context: CodeAnalysisContext) -> Dict[str, int]:
         """Calculate complexity of each class"""
         classes = {}
         
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                methods = sum(1 for child in node.body if isinstance(child, ast.FunctionDef))
-                classes[node.name] = methods
+        for node in context.classes:
+            methods = sum(1 for child in node.body if isinstance(child, ast.FunctionDef))
+            classes[node.name] = methods
         
         return classes
     
@@ -284,17 +274,17 @@ class TechnicalDebtAssessor:
         
         # Check for long functions
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    length = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
-                    if length > 50:
-                        debt_items.append({
-                            "type": "long_function",
-                            "description": f"Function {node.name} is too long ({length} lines)",
-                            "score": 7,
-                            "priority": "medium"
-                        })
+            context = get_analysis_context(code)
+            context.require_tree()
+            for node in context.of_type(ast.FunctionDef):
+                length = node.end_lineno - node.lineno if hasattr(node, 'end_lineno') else 0
+                if length > 50:
+                    debt_items.append({
+                        "type": "long_function",
+                        "description": f"Function {node.name} is too long ({length} lines)",
+                        "score": 7,
+                        "priority": "medium"
+                    })
         except:
             pass
         
@@ -422,18 +412,18 @@ class CodeSmellDetector:
         
         # God class (too many methods)
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    methods = sum(1 for child in node.body if isinstance(child, ast.FunctionDef))
-                    if methods > 20:
-                        smells.append({
-                            "type": "god_class",
-                            "description": f"Class {node.name} has too many methods ({methods})",
-                            "severity": "high",
-                            "fix": "Split class into smaller, focused classes",
-                            "line": node.lineno
-                        })
+            context = get_analysis_context(code)
+            context.require_tree()
+            for node in context.classes:
+                methods = sum(1 for child in node.body if isinstance(child, ast.FunctionDef))
+                if methods > 20:
+                    smells.append({
+                        "type": "god_class",
+                        "description": f"Class {node.name} has too many methods ({methods})",
+                        "severity": "high",
+                        "fix": "Split class into smaller, focused classes",
+                        "line": node.lineno
+                    })
         except:
             pass
         
@@ -635,6 +625,34 @@ class PerformanceBottleneckDetector:
         return sorted(bottlenecks, key=lambda x: severity_order.get(x.get("severity", "low"), 3))
 
 
+_SECURITY_COMPLIANCE_RULES = RuleSet([
+    PatternRule("hardcoded_secret", r'(password|secret|api_key)\s*=\s*["\'][^"\']+["\']', re.IGNORECASE),
+    PatternRule("sql_injection_risk", r'execute\([^)]*f["\']|execute\([^)]*%'),
+    PatternRule("unsafe_deserialization", r'pickle\.loads|eval\('),
+], name="compliance.security")
+
+_SECURITY_COMPLIANCE_ISSUES = {
+    "hardcoded_secret": {
+        "type": "hardcoded_secret",
+        "description": "Potential hardcoded secret detected",
+        "severity": "critical",
+        "recommendation": "Use environment variables or secret management"
+    },
+    "sql_injection_risk": {
+        "type": "sql_injection_risk",
+        "description": "Potential SQL injection vulnerability",
+        "severity": "critical",
+        "recommendation": "Use parameterized queries"
+    },
+    "unsafe_deserialization": {
+        "type": "unsafe_deserialization",
+        "description": "Unsafe deserialization method used",
+        "severity": "critical",
+        "recommendation": "Use safe alternatives like JSON"
+    },
+}
+
+
 class ComplianceChecker:
     """Implements capability #20: Compliance Checking"""
     
@@ -707,37 +725,8 @@ class ComplianceChecker:
         return violations
     
     def _check_security_compliance(self, code: str) -> List[Dict[str, Any]]:
-        """Check security compliance"""
-        issues = []
-        
-        # Hardcoded secrets
-        if re.search(r'(password|secret|api_key)\s*=\s*["\'][^"\']+["\']', code, re.IGNORECASE):
-            issues.append({
-                "type": "hardcoded_secret",
-                "description": "Potential hardcoded secret detected",
-                "severity": "critical",
-                "recommendation": "Use environment variables or secret management"
-            })
-        
-        # SQL injection risk
-        if re.search(r'execute\([^)]*f["\']|execute\([^)]*%', code):
-            issues.append({
-                "type": "sql_injection_risk",
-                "description": "Potential SQL injection vulnerability",
-                "severity": "critical",
-                "recommendation": "Use parameterized queries"
-            })
-        
-        # Unsafe deserialization
-        if "pickle.loads" in code or "eval(" in code:
-            issues.append({
-                "type": "unsafe_deserialization",
-                "description": "Unsafe deserialization method used",
-                "severity": "critical",
-                "recommendation": "Use safe alternatives like JSON"
-            })
-        
-        return issues
+        """Check security compliance (hardcoded secrets, SQL injection risk, unsafe deserialization)"""
+        return [dict(_SECURITY_COMPLIANCE_ISSUES[rule_id]) for rule_id in _SECURITY_COMPLIANCE_RULES.matching_rules(code)]
     
     def _calculate_compliance_score(self, violations: List, security_issues: List) -> int:
         """Calculate compliance score"""
@@ -9,6 +9,8 @@ import re
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+from app.core.code_analysis_context import get_analysis_context
+
 logger = structlog.get_logger()
 
 
@@ -640,8 +642,9 @@ class ErrorHandlingGenerator:
         """Extract function names from code"""
         if language == "python":
             try:
-                tree = ast.parse(code)
-                return [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
+                context = get_analysis_context(code)
+                context.require_tree()
+                return [node.name for node in context.of_type(ast.FunctionDef)]
             except:
                 return []
         return []
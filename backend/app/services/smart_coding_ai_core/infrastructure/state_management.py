@@ -681,6 +681,7 @@ class IntelligentSessionManager:
         
         # ENHANCEMENT: Track user pattern
         await self._track_user_activity(user_id, "session_created", context)
+        await self.record_file_access(user_id, current_file)
         
         return context
     
@@ -698,6 +699,8 @@ class IntelligentSessionManager:
                         
                         # ENHANCEMENT: Track pattern
                         await self._track_user_activity(user_id, "context_updated", updates)
+                        if updates.get("current_file"):
+                            await self.record_file_access(user_id, updates["current_file"])
                         break
                 
                 return True
@@ -725,43 +728,44 @@ class IntelligentSessionManager:
             logger.error(f"Failed to save project memory: {e}")
             return False
     
+    async def record_file_access(self, user_id: str, file_path: str):
+        """Track a file the user opened (input to next-file prediction)"""
+        await self._track_user_activity(user_id, "file_access", {"file": file_path})
+    
     async def predict_next_file(self, user_id: str, current_file: str) -> Optional[str]:
         """
         ENHANCEMENT: Predict next file user will likely access
         Based on learned patterns
         """
+        predictions = await self.predict_next_files(user_id, current_file)
+        if not predictions:
+            return None
+        predicted_file, confidence = predictions[0]
+        logger.debug(f"Predicted next file: {predicted_file}", current=current_file, confidence=confidence)
+        return predicted_file
+    
+    async def predict_next_files(self, user_id: str, current_file: str, k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Up to ``k`` likely next files with their confidence: the share of the
+        user's switches away from ``current_file`` that went to each file
+        """
         try:
-            if user_id not in self.user_patterns:
-                return None
-            
-            # Analyze user patterns to predict next file
-            patterns = self.user_patterns[user_id]
-            file_transitions = [p for p in patterns if p.get("type") == "file_access"]
-            
-            # Find common sequences
-            file_sequence_counts = {}
-            for i in range(len(file_transitions) - 1):
-                if file_transitions[i].get("file") == current_file:
-                    next_file = file_transitions[i + 1].get("file")
-                    if next_file:
-                        file_sequence_counts[next_file] = file_sequence_counts.get(next_file, 0) + 1
+            patterns = self.user_patterns.get(user_id, [])
+            files = [p["data"].get("file") for p in patterns if p.get("type") == "file_access"]
             
-            if file_sequence_counts:
-                predicted_file = max(file_sequence_counts, key=file_sequence_counts.get)
-                confidence = file_sequence_counts[predicted_file] / len(file_transitions)
-                
-                logger.debug(
-                    f"Predicted next file: {predicted_file}",
-                    current=current_file,
-                    confidence=confidence
-                )
-                return predicted_file
+            # Count switches out of the current file (re-opening the same file is not a switch)
+            file_sequence_counts: Dict[str, int] = {}
+            for previous, next_file in zip(files, files[1:]):
+                if previous == current_file and next_file and next_file != current_file:
+                    file_sequence_counts[next_file] = file_sequence_counts.get(next_file, 0) + 1
             
-            return None
+            total = sum(file_sequence_counts.values())
+            ranked = sorted(file_sequence_counts.items(), key=lambda item: item[1], reverse=True)[:k]
+            return [(path, count / total) for path, count in ranked]
             
         except Exception as e:
             logger.error(f"File prediction failed: {e}")
-            return None
+            return []
     
     async def _track_user_activity(self, user_id: str, activity_type: str, data: Dict[str, Any]):
         """
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 from collections import defaultdict
 
+from app.core.code_analysis_context import get_analysis_context
+
 logger = structlog.get_logger()
 
 
@@ -194,8 +196,9 @@ class RuntimeBehaviorPredictor:
         path = ["Program start"]
         
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
+            context = get_analysis_context(code)
+            context.require_tree()
+            for node in context.of_type(ast.FunctionDef, ast.If, ast.For):
                 if isinstance(node, ast.FunctionDef):
                     path.append(f"Function: {node.name}")
                 elif isinstance(node, ast.If):
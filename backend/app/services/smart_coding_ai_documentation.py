@@ -9,6 +9,8 @@ import re
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from app.core.code_analysis_context import parse_code
+
 logger = structlog.get_logger()
 
 
@@ -264,7 +266,7 @@ class CodeDocumentationGenerator:
     def _add_python_docstrings(self, code: str) -> str:
         """Add comprehensive docstrings to Python code"""
         try:
-            tree = ast.parse(code)
+            tree = parse_code(code)
             
             documented = '''"""
 Module documentation added by Smart Coding AI
@@ -66,6 +66,13 @@ from app.core.architecture_compliance import (
     compliance_engine
 )
 
+from app.core.completion_cache import CompletionCache
+from app.services.symbol_completion import find_symbol_completion_index
+from app.services.speculative_prefetch import FileTransitionModel, PrefetchTarget, SpeculativePrefetcher
+from app.services.code_intelligence_analysis import detect_language
+from app.core.code_analysis_context import get_analysis_context
+from app.core.config import get_settings
+
 # Import Performance Architecture System
 from app.core.performance_architecture import (
     PerformanceArchitecture,
@@ -89,7 +96,7 @@ import json
 import pickle
 import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from queue import PriorityQueue, Empty
 from .codebase_memory_system import CodebaseMemorySystem
 
@@ -382,6 +389,9 @@ logger = structlog.get_logger()
 # Enums, models, helpers, and analyzers are now imported from separate files
 
 
+_IDENTIFIER_TAIL = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+
+
 class CompletionGenerator:
     """Generates intelligent code completions"""
     
@@ -502,6 +512,7 @@ class CompletionGenerator:
         # Get the current line content
         lines = context.content.split('\n')
         current_line = lines[context.cursor_position[0] - 1] if context.cursor_position[0] <= len(lines) else ""
+        typed = current_line[:context.cursor_position[1]]
         
         # Simple completion logic based on context
         if current_line.strip().endswith('def '):
@@ -521,9 +532,29 @@ class CompletionGenerator:
         elif current_line.strip().endswith('except'):
             return "Exception as e:\n    pass"
         else:
+            identifier = self._complete_identifier(typed, context)
+            if identifier:
+                return identifier
             # Generic completion
             return "completion_text"
     
+    def _complete_identifier(self, typed: str, context: CompletionContext) -> Optional[str]:
+        """Rest of the identifier being typed, from the project symbol index or the request's own symbols"""
+        match = _IDENTIFIER_TAIL.search(typed)
+        if not match:
+            return None
+        prefix = match.group(0)
+        index = find_symbol_completion_index((context.project_context or {}).get("project_id"))
+        if index is not None:
+            for candidate in index.complete(prefix, 5, history=context.completion_history):
+                if candidate.name.startswith(prefix):
+                    return candidate.name[len(prefix):]
+        local = [
+            name for names in (context.variables, context.functions, context.classes, context.imports)
+            for name in names or () if name.startswith(prefix) and name != prefix
+        ]
+        return min(local, key=len)[len(prefix):] if local else None
+    
     async def _calculate_confidence(self, completion_text: str, context: CompletionContext) -> float:
         """Calculate confidence score for completion"""
         confidence = 0.5  # Base confidence
@@ -718,81 +749,80 @@ class ConfidenceScorer:
 
 
 class PerformanceOptimizer:
-    """Optimizes completion performance"""
+    """
+    Completion latency and resource metrics. The request path only calls
+    ``record``; system readings are sampled when metrics are read.
+    """
     
-    def __init__(self):
-        self.cache_size_limit = 1000
-        self.response_time_target = 200  # ms
+    def __init__(self, cache: Optional[CompletionCache] = None, latency_samples: int = 1024,
+                 system_sample_seconds: float = 5.0):
+        self.cache = cache
+        self.response_time_target = 50  # ms budget while the user types
         self.memory_usage_limit = 0.8  # 80%
+        self.system_sample_seconds = system_sample_seconds
+        self._latencies: deque = deque(maxlen=latency_samples)
+        self._requests = 0
+        self._cache_hits = 0
+        self._memory_sample: Tuple[float, Optional[float]] = (0.0, None)
+    
+    def record(self, response_time_ms: float, cache_hit: bool) -> None:
+        """Account one served completion"""
+        self._requests += 1
+        self._cache_hits += cache_hit
+        self._latencies.append(response_time_ms)
     
     async def optimize_completion(self, context: CompletionContext) -> Dict[str, Any]:
-        """Optimize completion performance"""
-        optimizations = {
-            "cache_optimization": await self._optimize_cache(context),
-            "response_time_optimization": await self._optimize_response_time(context),
-            "memory_optimization": await self._optimize_memory(context),
-            "accuracy_optimization": await self._optimize_accuracy(context)
+        """Completion performance metrics (diagnostics; not called per completion)"""
+        return {
+            "cache_optimization": self._cache_metrics(context),
+            "response_time_optimization": self._response_time_metrics(),
+            "memory_optimization": self._memory_metrics(),
+            "accuracy_optimization": {
+                "accuracy_target": 100.0,
+                "current_accuracy": 100.0,
+                "optimization": "enabled"
+            }
         }
-        
-        return optimizations
     
-    async def _optimize_cache(self, context: CompletionContext) -> Dict[str, Any]:
-        """Optimize completion cache"""
-        cache_key = self._generate_cache_key(context)
-        
+    def _cache_metrics(self, context: CompletionContext) -> Dict[str, Any]:
+        if self.cache is None:
+            return {"cache_hit": False, "cache_size": 0, "cache_optimization": "disabled"}
         return {
-            "cache_key": cache_key,
-            "cache_hit": cache_key in self.cache,
+            "cache_hit": self.cache.peek(context),
             "cache_size": len(self.cache),
-            "cache_optimization": "enabled"
+            "cache_optimization": "enabled",
+            **self.cache.get_stats()
         }
     
-    async def _optimize_response_time(self, context: CompletionContext) -> Dict[str, Any]:
-        """Optimize response time"""
-        start_time = time.time()
-        
-        # Simulate optimization
-        await asyncio.sleep(0.001)  # 1ms optimization
-        
-        response_time = (time.time() - start_time) * 1000
-        
+    def _response_time_metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        if not latencies:
+            return {"response_time": 0.0, "target_time": self.response_time_target, "optimization": "enabled"}
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
         return {
-            "response_time": response_time,
+            "response_time": latencies[len(latencies) // 2],
+            "p95_response_time": p95,
+            "samples": len(latencies),
+            "requests": self._requests,
+            "cache_hit_rate": self._cache_hits / self._requests if self._requests else 0.0,
             "target_time": self.response_time_target,
-            "optimization": "enabled" if response_time < self.response_time_target else "needed"
+            "optimization": "enabled" if p95 < self.response_time_target else "needed"
         }
     
-    async def _optimize_memory(self, context: CompletionContext) -> Dict[str, Any]:
-        """Optimize memory usage"""
-        import psutil
-        
-        memory_usage = psutil.virtual_memory().percent / 100
-        
+    def _memory_metrics(self) -> Dict[str, Any]:
+        sampled_at, memory_usage = self._memory_sample
+        if memory_usage is None or time.monotonic() - sampled_at > self.system_sample_seconds:
+            try:
+                import psutil
+                memory_usage = psutil.virtual_memory().percent / 100
+            except Exception:
+                memory_usage = 0.0
+            self._memory_sample = (time.monotonic(), memory_usage)
         return {
             "memory_usage": memory_usage,
             "memory_limit": self.memory_usage_limit,
             "optimization": "enabled" if memory_usage < self.memory_usage_limit else "needed"
         }
-    
-    async def _optimize_accuracy(self, context: CompletionContext) -> Dict[str, Any]:
-        """Optimize accuracy"""
-        return {
-            "accuracy_target": 100.0,
-            "current_accuracy": 100.0,
-            "optimization": "enabled"
-        }
-    
-    def _generate_cache_key(self, context: CompletionContext) -> str:
-        """Generate cache key for context"""
-        key_data = {
-            "file_path": context.file_path,
-            "language": context.language.value,
-            "content": context.content,
-            "cursor_position": context.cursor_position
-        }
-        
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
 
 
 # ============================================================================
@@ -1577,10 +1607,31 @@ class SmartCodingAIOptimized:
         self.ml_predictor = MLPredictor()
         self.ensemble_optimizer = EnsembleOptimizer()
         # In-line completion specific attributes
-        self.inline_completion_cache: Dict[str, List[InlineCompletion]] = {}
+        settings = get_settings()
+        self.inline_completion_cache = CompletionCache(
+            max_entries=settings.INLINE_COMPLETION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.INLINE_COMPLETION_CACHE_MAX_BYTES,
+            prefix_chars=settings.INLINE_COMPLETION_CACHE_PREFIX_CHARS,
+            suffix_chars=settings.INLINE_COMPLETION_CACHE_SUFFIX_CHARS
+        )
         self.completion_generator = CompletionGenerator()
         self.confidence_scorer = ConfidenceScorer()
-        self.performance_optimizer = PerformanceOptimizer()
+        self.performance_optimizer = PerformanceOptimizer(self.inline_completion_cache)
+        # Warm the caches for the file the user is predicted to open next
+        self.prefetch_enabled = settings.PREFETCH_ENABLED
+        self.file_transitions = FileTransitionModel()
+        self.prefetcher = SpeculativePrefetcher(
+            self.file_transitions,
+            self._project_root,
+            confidence_threshold=settings.PREFETCH_CONFIDENCE_THRESHOLD,
+            time_budget_ms=settings.PREFETCH_TIME_BUDGET_MS,
+            cpu_share=settings.PREFETCH_CPU_SHARE,
+            idle_ms=settings.PREFETCH_IDLE_MS
+        )
+        self.prefetcher.add_warmer("parse", self._prefetch_parse)
+        self.prefetcher.add_warmer("symbols", self._prefetch_symbols)
+        self.prefetcher.add_warmer("memory_context", self._prefetch_memory_context)
+        self.prefetcher.add_warmer("completions", self._prefetch_completions)
         self.streaming_completions: Dict[str, Any] = {}
         
         # Core DNA: Proactive Consistency Management
@@ -2333,6 +2384,15 @@ class SmartCodingAIOptimized:
             logger.error(f"Failed to search codebase memory: {e}")
             return []
     
+    async def retrieve_memory_context(self, query: str, project_id: Optional[str] = None,
+                                      limit: int = 8) -> List[Dict]:
+        """Most relevant remembered code for a prompt (vector + keyword retrieval)"""
+        try:
+            return await self.memory_system.retrieve_context(query, project_id, limit)
+        except Exception as e:
+            logger.error(f"Failed to retrieve memory context: {e}")
+            return []
+    
     async def get_memory_status(self) -> Dict[str, Any]:
         """Get memory system status"""
         try:
@@ -2350,9 +2410,11 @@ class SmartCodingAIOptimized:
                                    working_directory: str) -> Dict[str, Any]:
         """Create session context for cross-session memory"""
         try:
-            return await self.memory_system.session_manager.create_session_context(
+            context = await self.memory_system.session_manager.create_session_context(
                 user_id, project_id, current_file, cursor_position, working_directory
             )
+            await self.record_file_access(user_id, current_file, project_id, cursor_position)
+            return context
         except Exception as e:
             logger.error(f"Failed to create session context: {e}")
             return {}
@@ -2360,11 +2422,28 @@ class SmartCodingAIOptimized:
     async def update_session_context(self, session_id: str, updates: Dict[str, Any]) -> bool:
         """Update session context"""
         try:
-            return await self.memory_system.session_manager.update_session_context(session_id, updates)
+            updated = await self.memory_system.session_manager.update_session_context(session_id, updates)
+            if updated and updates.get("current_file"):
+                session = self.memory_system.session_manager.session_cache[session_id]
+                await self.record_file_access(session["user_id"], updates["current_file"],
+                                              session.get("project_id"), updates.get("cursor_position"))
+            return updated
         except Exception as e:
             logger.error(f"Failed to update session context: {e}")
             return False
     
+    async def record_file_access(self, user_id: str, file_path: str, project_id: Optional[str] = None,
+                                 cursor_position: Optional[Tuple[int, int]] = None) -> None:
+        """Learn the file switch and prefetch the file predicted to come next"""
+        self.file_transitions.record(user_id, file_path)
+        if self.prefetch_enabled:
+            await self.prefetcher.on_file_access(user_id, file_path, project_id, cursor_position)
+    
+    async def close(self) -> None:
+        """Cancel in-flight speculative prefetches and stop memory watchers/indexers (application shutdown)"""
+        await self.prefetcher.close()
+        self.memory_system.shutdown()
+    
     async def get_user_context(self, user_id: str) -> Dict[str, Any]:
         """Get user's context across all sessions"""
         try:
@@ -5521,37 +5600,19 @@ async def get_item(item_id: int):
     
     async def get_inline_completion(self, context: CompletionContext) -> InlineCompletion:
         """Get in-line code completion with advanced AI assistance"""
+        started = time.perf_counter()
+        self.prefetcher.note_activity()
         try:
-            logger.info("Getting in-line completion", 
-                       file_path=context.file_path, 
-                       language=context.language.value,
-                       cursor_position=context.cursor_position)
-            
-            # Check cache first
-            cache_key = self._generate_completion_cache_key(context)
-            if cache_key in self.inline_completion_cache:
-                cached_completions = self.inline_completion_cache[cache_key]
-                if cached_completions:
-                    logger.info("Returning cached completion")
-                    return cached_completions[0]
-            
-            # Generate new completion
-            completion = await self.completion_generator.generate_completion(context)
+            # Same window around the cursor, or the user typed into a cached completion
+            cached = self.inline_completion_cache.get(context)
+            if cached is not None:
+                self.performance_optimizer.record((time.perf_counter() - started) * 1000, cache_hit=True)
+                return cached
             
-            # Score completion confidence
-            confidence_score = await self.confidence_scorer.score_completion(completion, context)
-            completion.confidence = confidence_score
-            
-            # Optimize performance
-            optimizations = await self.performance_optimizer.optimize_completion(context)
+            completion = await self._generate_inline_completion(context)
+            self.performance_optimizer.record((time.perf_counter() - started) * 1000, cache_hit=False)
             
-            # Cache completion
-            self.inline_completion_cache[cache_key] = [completion]
-            
-            # Update metrics
-            self._update_completion_metrics(completion)
-            
-            logger.info("Generated in-line completion", 
+            logger.debug("Generated in-line completion", 
                        completion_id=completion.completion_id,
                        confidence=completion.confidence,
                        accuracy=completion.accuracy_score)
@@ -5562,57 +5623,135 @@ async def get_item(item_id: int):
             logger.error("Failed to get in-line completion", error=str(e))
             raise
     
+    async def _generate_inline_completion(self, context: CompletionContext,
+                                          record_metrics: bool = True) -> InlineCompletion:
+        """Generate, score and cache a completion at the context's cursor"""
+        completion = await self.completion_generator.generate_completion(context)
+        completion.confidence = await self.confidence_scorer.score_completion(completion, context)
+        self.inline_completion_cache.put(context, completion)
+        if record_metrics:
+            self._update_completion_metrics(completion)
+        return completion
+    
+    # Prefetch warmers: each gets the predicted file (content is None when unreadable)
+    
+    def _project_root(self, project_id: Optional[str]) -> Optional[str]:
+        """Root of an indexed project; prefetch only reads files inside it"""
+        indexer = self.memory_system.indexers.get(project_id) if project_id else None
+        return indexer.root if indexer is not None else None
+    
+    async def _prefetch_parse(self, target: PrefetchTarget) -> None:
+        if target.content is not None and detect_language(target.file_path) == "python":
+            get_analysis_context(target.content)
+    
+    async def _prefetch_symbols(self, target: PrefetchTarget) -> None:
+        index = find_symbol_completion_index(target.project_id)
+        if index is not None:
+            index.refresh()
+    
+    async def _prefetch_memory_context(self, target: PrefetchTarget) -> Optional[List[Dict]]:
+        if target.project_id is None:
+            return None
+        query = Path(target.file_path).stem.replace("_", " ")
+        return await self.memory_system.retrieve_context(query, target.project_id)
+    
+    async def _prefetch_completions(self, target: PrefetchTarget) -> int:
+        """Completions at the last known cursor in the file and at its end"""
+        language = detect_language(target.file_path)
+        if target.content is None or language is None:
+            return 0
+        lines = target.content.split("\n")
+        cursors = [tuple(target.cursor)] if target.cursor else []
+        cursors.append((len(lines), len(lines[-1])))
+        warmed = 0
+        for cursor in dict.fromkeys(cursors):
+            context = CompletionContext(
+                file_path=target.file_path,
+                language=Language(language),
+                content=target.content,
+                cursor_position=cursor,
+                project_context={"project_id": target.project_id} if target.project_id else None
+            )
+            if not self.inline_completion_cache.peek(context):
+                # Speculative completions are not shown to the user, so they stay out of the metrics
+                await self._generate_inline_completion(context, record_metrics=False)
+                warmed += 1
+        return warmed
+    
+    def _build_streaming_prompt(self, context: CompletionContext, max_prefix_chars: int = 4000) -> str:
+        """Prompt for provider-backed completion: file header plus the code before the cursor"""
+        line, column = context.cursor_position  # 1-based line, 0-based column
+        lines = context.content.split("\n")
+        line = min(max(line, 1), len(lines))
+        prefix_lines = lines[:line - 1] + [lines[line - 1][:max(column, 0)]]
+        prefix = "\n".join(prefix_lines)[-max_prefix_chars:]
+        
+        return (
+            f"# Language: {context.language.value}\n"
+            f"# File: {context.file_path}\n"
+            "# Continue the code at the end of this snippet. Reply with code only.\n"
+            f"{prefix}"
+        )
+    
+    async def stream_completion_tokens(
+        self,
+        context: CompletionContext,
+        max_tokens: int = 128,
+        temperature: float = 0.2
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream completion text chunks from the configured AI providers as they arrive.
+        Closing the generator (e.g. when the client disconnects) aborts the provider request.
+        """
+        from app.core.strategies.ai_provider_strategy import get_ai_provider_manager
+        
+        prompt = self._build_streaming_prompt(context)
+        async for text in get_ai_provider_manager().stream_completion(prompt, max_tokens, temperature):
+            yield text
+    
     async def get_streaming_completion(self, context: CompletionContext) -> AsyncGenerator[InlineCompletion, None]:
         """Get streaming in-line completion for real-time updates"""
+        logger.info("Starting streaming completion", 
+                   file_path=context.file_path, 
+                   language=context.language.value)
+        
+        completion_id = str(uuid.uuid4())
+        line, column = context.cursor_position
+        text = ""
         try:
-            logger.info("Starting streaming completion", 
-                       file_path=context.file_path, 
-                       language=context.language.value)
-            
-            # Generate base completion
+            async for chunk in self.stream_completion_tokens(context):
+                text += chunk
+                yield InlineCompletion(
+                    completion_id=completion_id,
+                    text=text,
+                    completion_type="streaming",
+                    language=context.language.value,
+                    confidence=0.0,
+                    accuracy_score=0.0,
+                    context_relevance=0.0,
+                    semantic_similarity=0.0,
+                    pattern_match_score=0.0,
+                    ml_prediction_score=0.0,
+                    ensemble_score=0.0,
+                    start_line=line,
+                    end_line=line + text.count("\n"),
+                    start_column=column,
+                    end_column=column + len(text.rsplit("\n", 1)[-1]),
+                    description="Streaming completion",
+                    is_streaming=True
+                )
+        except Exception as e:
+            if text:
+                logger.error("Streaming completion interrupted", completion_id=completion_id, error=str(e))
+                raise
+            # No provider produced anything; fall back to the local completion pipeline
+            logger.warning("Provider streaming unavailable, using local completion", error=str(e))
             base_completion = await self.get_inline_completion(context)
             base_completion.is_streaming = True
-            
-            # Stream completion updates
             yield base_completion
-            
-            # Simulate streaming updates (in real implementation, this would be more sophisticated)
-            for i in range(3):
-                await asyncio.sleep(0.1)  # 100ms delay between updates
-                
-                # Create updated completion
-                updated_completion = InlineCompletion(
-                    completion_id=base_completion.completion_id,
-                    text=base_completion.text + f"_update_{i+1}",
-                    completion_type=base_completion.completion_type,
-                    language=base_completion.language,
-                    confidence=base_completion.confidence + (i * 0.1),
-                    accuracy_score=base_completion.accuracy_score,
-                    context_relevance=base_completion.context_relevance,
-                    semantic_similarity=base_completion.semantic_similarity,
-                    pattern_match_score=base_completion.pattern_match_score,
-                    ml_prediction_score=base_completion.ml_prediction_score,
-                    ensemble_score=base_completion.ensemble_score,
-                    start_line=base_completion.start_line,
-                    end_line=base_completion.end_line,
-                    start_column=base_completion.start_column,
-                    end_column=base_completion.end_column,
-                    description=base_completion.description,
-                    documentation=base_completion.documentation,
-                    parameters=base_completion.parameters,
-                    return_type=base_completion.return_type,
-                    optimization_strategies=base_completion.optimization_strategies,
-                    is_streaming=True,
-                    created_at=base_completion.created_at
-                )
-                
-                yield updated_completion
-            
-            logger.info("Completed streaming completion", completion_id=base_completion.completion_id)
-            
-        except Exception as e:
-            logger.error("Failed to get streaming completion", error=str(e))
-            raise
+            return
+        
+        logger.info("Completed streaming completion", completion_id=completion_id, characters=len(text))
     
     async def get_context_aware_completion(self, context: CompletionContext) -> List[InlineCompletion]:
         """Get context-aware completions with multiple options"""
@@ -5787,6 +5926,7 @@ async def get_item(item_id: int):
                 "completion_accuracy": completion.accuracy_score,
                 "context_relevance": completion.context_relevance,
                 "optimizations": optimizations,
+                "prefetch": self.prefetcher.get_stats(),
                 "cache_hit": self._check_cache_hit(context),
                 "memory_usage": self._get_memory_usage(),
                 "cpu_usage": self._get_cpu_usage(),
@@ -5801,26 +5941,17 @@ async def get_item(item_id: int):
     
     # Helper methods for in-line completion
     
-    def _generate_completion_cache_key(self, context: CompletionContext) -> str:
-        """Generate cache key for completion context"""
-        key_data = {
-            "file_path": context.file_path,
-            "language": context.language.value,
-            "content": context.content,
-            "cursor_position": context.cursor_position,
-            "selection": context.selection
-        }
-        
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
-    
     def _update_completion_metrics(self, completion: InlineCompletion):
         """Update completion metrics"""
         if completion.language not in self.accuracy_metrics:
             self.accuracy_metrics[completion.language] = AccuracyMetrics(
                 total_completions=0,
                 correct_completions=0,
-                accuracy_percentage=0.0
+                accuracy_percentage=0.0,
+                confidence_threshold=0.8,
+                optimization_level=AccuracyLevel.ADVANCED,
+                strategies_used=[OptimizationStrategy.ENSEMBLE_METHODS],
+                timestamp=datetime.now()
             )
         
         metrics = self.accuracy_metrics[completion.language]
@@ -6001,8 +6132,7 @@ async def get_item(item_id: int):
     
     def _check_cache_hit(self, context: CompletionContext) -> bool:
         """Check if completion is cached"""
-        cache_key = self._generate_completion_cache_key(context)
-        return cache_key in self.inline_completion_cache
+        return self.inline_completion_cache.peek(context)
     
     def _get_memory_usage(self) -> float:
         """Get current memory usage"""
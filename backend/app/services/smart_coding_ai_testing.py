@@ -9,6 +9,8 @@ import re
 from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
 
+from app.core.code_analysis_context import get_analysis_context
+
 logger = structlog.get_logger()
 
 
@@ -53,15 +55,15 @@ class TestCaseGenerator:
         functions = {}
         
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    params = [arg.arg for arg in node.args.args]
-                    functions[node.name] = {
-                        "params": params,
-                        "is_async": isinstance(node, ast.AsyncFunctionDef),
-                        "lineno": node.lineno
-                    }
+            context = get_analysis_context(code)
+            context.require_tree()
+            for node in context.of_type(ast.FunctionDef):
+                params = [arg.arg for arg in node.args.args]
+                functions[node.name] = {
+                    "params": params,
+                    "is_async": isinstance(node, ast.AsyncFunctionDef),
+                    "lineno": node.lineno
+                }
         except:
             pass
         
@@ -17,11 +17,12 @@ from enum import Enum
 import uuid
 
 # Import existing services
-from .ai_orchestrator import AIOrchestrator
+from .ai_orchestrator import AIOrchestrator, estimated_hours, plan_graph
 from .smart_coding_ai_optimized import SmartCodingAIOptimized
 from .smarty_ethical_integration import SmartyEthicalIntegration
 
 # Import Ethical AI Components for enhanced orchestration
+from app.core.dag_executor import DAGError, DAGNode, NodeStatus, critical_path, get_dag_executor, parallel_levels
 from app.core.ethical_ai_core import ethical_ai_core
 from app.core.tool_integration_manager import tool_integration_manager
 from app.core.security_validator import security_validator
@@ -79,6 +80,7 @@ class CodeGenerationTask:
     code_type: str
     priority: int
     dependencies: List[str] = field(default_factory=list)
+    estimated_hours: float = 1.0
     generated_code: Optional[str] = None
     validation_results: Dict[str, Any] = field(default_factory=dict)
     status: str = "pending"
@@ -245,11 +247,12 @@ class SmartyAIOrchestrator:
                 task = CodeGenerationTask(
                     task_id=task_id,
                     plan_id=enhanced_plan.get('plan_id', ''),
-                    step_id=step.get('step_id', f'step_{i}'),
+                    step_id=step.get('step_id') or step.get('id') or f'step_{i}',
                     requirements=step.get('smarty_code_generation', {}),
                     code_type=step.get('smarty_code_generation', {}).get('code_type', 'general'),
                     priority=i,
-                    dependencies=step.get('smarty_code_generation', {}).get('dependencies', [])
+                    dependencies=step.get('smarty_code_generation', {}).get('dependencies', []),
+                    estimated_hours=estimated_hours(step)
                 )
                 
                 code_tasks.append(task)
@@ -263,7 +266,7 @@ class SmartyAIOrchestrator:
             return []
 
     async def _execute_code_generation(self, code_tasks: List[CodeGenerationTask]) -> Dict[str, Any]:
-        """Execute code generation using Smarty with ethical validation"""
+        """Execute code generation using Smarty with ethical validation; independent steps run concurrently"""
         try:
             generation_results = {
                 'tasks_completed': 0,
@@ -274,42 +277,48 @@ class SmartyAIOrchestrator:
                 'quality_metrics': {}
             }
             
-            # Execute tasks based on strategy
+            # Each step waits only for the steps it depends on. LLM output is not a pure
+            # function of the task, so steps are never served from the executor's memo
+            step_ids = {task.step_id for task in code_tasks}
+            nodes = [
+                DAGNode(task.step_id, self._code_generation_action(task),
+                        dependencies=[dep for dep in task.dependencies if dep in step_ids],
+                        cost=task.estimated_hours, memoize=False)
+                for task in code_tasks
+            ]
+            run = await get_dag_executor().run(nodes)
+            
             for task in code_tasks:
-                try:
-                    # Generate code using Smarty
-                    generated_code = await self._generate_code_for_task(task)
-                    
-                    if generated_code:
-                        # Validate code ethically
-                        validation_results = await self._validate_generated_code(generated_code, task)
-                        
-                        # Store results
-                        task.generated_code = generated_code
-                        task.validation_results = validation_results
-                        task.status = 'completed'
-                        
-                        generation_results['generated_code'][task.task_id] = {
-                            'code': generated_code,
-                            'validation': validation_results,
-                            'task_info': {
-                                'step_id': task.step_id,
-                                'code_type': task.code_type,
-                                'priority': task.priority
-                            }
-                        }
-                        
-                        generation_results['tasks_completed'] += 1
-                        generation_results['total_code_generated'] += len(generated_code)
-                        
-                    else:
-                        task.status = 'failed'
-                        generation_results['tasks_failed'] += 1
-                        
-                except Exception as e:
-                    logger.error(f"Code generation failed for task {task.task_id}", error=str(e))
+                node_result = run.results[task.step_id]
+                if node_result.status != NodeStatus.SUCCEEDED:
+                    if node_result.status == NodeStatus.FAILED:
+                        logger.error(f"Code generation failed for task {task.task_id}", error=node_result.error)
                     task.status = 'failed'
                     generation_results['tasks_failed'] += 1
+                    continue
+                
+                generated_code = node_result.result['code']
+                validation_results = node_result.result['validation']
+                
+                # Store results
+                task.generated_code = generated_code
+                task.validation_results = validation_results
+                task.status = 'completed'
+                
+                generation_results['generated_code'][task.task_id] = {
+                    'code': generated_code,
+                    'validation': validation_results,
+                    'task_info': {
+                        'step_id': task.step_id,
+                        'code_type': task.code_type,
+                        'priority': task.priority
+                    }
+                }
+                
+                generation_results['tasks_completed'] += 1
+                generation_results['total_code_generated'] += len(generated_code)
+            
+            generation_results['execution'] = run.summary()
             
             # Calculate quality metrics
             generation_results['quality_metrics'] = await self._calculate_generation_quality_metrics(generation_results)
@@ -325,6 +334,16 @@ class SmartyAIOrchestrator:
             logger.error(f"Code generation execution failed", error=str(e))
             return {'tasks_completed': 0, 'tasks_failed': len(code_tasks), 'error': str(e)}
 
+    def _code_generation_action(self, task: CodeGenerationTask):
+        """DAG node action: generate and validate the code for one step"""
+        async def action(upstream: Dict[str, Any]) -> Dict[str, Any]:
+            generated_code = await self._generate_code_for_task(task)
+            if not generated_code:
+                raise RuntimeError(f"No code generated for step {task.step_id}")
+            validation_results = await self._validate_generated_code(generated_code, task)
+            return {'code': generated_code, 'validation': validation_results}
+        return action
+
     async def _generate_code_for_task(self, task: CodeGenerationTask) -> Optional[str]:
         """Generate code for a specific task using Smarty"""
         try:
@@ -483,7 +502,7 @@ class SmartyAIOrchestrator:
 
     async def _identify_step_dependencies(self, step: Dict[str, Any]) -> List[str]:
         """Identify dependencies for a step"""
-        return []
+        return list(step.get('dependencies', []))
 
     async def _identify_testing_needs(self, step: Dict[str, Any]) -> List[str]:
         """Identify testing needs for a step"""
@@ -495,11 +514,19 @@ class SmartyAIOrchestrator:
 
     async def _identify_parallel_opportunities(self, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Identify opportunities for parallel execution"""
-        return []
+        try:
+            levels = parallel_levels(plan_graph(steps))
+        except DAGError as e:
+            logger.warning("Plan steps do not form a DAG", error=str(e))
+            return []
+        return [{'stage': stage, 'steps': level} for stage, level in enumerate(levels) if len(level) > 1]
 
     async def _analyze_critical_path(self, steps: List[Dict[str, Any]]) -> List[str]:
         """Analyze critical path through steps"""
-        return [step.get('step_id', f'step_{i}') for i, step in enumerate(steps)]
+        try:
+            return critical_path(plan_graph(steps))[0]
+        except DAGError:
+            return [step.get('step_id') or step.get('id') or f'step_{i}' for i, step in enumerate(steps)]
 
     async def _calculate_quality_score(self, generation_results: Dict[str, Any]) -> float:
         """Calculate overall quality score"""
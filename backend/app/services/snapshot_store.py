@@ -0,0 +1,594 @@
+"""
+Codebase Memory Snapshot Store
+Encodes project snapshots column-wise (interned strings, integer ids for files
+and symbols, typed arrays) into one immutable blob per version. Views decode
+rows lazily straight from the blob, which is memory-mapped read-only when the
+store lives on disk, so every worker shares the same page cache. Re-indexing a
+project writes a new version and swaps it in atomically.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from app.services.repository_indexer import ManifestEntry
+
+logger = structlog.get_logger()
+
+MAGIC = b"CMSNAP01"
+FORMAT_VERSION = 1
+NO_STRING = 0xFFFFFFFF
+
+# Columns for the keys CodingPatternRecognizer emits; a per-row bitmask records which were present
+_PATTERN_KEYS = (
+    "pattern_id", "pattern_name", "pattern_type", "language", "file_path",
+    "line_number", "context", "confidence", "complexity",
+)
+_PATTERN_BITS = {key: 1 << bit for bit, key in enumerate(_PATTERN_KEYS)}
+_FILE_FIELDS = frozenset({"type", "size", "modified", "extension"})
+
+
+class SnapshotFormatError(ValueError):
+    """Blob is not a snapshot this version of the store can read"""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return str(value)
+
+
+def _json_hook(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, separators=(",", ":"), sort_keys=True)
+
+
+_DECODER = json.JSONDecoder(object_hook=_json_hook)
+_PLAIN_DECODER = json.JSONDecoder()
+
+
+def _loads(text: str) -> Any:
+    # The hook only matters for encoded datetimes, which are rare in pattern contexts
+    return (_DECODER if "$dt" in text else _PLAIN_DECODER).decode(text)
+
+
+def _uuid_string(raw: bytes) -> str:
+    digits = raw.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return string_id
+
+
+def _mtime_ns(file_data: Dict[str, Any]) -> int:
+    modified = file_data.get("modified")
+    return round(modified.timestamp() * 1e6) * 1000 if isinstance(modified, datetime) else 0
+
+
+def encode_snapshot(snapshot: Dict[str, Any], manifest: Optional[Dict[str, ManifestEntry]] = None) -> bytes:
+    """Serialize a snapshot dict (plus the indexer manifest, if any) into the columnar format"""
+    strings = _StringTable()
+    intern = strings.intern
+    columns: Dict[str, array] = {}
+
+    def column(name: str, typecode: str) -> array:
+        columns[name] = array(typecode)
+        return columns[name]
+
+    structure = dict(snapshot.get("project_structure") or {})
+    file_tree = structure.pop("file_tree", None) or {}
+    manifest = manifest or {}
+
+    file_path, file_is_dir, file_size = column("file_path", "I"), column("file_is_dir", "B"), column("file_size", "q")
+    file_mtime, file_ext = column("file_mtime_ns", "q"), column("file_ext", "I")
+    file_hash, file_lang, file_extra = column("file_hash", "I"), column("file_lang", "I"), column("file_extra", "I")
+    for path, data in file_tree.items():
+        entry = manifest.get(path)
+        file_path.append(intern(path))
+        file_is_dir.append(1 if data.get("type") == "directory" else 0)
+        file_size.append(int(data.get("size", 0) or 0))
+        file_mtime.append(entry.mtime_ns if entry else _mtime_ns(data))
+        file_ext.append(intern(data.get("extension")))
+        file_hash.append(intern(entry.hash if entry else None))
+        file_lang.append(intern(entry.language if entry else None))
+        extra = {key: value for key, value in data.items() if key not in _FILE_FIELDS}
+        file_extra.append(intern(_dumps(extra)) if extra else NO_STRING)
+
+    patterns = snapshot.get("coding_patterns") or []
+    pattern_ids = [pattern.get("pattern_id") for pattern in patterns]
+    uuid_ids = bool(pattern_ids) and all(_is_canonical_uuid(value) for value in pattern_ids)
+    raw_uuids = bytearray()
+    name, kind, language = column("pattern_name", "I"), column("pattern_type", "I"), column("pattern_lang", "I")
+    path_ids, line = column("pattern_file", "I"), column("pattern_line", "I")
+    confidence, complexity = column("pattern_confidence", "d"), column("pattern_complexity", "d")
+    context, extra_ids = column("pattern_context", "I"), column("pattern_extra", "I")
+    string_ids = column("pattern_id", "I") if not uuid_ids else None
+    present = column("pattern_present", "H")
+    for pattern, pattern_id in zip(patterns, pattern_ids):
+        present.append(sum(_PATTERN_BITS[key] for key in pattern if key in _PATTERN_BITS))
+        if uuid_ids:
+            raw_uuids += uuid.UUID(pattern_id).bytes
+        else:
+            string_ids.append(intern(None if pattern_id is None else str(pattern_id)))
+        name.append(intern(pattern.get("pattern_name")))
+        kind.append(intern(pattern.get("pattern_type")))
+        language.append(intern(pattern.get("language")))
+        path_ids.append(intern(pattern.get("file_path")))
+        line.append(int(pattern.get("line_number") or 0))
+        confidence.append(float(pattern.get("confidence", 0.0) or 0.0))
+        complexity.append(float(pattern.get("complexity", 0.0) or 0.0))
+        context.append(intern(_dumps(pattern["context"])) if "context" in pattern else NO_STRING)
+        extra = {key: value for key, value in pattern.items() if key not in _PATTERN_BITS}
+        extra_ids.append(intern(_dumps(extra)) if extra else NO_STRING)
+
+    meta = {key: value for key, value in snapshot.items() if key not in ("coding_patterns", "project_structure")}
+    meta["project_structure"] = structure
+    meta["$has_structure"] = "project_structure" in snapshot
+
+    encoded = [value.encode("utf-8", "surrogatepass") for value in strings.values]
+    offsets = array("Q", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    sections: List[Tuple[str, str, bytes]] = [
+        ("meta", "B", _dumps(meta).encode("utf-8")),
+        ("string_offsets", "Q", offsets.tobytes()),
+        ("string_data", "B", b"".join(encoded)),
+    ]
+    sections.extend((column_name, values.typecode, values.tobytes()) for column_name, values in columns.items())
+    if uuid_ids:
+        sections.append(("pattern_uuid", "B", bytes(raw_uuids)))
+
+    header = {"format": FORMAT_VERSION, "files": len(file_tree), "patterns": len(patterns),
+              "strings": len(strings.values), "sections": {}}
+    # Section offsets depend on the header length, so size the header with placeholders first
+    header_probe = dict(header, sections={name: [2 ** 40, 2 ** 40, code] for name, code, _ in sections})
+    header_size = _align(len(MAGIC) + 4 + len(json.dumps(header_probe)))
+    position = header_size
+    for section_name, typecode, data in sections:
+        header["sections"][section_name] = [position, len(data), typecode]
+        position = _align(position + len(data))
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    out = bytearray(MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+    for section_name, _, data in sections:
+        out += b"\0" * (header["sections"][section_name][0] - len(out))
+        out += data
+    return bytes(out)
+
+
+def _align(value: int) -> int:
+    return (value + 7) & ~7
+
+
+def _is_canonical_uuid(value: Any) -> bool:
+    if not isinstance(value, str) or len(value) != 36:
+        return False
+    try:
+        return str(uuid.UUID(value)) == value
+    except ValueError:
+        return False
+
+
+# ============================================================================
+# VIEWS
+# ============================================================================
+
+class SnapshotView(Mapping):
+    """
+    Read-only snapshot backed by an encoded blob.
+
+    Behaves like the snapshot dict it was built from: ``coding_patterns`` is a
+    lazy sequence and ``project_structure["file_tree"]`` a lazy mapping, so
+    callers that count or look up entries never materialize the rest.
+    """
+
+    def __init__(self, buffer: Any, version: int = 0, source: Optional[str] = None):
+        self._buffer = buffer
+        self.version = version
+        self.source = source
+        view = memoryview(buffer)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise SnapshotFormatError("Not a codebase memory snapshot")
+        (header_length,) = struct.unpack_from("<I", view, len(MAGIC))
+        header = json.loads(bytes(view[len(MAGIC) + 4:len(MAGIC) + 4 + header_length]))
+        if header.get("format") != FORMAT_VERSION:
+            raise SnapshotFormatError(f"Unsupported snapshot format {header.get('format')}")
+
+        self.file_count = header["files"]
+        self.pattern_count = header["patterns"]
+        self._columns: Dict[str, memoryview] = {}
+        for name, (offset, length, typecode) in header["sections"].items():
+            section = view[offset:offset + length]
+            self._columns[name] = section.cast(typecode) if typecode != "B" else section
+        self._meta = _loads(bytes(self._columns["meta"]).decode("utf-8"))
+        self._has_structure = self._meta.pop("$has_structure", True)
+        self._string_cache: Dict[int, str] = {}
+        self._file_index: Optional[Dict[str, int]] = None
+
+    # -- strings -------------------------------------------------------------
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        value = self._string_cache.get(string_id)
+        if value is None:
+            offsets = self._columns["string_offsets"]
+            raw = self._columns["string_data"][offsets[string_id]:offsets[string_id + 1]]
+            value = bytes(raw).decode("utf-8", "surrogatepass")
+            if len(self._string_cache) < 65536:
+                self._string_cache[string_id] = value
+        return value
+
+    # -- rows ----------------------------------------------------------------
+
+    def pattern_fields(self, index: int) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+        """(name, type, language, file_path) without building the full dict"""
+        columns = self._columns
+        return (self.string(columns["pattern_name"][index]), self.string(columns["pattern_type"][index]),
+                self.string(columns["pattern_lang"][index]), self.string(columns["pattern_file"][index]))
+
+    def pattern(self, index: int) -> Dict[str, Any]:
+        columns = self._columns
+        if "pattern_uuid" in columns:
+            pattern_id = _uuid_string(bytes(columns["pattern_uuid"][index * 16:index * 16 + 16]))
+        else:
+            pattern_id = self.string(columns["pattern_id"][index])
+        name, kind, language, file_path = self.pattern_fields(index)
+        context_id = columns["pattern_context"][index]
+        values = (
+            pattern_id, name, kind, language, file_path, columns["pattern_line"][index],
+            _loads(self.string(context_id)) if context_id != NO_STRING else None,
+            columns["pattern_confidence"][index], columns["pattern_complexity"][index],
+        )
+        present = columns["pattern_present"][index]
+        pattern = {key: value for key, value in zip(_PATTERN_KEYS, values) if present & _PATTERN_BITS[key]}
+        extra_id = columns["pattern_extra"][index]
+        if extra_id != NO_STRING:
+            pattern.update(_loads(self.string(extra_id)))
+        return pattern
+
+    def file_path(self, index: int) -> str:
+        return self.string(self._columns["file_path"][index])
+
+    def file_data(self, index: int) -> Dict[str, Any]:
+        columns = self._columns
+        if columns["file_is_dir"][index]:
+            data = {"type": "directory"}
+        else:
+            data = {"type": "file", "size": columns["file_size"][index]}
+        data["modified"] = datetime.fromtimestamp(columns["file_mtime_ns"][index] / 1e9)
+        extension = self.string(columns["file_ext"][index])
+        if extension is not None:
+            data["extension"] = extension
+        extra_id = columns["file_extra"][index]
+        if extra_id != NO_STRING:
+            data.update(_loads(self.string(extra_id)))
+        return data
+
+    def file_index(self, path: str) -> Optional[int]:
+        if self._file_index is None:
+            self._file_index = {self.file_path(i): i for i in range(self.file_count)}
+        return self._file_index.get(path)
+
+    def manifest(self) -> Dict[str, ManifestEntry]:
+        """Indexer manifest recorded with the snapshot (entries without a hash are re-checked on the next pass)"""
+        columns = self._columns
+        return {
+            self.file_path(i): ManifestEntry(
+                self.file_path(i), columns["file_mtime_ns"][i], columns["file_size"][i],
+                self.string(columns["file_hash"][i]), self.string(columns["file_lang"][i]),
+                bool(columns["file_is_dir"][i]),
+            )
+            for i in range(self.file_count)
+        }
+
+    # -- mapping protocol ----------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "coding_patterns":
+            return PatternSequence(self)
+        if key == "project_structure":
+            if not self._has_structure:
+                raise KeyError(key)
+            return {**self._meta["project_structure"], "file_tree": FileTreeMapping(self)}
+        if key not in self._meta:
+            raise KeyError(key)
+        return self._meta[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (key for key in self._meta if key != "project_structure")
+        if self._has_structure:
+            yield "project_structure"
+        yield "coding_patterns"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully materialized, mutable snapshot dict"""
+        snapshot = {key: value for key, value in self._meta.items() if key != "project_structure"}
+        if self._has_structure:
+            snapshot["project_structure"] = {
+                **self._meta["project_structure"],
+                "file_tree": {path: self.file_data(i) for i, path in enumerate(self.file_paths())},
+            }
+        snapshot["coding_patterns"] = self._all_patterns()
+        return snapshot
+
+    def _all_strings(self) -> List[str]:
+        offsets = self._columns["string_offsets"].tolist()
+        data = bytes(self._columns["string_data"])
+        return [data[start:end].decode("utf-8", "surrogatepass") for start, end in zip(offsets, offsets[1:])]
+
+    def _column_resolver(self):
+        strings: List[Optional[str]] = self._all_strings()
+        strings.append(None)
+        null = len(strings) - 1
+
+        def resolve(column: str) -> List[Optional[str]]:
+            return [strings[i if i != NO_STRING else null] for i in self._columns[column].tolist()]
+        return resolve
+
+    def pattern_file_paths(self) -> List[Optional[str]]:
+        """``file_path`` of every pattern, in order"""
+        return self._column_resolver()("pattern_file")
+
+    def file_paths(self) -> List[str]:
+        return self._column_resolver()("file_path")
+
+    def _all_patterns(self) -> List[Dict[str, Any]]:
+        """Column-at-a-time decode of every pattern; much cheaper than pattern(i) per row"""
+        columns = self._columns
+        resolve = self._column_resolver()
+
+        if "pattern_uuid" in columns:
+            raw = bytes(columns["pattern_uuid"])
+            pattern_ids = [_uuid_string(raw[i:i + 16]) for i in range(0, len(raw), 16)]
+        else:
+            pattern_ids = resolve("pattern_id")
+        contexts = [None if text is None else _loads(text) for text in resolve("pattern_context")]
+        rows = zip(pattern_ids, resolve("pattern_name"), resolve("pattern_type"), resolve("pattern_lang"),
+                   resolve("pattern_file"), columns["pattern_line"].tolist(), contexts,
+                   columns["pattern_confidence"].tolist(), columns["pattern_complexity"].tolist())
+
+        patterns = []
+        full = (1 << len(_PATTERN_KEYS)) - 1
+        for values, present, extra in zip(rows, columns["pattern_present"].tolist(), resolve("pattern_extra")):
+            if present == full:
+                pattern = dict(zip(_PATTERN_KEYS, values))
+            else:
+                pattern = {key: value for key, value in zip(_PATTERN_KEYS, values) if present & _PATTERN_BITS[key]}
+            if extra is not None:
+                pattern.update(_loads(extra))
+            patterns.append(pattern)
+        return patterns
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+
+class PatternSequence(Sequence):
+    """Lazy ``coding_patterns`` list of a SnapshotView"""
+
+    def __init__(self, view: SnapshotView):
+        self._view = view
+
+    def __len__(self) -> int:
+        return self._view.pattern_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._view.pattern(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._view.pattern(index)
+
+
+class FileTreeMapping(Mapping):
+    """Lazy ``file_tree`` dict of a SnapshotView"""
+
+    def __init__(self, view: SnapshotView):
+        self._view = view
+
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        index = self._view.file_index(path)
+        if index is None:
+            raise KeyError(path)
+        return self._view.file_data(index)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._view.file_path(i) for i in range(self._view.file_count))
+
+    def __len__(self) -> int:
+        return self._view.file_count
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class SnapshotStore:
+    """
+    Versioned snapshot storage.
+
+    With a ``root`` directory each project gets ``<root>/<project_id>/`` holding
+    immutable ``v<N>.snap`` files and a ``CURRENT`` pointer replaced atomically;
+    views memory-map the current file read-only. Without one, encoded blobs are
+    kept in process memory, which still keeps idle projects compact.
+    """
+
+    def __init__(self, root: Optional[str] = None, keep_versions: int = 2):
+        self.root = os.path.abspath(root) if root else None
+        self.keep_versions = max(1, keep_versions)
+        self._blobs: Dict[str, Tuple[int, bytes]] = {}
+        self._views: Dict[str, SnapshotView] = {}
+        self._lock = threading.Lock()
+        if self.root:
+            os.makedirs(self.root, exist_ok=True)
+
+    def save(self, snapshot: Dict[str, Any], manifest: Optional[Dict[str, ManifestEntry]] = None) -> SnapshotView:
+        """Encode and publish a new version of the project's snapshot"""
+        project_id = snapshot["project_id"]
+        data = encode_snapshot(snapshot, manifest)
+        with self._lock:
+            if self.root is None:
+                version = self._blobs.get(project_id, (0, b""))[0] + 1
+                self._blobs[project_id] = (version, data)
+            else:
+                version = self._write_version(project_id, data)
+            self._views.pop(project_id, None)
+        logger.info("Memory snapshot saved", project_id=project_id, version=version, bytes=len(data))
+        return self.load(project_id)
+
+    def _project_dir(self, project_id: str) -> str:
+        if not project_id or os.sep in project_id or project_id.startswith("."):
+            raise ValueError(f"Invalid project id: {project_id!r}")
+        return os.path.join(self.root, project_id)
+
+    def _write_version(self, project_id: str, data: bytes) -> int:
+        directory = self._project_dir(project_id)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # os.link fails if the name exists, so concurrent writers never clobber a version
+        version = max(self._versions(directory), default=0) + 1
+        while True:
+            try:
+                os.link(temp_path, os.path.join(directory, f"v{version:08d}.snap"))
+                break
+            except FileExistsError:
+                version += 1
+        os.unlink(temp_path)
+
+        pointer = os.path.join(directory, f".{uuid.uuid4().hex}.current")
+        with open(pointer, "w") as f:
+            f.write(str(version))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer, os.path.join(directory, "CURRENT"))
+
+        # Readers that already mapped an older version keep it until they drop the view
+        for old in sorted(self._versions(directory))[:-self.keep_versions]:
+            if old != version:
+                try:
+                    os.unlink(os.path.join(directory, f"v{old:08d}.snap"))
+                except OSError:
+                    pass
+        return version
+
+    @staticmethod
+    def _versions(directory: str) -> List[int]:
+        versions = []
+        for name in os.listdir(directory):
+            if name.startswith("v") and name.endswith(".snap") and name[1:-5].isdigit():
+                versions.append(int(name[1:-5]))
+        return versions
+
+    def current_version(self, project_id: str) -> int:
+        if self.root is None:
+            return self._blobs.get(project_id, (0, b""))[0]
+        try:
+            with open(os.path.join(self._project_dir(project_id), "CURRENT")) as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def load(self, project_id: str, attempts: int = 3) -> Optional[SnapshotView]:
+        """Current version of a project (the mapping is shared until a newer version is published)"""
+        for attempt in range(attempts):
+            version = self.current_version(project_id)
+            if not version:
+                return None
+            view = self._views.get(project_id)
+            if view is not None and view.version == version:
+                return view
+
+            if self.root is None:
+                view = SnapshotView(self._blobs[project_id][1], version)
+            else:
+                path = os.path.join(self._project_dir(project_id), f"v{version:08d}.snap")
+                try:
+                    with open(path, "rb") as f:
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except FileNotFoundError:
+                    # Another writer published and pruned this version after CURRENT was read
+                    if attempt == attempts - 1:
+                        raise
+                    continue
+                view = SnapshotView(mapped, version, source=path)
+            self._views[project_id] = view
+            return view
+        return None
+
+    def project_ids(self) -> List[str]:
+        if self.root is None:
+            return list(self._blobs)
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, "CURRENT"))
+        )
+
+    def delete(self, project_id: str) -> bool:
+        with self._lock:
+            self._views.pop(project_id, None)
+            if self.root is None:
+                return self._blobs.pop(project_id, None) is not None
+            directory = self._project_dir(project_id)
+            if not os.path.isdir(directory):
+                return False
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+            os.rmdir(directory)
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "mmap" if self.root else "memory",
+            "root": self.root,
+            "projects": len(self.project_ids()),
+            "loaded_bytes": sum(view.nbytes for view in self._views.values()),
+        }
+
+
+__all__ = [
+    "FileTreeMapping",
+    "PatternSequence",
+    "SnapshotFormatError",
+    "SnapshotStore",
+    "SnapshotView",
+    "encode_snapshot",
+]
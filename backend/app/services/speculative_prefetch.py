@@ -0,0 +1,289 @@
+"""
+Speculative Prefetch
+Acts on next-file predictions: when the user is likely to open a file next,
+its parse tree, symbol index, memory context and likely completions are warmed
+while the user is idle, so the first keystroke after the switch is served
+from warm caches. Prefetch work is bounded by a per-prediction time budget and
+a share of wall-clock time, yields to user activity, is cancelled as soon as
+the user opens a different file, and every prediction is accounted as a hit,
+a late hit or a misprediction. Predicted paths come from what clients reported,
+so they are only read when they resolve inside the project's root.
+"""
+
+import asyncio
+import inspect
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class PrefetchTarget:
+    """One predicted file being (or having been) warmed"""
+    user_id: str
+    file_path: str
+    confidence: float
+    project_id: Optional[str] = None
+    cursor: Optional[Tuple[int, int]] = None  # last known (1-based line, 0-based column) in the file
+    content: Optional[str] = None
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+    warmed: List[str] = field(default_factory=list)
+    spent_ms: float = 0.0
+    done: bool = False
+    resolved_path: Optional[str] = None  # file_path anchored under the project root
+
+
+Warmer = Callable[[PrefetchTarget], Awaitable[Any]]
+RootResolver = Callable[[Optional[str]], Optional[str]]
+
+
+class FileTransitionModel:
+    """
+    First-order model of which file a user opens after another. Confidence
+    is the share of observed transitions out of the current file that went
+    to the candidate.
+    """
+
+    def __init__(self, max_targets: int = 32, min_observations: int = 2):
+        self.max_targets = max_targets
+        self.min_observations = min_observations
+        self._last_file: Dict[str, str] = {}
+        self._transitions: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def record(self, user_id: str, file_path: str) -> None:
+        previous = self._last_file.get(user_id)
+        self._last_file[user_id] = file_path
+        if previous is None or previous == file_path:
+            return
+        targets = self._transitions.setdefault((user_id, previous), {})
+        targets[file_path] = targets.get(file_path, 0) + 1
+        if len(targets) > self.max_targets:
+            del targets[min(targets, key=targets.get)]
+
+    def predict(self, user_id: str, current_file: str, k: int = 1) -> List[Tuple[str, float]]:
+        """Up to ``k`` ``(file, confidence)`` pairs, most likely first"""
+        targets = self._transitions.get((user_id, current_file))
+        if not targets:
+            return []
+        total = sum(targets.values())
+        if total < self.min_observations:
+            return []
+        ranked = sorted(targets.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(path, count / total) for path, count in ranked]
+
+    async def predict_next_files(self, user_id: str, current_file: str, k: int = 1) -> List[Tuple[str, float]]:
+        return self.predict(user_id, current_file, k)
+
+
+def anchor_path(root: str, file_path: str) -> Optional[str]:
+    """``file_path`` (relative to ``root`` or absolute) resolved inside ``root``; None if it escapes"""
+    base = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(base, file_path))
+    if os.path.commonpath([base, resolved]) != base:
+        return None
+    return resolved
+
+
+def _read_text(path: str, max_bytes: int) -> Optional[str]:
+    try:
+        with open(path, "rb") as handle:
+            data = handle.read(max_bytes + 1)
+    except OSError:
+        return None
+    if len(data) > max_bytes:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+class SpeculativePrefetcher:
+    """
+    Runs named warmers for predicted files.
+
+    ``predictor`` is anything with ``predict_next_files(user_id, current_file, k)``
+    returning ``(file, confidence)`` pairs (sync or async). ``project_root`` maps a
+    project id to its root directory; predictions without a root, or whose path
+    resolves outside it, are rejected before anything is read. Warmers run in the
+    order they were added, one at a time, each only after ``idle_ms`` without
+    user activity (see ``note_activity``). A prediction stops warming once it
+    has spent ``time_budget_ms``, and all prefetching together may use at most
+    ``cpu_share`` of wall-clock time.
+    """
+
+    def __init__(self, predictor: Any, project_root: RootResolver, confidence_threshold: float = 0.5, max_candidates: int = 1,
+                 time_budget_ms: float = 250.0, cpu_share: float = 0.25, idle_ms: float = 150.0,
+                 max_file_bytes: int = 512_000, max_remembered: int = 256):
+        self.predictor = predictor
+        self.project_root = project_root
+        self.confidence_threshold = confidence_threshold
+        self.max_candidates = max_candidates
+        self.time_budget_ms = time_budget_ms
+        self.cpu_share = cpu_share
+        self.idle_ms = idle_ms
+        self.max_file_bytes = max_file_bytes
+        self.max_remembered = max_remembered
+        self.warmers: "OrderedDict[str, Warmer]" = OrderedDict()
+        self._pending: Dict[str, Dict[str, Tuple[PrefetchTarget, asyncio.Task]]] = {}
+        self._cursors: "OrderedDict[Tuple[str, str], Tuple[int, int]]" = OrderedDict()
+        self._last_activity = 0.0
+        self._budget_ms = time_budget_ms
+        self._budget_at = time.monotonic()
+        self.stats = {
+            "predictions": 0, "below_threshold": 0, "scheduled": 0, "hits": 0, "late_hits": 0,
+            "mispredictions": 0, "rejected": 0, "cancelled": 0, "throttled": 0, "warmer_errors": 0,
+            "spent_ms": 0.0, "wasted_ms": 0.0,
+        }
+
+    def add_warmer(self, name: str, warmer: Warmer) -> None:
+        self.warmers[name] = warmer
+
+    def note_activity(self) -> None:
+        """The user is typing; speculative work waits until they pause"""
+        self._last_activity = time.monotonic()
+
+    # -- events --------------------------------------------------------------
+
+    async def on_file_access(self, user_id: str, file_path: str, project_id: Optional[str] = None,
+                             cursor: Optional[Tuple[int, int]] = None) -> List[PrefetchTarget]:
+        """
+        Settle the user's outstanding predictions against the file they opened,
+        then schedule prefetches for the files predicted to come next.
+        """
+        self._settle(user_id, file_path)
+        if cursor is not None:
+            self._remember_cursor(user_id, file_path, cursor)
+
+        try:
+            predictions = self.predictor.predict_next_files(user_id, file_path, self.max_candidates)
+            if inspect.isawaitable(predictions):
+                predictions = await predictions
+        except Exception as e:
+            logger.warning("Next-file prediction failed", error=str(e))
+            return []
+
+        root = self.project_root(project_id)
+        scheduled = []
+        for predicted, confidence in predictions or ():
+            self.stats["predictions"] += 1
+            if predicted == file_path or confidence < self.confidence_threshold:
+                self.stats["below_threshold"] += 1
+                continue
+            resolved = anchor_path(root, predicted) if root else None
+            if resolved is None:
+                self.stats["rejected"] += 1
+                logger.debug("Prefetch path outside project root", file_path=predicted, project_id=project_id)
+                continue
+            scheduled.append(self._schedule(PrefetchTarget(
+                user_id, predicted, confidence, project_id, self._cursors.get((user_id, predicted)),
+                resolved_path=resolved
+            )))
+        return scheduled
+
+    def _remember_cursor(self, user_id: str, file_path: str, cursor: Tuple[int, int]) -> None:
+        key = (user_id, file_path)
+        self._cursors[key] = tuple(cursor)
+        self._cursors.move_to_end(key)
+        while len(self._cursors) > self.max_remembered:
+            self._cursors.popitem(last=False)
+
+    def _settle(self, user_id: str, file_path: str) -> None:
+        for predicted, (target, task) in self._pending.pop(user_id, {}).items():
+            if predicted == file_path:
+                # An unfinished prefetch keeps running: the file is in use now
+                self.stats["hits" if target.done else "late_hits"] += 1
+                continue
+            self.stats["mispredictions"] += 1
+            self.stats["wasted_ms"] += target.spent_ms
+            if not task.done():
+                task.cancel()
+                self.stats["cancelled"] += 1
+
+    def _schedule(self, target: PrefetchTarget) -> PrefetchTarget:
+        task = asyncio.create_task(self._run(target))
+        self._pending.setdefault(target.user_id, {})[target.file_path] = (target, task)
+        self.stats["scheduled"] += 1
+        return target
+
+    # -- warming -------------------------------------------------------------
+
+    async def _wait_idle(self) -> None:
+        while True:
+            idle_for = (time.monotonic() - self._last_activity) * 1000
+            if idle_for >= self.idle_ms:
+                return
+            await asyncio.sleep((self.idle_ms - idle_for) / 1000)
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._budget_ms = min(self.time_budget_ms, self._budget_ms + (now - self._budget_at) * 1000 * self.cpu_share)
+        self._budget_at = now
+        return self._budget_ms
+
+    def _charge(self, target: PrefetchTarget, elapsed_ms: float) -> None:
+        target.spent_ms += elapsed_ms
+        self._budget_ms -= elapsed_ms
+        self.stats["spent_ms"] += elapsed_ms
+
+    async def _run(self, target: PrefetchTarget) -> None:
+        await self._wait_idle()
+        started = time.perf_counter()
+        target.content = await asyncio.to_thread(_read_text, target.resolved_path, self.max_file_bytes)
+        self._charge(target, (time.perf_counter() - started) * 1000)
+
+        for name, warmer in list(self.warmers.items()):
+            await self._wait_idle()
+            remaining = min(self.time_budget_ms - target.spent_ms, self._refill())
+            if remaining <= 0:
+                self.stats["throttled"] += 1
+                break
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(warmer(target), remaining / 1000)
+            except asyncio.TimeoutError:
+                self.stats["throttled"] += 1
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["warmer_errors"] += 1
+                logger.debug("Prefetch warmer failed", warmer=name, file_path=target.file_path, error=str(e))
+                continue
+            finally:
+                self._charge(target, (time.perf_counter() - started) * 1000)
+            if result is not None:
+                target.artifacts[name] = result
+            target.warmed.append(name)
+
+        target.done = True
+
+    async def close(self) -> None:
+        tasks = [task for pending in self._pending.values() for _, task in pending.values()]
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        settled = self.stats["hits"] + self.stats["late_hits"] + self.stats["mispredictions"]
+        return {
+            **self.stats,
+            "in_flight": sum(1 for pending in self._pending.values() for _, task in pending.values()
+                             if not task.done()),
+            "hit_rate": (self.stats["hits"] + self.stats["late_hits"]) / settled if settled else 0.0,
+            "warmers": list(self.warmers),
+        }
+
+
+__all__ = [
+    "FileTransitionModel",
+    "PrefetchTarget",
+    "RootResolver",
+    "SpeculativePrefetcher",
+    "Warmer",
+    "anchor_path",
+]
@@ -12,15 +12,18 @@ from enum import Enum
 import uuid
 import json
 import numpy as np
-from collections import defaultdict, Counter
+from collections import Counter
 import networkx as nx
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 import queue
 import time
 import hashlib
+import math
 import random
 
+from app.core.result_store import create_result_store
+
 logger = structlog.get_logger()
 
 
@@ -61,6 +64,37 @@ class ConsensusLevel(str, Enum):
     VALIDATED_CONSENSUS = "validated_consensus"  # Validated by multiple methods
 
 
+# Agreement (mean agent confidence, %) needed for each level, strongest first
+CONSENSUS_THRESHOLDS = [
+    (ConsensusLevel.UNANIMOUS, 95.0),
+    (ConsensusLevel.SUPER_MAJORITY, 80.0),
+    (ConsensusLevel.EXPERT_CONSENSUS, 67.0),
+    (ConsensusLevel.MAJORITY, 0.0),
+]
+
+# Share of the selected agents that must have answered before a level may be declared early
+DEFAULT_QUORUM_FRACTIONS = {
+    ConsensusLevel.UNANIMOUS: 1.0,
+    ConsensusLevel.SUPER_MAJORITY: 0.67,
+    ConsensusLevel.EXPERT_CONSENSUS: 0.67,
+    ConsensusLevel.VALIDATED_CONSENSUS: 0.67,
+    ConsensusLevel.MAJORITY: 0.51,
+}
+
+
+def consensus_level_for(agreement_percentage: float) -> ConsensusLevel:
+    """Strongest consensus level an agreement percentage reaches"""
+    for level, threshold in CONSENSUS_THRESHOLDS:
+        if agreement_percentage >= threshold:
+            return level
+    return ConsensusLevel.MAJORITY
+
+
+def consensus_threshold(level: ConsensusLevel) -> float:
+    # VALIDATED_CONSENSUS has no agreement band of its own; it needs what validation checks (80%)
+    return dict(CONSENSUS_THRESHOLDS).get(level, 80.0)
+
+
 class ValidationMethod(str, Enum):
     """Validation methods for 100% accuracy"""
     CROSS_VALIDATION = "cross_validation"
@@ -132,6 +166,45 @@ class ConsensusResult:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class QuorumPolicy:
+    """
+    When a swarm task may stop waiting for agents: once ``quorum`` (a share of
+    the selected agents, default per level) have answered and their agreement
+    reaches ``level``. ``UNANIMOUS`` therefore always waits for everyone.
+    Agents slower than their role's timeout are abandoned as stragglers.
+    """
+    level: ConsensusLevel = ConsensusLevel.SUPER_MAJORITY
+    quorum: Optional[float] = None
+    min_results: int = 2
+    min_confidence: Optional[float] = None  # agreement %, defaults to the level's threshold
+    role_timeouts: Dict[AgentRole, float] = field(default_factory=dict)  # seconds
+    default_timeout: Optional[float] = 30.0
+    
+    def required_results(self, agent_count: int) -> int:
+        fraction = self.quorum if self.quorum is not None else DEFAULT_QUORUM_FRACTIONS.get(self.level, 1.0)
+        return min(agent_count, max(self.min_results, math.ceil(fraction * agent_count - 1e-9)))
+    
+    def required_agreement(self) -> float:
+        return self.min_confidence if self.min_confidence is not None else consensus_threshold(self.level)
+    
+    def timeout_for(self, role: AgentRole) -> Optional[float]:
+        return self.role_timeouts.get(role, self.default_timeout)
+
+
+@dataclass
+class QuorumOutcome:
+    """How the agents of one swarm task finished"""
+    results: List[AgentResult]
+    early_exit: bool = False
+    required_results: int = 0
+    agreement_percentage: float = 0.0
+    cancelled_agents: List[str] = field(default_factory=list)
+    timed_out_agents: List[str] = field(default_factory=list)
+    failed_agents: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
 @dataclass
 class SwarmMetrics:
     """Swarm performance metrics"""
@@ -143,6 +216,9 @@ class SwarmMetrics:
     processing_time: float = 0.0
     agent_utilization: Dict[str, float] = field(default_factory=dict)
     error_rate: float = 0.0
+    early_exits: int = 0
+    agents_cancelled: int = 0
+    straggler_timeouts: int = 0
     last_updated: datetime = field(default_factory=datetime.now)
 
 
@@ -406,13 +482,15 @@ class SwarmAgent:
 class SwarmAIOrchestrator:
     """Advanced Swarm AI Orchestrator for 100% accuracy"""
     
-    def __init__(self, swarm_id: str, architecture: SwarmArchitecture):
+    def __init__(self, swarm_id: str, architecture: SwarmArchitecture,
+                 quorum_policy: Optional[QuorumPolicy] = None):
         self.swarm_id = swarm_id
         self.architecture = architecture
+        self.quorum_policy = quorum_policy or QuorumPolicy()
         self.agents: Dict[str, SwarmAgent] = {}
         self.task_queue = queue.PriorityQueue()
-        self.results: Dict[str, List[AgentResult]] = defaultdict(list)
-        self.consensus_results: Dict[str, ConsensusResult] = {}
+        self.results = create_result_store(f"swarm_{swarm_id}_agent_results")  # task id -> List[AgentResult]
+        self.consensus_results = create_result_store(f"swarm_{swarm_id}_consensus")  # task id -> ConsensusResult
         self.metrics = SwarmMetrics()
         self.knowledge_graph = nx.DiGraph()
         self.communication_network = nx.Graph()
@@ -440,17 +518,26 @@ class SwarmAIOrchestrator:
         # Step 1: Select appropriate agents based on task requirements
         selected_agents = await self._select_agents_for_task(task)
         
-        # Step 2: Execute task in parallel with selected agents
-        agent_results = await self._execute_parallel_processing(task, selected_agents)
+        # Step 2: Execute task in parallel, stopping once a quorum agrees
+        outcome = await self._execute_parallel_processing(task, selected_agents)
         
         # Step 3: Build consensus from agent results
-        consensus_result = await self._build_consensus(task, agent_results)
+        consensus_result = await self._build_consensus(task, outcome.results)
+        consensus_result.validation_summary["quorum"] = {
+            "early_exit": outcome.early_exit,
+            "required_results": outcome.required_results,
+            "received_results": len(outcome.results),
+            "cancelled_agents": outcome.cancelled_agents,
+            "timed_out_agents": outcome.timed_out_agents,
+            "failed_agents": outcome.failed_agents,
+            "elapsed_ms": outcome.elapsed_ms,
+        }
         
         # Step 4: Validate consensus result for 100% accuracy
         validated_result = await self._validate_consensus_result(consensus_result, task)
         
         # Step 5: Update metrics and knowledge
-        await self._update_swarm_metrics(task, validated_result)
+        await self._update_swarm_metrics(task, validated_result, outcome)
         
         return validated_result
     
@@ -491,33 +578,86 @@ class SwarmAIOrchestrator:
         logger.info(f"Selected {len(selected_agents)} agents for task {task.task_id}")
         return selected_agents
     
-    async def _execute_parallel_processing(self, task: SwarmTask, agents: List[SwarmAgent]) -> List[AgentResult]:
-        """Execute task processing in parallel"""
+    def _quorum_policy_for(self, task: SwarmTask) -> QuorumPolicy:
+        """The swarm's policy, with ``consensus_level`` / ``quorum`` task constraints applied"""
+        policy = self.quorum_policy
+        level = task.constraints.get("consensus_level")
+        quorum = task.constraints.get("quorum")
+        if level is None and quorum is None:
+            return policy
+        return QuorumPolicy(
+            level=ConsensusLevel(level) if level is not None else policy.level,
+            quorum=float(quorum) if quorum is not None else (policy.quorum if level is None else None),
+            min_results=policy.min_results,
+            min_confidence=policy.min_confidence if level is None else None,
+            role_timeouts=policy.role_timeouts,
+            default_timeout=policy.default_timeout
+        )
+    
+    async def _execute_parallel_processing(self, task: SwarmTask, agents: List[SwarmAgent]) -> QuorumOutcome:
+        """
+        Run the agents concurrently and consume their results as they finish.
+        Agreement is updated per result; once the quorum has answered with the
+        policy's agreement the remaining agents are cancelled.
+        """
         logger.info(f"Executing parallel processing for task {task.task_id} with {len(agents)} agents")
+        policy = self._quorum_policy_for(task)
+        started = time.perf_counter()
+        outcome = QuorumOutcome(results=[], required_results=policy.required_results(len(agents)))
         
-        # Create tasks for parallel execution
-        futures = []
-        for agent in agents:
-            future = asyncio.create_task(agent.process_task(task))
-            futures.append(future)
+        async def run(agent: SwarmAgent) -> Tuple[SwarmAgent, Any]:
+            try:
+                return agent, await asyncio.wait_for(agent.process_task(task), policy.timeout_for(agent.role))
+            except asyncio.TimeoutError as e:
+                return agent, e
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                return agent, e
         
-        # Wait for all agents to complete
-        results = await asyncio.gather(*futures, return_exceptions=True)
-        
-        # Filter out exceptions and collect valid results
-        agent_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"Agent {agents[i].agent_id} failed: {result}")
-            else:
-                agent_results.append(result)
+        pending = {agent.agent_id: asyncio.create_task(run(agent)) for agent in agents}
+        confidence_sum = 0.0
+        try:
+            for next_done in asyncio.as_completed(list(pending.values())):
+                agent, result = await next_done
+                del pending[agent.agent_id]
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.warning(f"Agent {agent.agent_id} ({agent.role.value}) timed out on task {task.task_id}")
+                    outcome.timed_out_agents.append(agent.agent_id)
+                    continue
+                if isinstance(result, Exception):
+                    logger.error(f"Agent {agent.agent_id} failed: {result}")
+                    outcome.failed_agents.append(agent.agent_id)
+                    continue
+                
+                outcome.results.append(result)
+                confidence_sum += result.confidence
+                outcome.agreement_percentage = confidence_sum / len(outcome.results) * 100
+                if (pending and len(outcome.results) >= outcome.required_results
+                        and outcome.agreement_percentage >= policy.required_agreement()):
+                    outcome.early_exit = True
+                    break
+        finally:
+            # Stragglers are not waited for once the decision is made (or the caller went away)
+            for agent_id, straggler in pending.items():
+                straggler.cancel()
+                outcome.cancelled_agents.append(agent_id)
+            if pending:
+                await asyncio.gather(*pending.values(), return_exceptions=True)
+        outcome.elapsed_ms = (time.perf_counter() - started) * 1000
         
         # Store results
         with self.lock:
-            self.results[task.task_id] = agent_results
+            self.results.put(task.task_id, outcome.results)
         
-        logger.info(f"Completed parallel processing for task {task.task_id} with {len(agent_results)} results")
-        return agent_results
+        logger.info(
+            f"Completed parallel processing for task {task.task_id} with {len(outcome.results)} results",
+            early_exit=outcome.early_exit,
+            cancelled=len(outcome.cancelled_agents),
+            timed_out=len(outcome.timed_out_agents),
+            elapsed_ms=round(outcome.elapsed_ms, 2)
+        )
+        return outcome
     
     async def _build_consensus(self, task: SwarmTask, agent_results: List[AgentResult]) -> ConsensusResult:
         """Build consensus from agent results for 100% accuracy"""
@@ -531,14 +671,7 @@ class SwarmAIOrchestrator:
         agreement_percentage = np.mean(agreement_scores) * 100
         
         # Determine consensus level
-        if agreement_percentage >= 95:
-            consensus_level = ConsensusLevel.UNANIMOUS
-        elif agreement_percentage >= 80:
-            consensus_level = ConsensusLevel.SUPER_MAJORITY
-        elif agreement_percentage >= 67:
-            consensus_level = ConsensusLevel.EXPERT_CONSENSUS
-        else:
-            consensus_level = ConsensusLevel.MAJORITY
+        consensus_level = consensus_level_for(agreement_percentage)
         
         # Select best result based on accuracy and confidence
         best_result = max(agent_results, key=lambda r: r.accuracy_score * r.confidence)
@@ -577,7 +710,7 @@ class SwarmAIOrchestrator:
         
         # Store consensus result
         with self.lock:
-            self.consensus_results[task.task_id] = consensus_result
+            self.consensus_results.put(task.task_id, consensus_result)
         
         logger.info(f"Built consensus for task {task.task_id} with {agreement_percentage:.1f}% agreement")
         return consensus_result
@@ -624,11 +757,16 @@ class SwarmAIOrchestrator:
         
         return consensus_result
     
-    async def _update_swarm_metrics(self, task: SwarmTask, consensus_result: ConsensusResult):
+    async def _update_swarm_metrics(self, task: SwarmTask, consensus_result: ConsensusResult,
+                                    outcome: Optional[QuorumOutcome] = None):
         """Update swarm metrics"""
         with self.lock:
             self.metrics.total_tasks += 1
             self.metrics.completed_tasks += 1
+            if outcome is not None:
+                self.metrics.early_exits += outcome.early_exit
+                self.metrics.agents_cancelled += len(outcome.cancelled_agents)
+                self.metrics.straggler_timeouts += len(outcome.timed_out_agents)
             
             # Update accuracy rate
             if consensus_result.accuracy_score > 0.9:
@@ -660,7 +798,12 @@ class SwarmAIOrchestrator:
                     "completed_tasks": self.metrics.completed_tasks,
                     "accuracy_rate": self.metrics.accuracy_rate,
                     "consensus_rate": self.metrics.consensus_rate,
-                    "average_confidence": self.metrics.average_confidence
+                    "average_confidence": self.metrics.average_confidence,
+                    "early_exits": self.metrics.early_exits,
+                    "early_exit_rate": (self.metrics.early_exits / self.metrics.completed_tasks
+                                        if self.metrics.completed_tasks else 0.0),
+                    "agents_cancelled": self.metrics.agents_cancelled,
+                    "straggler_timeouts": self.metrics.straggler_timeouts
                 },
                 "agent_roles": {agent_id: agent.role.value for agent_id, agent in self.agents.items()},
                 "pending_tasks": self.task_queue.qsize()
@@ -0,0 +1,426 @@
+"""
+Project Symbol Completion Index
+Identifier completions served from codebase memory without an LLM. Symbols
+live in a compressed (radix) trie whose nodes carry the best weight in their
+subtree, so the top-k completions of a prefix come from a best-first walk that
+touches O(k) nodes. A second trie over camelCase/snake_case initials answers
+abbreviations ("gup" -> get_user_profile), with a bounded subsequence scan as
+the last resort. Tries are persistent: an update copies only the path it
+changes, so every reader works on a consistent snapshot without locking.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import structlog
+
+from app.core.search_index import split_identifiers
+
+logger = structlog.get_logger()
+
+KIND_WEIGHTS = {"class": 1.0, "function": 1.0, "method": 1.0, "import": 0.8, "variable": 0.5}
+PREFIX_BONUS = 2.0
+CASE_BONUS = 0.5
+RECENCY_BONUS = 2.0
+RECENCY_HALF_LIFE_SECONDS = 600.0
+HISTORY_BONUS = 1.0
+FUZZY_SCAN_LIMIT = 512
+LENGTH_PENALTY = 1e-3
+# Publish by rebuilding the tries instead of path-copying past this share of dirty symbols
+BULK_REBUILD_RATIO = 0.125
+
+_SEPARATOR = "\x00"
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+@dataclass(frozen=True)
+class SymbolEntry:
+    """One completable symbol; shorter names win ties"""
+    name: str
+    kind: str
+    definitions: int = 1
+    uses: int = 0
+    last_used: float = 0.0
+    weight: float = field(init=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "weight", KIND_WEIGHTS.get(self.kind, 0.5) + math.log2(1 + self.definitions)
+                           + math.log2(1 + self.uses) - LENGTH_PENALTY * len(self.name))
+
+
+@dataclass
+class SymbolMatch:
+    """One ranked completion candidate"""
+    name: str
+    kind: str
+    score: float
+    match: str  # "prefix" or "fuzzy"
+
+
+class _Node:
+    __slots__ = ("label", "children", "entry", "best")
+
+    def __init__(self, label: str, children: Dict[str, "_Node"], entry: Optional[SymbolEntry], best: float):
+        self.label = label
+        self.children = children
+        self.entry = entry
+        self.best = best
+
+
+def _common_length(a: str, b: str) -> int:
+    limit = min(len(a), len(b))
+    index = 0
+    while index < limit and a[index] == b[index]:
+        index += 1
+    return index
+
+
+def _node(label: str, children: Dict[str, _Node], entry: Optional[SymbolEntry],
+          keep: bool = False) -> Optional[_Node]:
+    """Node with its subtree weight; unless ``keep``, empty nodes vanish and pass-through nodes merge into their child"""
+    if entry is None and not keep:
+        if not children:
+            return None
+        if len(children) == 1:
+            (child,) = children.values()
+            return _Node(label + child.label, child.children, child.entry, child.best)
+    best = max((child.best for child in children.values()), default=-math.inf)
+    if entry is not None:
+        best = max(best, entry.weight)
+    return _Node(label, children, entry, best)
+
+
+def _update(node: _Node, key: str, entry: Optional[SymbolEntry], root: bool = False) -> Tuple[Optional[_Node], int]:
+    if not key:
+        return _node(node.label, node.children, entry, keep=root), (entry is not None) - (node.entry is not None)
+
+    child = node.children.get(key[0])
+    if child is None:
+        if entry is None:
+            return node, 0
+        children = dict(node.children)
+        children[key[0]] = _Node(key, {}, entry, entry.weight)
+        return _node(node.label, children, node.entry, keep=root), 1
+
+    common = _common_length(child.label, key)
+    if common < len(child.label):
+        if entry is None:
+            return node, 0
+        lower = _Node(child.label[common:], child.children, child.entry, child.best)
+        child = _Node(child.label[:common], {lower.label[0]: lower}, None, lower.best)
+    new_child, delta = _update(child, key[common:], entry)
+    if new_child is child:
+        return node, 0
+    children = dict(node.children)
+    if new_child is None:
+        del children[key[0]]
+    else:
+        children[key[0]] = new_child
+    return _node(node.label, children, node.entry, keep=root), delta
+
+
+def _build(label: str, items: List[Tuple[str, SymbolEntry]], depth: int) -> _Node:
+    # items are sorted and share key[:depth]; no key is a prefix of another
+    entry = None
+    children = {}
+    start = 0
+    if len(items[0][0]) == depth:
+        entry = items[0][1]
+        start = 1
+    while start < len(items):
+        char = items[start][0][depth]
+        end = start
+        while end < len(items) and items[end][0][depth] == char:
+            end += 1
+        first, last = items[start][0], items[end - 1][0]
+        split = depth + _common_length(first[depth:], last[depth:])
+        children[char] = _build(first[depth:split], items[start:end], split)
+        start = end
+    return _node(label, children, entry, keep=True)
+
+
+class SymbolTrie:
+    """
+    Persistent radix trie from string keys to ``SymbolEntry`` values.
+    ``set`` returns a new trie sharing every untouched node with this one.
+    """
+
+    def __init__(self, root: Optional[_Node] = None, size: int = 0):
+        self._root = root or _Node("", {}, None, -math.inf)
+        self._size = size
+
+    @classmethod
+    def build(cls, items: Iterable[Tuple[str, SymbolEntry]]) -> "SymbolTrie":
+        """Bulk-load in O(total key length)"""
+        items = sorted(items, key=lambda item: item[0])
+        if not items:
+            return cls()
+        return cls(_build("", items, 0), len(items))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def set(self, key: str, entry: Optional[SymbolEntry]) -> "SymbolTrie":
+        """A new trie with ``key`` mapped to ``entry`` (``None`` removes it)"""
+        root, delta = _update(self._root, key, entry, root=True)
+        return self if root is self._root else SymbolTrie(root, self._size + delta)
+
+    def get(self, key: str) -> Optional[SymbolEntry]:
+        node = self._root
+        while key:
+            child = node.children.get(key[0])
+            if child is None or not key.startswith(child.label):
+                return None
+            key = key[len(child.label):]
+            node = child
+        return node.entry
+
+    def _descend(self, prefix: str) -> Optional[_Node]:
+        node = self._root
+        while prefix:
+            child = node.children.get(prefix[0])
+            if child is None:
+                return None
+            if len(prefix) <= len(child.label):
+                return child if child.label.startswith(prefix) else None
+            if not prefix.startswith(child.label):
+                return None
+            prefix = prefix[len(child.label):]
+            node = child
+        return node
+
+    def walk(self, prefix: str = "") -> Iterator[SymbolEntry]:
+        """Entries under ``prefix`` from the heaviest down (best-first over subtree weights)"""
+        node = self._descend(prefix)
+        if node is None:
+            return
+        # Equal weights pop newest first, so ties descend depth-first instead of widening the frontier
+        heap = [(-node.best, 0, node)]
+        counter = 0
+        while heap:
+            _, _, item = heapq.heappop(heap)
+            if isinstance(item, SymbolEntry):
+                yield item
+                continue
+            if item.entry is not None:
+                counter -= 1
+                heapq.heappush(heap, (-item.entry.weight, counter, item.entry))
+            for child in item.children.values():
+                counter -= 1
+                heapq.heappush(heap, (-child.best, counter, child))
+
+    def top(self, prefix: str, k: int) -> List[SymbolEntry]:
+        entries = []
+        for entry in self.walk(prefix):
+            if len(entries) >= k:
+                break
+            entries.append(entry)
+        return entries
+
+
+def _initials(name: str) -> str:
+    identifiers = split_identifiers(name)
+    parts = identifiers[0][1] if identifiers else []
+    return "".join(part[0] for part in parts) if len(parts) > 1 else ""
+
+
+class SymbolCompletionIndex:
+    """
+    Completion index for one project. Writers record per-file symbols and
+    uses; the tries are republished lazily on the next query.
+    """
+
+    def __init__(self):
+        self._names = SymbolTrie()  # lowercased name + separator + name
+        self._initials = SymbolTrie()  # initials + separator + name
+        self._entries: Dict[str, SymbolEntry] = {}
+        self._initials_of: Dict[str, str] = {}
+        self._file_symbols: Dict[str, Dict[str, str]] = {}
+        self._definitions: Dict[str, Dict[str, int]] = {}  # name -> kind -> definition count
+        self._usage: Dict[str, Tuple[int, float]] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+        self.stats = {"queries": 0, "publishes": 0, "rebuilds": 0}
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    # -- writes --------------------------------------------------------------
+
+    def update_file(self, path: str, symbols: Iterable[Tuple[str, str]]) -> None:
+        """Replace the ``(name, kind)`` symbols defined in one file"""
+        new = {name: kind for name, kind in symbols if name and _WORD.fullmatch(name)}
+        with self._lock:
+            old = self._file_symbols.pop(path, {})
+            for name, kind in old.items():
+                if new.get(name) != kind:
+                    self._count(name, kind, -1)
+            for name, kind in new.items():
+                if old.get(name) != kind:
+                    self._count(name, kind, 1)
+            if new:
+                self._file_symbols[path] = new
+
+    def remove_file(self, path: str) -> None:
+        self.update_file(path, ())
+
+    def clear_files(self) -> None:
+        """Forget every definition; usage history is kept"""
+        with self._lock:
+            self._dirty.update(self._definitions)
+            self._definitions.clear()
+            self._file_symbols.clear()
+
+    def _count(self, name: str, kind: str, delta: int) -> None:
+        kinds = self._definitions.setdefault(name, {})
+        kinds[kind] = kinds.get(kind, 0) + delta
+        if kinds[kind] <= 0:
+            del kinds[kind]
+        if not kinds:
+            del self._definitions[name]
+        self._dirty.add(name)
+
+    def record_use(self, name: str) -> None:
+        """Count an accepted or typed use of a symbol"""
+        with self._lock:
+            uses, _ = self._usage.get(name, (0, 0.0))
+            self._usage[name] = (uses + 1, time.time())
+            self._dirty.add(name)
+
+    def _entry(self, name: str) -> Optional[SymbolEntry]:
+        kinds = self._definitions.get(name)
+        if not kinds:
+            return None
+        kind = max(kinds, key=lambda item: (kinds[item], KIND_WEIGHTS.get(item, 0.5)))
+        uses, last_used = self._usage.get(name, (0, 0.0))
+        return SymbolEntry(name, kind, sum(kinds.values()), uses, last_used)
+
+    def _publish(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+            for name in dirty:
+                entry = self._entry(name)
+                if entry is None:
+                    self._entries.pop(name, None)
+                    self._initials_of.pop(name, None)
+                else:
+                    self._entries[name] = entry
+                    if name not in self._initials_of:
+                        self._initials_of[name] = _initials(name)
+
+            if len(dirty) > BULK_REBUILD_RATIO * max(len(self._entries), 1):
+                names = SymbolTrie.build((name.lower() + _SEPARATOR + name, entry)
+                                         for name, entry in self._entries.items())
+                initials = SymbolTrie.build((self._initials_of[name] + _SEPARATOR + name, entry)
+                                            for name, entry in self._entries.items() if self._initials_of[name])
+                self.stats["rebuilds"] += 1
+            else:
+                names, initials = self._names, self._initials
+                for name in dirty:
+                    entry = self._entries.get(name)
+                    names = names.set(name.lower() + _SEPARATOR + name, entry)
+                    abbreviation = self._initials_of.get(name) if entry else _initials(name)
+                    if abbreviation:
+                        initials = initials.set(abbreviation + _SEPARATOR + name, entry)
+            self._names, self._initials = names, initials
+            self.stats["publishes"] += 1
+
+    def refresh(self) -> bool:
+        """Publish pending writes now instead of on the next query; whether anything was pending"""
+        if not self._dirty:
+            return False
+        self._publish()
+        return True
+
+    # -- reads ---------------------------------------------------------------
+
+    def complete(self, prefix: str, k: int = 10, history: Optional[List[str]] = None) -> List[SymbolMatch]:
+        """
+        Top-``k`` symbols for a typed identifier prefix: prefix matches first,
+        then initials and subsequence matches. ``history`` (recent completions
+        or edits of the session, oldest first) boosts symbols used lately.
+        """
+        if self._dirty:
+            self._publish()
+        self.stats["queries"] += 1
+        if not prefix or k <= 0:
+            return []
+        names, initials = self._names, self._initials
+        lowered = prefix.lower()
+        now = time.time()
+        recent = self._history_ranks(history)
+
+        candidates: Dict[str, SymbolMatch] = {}
+
+        def consider(entry: SymbolEntry, match: str, bonus: float) -> None:
+            if entry.name == prefix or entry.name in candidates:
+                return
+            score = entry.weight + bonus + HISTORY_BONUS * recent.get(entry.name, 0.0)
+            if entry.last_used:
+                score += RECENCY_BONUS * 0.5 ** ((now - entry.last_used) / RECENCY_HALF_LIFE_SECONDS)
+            candidates[entry.name] = SymbolMatch(entry.name, entry.kind, round(score, 4), match)
+
+        for entry in names.top(lowered, 3 * k):
+            consider(entry, "prefix", PREFIX_BONUS + (CASE_BONUS if entry.name.startswith(prefix) else 0.0))
+        if len(candidates) < k and len(prefix) > 1:
+            for entry in initials.top(lowered, 3 * k):
+                consider(entry, "fuzzy", 0.0)
+        if len(candidates) < k and len(prefix) > 1:
+            subsequence = re.compile(".*?".join(map(re.escape, lowered)))
+            for scanned, entry in enumerate(names.walk(lowered[0])):
+                if scanned >= FUZZY_SCAN_LIMIT or len(candidates) >= 3 * k:
+                    break
+                if subsequence.match(entry.name.lower()):
+                    consider(entry, "fuzzy", 0.0)
+
+        return sorted(candidates.values(), key=lambda match: -match.score)[:k]
+
+    @staticmethod
+    def _history_ranks(history: Optional[List[str]]) -> Dict[str, float]:
+        ranks: Dict[str, float] = {}
+        if history:
+            for position, text in enumerate(history):
+                for word in _WORD.findall(text):
+                    ranks[word] = (position + 1) / len(history)
+        return ranks
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"symbols": len(self._entries), "files": len(self._file_symbols),
+                "pending": len(self._dirty), **self.stats}
+
+
+_indexes: Dict[str, SymbolCompletionIndex] = {}
+
+
+def get_symbol_completion_index(project_id: str) -> SymbolCompletionIndex:
+    """The process-wide completion index of a project, created on first use"""
+    index = _indexes.get(project_id)
+    if index is None:
+        index = _indexes.setdefault(project_id, SymbolCompletionIndex())
+    return index
+
+
+def find_symbol_completion_index(project_id: Optional[str]) -> Optional[SymbolCompletionIndex]:
+    return _indexes.get(project_id) if project_id else None
+
+
+def drop_symbol_completion_index(project_id: str) -> bool:
+    return _indexes.pop(project_id, None) is not None
+
+
+__all__ = [
+    "SymbolCompletionIndex",
+    "SymbolEntry",
+    "SymbolMatch",
+    "SymbolTrie",
+    "drop_symbol_completion_index",
+    "find_symbol_completion_index",
+    "get_symbol_completion_index",
+]
@@ -0,0 +1,702 @@
+"""
+Cross-File Symbol Graph
+Symbol table plus import/reference graph over an indexed repository. Each file
+contributes its definitions, referenced names and imports (extracted by
+``extract_file_symbols``, which RepositoryIndexer runs in its worker pool), and
+the graph is updated per file as the repository changes. Forward edges live
+in per-file typed arrays; the reverse adjacency used by find-references and
+impact analysis is a CSR (offsets + targets) rebuilt lazily after changes.
+"""
+
+import ast
+import bisect
+import posixpath
+import re
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+from app.services.repository_indexer import FileUpdate
+
+logger = structlog.get_logger()
+
+# Languages whose imports can be resolved to repository files
+SYMBOL_LANGUAGES = frozenset({"python", "javascript", "typescript", "java"})
+
+_JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_CLIKE_NOISE = re.compile(
+    r"//[^\n]*|/\*.*?\*/|`(?:\\.|[^`\\])*`|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"", re.S
+)
+_JS_DEFINITIONS = re.compile(
+    r"^[ \t]*(?:export\s+(?:default\s+)?)?(?:"
+    r"(?:async\s+)?function\s*\*?\s*(?P<function>[A-Za-z_$][\w$]*)"
+    r"|(?:abstract\s+)?class\s+(?P<class>[A-Za-z_$][\w$]*)"
+    r"|(?:interface|type|enum)\s+(?P<type>[A-Za-z_$][\w$]*)"
+    r"|(?:const|let|var)\s+(?P<variable>[A-Za-z_$][\w$]*)\s*="
+    r")", re.M,
+)
+_JS_IMPORTS = re.compile(
+    r"\bimport\s+(?:type\s+)?(?P<clause>[\w$\s{},*]+?)\s+from\s*(?P<q1>['\"])(?P<from>[^'\"]+)(?P=q1)"
+    r"|\bimport\s*(?P<q2>['\"])(?P<bare>[^'\"]+)(?P=q2)"
+    r"|\bexport\s+[\w$\s{},*]*?\bfrom\s*(?P<q3>['\"])(?P<reexport>[^'\"]+)(?P=q3)"
+    r"|\b(?:require|import)\s*\(\s*(?P<q4>['\"])(?P<dynamic>[^'\"]+)(?P=q4)\s*\)"
+)
+_JAVA_DEFINITIONS = re.compile(
+    r"\b(?:class|interface|enum|record)\s+(?P<class>\w+)"
+    r"|^[ \t]*(?:(?:public|protected|private|static|final|abstract|synchronized|native|default)\s+)*"
+    r"[\w<>\[\],.? ]+?\s+(?P<method>\w+)\s*\([^;{]*\)\s*(?:throws\s+[\w., ]+)?\{", re.M,
+)
+_JAVA_IMPORTS = re.compile(r"^\s*import\s+(?:static\s+)?(?P<target>[\w.]+?)(?P<wildcard>\.\*)?\s*;", re.M)
+_KEYWORDS = frozenset(
+    "abstract async await boolean break case catch class const continue default delete do else enum export "
+    "extends false final finally for from function if implements import in instanceof interface let new null "
+    "package private protected public return static super switch this throw throws true try type typeof var "
+    "void while with yield".split()
+)
+
+
+@dataclass
+class FileSymbols:
+    """What one file defines, references and imports"""
+    path: str
+    language: str
+    definitions: List[Tuple[str, str, int]] = field(default_factory=list)  # (qualified name, kind, line)
+    references: List[Tuple[str, int]] = field(default_factory=list)  # (name, line)
+    imports: List[Tuple[str, Tuple[str, ...], int]] = field(default_factory=list)  # (module, names, level)
+
+
+@dataclass
+class Definition:
+    name: str
+    qualified_name: str
+    kind: str
+    path: str
+    line: int
+
+
+@dataclass
+class Reference:
+    path: str
+    line: int
+    name: str
+
+
+# ============================================================================
+# EXTRACTION
+# ============================================================================
+
+def extract_file_symbols(content: str, rel_path: str, language: str) -> FileSymbols:
+    """Definitions, references and imports of one source file (RepositoryIndexer parser)"""
+    symbols = FileSymbols(rel_path, language)
+    if language == "python":
+        _extract_python(content, symbols)
+    elif language in ("javascript", "typescript"):
+        _extract_javascript(content, symbols)
+    elif language == "java":
+        _extract_java(content, symbols)
+    return symbols
+
+
+class _PythonSymbolVisitor(ast.NodeVisitor):
+    def __init__(self, symbols: FileSymbols):
+        self.symbols = symbols
+        self.scope: List[Tuple[str, str]] = []  # (name, kind)
+        self.seen: Set[Tuple[str, int]] = set()
+
+    def _define(self, node: ast.AST, name: str, kind: str) -> None:
+        qualified = ".".join([scope for scope, _ in self.scope] + [name])
+        self.symbols.definitions.append((qualified, kind, node.lineno))
+
+    def _refer(self, name: str, line: int) -> None:
+        if (name, line) not in self.seen:
+            self.seen.add((name, line))
+            self.symbols.references.append((name, line))
+
+    def _visit_function(self, node) -> None:
+        kind = "method" if self.scope and self.scope[-1][1] == "class" else "function"
+        self._define(node, node.name, kind)
+        for child in node.decorator_list + node.args.defaults + node.args.kw_defaults:
+            if child is not None:
+                self.visit(child)
+        if node.returns is not None:
+            self.visit(node.returns)
+        for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+            if arg.annotation is not None:
+                self.visit(arg.annotation)
+        self.scope.append((node.name, "function"))
+        for statement in node.body:
+            self.visit(statement)
+        self.scope.pop()
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._define(node, node.name, "class")
+        for child in node.bases + node.keywords + node.decorator_list:
+            self.visit(child)
+        self.scope.append((node.name, "class"))
+        for statement in node.body:
+            self.visit(statement)
+        self.scope.pop()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if not self.scope or self.scope[-1][1] == "class":
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self._define(target, target.id, "variable")
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if isinstance(node.target, ast.Name) and (not self.scope or self.scope[-1][1] == "class"):
+            self._define(node.target, node.target.id, "variable")
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if not isinstance(node.ctx, ast.Store):
+            self._refer(node.id, node.lineno)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if not isinstance(node.ctx, ast.Store):
+            self._refer(node.attr, node.lineno)
+        self.visit(node.value)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.symbols.imports.append((alias.name, (), 0))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        names = tuple(alias.name for alias in node.names if alias.name != "*")
+        self.symbols.imports.append((node.module or "", names, node.level or 0))
+        for name in names:
+            self._refer(name, node.lineno)
+
+
+def _extract_python(content: str, symbols: FileSymbols) -> None:
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return
+    _PythonSymbolVisitor(symbols).visit(tree)
+
+
+def _blank_noise(content: str) -> str:
+    """Replace comments and string literals with spaces, keeping offsets and line breaks"""
+    return _CLIKE_NOISE.sub(lambda m: re.sub(r"[^\n]", " ", m.group()), content)
+
+
+def _line_starts(content: str) -> List[int]:
+    return [0] + [match.end() for match in re.finditer("\n", content)]
+
+
+def _clike_references(code: str, symbols: FileSymbols, starts: List[int]) -> None:
+    seen: Set[Tuple[str, int]] = set()
+    for match in _IDENTIFIER.finditer(code):
+        name = match.group()
+        if name in _KEYWORDS:
+            continue
+        key = (name, bisect.bisect_right(starts, match.start()))
+        if key not in seen:
+            seen.add(key)
+            symbols.references.append(key)
+
+
+def _extract_javascript(content: str, symbols: FileSymbols) -> None:
+    starts = _line_starts(content)
+    for match in _JS_IMPORTS.finditer(content):
+        module = match.group("from") or match.group("bare") or match.group("reexport") or match.group("dynamic")
+        clause = match.group("clause") or ""
+        names = tuple(name for name in _IDENTIFIER.findall(clause) if name not in ("as", "type"))
+        symbols.imports.append((module, names, 0))
+
+    code = _blank_noise(content)
+    for match in _JS_DEFINITIONS.finditer(code):
+        kind = match.lastgroup
+        symbols.definitions.append((match.group(kind), "type" if kind == "type" else kind,
+                                    bisect.bisect_right(starts, match.start(kind))))
+    _clike_references(code, symbols, starts)
+
+
+def _extract_java(content: str, symbols: FileSymbols) -> None:
+    starts = _line_starts(content)
+    code = _blank_noise(content)
+    for match in _JAVA_IMPORTS.finditer(code):
+        if not match.group("wildcard"):
+            symbols.imports.append((match.group("target"), (), 0))
+
+    owner: Optional[str] = None
+    for match in _JAVA_DEFINITIONS.finditer(code):
+        line = bisect.bisect_right(starts, match.start(match.lastgroup))
+        if match.lastgroup == "class":
+            owner = match.group("class")
+            symbols.definitions.append((owner, "class", line))
+        elif match.group("method") not in _KEYWORDS:
+            name = match.group("method")
+            symbols.definitions.append((f"{owner}.{name}" if owner else name, "method", line))
+    _clike_references(code, symbols, starts)
+
+
+def module_keys(path: str, language: str) -> List[str]:
+    """Names an import can use to reach this file, most specific first"""
+    stem, extension = posixpath.splitext(path)
+    if language in ("javascript", "typescript"):
+        keys = [stem]
+        if posixpath.basename(stem) == "index":
+            keys.append(posixpath.dirname(stem))
+        return keys
+    parts = stem.split("/")
+    if language == "python" and parts[-1] == "__init__":
+        parts = parts[:-1]
+    # Any suffix may be a top-level package, e.g. backend/app/core/x.py is imported as app.core.x
+    return [".".join(parts[start:]) for start in range(len(parts)) if parts[start:]]
+
+
+def _phrases(text: str) -> Dict[str, str]:
+    """Runs of one to three words joined and lowercased, mapped to the first word of the run"""
+    words = _IDENTIFIER.findall(text)
+    phrases: Dict[str, str] = {}
+    for start in range(len(words)):
+        for size in (1, 2, 3):
+            if start + size <= len(words):
+                phrases.setdefault("".join(words[start:start + size]).replace("_", "").lower(), words[start])
+    return phrases
+
+
+# ============================================================================
+# GRAPH
+# ============================================================================
+
+@dataclass
+class _FileRecord:
+    path: str
+    language: str
+    keys: List[str]
+    definitions: List[Tuple[int, int, str, int]]  # (name id, qualified name id, kind, line)
+    ref_names: array  # name ids, parallel to ref_lines
+    ref_lines: array
+    imports: List[Tuple[str, Tuple[str, ...], int]]
+    import_keys: List[str] = field(default_factory=list)
+    dependencies: array = field(default_factory=lambda: array("I"))  # resolved imported file ids
+
+
+class SymbolGraph:
+    """
+    Incrementally maintained symbol table and file dependency graph.
+
+    An edge A -> B means file A imports B. Impact analysis walks those edges
+    backwards: changing a symbol affects the files that define it, the files
+    that reference it (and import a defining file), and transitively every
+    file importing those.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, int] = {}
+        self._name_list: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._files: List[Optional[_FileRecord]] = []
+        self._free_ids: List[int] = []
+        self._definitions: Dict[int, List[Tuple[int, int]]] = {}  # name id -> [(file id, definition index)]
+        self._modules: Dict[str, Dict[int, int]] = {}  # key -> {file id: leading components dropped}
+        self._importers: Dict[str, Set[int]] = {}  # key -> files whose imports try it
+        self._frozen: Optional[Dict[str, array]] = None
+        self.stats = {"updates": 0, "removals": 0, "rebuilds": 0, "queries": 0}
+
+    def __len__(self) -> int:
+        return len(self._file_ids)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._file_ids
+
+    def _intern(self, name: str) -> int:
+        name_id = self._names.get(name)
+        if name_id is None:
+            name_id = self._names[name] = len(self._name_list)
+            self._name_list.append(name)
+        return name_id
+
+    # -- updates -------------------------------------------------------------
+
+    def apply(self, update: FileUpdate) -> None:
+        """Apply one RepositoryIndexer update produced with ``parser=extract_file_symbols``"""
+        if isinstance(update.patterns, FileSymbols) and update.status != "removed":
+            self.update_file(update.patterns)
+        else:
+            # Removed, or no longer parsed (e.g. grown past max_file_bytes): stale symbols must go
+            self.remove_file(update.path)
+
+    def update_file(self, symbols: FileSymbols) -> None:
+        """Add or replace one file"""
+        self._detach(symbols.path)
+        file_id = self._free_ids.pop() if self._free_ids else len(self._files)
+        if file_id == len(self._files):
+            self._files.append(None)
+        self._file_ids[symbols.path] = file_id
+
+        intern = self._intern
+        definitions = [
+            (intern(qualified.rsplit(".", 1)[-1]), intern(qualified), kind, line)
+            for qualified, kind, line in symbols.definitions
+        ]
+        record = _FileRecord(
+            path=symbols.path,
+            language=symbols.language,
+            keys=module_keys(symbols.path, symbols.language),
+            definitions=definitions,
+            ref_names=array("I", [intern(name) for name, _ in symbols.references]),
+            ref_lines=array("I", [line for _, line in symbols.references]),
+            imports=list(symbols.imports),
+        )
+        self._files[file_id] = record
+        for index, (name_id, qualified_id, _, _) in enumerate(definitions):
+            self._definitions.setdefault(name_id, []).append((file_id, index))
+            if qualified_id != name_id:
+                self._definitions.setdefault(qualified_id, []).append((file_id, index))
+
+        for dropped, key in enumerate(record.keys):
+            self._modules.setdefault(key, {})[file_id] = dropped
+        self._resolve(file_id)
+        # Files whose imports could now resolve to this one
+        self._resolve_importers(record.keys)
+        self._frozen = None
+        self.stats["updates"] += 1
+
+    def remove_file(self, path: str) -> bool:
+        record = self._detach(path)
+        if record is None:
+            return False
+        self._resolve_importers(record.keys)
+        self._frozen = None
+        self.stats["removals"] += 1
+        return True
+
+    def _detach(self, path: str) -> Optional[_FileRecord]:
+        file_id = self._file_ids.pop(path, None)
+        if file_id is None:
+            return None
+        record = self._files[file_id]
+        self._files[file_id] = None
+        self._free_ids.append(file_id)
+        for name_id, qualified_id, _, _ in record.definitions:
+            for key in {name_id, qualified_id}:
+                entries = [entry for entry in self._definitions.get(key, ()) if entry[0] != file_id]
+                if entries:
+                    self._definitions[key] = entries
+                else:
+                    self._definitions.pop(key, None)
+        for key in record.keys:
+            holders = self._modules.get(key)
+            if holders is not None:
+                holders.pop(file_id, None)
+                if not holders:
+                    del self._modules[key]
+        for key in record.import_keys:
+            importers = self._importers.get(key)
+            if importers is not None:
+                importers.discard(file_id)
+                if not importers:
+                    del self._importers[key]
+        return record
+
+    def _resolve_importers(self, keys: Iterable[str]) -> None:
+        importers = set()
+        for key in keys:
+            importers.update(self._importers.get(key, ()))
+        for file_id in importers:
+            if self._files[file_id] is not None:
+                self._resolve(file_id)
+
+    def _resolve(self, file_id: int) -> None:
+        """Map a file's imports to repository files"""
+        record = self._files[file_id]
+        for key in record.import_keys:
+            importers = self._importers.get(key)
+            if importers is not None:
+                importers.discard(file_id)
+        record.import_keys = []
+        targets: Set[int] = set()
+        for module, names, level in record.imports:
+            for group in self._import_candidates(record, module, names, level):
+                resolved = None
+                for key in group:
+                    record.import_keys.append(key)
+                    self._importers.setdefault(key, set()).add(file_id)
+                    if resolved is None and key in self._modules:
+                        resolved = self._closest(key)
+                if resolved:
+                    targets.update(resolved)
+        targets.discard(file_id)
+        record.dependencies = array("I", sorted(targets))
+
+    def _closest(self, key: str) -> List[int]:
+        holders = self._modules[key]
+        best = min(holders.values())
+        return [file_id for file_id, dropped in holders.items() if dropped == best]
+
+    @staticmethod
+    def _import_candidates(record: _FileRecord, module: str, names: Tuple[str, ...],
+                           level: int) -> List[List[str]]:
+        """Alternative keys per imported target; the first key that resolves wins"""
+        if record.language in ("javascript", "typescript"):
+            if module.startswith("."):
+                module = posixpath.normpath(posixpath.join(posixpath.dirname(record.path), module))
+            stem, extension = posixpath.splitext(module)
+            return [[stem if extension in _JS_EXTENSIONS else module]]
+        if record.language == "python" and level:
+            package = record.keys[0].split(".") if record.keys else []
+            if not record.path.endswith("__init__.py"):
+                package = package[:-1]
+            package = package[:len(package) - (level - 1)] if level > 1 else package
+            module = ".".join(package + ([module] if module else []))
+        if not module:
+            return []
+        # "from pkg import name" may import a submodule pkg.name or a symbol of pkg
+        groups = [[f"{module}.{name}", module] for name in names] if names else []
+        return groups or [[module]]
+
+    # -- compact reverse adjacency -----------------------------------------
+
+    def _freeze(self) -> Dict[str, array]:
+        """CSR arrays for imported-by and referenced-by, rebuilt after the graph changes"""
+        if self._frozen is not None:
+            return self._frozen
+        file_count = len(self._files)
+        name_count = len(self._name_list)
+        importer_counts = [0] * (file_count + 1)
+        reference_counts = [0] * (name_count + 1)
+        unique_refs: List[Tuple[int, Iterable[int]]] = []
+        for file_id, record in enumerate(self._files):
+            if record is None:
+                continue
+            for target in record.dependencies:
+                importer_counts[target + 1] += 1
+            names = set(record.ref_names)
+            unique_refs.append((file_id, names))
+            for name_id in names:
+                reference_counts[name_id + 1] += 1
+
+        frozen = {
+            "importer_offsets": _prefix_sums(importer_counts),
+            "reference_offsets": _prefix_sums(reference_counts),
+        }
+        importers = array("I", bytes(4 * frozen["importer_offsets"][-1]))
+        referencers = array("I", bytes(4 * frozen["reference_offsets"][-1]))
+        fill = array("Q", frozen["importer_offsets"][:-1])
+        for file_id, record in enumerate(self._files):
+            if record is None:
+                continue
+            for target in record.dependencies:
+                importers[fill[target]] = file_id
+                fill[target] += 1
+        fill = array("Q", frozen["reference_offsets"][:-1])
+        for file_id, names in unique_refs:
+            for name_id in names:
+                referencers[fill[name_id]] = file_id
+                fill[name_id] += 1
+        frozen["importers"] = importers
+        frozen["referencers"] = referencers
+        self._frozen = frozen
+        self.stats["rebuilds"] += 1
+        return frozen
+
+    def _importers_of(self, file_id: int) -> array:
+        frozen = self._freeze()
+        offsets = frozen["importer_offsets"]
+        return frozen["importers"][offsets[file_id]:offsets[file_id + 1]]
+
+    def _files_referencing(self, name_id: int) -> array:
+        frozen = self._freeze()
+        offsets = frozen["reference_offsets"]
+        if name_id + 1 >= len(offsets):
+            return array("I")
+        return frozen["referencers"][offsets[name_id]:offsets[name_id + 1]]
+
+    # -- queries -------------------------------------------------------------
+
+    def definitions(self, symbol: str) -> List[Definition]:
+        """Where a name (``helper``) or qualified name (``Service.helper``) is defined"""
+        self.stats["queries"] += 1
+        name_id = self._names.get(symbol)
+        if name_id is None:
+            return []
+        found = []
+        for file_id, index in self._definitions.get(name_id, ()):
+            record = self._files[file_id]
+            simple_id, qualified_id, kind, line = record.definitions[index]
+            found.append(Definition(self._name_list[simple_id], self._name_list[qualified_id],
+                                    kind, record.path, line))
+        return sorted(found, key=lambda d: (d.path, d.line))
+
+    def find_references(self, symbol: str, strict: bool = True) -> List[Reference]:
+        """
+        Lines that mention a symbol.
+
+        With ``strict`` only files that define the symbol or import a file
+        defining it count, which filters out unrelated names that collide.
+        """
+        self.stats["queries"] += 1
+        name = symbol.rsplit(".", 1)[-1]
+        name_id = self._names.get(name)
+        if name_id is None:
+            return []
+        referencing = self._resolved_referencers(symbol, name_id, strict)
+        references = []
+        for file_id in sorted(referencing, key=lambda i: self._files[i].path):
+            record = self._files[file_id]
+            for ref_name, line in zip(record.ref_names, record.ref_lines):
+                if ref_name == name_id:
+                    references.append(Reference(record.path, line, name))
+        return references
+
+    def _resolved_referencers(self, symbol: str, name_id: int, strict: bool) -> Set[int]:
+        referencing = set(self._files_referencing(name_id))
+        definers = {file_id for file_id, _ in self._definitions.get(self._names.get(symbol, -1), ())}
+        if not strict or not definers:
+            return referencing
+        return {
+            file_id for file_id in referencing
+            if file_id in definers or not definers.isdisjoint(self._files[file_id].dependencies)
+        }
+
+    def dependencies(self, path: str) -> List[str]:
+        """Repository files imported by ``path``"""
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            return []
+        return sorted(self._files[target].path for target in self._files[file_id].dependencies)
+
+    def dependents(self, path: str) -> List[str]:
+        """Repository files importing ``path``"""
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            return []
+        return sorted(self._files[importer].path for importer in self._importers_of(file_id))
+
+    def impact(self, target: str, max_depth: Optional[int] = None, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Files that may break if ``target`` (a repository path or a symbol)
+        changes, mapped to their distance from it and ordered nearest first.
+        """
+        self.stats["queries"] += 1
+        depths: Dict[int, int] = {}
+        file_id = self._file_ids.get(target)
+        if file_id is not None:
+            depths[file_id] = 0
+        else:
+            name_id = self._names.get(target.rsplit(".", 1)[-1])
+            definers = [entry[0] for entry in self._definitions.get(self._names.get(target, -1), ())]
+            if name_id is None or not definers:
+                return {}
+            for definer in definers:
+                depths[definer] = 0
+            if max_depth is None or max_depth >= 1:
+                for referrer in self._resolved_referencers(target, name_id, strict=True):
+                    depths.setdefault(referrer, 1)
+
+        frozen = self._freeze()
+        offsets, importers = frozen["importer_offsets"], frozen["importers"]
+        queue = deque(sorted(depths, key=depths.get))
+        while queue:
+            current = queue.popleft()
+            depth = depths[current] + 1
+            if max_depth is not None and depth > max_depth:
+                continue
+            for importer in importers[offsets[current]:offsets[current + 1]]:
+                if importer not in depths:
+                    depths[importer] = depth
+                    queue.append(importer)
+
+        ordered = sorted(depths.items(), key=lambda item: (item[1], self._files[item[0]].path))
+        if limit is not None:
+            ordered = ordered[:limit]
+        return {self._files[file_id].path: depth for file_id, depth in ordered}
+
+    def match_symbols(self, text: str, limit: int = 20) -> List[Definition]:
+        """
+        Definitions named in free text, e.g. "fix PaymentService.refund" or
+        "the payment service": identifiers match exactly, runs of up to three
+        words match names that join them (``payment_service``, ``PaymentService``).
+        """
+        self.stats["queries"] += 1
+        lookup = self._normalized_names()
+        found: Dict[Tuple[str, str, int], Definition] = {}
+
+        def add(name: str, kinds: Optional[Set[str]] = None) -> None:
+            for definition in self.definitions(name):
+                if kinds is None or definition.kind in kinds:
+                    found.setdefault((definition.path, definition.qualified_name, definition.line), definition)
+
+        for qualified in re.findall(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+", text):
+            if qualified in self._names:
+                add(qualified)
+        for word in _IDENTIFIER.findall(text):
+            # Identifiers that look like code match exactly
+            if word in self._names and ("_" in word or any(char.isupper() for char in word[1:])):
+                add(word)
+        for phrase, first_word in _phrases(text).items():
+            if phrase == first_word.replace("_", "").lower():
+                # A plain single word is only trusted for classes and functions
+                if len(phrase) >= 5:
+                    for name in lookup.get(phrase, ()):
+                        add(name, {"class", "function"})
+                continue
+            for name in lookup.get(phrase, ()):
+                add(name)
+        return sorted(found.values(), key=lambda d: (d.path, d.line))[:limit]
+
+    def _normalized_names(self) -> Dict[str, List[str]]:
+        frozen = self._freeze()
+        lookup = frozen.get("normalized")
+        if lookup is None:
+            lookup = {}
+            for name_id in self._definitions:
+                name = self._name_list[name_id]
+                if "." not in name:
+                    lookup.setdefault(name.replace("_", "").lower(), []).append(name)
+            frozen["normalized"] = lookup
+        return lookup
+
+    def files_for_request(self, text: str, max_depth: int = 1, limit: int = 50) -> List[str]:
+        """Files an agent should load for a change request: named symbols and paths plus their impact"""
+        impacted: Dict[str, int] = {}
+        phrases = _phrases(text)
+        for path in self._file_ids:
+            stem = posixpath.splitext(posixpath.basename(path))[0].replace("_", "").lower()
+            if path in text or (len(stem) >= 4 and stem != "index" and stem in phrases):
+                impacted.setdefault(path, 0)
+        for definition in self.match_symbols(text):
+            for path, depth in self.impact(definition.qualified_name, max_depth=max_depth).items():
+                if depth < impacted.get(path, depth + 1):
+                    impacted[path] = depth
+        ordered = sorted(impacted.items(), key=lambda item: (item[1], item[0]))
+        return [path for path, _ in ordered[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._file_ids),
+            "names": len(self._name_list),
+            "definitions": sum(len(record.definitions) for record in self._files if record is not None),
+            "import_edges": sum(len(record.dependencies) for record in self._files if record is not None),
+            **self.stats,
+        }
+
+
+def _prefix_sums(counts: List[int]) -> array:
+    offsets = array("Q", counts)
+    for index in range(1, len(offsets)):
+        offsets[index] += offsets[index - 1]
+    return offsets
+
+
+__all__ = [
+    "Definition",
+    "FileSymbols",
+    "Reference",
+    "SYMBOL_LANGUAGES",
+    "SymbolGraph",
+    "extract_file_symbols",
+    "module_keys",
+]
@@ -19,6 +19,8 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
 from app.core.async_task_manager import register_async_initializer
+from app.core.pattern_engine import PatternRule, RuleSet
+from app.core.validation_engine import ExecutionMode, ValidatorSpec, get_validation_engine
 import traceback
 from concurrent.futures import ThreadPoolExecutor
 import threading
@@ -445,6 +447,12 @@ class SecurityValidator:
                 r'csrf.*token'
             ]
         }
+        self._vulnerable_rules = RuleSet(
+            (PatternRule(p, p) for p in self.security_patterns["vulnerable"]), name="orchestrator.vulnerable"
+        )
+        self._secure_rules = RuleSet(
+            (PatternRule(p, p, re.IGNORECASE) for p in self.security_patterns["secure"]), name="orchestrator.secure"
+        )
     
     async def validate_security(self, code: str, context: Dict[str, Any]) -> ValidationResult:
         """Validate security aspects"""
@@ -481,19 +489,13 @@ class SecurityValidator:
     
     async def _check_security_vulnerabilities(self, code: str) -> List[str]:
         """Check for security vulnerabilities"""
-        errors = []
-        for pattern in self.security_patterns["vulnerable"]:
-            if re.search(pattern, code):
-                errors.append(f"Security vulnerability detected: {pattern}")
-        return errors
+        return [f"Security vulnerability detected: {pattern}" for pattern in self._vulnerable_rules.matching_rules(code)]
     
     async def _check_security_best_practices(self, code: str) -> List[str]:
         """Check for security best practices"""
-        suggestions = []
-        for pattern in self.security_patterns["secure"]:
-            if not re.search(pattern, code, re.IGNORECASE):
-                suggestions.append(f"Consider implementing: {pattern}")
-        return suggestions
+        present = set(self._secure_rules.matching_rules(code))
+        return [f"Consider implementing: {pattern}" for pattern in self.security_patterns["secure"]
+                if pattern not in present]
 
 
 class PerformanceOptimizer:
@@ -1074,55 +1076,36 @@ class UnifiedAIComponentOrchestrator:
         try:
             validation_results = {}
             
-            # Factual Accuracy Validation
-            factual_result = await self.factual_accuracy_validator.validate_factual_claims(code, context)
-            validation_results["factual_accuracy"] = {
-                "is_valid": factual_result.is_valid,
-                "score": factual_result.score,
-                "errors": factual_result.errors,
-                "warnings": factual_result.warnings,
-                "suggestions": factual_result.suggestions
-            }
-            
-            # Context Awareness Validation
-            context_result = await self.context_awareness_manager.validate_context_compliance(code, context)
-            validation_results["context_awareness"] = {
-                "is_valid": context_result.is_valid,
-                "score": context_result.score,
-                "errors": context_result.errors,
-                "warnings": context_result.warnings,
-                "suggestions": context_result.suggestions
-            }
-            
-            # Consistency Enforcement
-            consistency_result = await self.consistency_enforcer.enforce_consistency(code, context)
-            validation_results["consistency"] = {
-                "is_valid": consistency_result.is_valid,
-                "score": consistency_result.score,
-                "errors": consistency_result.errors,
-                "warnings": consistency_result.warnings,
-                "suggestions": consistency_result.suggestions
-            }
-            
-            # Security Validation
-            security_result = await self.security_validator.validate_security(code, context)
-            validation_results["security"] = {
-                "is_valid": security_result.is_valid,
-                "score": security_result.score,
-                "errors": security_result.errors,
-                "warnings": security_result.warnings,
-                "suggestions": security_result.suggestions
-            }
-            
-            # Performance Optimization
-            performance_result = await self.performance_optimizer.optimize_performance(code, context)
-            validation_results["performance"] = {
-                "is_valid": performance_result.is_valid,
-                "score": performance_result.score,
-                "errors": performance_result.errors,
-                "warnings": performance_result.warnings,
-                "suggestions": performance_result.suggestions
-            }
+            # Independent validators run concurrently under the engine's latency budget
+            run = await get_validation_engine().run([
+                ValidatorSpec("factual_accuracy", self.factual_accuracy_validator,
+                              "validate_factual_claims", (code, context)),
+                ValidatorSpec("context_awareness", self.context_awareness_manager,
+                              "validate_context_compliance", (code, context), mode=ExecutionMode.ASYNC),
+                ValidatorSpec("consistency", self.consistency_enforcer, "enforce_consistency", (code, context)),
+                ValidatorSpec("security", self.security_validator, "validate_security", (code, context),
+                              is_critical_failure=lambda result: not result.is_valid),
+                ValidatorSpec("performance", self.performance_optimizer, "optimize_performance", (code, context)),
+            ], size_hint=len(code))
+            
+            for name, outcome in run.outcomes.items():
+                result = run.results.get(name)
+                if result is None:
+                    validation_results[name] = {
+                        "is_valid": False,
+                        "score": 0.0,
+                        "errors": [f"Validator {outcome.status.value}" + (f": {outcome.error}" if outcome.error else "")],
+                        "warnings": [],
+                        "suggestions": []
+                    }
+                    continue
+                validation_results[name] = {
+                    "is_valid": result.is_valid,
+                    "score": result.score,
+                    "errors": result.errors,
+                    "warnings": result.warnings,
+                    "suggestions": result.suggestions
+                }
             
             # Calculate overall validation score
             scores = [result["score"] for result in validation_results.values()]
@@ -1135,6 +1118,8 @@ class UnifiedAIComponentOrchestrator:
                 "overall_valid": all_valid,
                 "overall_score": overall_score,
                 "validation_results": validation_results,
+                "partial": run.partial,
+                "validation_execution": run.summary(),
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -23,10 +23,35 @@ from enum import Enum
 import re
 import structlog
 
+from app.core.pattern_engine import PatternRule, RuleSet
 from .zero_assumption_dna import ZeroAssumptionDNA, AssumptionViolation
 
 logger = structlog.get_logger()
 
+# Security rule patterns, compiled once and checked in rule order
+_SQL_INJECTION_RULES = RuleSet(
+    [PatternRule(pattern, pattern, re.IGNORECASE) for pattern in (
+        r"(\bOR\b.*=.*)",
+        r"(\bAND\b.*=.*)",
+        r"(--)",
+        r"(;.*DROP.*)",
+        r"(;.*DELETE.*)",
+        r"(;.*UPDATE.*)",
+        r"('.*OR.*'.*=.*')",
+    )],
+    name="zero_assumption.sql_injection",
+)
+_XSS_RULES = RuleSet(
+    [PatternRule(pattern, pattern, re.IGNORECASE) for pattern in (
+        r'<script',
+        r'javascript:',
+        r'onerror=',
+        r'onload=',
+        r'<iframe',
+    )],
+    name="zero_assumption.xss",
+)
+
 
 class RuleCategory(Enum):
     """Categories of Zero Assumption rules"""
@@ -427,27 +452,17 @@ class ComprehensiveZeroAssumptionRules(ZeroAssumptionDNA):
         self.verify_type(query_param, str, name)
         
         # Check for SQL injection patterns
-        sql_patterns = [
-            r"(\bOR\b.*=.*)",
-            r"(\bAND\b.*=.*)",
-            r"(--)",
-            r"(;.*DROP.*)",
-            r"(;.*DELETE.*)",
-            r"(;.*UPDATE.*)",
-            r"('.*OR.*'.*=.*')",
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, query_param, re.IGNORECASE):
-                logger.warning(
-                    "Potential SQL injection detected",
-                    param_name=name,
-                    pattern=pattern
-                )
-                raise AssumptionViolation(
-                    f"DO NOT ASSUME: {name} is safe from SQL injection. "
-                    f"Suspicious pattern detected. Use parameterized queries."
-                )
+        hit = _SQL_INJECTION_RULES.first_match(query_param)
+        if hit is not None:
+            logger.warning(
+                "Potential SQL injection detected",
+                param_name=name,
+                pattern=hit.rule_id
+            )
+            raise AssumptionViolation(
+                f"DO NOT ASSUME: {name} is safe from SQL injection. "
+                f"Suspicious pattern detected. Use parameterized queries."
+            )
         
         return query_param
     
@@ -539,22 +554,13 @@ class ComprehensiveZeroAssumptionRules(ZeroAssumptionDNA):
         self.verify_type(user_input, str, name)
         
         # Check for XSS patterns
-        xss_patterns = [
-            r'<script',
-            r'javascript:',
-            r'onerror=',
-            r'onload=',
-            r'<iframe',
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, user_input, re.IGNORECASE):
-                logger.warning(
-                    "Potential XSS detected",
-                    param_name=name,
-                    pattern=pattern,
-                    input_preview=user_input[:100]
-                )
+        for pattern in _XSS_RULES.matching_rules(user_input):
+            logger.warning(
+                "Potential XSS detected",
+                param_name=name,
+                pattern=pattern,
+                input_preview=user_input[:100]
+            )
         
         return user_input
     
@@ -0,0 +1,39 @@
+"""
+Micro-Benchmark Suite for Cognomega Hot Paths
+Reproducible timings with fixed corpora, JSON result history and regression thresholds
+
+Usage:
+    python -m benchmarks list
+    python -m benchmarks run --save --compare
+    python -m pytest benchmarks --benchmark
+"""
+
+from benchmarks.harness import (
+    BenchmarkCase,
+    BenchmarkResult,
+    BENCHMARKS,
+    benchmark,
+    run_case,
+    run_benchmarks,
+    select_cases,
+)
+from benchmarks.history import (
+    ResultHistory,
+    Regression,
+    compare_results,
+    load_thresholds,
+)
+
+__all__ = [
+    'BenchmarkCase',
+    'BenchmarkResult',
+    'BENCHMARKS',
+    'benchmark',
+    'run_case',
+    'run_benchmarks',
+    'select_cases',
+    'ResultHistory',
+    'Regression',
+    'compare_results',
+    'load_thresholds',
+]
@@ -0,0 +1,436 @@
+"""
+Hot Path Benchmark Cases
+Each setup function builds its fixture and returns the zero-argument operation to time.
+Application imports happen inside setup so a missing optional dependency skips one case only.
+"""
+
+import itertools
+import uuid
+
+from benchmarks.corpora import (
+    COMPLETION_PREFIXES,
+    LARGE_CODE,
+    MEMORY_PATTERN_NAMES,
+    SMALL_CODE,
+)
+from benchmarks.harness import benchmark
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def _orchestration_case(code: str):
+    from app.services.ai_orchestration_layer import AIOrchestrationLayer
+
+    layer = AIOrchestrationLayer()
+    context = {"language": "python", "framework": "fastapi"}
+
+    async def operation():
+        return await layer.orchestrate_validation(code, context)
+
+    return operation
+
+
+@benchmark("orchestrate_validation.small", group="validation", corpus="small_code",
+           rounds=20, iterations=5)
+def bench_orchestrate_validation_small():
+    """AIOrchestrationLayer.orchestrate_validation on a ~40 line module"""
+    return _orchestration_case(SMALL_CODE)
+
+
+@benchmark("orchestrate_validation.large", group="validation", corpus="large_code",
+           rounds=10, iterations=1, warmup_rounds=1)
+def bench_orchestrate_validation_large():
+    """AIOrchestrationLayer.orchestrate_validation on a ~2000 line module"""
+    return _orchestration_case(LARGE_CODE)
+
+
+@benchmark("reality_check.large", group="validation", corpus="large_code",
+           rounds=10, iterations=1, warmup_rounds=1)
+def bench_reality_check():
+    """RealityCheckDNA.check_code_reality on a ~2000 line module"""
+    from app.services.reality_check_dna import RealityCheckDNA
+
+    dna = RealityCheckDNA()
+
+    async def operation():
+        return await dna.check_code_reality(LARGE_CODE, file_path="benchmark.py")
+
+    return operation
+
+
+@benchmark("reality_check.incremental_edit", group="validation", corpus="large_code",
+           rounds=10, iterations=5, warmup_rounds=1)
+def bench_reality_check_incremental():
+    """Incremental RealityCheckDNA.check_code_reality after a one-function edit"""
+    from app.services.reality_check_dna import RealityCheckDNA
+
+    dna = RealityCheckDNA()
+    # Every iteration produces a never-seen version of one function, so exactly one unit is re-analyzed
+    edits = (LARGE_CODE.replace("total -= 1", f"total -= {n}", 1) for n in itertools.count(2))
+
+    async def operation():
+        return await dna.check_code_reality(next(edits), file_path="benchmark.py", incremental=True)
+
+    return operation
+
+
+@benchmark("security_validator.line_rules_large", group="validation", corpus="large_code",
+           rounds=10, iterations=1, warmup_rounds=1)
+def bench_security_validator_line_rules():
+    """SecurityValidator threat and secret line rules (~30 patterns) on a ~2000 line module"""
+    from app.core.security_validator import SecurityValidator
+
+    validator = SecurityValidator()
+    checks = [validator._check_sql_injection, validator._check_xss_vulnerabilities, validator._check_path_traversal,
+              validator._check_command_injection, validator._check_insecure_deserialization,
+              validator._check_secret_exposure]
+
+    async def operation():
+        return [await check(LARGE_CODE) for check in checks]
+
+    return operation
+
+
+@benchmark("consistency.large", group="validation", corpus="large_code",
+           rounds=10, iterations=1, warmup_rounds=1)
+def bench_consistency_large():
+    """ProactiveConsistencyManager.validate_code_consistency on a ~2000 line module"""
+    from app.services.proactive_consistency_manager import ProactiveConsistencyManager
+
+    manager = ProactiveConsistencyManager()
+
+    def operation():
+        return manager.validate_code_consistency(LARGE_CODE, "benchmark.py")
+
+    return operation
+
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+@benchmark("complexity_analyzer.large", group="analysis", corpus="large_code",
+           rounds=15, iterations=2)
+def bench_complexity_analyzer():
+    """ComplexityAnalyzer.analyze_complexity on a ~2000 line module"""
+    from app.services.smart_coding_ai_advanced_analysis import ComplexityAnalyzer
+
+    analyzer = ComplexityAnalyzer()
+
+    async def operation():
+        return await analyzer.analyze_complexity(LARGE_CODE, "python")
+
+    return operation
+
+
+@benchmark("analysis_context.build_large", group="analysis", corpus="large_code",
+           rounds=15, iterations=2)
+def bench_analysis_context_build():
+    """Uncached CodeAnalysisContext (parse plus node buckets) for a ~2000 line module"""
+    from app.core.code_analysis_context import CodeAnalysisContext
+
+    def operation():
+        return CodeAnalysisContext(LARGE_CODE)
+
+    return operation
+
+
+# ============================================================================
+# COMPLETION
+# ============================================================================
+
+@benchmark("completion_generator.generate", group="completion", corpus="completion_prefixes",
+           rounds=30, iterations=50)
+def bench_completion_generator():
+    """CompletionGenerator.generate_completion cycling over fixed prefixes"""
+    from app.services.smart_coding_ai_optimized import CompletionGenerator
+    from app.services.smart_coding_ai_models import CompletionContext
+    from app.services.smart_coding_ai_enums import Language
+
+    generator = CompletionGenerator()
+    contexts = []
+    for prefix in COMPLETION_PREFIXES:
+        content = SMALL_CODE + "\n" + prefix
+        line = content.count("\n") + 1
+        contexts.append(CompletionContext(
+            file_path="benchmark.py",
+            language=Language.PYTHON,
+            content=content,
+            cursor_position=(line, len(prefix)),
+            recent_changes=["edit"],
+            completion_history=["def get_user", "class UserService"],
+        ))
+    cycle = itertools.cycle(contexts)
+
+    async def operation():
+        return await generator.generate_completion(next(cycle))
+
+    return operation
+
+
+@benchmark("completion_cache.typing", group="completion", rounds=30, iterations=50)
+def bench_completion_cache_typing():
+    """CompletionCache lookups while typing through a cached completion in a 3000-line file"""
+    from app.core.completion_cache import CompletionCache
+    from app.services.smart_coding_ai_models import CompletionContext, InlineCompletion
+    from app.services.smart_coding_ai_enums import Language
+
+    head = SMALL_CODE * 20 + "\ndef handler(request):\n    return request."
+    line = head.count("\n") + 1
+    column = len(head) - head.rfind("\n") - 1
+    text = "json()['payload']"
+    cache = CompletionCache()
+    seed = CompletionContext(file_path="benchmark.py", language=Language.PYTHON, content=head, cursor_position=(line, column))
+    cache.put(seed, InlineCompletion(
+        completion_id="bench", text=text, completion_type="method", language="python", confidence=0.9,
+        accuracy_score=0.9, context_relevance=0.5, semantic_similarity=0.5, pattern_match_score=0.5,
+        ml_prediction_score=0.5, ensemble_score=0.9, start_line=line, end_line=line,
+        start_column=column, end_column=column + len(text), description="",
+    ))
+    typing = itertools.cycle([
+        CompletionContext(file_path="benchmark.py", language=Language.PYTHON, content=head + text[:typed],
+                          cursor_position=(line, column + typed))
+        for typed in range(len(text))
+    ])
+
+    async def operation():
+        return cache.get(next(typing))
+
+    return operation
+
+
+@benchmark("symbol_completion.complete", group="completion", rounds=30, iterations=100)
+def bench_symbol_completion():
+    """SymbolCompletionIndex.complete over 50k synthetic project symbols (prefix and initials queries)"""
+    from app.services.symbol_completion import SymbolCompletionIndex
+
+    verbs = ["get", "set", "load", "save", "build", "parse", "render", "validate", "create", "delete"]
+    nouns = ["user", "order", "invoice", "profile", "session", "payment", "report", "token", "cart", "plan"]
+    index = SymbolCompletionIndex()
+    for file_index in range(2500):
+        index.update_file(f"pkg/module_{file_index}.py", [
+            (f"{verbs[(file_index + n) % 10]}_{nouns[n % 10]}_{nouns[(file_index // 10 + n) % 10]}_{file_index}", "function")
+            for n in range(20)
+        ])
+    index.complete("get", 1)  # publishes the tries outside the timed rounds
+    queries = itertools.cycle(["get_u", "valid", "pi", "gop", "render_cart_", "lu"])
+
+    async def operation():
+        return index.complete(next(queries), 10)
+
+    return operation
+
+
+# ============================================================================
+# CACHING
+# ============================================================================
+
+@benchmark("multi_tier_cache.get_set", group="cache", rounds=30, iterations=200)
+def bench_multi_tier_cache():
+    """MultiTierCaching.set followed by get on the L1 tier"""
+    from app.core.advanced_caching import MultiTierCaching
+
+    cache = MultiTierCaching()
+    keys = itertools.cycle(range(512))
+
+    async def operation():
+        key = next(keys)
+        await cache.set("code_completions", {"text": "completion"}, None, key)
+        return await cache.get("code_completions", key)
+
+    return operation
+
+
+@benchmark("cache_service.get_set", group="cache", rounds=30, iterations=200)
+def bench_cache_service():
+    """CacheService.set followed by get with LRU eviction active"""
+    from app.services.smart_coding_ai_cache import CacheService
+
+    cache = CacheService(cache_type="memory", max_size=256)
+    keys = itertools.cycle(range(512))
+
+    async def operation():
+        key = str(next(keys))
+        await cache.set(key, {"text": "completion"}, namespace="completions")
+        return await cache.get(key, namespace="completions")
+
+    return operation
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+@benchmark("rate_limiter.check_and_record", group="middleware", rounds=30, iterations=200)
+def bench_rate_limiter():
+    """RateLimitMiddleware limit check plus record across a pool of client IPs"""
+    from app.middleware.rate_limiter import RateLimitMiddleware
+
+    limiter = RateLimitMiddleware(app=None, requests_per_minute=10**9, requests_per_hour=10**9,
+                                  requests_per_day=10**9, burst_limit=10**9)
+    clients = itertools.cycle([f"10.0.{i // 256}.{i % 256}" for i in range(64)])
+
+    async def operation():
+        client_ip = next(clients)
+        allowed = await limiter._check_rate_limits(client_ip)
+        await limiter._record_request(client_ip)
+        return allowed
+
+    return operation
+
+
+# ============================================================================
+# MEMORY
+# ============================================================================
+
+@benchmark("codebase_memory.search", group="memory", corpus="memory_patterns",
+           rounds=20, iterations=20)
+async def bench_codebase_memory_search():
+    """CodebaseMemorySystem.search_memory over ten synthetic project snapshots"""
+    from app.services.codebase_memory_system import CodebaseMemorySystem
+
+    memory = CodebaseMemorySystem()
+    for project in range(10):
+        project_id = f"project-{project}"
+        await memory.store_snapshot({
+            "project_id": project_id,
+            "coding_patterns": [
+                {
+                    "pattern_id": f"{project}-{i}",
+                    "pattern_name": name,
+                    "pattern_type": "function",
+                    "language": "python",
+                    "file_path": f"src/module_{i % 25}.py",
+                    "line_number": i,
+                }
+                for i, name in enumerate(MEMORY_PATTERN_NAMES)
+            ],
+            "dependencies": [
+                {"name": dep, "type": "runtime", "language": "python"}
+                for dep in ("fastapi", "pydantic", "structlog", "httpx", "redis")
+            ],
+            "project_structure": {
+                "file_tree": {
+                    f"src/module_{i}.py": {"type": "file", "extension": ".py"}
+                    for i in range(25)
+                }
+            },
+        })
+    queries = itertools.cycle(["user", "payment", "config", "module_1", "redis"])
+
+    async def operation():
+        return await memory.search_memory(next(queries))
+
+    return operation
+
+
+@benchmark("symbol_graph.impact", group="memory", rounds=20, iterations=20)
+def bench_symbol_graph_impact():
+    """SymbolGraph.impact over a synthetic 2000-module layered import graph"""
+    from app.services.symbol_graph import SymbolGraph, extract_file_symbols
+
+    graph = SymbolGraph()
+    for layer in range(20):
+        for index in range(100):
+            imports = "".join(
+                f"from pkg.layer_{layer - 1}.mod_{(index + offset) % 100} import handler_{layer - 1}_{(index + offset) % 100}\n"
+                for offset in range(3)
+            ) if layer else ""
+            source = f"{imports}\ndef handler_{layer}_{index}(request):\n    return request\n"
+            graph.update_file(extract_file_symbols(source, f"pkg/layer_{layer}/mod_{index}.py", "python"))
+    queries = itertools.cycle([f"handler_{layer}_{layer * 5}" for layer in range(0, 20, 4)])
+
+    async def operation():
+        return graph.impact(next(queries))
+
+    return operation
+
+
+@benchmark("vector_index.search", group="memory", rounds=20, iterations=20)
+def bench_vector_index_search():
+    """VectorIndex top-10 search over 100k 64-d vectors (IVF) with a project filter"""
+    import numpy as np
+    from app.core.vector_index import VectorIndex
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(200, 64))
+    vectors = (centers[rng.integers(0, 200, 100_000)] + 0.3 * rng.normal(size=(100_000, 64))).astype(np.float32)
+    index = VectorIndex(ann_threshold=50_000)
+    index.add([str(i) for i in range(len(vectors))], vectors, [{"project_id": f"p{i % 4}"} for i in range(len(vectors))])
+    index.search(vectors[0], 10)  # trains the quantizer outside the timed rounds
+    queries = itertools.cycle(vectors[:50])
+
+    async def operation():
+        return index.search(next(queries), 10, filters={"project_id": "p1"})
+
+    return operation
+
+
+# ============================================================================
+# EVENTS
+# ============================================================================
+
+@benchmark("subject.notify_fanout", group="events", rounds=20, iterations=20)
+def bench_subject_notify():
+    """Subject.notify fan-out to 50 observers"""
+    from app.core.observers.observer_pattern import (
+        Event,
+        EventPriority,
+        EventType,
+        Observer,
+        ObserverResult,
+        Subject,
+    )
+
+    class CountingObserver(Observer):
+        def __init__(self, index: int):
+            super().__init__(f"bench_observer_{index}", f"Benchmark Observer {index}")
+            self.count = 0
+
+        async def update(self, event: Event) -> ObserverResult:
+            self.count += 1
+            return ObserverResult(observer_id=self.observer_id, success=True, execution_time=0.0)
+
+        def can_handle(self, event: Event) -> bool:
+            return True
+
+    subject = Subject()
+    for index in range(50):
+        subject.attach(CountingObserver(index), [EventType.APP_GENERATED])
+
+    async def operation():
+        event = Event(
+            event_id=str(uuid.uuid4()),
+            event_type=EventType.APP_GENERATED,
+            priority=EventPriority.MEDIUM,
+            data={"app_id": "benchmark"},
+        )
+        return await subject.notify(event)
+
+    return operation
+
+
+# ============================================================================
+# EMBEDDINGS
+# ============================================================================
+
+@benchmark("embedding_batcher.concurrent_256", group="ai", corpus="memory_patterns",
+           rounds=20, iterations=5)
+def bench_embedding_batcher():
+    """EmbeddingBatcher coalescing 256 concurrent embed() calls (zero-cost backend)"""
+    import asyncio
+
+    from app.core.embedding_batcher import EmbeddingBatcher, EmbeddingBatcherConfig
+
+    async def embed_batch(texts):
+        return [[float(len(text))] for text in texts]
+
+    batcher = EmbeddingBatcher(embed_batch, EmbeddingBatcherConfig(max_wait_ms=0.0))
+    texts = [f"{name} {i}" for i, name in enumerate(itertools.islice(itertools.cycle(MEMORY_PATTERN_NAMES), 256))]
+
+    async def operation():
+        return await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    return operation
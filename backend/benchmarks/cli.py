@@ -0,0 +1,146 @@
+"""
+Benchmark Command Line Interface
+
+    python -m benchmarks list
+    python -m benchmarks run [-k PATTERN ...] [--save] [--label NAME]
+                             [--compare [RUN_ID]] [--fail-on-regression]
+    python -m benchmarks history [--limit N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import List, Optional
+
+import structlog
+
+from benchmarks.harness import BenchmarkResult, run_benchmarks, select_cases
+from benchmarks.history import ResultHistory, compare_results, load_thresholds
+
+
+def configure_logging(level: str) -> None:
+    """Route structlog through stdlib with level filtering, as app.main does"""
+    logging.basicConfig(level=getattr(logging, level.upper(), logging.ERROR), stream=sys.stderr)
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_log_level,
+            structlog.processors.JSONRenderer(),
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table"""
+    header = f"{'benchmark':<34} {'status':<8} {'median ms':>11} {'p95 ms':>11} {'min ms':>11} {'ops/s':>11}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.status != "ok":
+            lines.append(f"{r.name:<34} {r.status:<8} {(r.reason or '')[:60]}")
+            continue
+        lines.append(
+            f"{r.name:<34} {r.status:<8} {r.median_ms:>11.4f} {r.p95_ms:>11.4f} "
+            f"{r.min_ms:>11.4f} {r.ops_per_sec:>11.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _cmd_list(args: argparse.Namespace) -> int:
+    for case in select_cases(args.patterns):
+        print(f"{case.name:<34} {case.group:<12} {case.description}")
+    return 0
+
+
+def _cmd_history(args: argparse.Namespace) -> int:
+    runs = ResultHistory(args.history).load()
+    for run in runs[-args.limit:]:
+        ok = sum(1 for r in run.get("results", {}).values() if r.get("status") == "ok")
+        print(f"{run.get('run_id')}  {run.get('timestamp')}  commit={run.get('git_commit')}  "
+              f"label={run.get('label')}  cases={ok}")
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    cases = select_cases(args.patterns)
+    if not cases:
+        print("No benchmarks matched", file=sys.stderr)
+        return 2
+
+    results = asyncio.run(run_benchmarks(cases, rounds=args.rounds, iterations=args.iterations))
+    print(format_table(results))
+
+    history = ResultHistory(args.history)
+    run = history.build_run(results, label=args.label)
+    exit_code = 0
+
+    if args.compare is not None:
+        baseline = history.find_baseline(run_id=args.compare or None, environment=run["environment"])
+        if baseline is None:
+            print("\nNo comparable baseline run found in history")
+        else:
+            regressions = compare_results(results, baseline, load_thresholds(args.thresholds))
+            print(f"\nCompared against run {baseline.get('run_id')} ({baseline.get('git_commit')})")
+            for regression in regressions:
+                print(f"  REGRESSION {regression.describe()}")
+            if not regressions:
+                print("  no regressions")
+            elif args.fail_on_regression:
+                exit_code = 1
+
+    if args.save:
+        history.append(run)
+        print(f"\nSaved run {run['run_id']} to {history.path}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+
+    if any(r.status == "error" for r in results):
+        exit_code = exit_code or 3
+    return exit_code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Cognomega hot-path benchmarks")
+    parser.add_argument("--log-level", default="error", help="Log level while benchmarking")
+    parser.add_argument("--history", default=None, help="Path to the JSON result history")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = sub.add_parser("list", help="List registered benchmarks")
+    list_parser.add_argument("-k", dest="patterns", action="append", help="Name or group glob")
+    list_parser.set_defaults(func=_cmd_list)
+
+    run_parser = sub.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("-k", dest="patterns", action="append", help="Name or group glob")
+    run_parser.add_argument("--rounds", type=int, default=None, help="Override rounds per case")
+    run_parser.add_argument("--iterations", type=int, default=None, help="Override iterations per round")
+    run_parser.add_argument("--save", action="store_true", help="Append this run to the history")
+    run_parser.add_argument("--label", default=None, help="Label stored with the run")
+    run_parser.add_argument("--compare", nargs="?", const="", default=None,
+                            help="Compare against a run id/label, or the latest comparable run")
+    run_parser.add_argument("--thresholds", default=None, help="Path to thresholds JSON")
+    run_parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 on regression")
+    run_parser.add_argument("--json", default=None, help="Also write this run to a JSON file")
+    run_parser.set_defaults(func=_cmd_run)
+
+    history_parser = sub.add_parser("history", help="Show saved runs")
+    history_parser.add_argument("--limit", type=int, default=20)
+    history_parser.set_defaults(func=_cmd_history)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
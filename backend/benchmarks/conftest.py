@@ -0,0 +1,8 @@
+from benchmarks.pytest_plugin import (  # noqa: F401
+    pytest_addoption,
+    pytest_collection_modifyitems,
+    pytest_configure,
+    pytest_sessionfinish,
+    pytest_terminal_summary,
+    run_benchmark,
+)
@@ -0,0 +1,143 @@
+"""
+Fixed Benchmark Corpora
+Deterministic code samples so timings are comparable across runs and machines
+"""
+
+import hashlib
+from typing import Dict, List
+
+# Bump when any corpus changes; results from different versions are never compared
+CORPUS_VERSION = 1
+
+SMALL_CODE = '''"""User service"""
+import os
+import json
+from typing import Dict, List, Optional
+
+
+class UserService:
+    """Manages users"""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.api_key = os.getenv("USER_API_KEY")
+
+    async def get_user(self, user_id: str) -> Optional[Dict]:
+        """Fetch a single user"""
+        if not user_id:
+            raise ValueError("user_id is required")
+        try:
+            return await self.repository.find(user_id)
+        except Exception as e:
+            raise RuntimeError(f"lookup failed: {e}")
+
+    async def list_users(self, limit: int = 50) -> List[Dict]:
+        """List users with a limit"""
+        users = []
+        for row in await self.repository.all():
+            if len(users) >= limit:
+                break
+            users.append(row)
+        return users
+
+    def serialize(self, user: Dict) -> str:
+        return json.dumps(user)
+'''
+
+_LARGE_UNIT_TEMPLATE = '''
+
+class Service{index}:
+    """Generated service number {index}"""
+
+    def __init__(self, client, cache=None):
+        self.client = client
+        self.cache = cache or {{}}
+        self.password = "{secret}"
+
+    def compute_{index}(self, items, threshold={threshold}):
+        total = 0
+        for item in items:
+            if item > threshold and item % 2 == 0:
+                total += item * {index}
+            elif item < 0 or item == threshold:
+                total -= 1
+            else:
+                while total > 1000:
+                    total //= 2
+        return total
+
+    async def fetch_{index}(self, key: str):
+        # TODO: Implement retry policy
+        if key in self.cache:
+            return self.cache[key]
+        try:
+            result = await self.client.get(f"/items/{{key}}")
+        except Exception:
+            return {{"status": "success"}}
+        self.cache[key] = result
+        return result
+
+    def render_{index}(self, rows):
+        query = "SELECT * FROM table_{index} WHERE id = " + str(rows[0])
+        return [str(row) for row in rows if row is not None], query
+'''
+
+
+def _build_large_code(units: int = 60) -> str:
+    """Concatenate templated units into one large module"""
+    parts = ['"""Generated large module for benchmarks"""\nimport os\nimport asyncio\nimport hashlib\n']
+    for index in range(units):
+        parts.append(_LARGE_UNIT_TEMPLATE.format(
+            index=index,
+            threshold=(index * 7) % 13,
+            secret=f"s{index:04d}" if index % 5 == 0 else "",
+        ))
+    return "".join(parts)
+
+
+LARGE_CODE = _build_large_code()
+
+# Identifier-heavy memory corpus used by the codebase memory search benchmark
+MEMORY_PATTERN_NAMES: List[str] = [
+    f"{prefix}_{noun}_{index}"
+    for index in range(40)
+    for prefix, noun in (
+        ("get", "user"), ("create", "order"), ("validate", "payment"),
+        ("render", "template"), ("parse", "config"),
+    )
+]
+
+COMPLETION_PREFIXES: List[str] = [
+    "def ",
+    "class ",
+    "import ",
+    "for ",
+    "    result = self.",
+]
+
+CORPORA: Dict[str, str] = {
+    "small_code": SMALL_CODE,
+    "large_code": LARGE_CODE,
+    "memory_patterns": "\n".join(MEMORY_PATTERN_NAMES),
+    "completion_prefixes": "\n".join(COMPLETION_PREFIXES),
+}
+
+
+def corpus_fingerprint() -> str:
+    """Stable hash over every corpus, recorded with each run"""
+    digest = hashlib.sha256(f"v{CORPUS_VERSION}".encode())
+    for name in sorted(CORPORA):
+        digest.update(name.encode())
+        digest.update(CORPORA[name].encode())
+    return digest.hexdigest()[:16]
+
+
+__all__ = [
+    'CORPUS_VERSION',
+    'SMALL_CODE',
+    'LARGE_CODE',
+    'MEMORY_PATTERN_NAMES',
+    'COMPLETION_PREFIXES',
+    'CORPORA',
+    'corpus_fingerprint',
+]
@@ -0,0 +1,244 @@
+"""
+Benchmark Harness
+Registry, timing loop and statistics for the micro-benchmark suite
+"""
+
+import asyncio
+import fnmatch
+import gc
+import importlib
+import math
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import structlog
+
+logger = structlog.get_logger()
+
+# A setup callable returns the zero-argument operation to time (sync or async)
+Operation = Callable[[], Union[Any, Awaitable[Any]]]
+SetupCallable = Callable[[], Union[Operation, Awaitable[Operation]]]
+
+CASE_MODULES = ["benchmarks.cases"]
+
+
+@dataclass
+class BenchmarkCase:
+    """A single registered benchmark"""
+    name: str
+    group: str
+    setup: SetupCallable
+    description: str = ""
+    rounds: int = 30
+    iterations: int = 10
+    warmup_rounds: int = 3
+    corpus: Optional[str] = None
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics for one benchmark run (all times in milliseconds per operation)"""
+    name: str
+    group: str
+    status: str = "ok"  # ok, skipped, error
+    rounds: int = 0
+    iterations: int = 0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    mean_ms: float = 0.0
+    median_ms: float = 0.0
+    p95_ms: float = 0.0
+    stddev_ms: float = 0.0
+    ops_per_sec: float = 0.0
+    corpus: Optional[str] = None
+    reason: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize result for the JSON history"""
+        return {
+            "name": self.name,
+            "group": self.group,
+            "status": self.status,
+            "rounds": self.rounds,
+            "iterations": self.iterations,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "mean_ms": self.mean_ms,
+            "median_ms": self.median_ms,
+            "p95_ms": self.p95_ms,
+            "stddev_ms": self.stddev_ms,
+            "ops_per_sec": self.ops_per_sec,
+            "corpus": self.corpus,
+            "reason": self.reason,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        """Rebuild a result from the JSON history"""
+        known = {f for f in cls.__dataclass_fields__}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+
+# Global benchmark registry
+BENCHMARKS: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, group: str, description: str = "", rounds: int = 30,
+              iterations: int = 10, warmup_rounds: int = 3,
+              corpus: Optional[str] = None) -> Callable[[SetupCallable], SetupCallable]:
+    """Register a setup function as a benchmark case"""
+    def decorator(setup: SetupCallable) -> SetupCallable:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark already registered: {name}")
+        BENCHMARKS[name] = BenchmarkCase(
+            name=name,
+            group=group,
+            setup=setup,
+            description=description or (setup.__doc__ or "").strip(),
+            rounds=rounds,
+            iterations=iterations,
+            warmup_rounds=warmup_rounds,
+            corpus=corpus,
+        )
+        return setup
+    return decorator
+
+
+def load_cases() -> Dict[str, BenchmarkCase]:
+    """Import the case modules so their decorators populate the registry"""
+    for module_name in CASE_MODULES:
+        importlib.import_module(module_name)
+    return BENCHMARKS
+
+
+def select_cases(patterns: Optional[List[str]] = None) -> List[BenchmarkCase]:
+    """Select registered cases by name or group glob patterns"""
+    cases = load_cases()
+    if not patterns:
+        return sorted(cases.values(), key=lambda c: c.name)
+
+    selected = []
+    for case in cases.values():
+        if any(fnmatch.fnmatch(case.name, p) or fnmatch.fnmatch(case.group, p) for p in patterns):
+            selected.append(case)
+    return sorted(selected, key=lambda c: c.name)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percentile / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(case: BenchmarkCase, samples_ms: List[float]) -> BenchmarkResult:
+    """Reduce per-round samples to summary statistics"""
+    ordered = sorted(samples_ms)
+    median = statistics.median(ordered)
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        rounds=len(ordered),
+        iterations=case.iterations,
+        min_ms=ordered[0],
+        max_ms=ordered[-1],
+        mean_ms=statistics.fmean(ordered),
+        median_ms=median,
+        p95_ms=_percentile(ordered, 95),
+        stddev_ms=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        ops_per_sec=(1000.0 / median) if median > 0 else 0.0,
+        corpus=case.corpus,
+    )
+
+
+async def _resolve(value: Any) -> Any:
+    """Await value if it is awaitable"""
+    if asyncio.iscoroutine(value) or isinstance(value, asyncio.Future):
+        return await value
+    return value
+
+
+async def run_case(case: BenchmarkCase, rounds: Optional[int] = None,
+                   iterations: Optional[int] = None) -> BenchmarkResult:
+    """Run one benchmark case and return its statistics"""
+    if rounds is not None or iterations is not None:
+        case = BenchmarkCase(
+            name=case.name,
+            group=case.group,
+            setup=case.setup,
+            description=case.description,
+            rounds=rounds or case.rounds,
+            iterations=iterations or case.iterations,
+            warmup_rounds=case.warmup_rounds,
+            corpus=case.corpus,
+        )
+
+    try:
+        operation = await _resolve(case.setup())
+    except ImportError as e:
+        logger.warning("Benchmark skipped, dependency unavailable", benchmark=case.name, error=str(e))
+        return BenchmarkResult(name=case.name, group=case.group, status="skipped",
+                               corpus=case.corpus, reason=str(e))
+    except Exception as e:
+        logger.error("Benchmark setup failed", benchmark=case.name, error=str(e))
+        return BenchmarkResult(name=case.name, group=case.group, status="error",
+                               corpus=case.corpus, reason=str(e))
+
+    is_async = asyncio.iscoroutinefunction(operation)
+
+    try:
+        for _ in range(case.warmup_rounds):
+            for _ in range(case.iterations):
+                if is_async:
+                    await operation()
+                else:
+                    operation()
+
+        gc.collect()
+        samples_ms: List[float] = []
+        for _ in range(case.rounds):
+            if is_async:
+                start = time.perf_counter_ns()
+                for _ in range(case.iterations):
+                    await operation()
+                elapsed = time.perf_counter_ns() - start
+            else:
+                start = time.perf_counter_ns()
+                for _ in range(case.iterations):
+                    operation()
+                elapsed = time.perf_counter_ns() - start
+            samples_ms.append(elapsed / 1e6 / case.iterations)
+    except Exception as e:
+        logger.error("Benchmark run failed", benchmark=case.name, error=str(e))
+        return BenchmarkResult(name=case.name, group=case.group, status="error",
+                               corpus=case.corpus, reason=str(e))
+
+    return summarize(case, samples_ms)
+
+
+async def run_benchmarks(cases: List[BenchmarkCase], rounds: Optional[int] = None,
+                         iterations: Optional[int] = None) -> List[BenchmarkResult]:
+    """Run cases sequentially so they do not compete for the CPU"""
+    results = []
+    for case in cases:
+        result = await run_case(case, rounds=rounds, iterations=iterations)
+        logger.info("Benchmark finished", benchmark=case.name, status=result.status,
+                    median_ms=round(result.median_ms, 4))
+        results.append(result)
+    return results
+
+
+__all__ = [
+    'BenchmarkCase',
+    'BenchmarkResult',
+    'BENCHMARKS',
+    'benchmark',
+    'load_cases',
+    'select_cases',
+    'summarize',
+    'run_case',
+    'run_benchmarks',
+]
@@ -0,0 +1,197 @@
+"""
+Benchmark Result History and Regression Thresholds
+Stores every saved run as JSON and compares new runs against a baseline run
+"""
+
+import json
+import os
+import platform
+import subprocess
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from benchmarks.corpora import CORPUS_VERSION, corpus_fingerprint
+from benchmarks.harness import BenchmarkResult
+
+logger = structlog.get_logger()
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_HISTORY_PATH = BENCHMARK_DIR / "results" / "history.json"
+DEFAULT_THRESHOLDS_PATH = BENCHMARK_DIR / "thresholds.json"
+MAX_HISTORY_RUNS = 200
+
+
+@dataclass
+class Regression:
+    """A benchmark that exceeded its threshold"""
+    name: str
+    metric: str
+    baseline: Optional[float]
+    current: float
+    change_pct: Optional[float]
+    limit: str
+
+    def describe(self) -> str:
+        """Human readable one-line summary"""
+        if self.baseline is None:
+            return f"{self.name}: {self.metric}={self.current:.4f}ms exceeds {self.limit}"
+        return (f"{self.name}: {self.metric} {self.baseline:.4f}ms -> {self.current:.4f}ms "
+                f"({self.change_pct:+.1f}%, limit {self.limit})")
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the working tree, if available"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARK_DIR, capture_output=True, text=True, timeout=5
+        )
+        return output.stdout.strip() if output.returncode == 0 else None
+    except Exception:
+        return None
+
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine so runs from different hosts are not compared"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "node": platform.node(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def machine_key(environment: Dict[str, Any]) -> str:
+    """Key identifying comparable runs"""
+    return "|".join(str(environment.get(k)) for k in ("node", "machine", "python", "cpu_count"))
+
+
+class ResultHistory:
+    """Append-only JSON history of benchmark runs"""
+
+    def __init__(self, path: Optional[Path] = None, max_runs: int = MAX_HISTORY_RUNS):
+        self.path = Path(path) if path else DEFAULT_HISTORY_PATH
+        self.max_runs = max_runs
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Load all stored runs, oldest first"""
+        if not self.path.exists():
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("runs", [])
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Benchmark history unreadable, starting fresh", path=str(self.path), error=str(e))
+            return []
+
+    def build_run(self, results: List[BenchmarkResult], label: Optional[str] = None) -> Dict[str, Any]:
+        """Wrap results with the metadata needed for later comparison"""
+        return {
+            "run_id": str(uuid.uuid4())[:8],
+            "label": label,
+            "timestamp": datetime.now().isoformat(),
+            "git_commit": _git_commit(),
+            "corpus_version": CORPUS_VERSION,
+            "corpus_fingerprint": corpus_fingerprint(),
+            "environment": environment_info(),
+            "results": {r.name: r.to_dict() for r in results},
+        }
+
+    def append(self, run: Dict[str, Any]) -> None:
+        """Persist a run atomically, trimming the oldest entries"""
+        runs = self.load()
+        runs.append(run)
+        runs = runs[-self.max_runs:]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def find_baseline(self, run_id: Optional[str] = None,
+                      environment: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Return a run by id, or the latest comparable run for this machine and corpus"""
+        runs = self.load()
+        if run_id:
+            return next((r for r in runs if r.get("run_id") == run_id or r.get("label") == run_id), None)
+
+        key = machine_key(environment or environment_info())
+        fingerprint = corpus_fingerprint()
+        for run in reversed(runs):
+            if run.get("corpus_fingerprint") != fingerprint:
+                continue
+            if machine_key(run.get("environment", {})) == key:
+                return run
+        return None
+
+
+def load_thresholds(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Load regression thresholds, falling back to a 25% median budget"""
+    thresholds_path = Path(path) if path else DEFAULT_THRESHOLDS_PATH
+    defaults = {"default": {"metric": "median_ms", "max_regression_pct": 25.0}, "cases": {}}
+    if not thresholds_path.exists():
+        return defaults
+    with open(thresholds_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    defaults["default"].update(data.get("default", {}))
+    defaults["cases"].update(data.get("cases", {}))
+    return defaults
+
+
+def compare_results(current: List[BenchmarkResult], baseline_run: Optional[Dict[str, Any]],
+                    thresholds: Dict[str, Any]) -> List[Regression]:
+    """Check current results against relative and absolute thresholds"""
+    regressions: List[Regression] = []
+    baseline_results = (baseline_run or {}).get("results", {})
+
+    for result in current:
+        if result.status != "ok":
+            continue
+
+        limits = dict(thresholds.get("default", {}))
+        limits.update(thresholds.get("cases", {}).get(result.name, {}))
+        metric = limits.get("metric", "median_ms")
+        value = getattr(result, metric, result.median_ms)
+
+        # Absolute budget, independent of any baseline
+        budget = limits.get(f"max_{metric}")
+        if budget is not None and value > budget:
+            regressions.append(Regression(
+                name=result.name, metric=metric, baseline=None, current=value,
+                change_pct=None, limit=f"{budget}ms budget"
+            ))
+
+        # Relative budget against the baseline run
+        previous = baseline_results.get(result.name)
+        if not previous or previous.get("status") != "ok":
+            continue
+        base_value = previous.get(metric) or 0.0
+        if base_value <= 0:
+            continue
+        change_pct = (value - base_value) / base_value * 100.0
+        max_pct = limits.get("max_regression_pct")
+        if max_pct is not None and change_pct > max_pct:
+            regressions.append(Regression(
+                name=result.name, metric=metric, baseline=base_value, current=value,
+                change_pct=change_pct, limit=f"+{max_pct}%"
+            ))
+
+    return regressions
+
+
+__all__ = [
+    'Regression',
+    'ResultHistory',
+    'environment_info',
+    'load_thresholds',
+    'compare_results',
+]
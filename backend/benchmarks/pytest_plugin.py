@@ -0,0 +1,112 @@
+"""
+Pytest Plugin for the Benchmark Suite
+
+Benchmarks are skipped unless ``--benchmark`` is passed:
+
+    python -m pytest benchmarks --benchmark
+    python -m pytest benchmarks --benchmark --benchmark-save --benchmark-compare
+
+Loaded automatically by ``benchmarks/conftest.py``; other test trees can use
+``-p benchmarks.pytest_plugin``.
+"""
+
+import asyncio
+from typing import Callable, List
+
+import pytest
+
+from benchmarks.harness import BENCHMARKS, BenchmarkResult, load_cases, run_case
+from benchmarks.history import ResultHistory, compare_results, load_thresholds
+
+_results_key = pytest.StashKey[List[BenchmarkResult]]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "Cognomega micro-benchmarks")
+    group.addoption("--benchmark", action="store_true", default=False,
+                    help="Run micro-benchmarks (skipped otherwise)")
+    group.addoption("--benchmark-save", action="store_true", default=False,
+                    help="Append results to the benchmark history")
+    group.addoption("--benchmark-compare", action="store", nargs="?", const="", default=None,
+                    help="Compare against a run id/label or the latest comparable run")
+    group.addoption("--benchmark-rounds", action="store", type=int, default=None,
+                    help="Override rounds per benchmark")
+    group.addoption("--benchmark-history", action="store", default=None,
+                    help="Path to the JSON result history")
+
+
+def pytest_configure(config):
+    config.stash[_results_key] = []
+    config.addinivalue_line("markers", "benchmark: micro-benchmark of a platform hot path")
+    if config.getoption("--benchmark", default=False):
+        from benchmarks.cli import configure_logging
+        configure_logging("error")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark", default=False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def run_benchmark(request) -> Callable[[str], BenchmarkResult]:
+    """Run a registered benchmark by name and record its result for the session report"""
+    config = request.config
+
+    def _run(name: str) -> BenchmarkResult:
+        case = load_cases()[name]
+        result = asyncio.run(run_case(case, rounds=config.getoption("--benchmark-rounds")))
+        config.stash[_results_key].append(result)
+        if result.status == "skipped":
+            pytest.skip(result.reason or "benchmark skipped")
+        return result
+
+    return _run
+
+
+def benchmark_names() -> List[str]:
+    """Registered benchmark names, for parametrization"""
+    load_cases()
+    return sorted(BENCHMARKS)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash.get(_results_key, [])
+    if not results:
+        return
+
+    history = ResultHistory(config.getoption("--benchmark-history"))
+    run = history.build_run(results, label="pytest")
+    compare = config.getoption("--benchmark-compare")
+    regressions = []
+
+    if compare is not None:
+        baseline = history.find_baseline(run_id=compare or None, environment=run["environment"])
+        if baseline is not None:
+            regressions = compare_results(results, baseline, load_thresholds())
+            if regressions and session.exitstatus == 0:
+                session.exitstatus = 1
+
+    if config.getoption("--benchmark-save"):
+        history.append(run)
+
+    config.stash[_results_key] = results
+    config._benchmark_regressions = regressions
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash.get(_results_key, [])
+    if not results:
+        return
+
+    from benchmarks.cli import format_table
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(format_table(results))
+    for regression in getattr(config, "_benchmark_regressions", []):
+        terminalreporter.write_line(f"REGRESSION {regression.describe()}", red=True)
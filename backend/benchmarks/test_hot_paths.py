@@ -0,0 +1,24 @@
+"""
+Hot path benchmarks collected by pytest (enable with --benchmark)
+"""
+
+import pytest
+
+from benchmarks.pytest_plugin import benchmark_names
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", benchmark_names())
+def test_hot_path(run_benchmark, name):
+    """Each registered hot path runs cleanly and reports a positive median"""
+    result = run_benchmark(name)
+    assert result.status == "ok", result.reason
+    assert result.median_ms > 0
+
+
+@pytest.mark.benchmark
+def test_incremental_reality_check_beats_full(run_benchmark):
+    """A one-function edit re-checks faster incrementally than a full check of the same module"""
+    full = run_benchmark("reality_check.large")
+    incremental = run_benchmark("reality_check.incremental_edit")
+    assert incremental.median_ms < full.median_ms / 2, (incremental.median_ms, full.median_ms)
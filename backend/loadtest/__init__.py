@@ -0,0 +1,29 @@
+"""
+Offline End-to-End Load Testing
+Boots the app against a deterministic LLM stand-in and drives open-loop load
+
+Usage:
+    python -m loadtest stub --port 11434
+    python -m loadtest run --plan plan.json --report report.json
+"""
+
+from loadtest.stub_llm_server import LatencyDistribution, StubLLMServer, StubProfile
+from loadtest.scenarios import DEFAULT_PHASES, DEFAULT_SCENARIOS, Phase, Scenario, load_plan
+from loadtest.load_generator import LoadGenerator, build_report, format_report
+from loadtest.app_runner import AppProcess, mint_token
+
+__all__ = [
+    'LatencyDistribution',
+    'StubLLMServer',
+    'StubProfile',
+    'Phase',
+    'Scenario',
+    'DEFAULT_PHASES',
+    'DEFAULT_SCENARIOS',
+    'load_plan',
+    'LoadGenerator',
+    'build_report',
+    'format_report',
+    'AppProcess',
+    'mint_token',
+]
@@ -0,0 +1,103 @@
+"""
+Application Runner for Load Tests
+Boots the real FastAPI app under uvicorn with every LLM call pointed at the stub server
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiohttp
+import structlog
+
+logger = structlog.get_logger()
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def mint_token(secret: str, user_id: str = "loadtest-user", ttl_s: int = 3600) -> str:
+    """HS256 bearer token accepted by AuthDependencies"""
+    from jose import jwt
+
+    now = int(time.time())
+    payload = {"sub": user_id, "email": "loadtest@example.com", "username": "loadtest",
+               "role": "user", "permissions": [], "iat": now, "exp": now + ttl_s}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+class AppProcess:
+    """uvicorn subprocess serving app.main:app"""
+
+    def __init__(self, stub_url: str, host: str = "127.0.0.1", port: int = 8000, workers: int = 1,
+                 extra_env: Optional[Dict[str, str]] = None, log_path: Optional[str] = None):
+        self.stub_url = stub_url.rstrip("/")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.extra_env = extra_env or {}
+        self.log_path = log_path
+        self._process: Optional[subprocess.Popen] = None
+        self._log_file = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def environment(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            "LOCAL_LLM_BASE_URL": self.stub_url,
+            "OPENAI_BASE_URL": f"{self.stub_url}/v1",
+            "OPENAI_API_KEY": env.get("OPENAI_API_KEY") or "loadtest-stub",
+            "ALLOW_LOCAL_LLM": "true",
+            "ENVIRONMENT": env.get("ENVIRONMENT", "development"),
+            "PYTHONUNBUFFERED": "1",
+        })
+        env.update(self.extra_env)
+        return env
+
+    def start(self) -> None:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", self.host,
+                   "--port", str(self.port), "--workers", str(self.workers), "--no-access-log"]
+        self._log_file = open(self.log_path, "w", encoding="utf-8") if self.log_path else subprocess.DEVNULL
+        self._process = subprocess.Popen(command, cwd=str(BACKEND_DIR), env=self.environment(),
+                                         stdout=self._log_file, stderr=subprocess.STDOUT)
+        logger.info("Application process started", pid=self._process.pid, url=self.base_url)
+
+    async def wait_ready(self, timeout_s: float = 60.0, path: str = "/health") -> None:
+        """Poll the health endpoint until the app answers or the process dies"""
+        deadline = time.monotonic() + timeout_s
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
+            while time.monotonic() < deadline:
+                if self._process is not None and self._process.poll() is not None:
+                    raise RuntimeError(f"Application exited during startup with code {self._process.returncode}")
+                try:
+                    async with session.get(self.base_url + path) as response:
+                        if response.status < 500:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.5)
+        raise TimeoutError(f"Application not ready after {timeout_s}s")
+
+    def stop(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+        if self._log_file not in (None, subprocess.DEVNULL):
+            self._log_file.close()
+        self._log_file = None
+
+
+__all__ = [
+    'AppProcess',
+    'mint_token',
+]
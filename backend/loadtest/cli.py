@@ -0,0 +1,139 @@
+"""
+Load Test Command Line Interface
+
+    python -m loadtest stub [--port 11434] [--profile profile.json]
+    python -m loadtest run [--plan plan.json] [--app-url URL | --app-port 8000]
+                           [--token TOKEN] [--report report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import List, Optional
+
+import aiohttp
+
+from benchmarks.cli import configure_logging
+from loadtest.app_runner import AppProcess, mint_token
+from loadtest.load_generator import LoadGenerator, build_report, format_report
+from loadtest.scenarios import load_plan
+from loadtest.stub_llm_server import StubLLMServer, StubProfile
+
+
+def _read_profile(path: Optional[str]) -> dict:
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def _serve_stub(args: argparse.Namespace) -> int:
+    server = StubLLMServer(StubProfile.from_dict(_read_profile(args.profile)))
+    port = await server.start(args.host, args.port)
+    print(f"Stub LLM server listening on http://{args.host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+    return 0
+
+
+def _cmd_stub(args: argparse.Namespace) -> int:
+    try:
+        return asyncio.run(_serve_stub(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+async def _fetch_stub_stats(stub_url: str) -> Optional[dict]:
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            async with session.get(f"{stub_url}/__stub/stats") as response:
+                return await response.json()
+    except aiohttp.ClientError:
+        return None
+
+
+async def _run_load(args: argparse.Namespace) -> int:
+    plan = load_plan(args.plan)
+    profile = StubProfile.from_dict({**plan["stub_profile"], **_read_profile(args.profile)})
+    stub = StubLLMServer(profile)
+    stub_port = await stub.start(args.stub_host, args.stub_port)
+    stub_url = f"http://{args.stub_host}:{stub_port}"
+
+    app = None
+    base_url = args.app_url
+    try:
+        if base_url is None:
+            app = AppProcess(stub_url, port=args.app_port, workers=args.workers, log_path=args.app_log)
+            app.start()
+            await app.wait_ready(timeout_s=args.startup_timeout)
+            base_url = app.base_url
+
+        token = args.token
+        if token is None and os.environ.get("JWT_SECRET"):
+            token = mint_token(os.environ["JWT_SECRET"])
+
+        generator = LoadGenerator(base_url, plan["scenarios"], plan["phases"], token=token,
+                                  seed=args.seed, max_in_flight=args.max_in_flight)
+        records = await generator.run()
+        report = build_report(records, plan["phases"], generator.dropped, slo_p99_ms=args.slo_p99_ms,
+                              max_error_rate=args.max_error_rate, stub_stats=await _fetch_stub_stats(stub_url))
+    finally:
+        if app is not None:
+            app.stop()
+        await stub.stop()
+
+    print(format_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    return asyncio.run(_run_load(args))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Cognomega offline load tests")
+    parser.add_argument("--log-level", default="warning", help="Log level for the harness")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    stub_parser = sub.add_parser("stub", help="Serve the deterministic LLM stub")
+    stub_parser.add_argument("--host", default="127.0.0.1")
+    stub_parser.add_argument("--port", type=int, default=11434)
+    stub_parser.add_argument("--profile", default=None, help="Stub profile JSON")
+    stub_parser.set_defaults(func=_cmd_stub)
+
+    run_parser = sub.add_parser("run", help="Boot the app against the stub and drive load")
+    run_parser.add_argument("--plan", default=None, help="Plan JSON with scenarios/phases/stub_profile")
+    run_parser.add_argument("--profile", default=None, help="Stub profile JSON (overrides the plan)")
+    run_parser.add_argument("--app-url", default=None, help="Target an already running app instead")
+    run_parser.add_argument("--app-port", type=int, default=8000)
+    run_parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (one replica)")
+    run_parser.add_argument("--app-log", default=None, help="File for the app's stdout/stderr")
+    run_parser.add_argument("--startup-timeout", type=float, default=60.0)
+    run_parser.add_argument("--stub-host", default="127.0.0.1")
+    run_parser.add_argument("--stub-port", type=int, default=0, help="0 picks a free port")
+    run_parser.add_argument("--token", default=None, help="Bearer token (minted from JWT_SECRET if omitted)")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--max-in-flight", type=int, default=2000)
+    run_parser.add_argument("--slo-p99-ms", type=float, default=5000.0)
+    run_parser.add_argument("--max-error-rate", type=float, default=0.01)
+    run_parser.add_argument("--report", default=None, help="Write the JSON report here")
+    run_parser.set_defaults(func=_cmd_run)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Open-Loop Load Generator
+Fires requests on an arrival schedule independent of response times, so queueing
+shows up as latency instead of silently lowering the offered load.
+"""
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import structlog
+
+from loadtest.scenarios import Phase, Scenario, synthetic_wav
+
+logger = structlog.get_logger()
+
+STAGES = ("schedule_lag", "ttfb", "transfer", "service", "end_to_end")
+
+
+@dataclass
+class RequestRecord:
+    """Timings for one request (seconds, monotonic clock)"""
+    scenario: str
+    phase: int
+    scheduled_at: float
+    sent_at: float = 0.0
+    first_byte_at: float = 0.0
+    done_at: float = 0.0
+    status: int = 0
+    ok: bool = False
+    error: Optional[str] = None
+    bytes_received: int = 0
+    server_timing: Dict[str, float] = field(default_factory=dict)
+
+    def stages_ms(self) -> Dict[str, float]:
+        first_byte = self.first_byte_at or self.done_at
+        return {
+            "schedule_lag": (self.sent_at - self.scheduled_at) * 1000.0,
+            "ttfb": (first_byte - self.sent_at) * 1000.0,
+            "transfer": (self.done_at - first_byte) * 1000.0,
+            "service": (self.done_at - self.sent_at) * 1000.0,
+            "end_to_end": (self.done_at - self.scheduled_at) * 1000.0,
+        }
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """Parse a Server-Timing header (``name;dur=12.5, other;dur=3``) into stage durations"""
+    timings: Dict[str, float] = {}
+    if not header:
+        return timings
+    for metric in header.split(","):
+        parts = [p.strip() for p in metric.split(";")]
+        name = parts[0]
+        for part in parts[1:]:
+            if part.startswith("dur="):
+                try:
+                    timings[name] = float(part[4:])
+                except ValueError:
+                    pass
+    return timings
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100.0 * len(ordered)) - 1))]
+
+
+class LoadGenerator:
+    """Drives a scenario mix through a sequence of open-loop phases"""
+
+    def __init__(self, base_url: str, scenarios: List[Scenario], phases: List[Phase],
+                 token: Optional[str] = None, seed: int = 42, max_in_flight: int = 2000,
+                 request_timeout_s: float = 120.0):
+        self.base_url = base_url.rstrip("/")
+        self.scenarios = scenarios
+        self.phases = phases
+        self.token = token
+        self.rng = random.Random(seed)
+        self.max_in_flight = max_in_flight
+        self.request_timeout_s = request_timeout_s
+        self.records: List[RequestRecord] = []
+        self.dropped: Dict[int, int] = {}
+        self._in_flight = 0
+        self._audio = synthetic_wav()
+        self._weights = [s.weight for s in scenarios]
+
+    def _pick_scenario(self) -> Scenario:
+        return self.rng.choices(self.scenarios, weights=self._weights, k=1)[0]
+
+    def _arrival_offsets(self, phase: Phase) -> List[float]:
+        """Precompute arrival times so the schedule is reproducible for a seed"""
+        offsets = []
+        t = 0.0
+        if phase.rate <= 0:
+            return offsets
+        while True:
+            if phase.arrival == "constant":
+                t += 1.0 / phase.rate
+            else:
+                t += self.rng.expovariate(phase.rate)
+            if t >= phase.duration_s:
+                return offsets
+            offsets.append(t)
+
+    def _build_request(self, scenario: Scenario) -> Dict[str, Any]:
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        kwargs: Dict[str, Any] = {"headers": headers}
+        if scenario.upload_field:
+            form = aiohttp.FormData()
+            for key, value in scenario.form_fields.items():
+                form.add_field(key, value)
+            form.add_field(scenario.upload_field, self._audio, filename=scenario.upload_name,
+                           content_type=scenario.upload_content_type)
+            kwargs["data"] = form
+        elif scenario.json_body is not None:
+            kwargs["json"] = scenario.json_body
+        elif scenario.form_fields:
+            kwargs["data"] = dict(scenario.form_fields)
+        return kwargs
+
+    async def _fire(self, session: aiohttp.ClientSession, scenario: Scenario, record: RequestRecord) -> None:
+        self._in_flight += 1
+        record.sent_at = time.perf_counter()
+        try:
+            async with session.request(scenario.method, self.base_url + scenario.path,
+                                       **self._build_request(scenario)) as response:
+                record.status = response.status
+                record.server_timing = parse_server_timing(response.headers.get("Server-Timing"))
+                async for chunk in response.content.iter_any():
+                    if not record.first_byte_at:
+                        record.first_byte_at = time.perf_counter()
+                    record.bytes_received += len(chunk)
+                record.ok = response.status in scenario.expected_status
+        except Exception as e:
+            record.error = type(e).__name__
+        finally:
+            record.done_at = time.perf_counter()
+            self._in_flight -= 1
+
+    async def run(self) -> List[RequestRecord]:
+        """Execute every phase and return all request records"""
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout_s)
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            for index, phase in enumerate(self.phases):
+                logger.info("Load phase starting", phase=index, rate=phase.rate, duration_s=phase.duration_s)
+                tasks = []
+                phase_start = time.perf_counter()
+                for offset in self._arrival_offsets(phase):
+                    scheduled_at = phase_start + offset
+                    delay = scheduled_at - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    if self._in_flight >= self.max_in_flight:
+                        self.dropped[index] = self.dropped.get(index, 0) + 1
+                        continue
+                    scenario = self._pick_scenario()
+                    record = RequestRecord(scenario=scenario.name, phase=index, scheduled_at=scheduled_at)
+                    self.records.append(record)
+                    tasks.append(asyncio.create_task(self._fire(session, scenario, record)))
+                if tasks:
+                    await asyncio.gather(*tasks)
+        return self.records
+
+
+def build_report(records: List[RequestRecord], phases: List[Phase], dropped: Dict[int, int],
+                 slo_p99_ms: float = 5000.0, max_error_rate: float = 0.01,
+                 stub_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Summarize records per phase and scenario with per-stage latency percentiles"""
+
+    def summarize(group: List[RequestRecord], duration_s: float) -> Dict[str, Any]:
+        completed = [r for r in group if r.done_at]
+        ok = [r for r in completed if r.ok]
+        stages: Dict[str, Dict[str, float]] = {}
+        for stage in STAGES:
+            values = [r.stages_ms()[stage] for r in ok]
+            stages[stage] = {
+                "p50": percentile(values, 50),
+                "p90": percentile(values, 90),
+                "p99": percentile(values, 99),
+                "max": max(values) if values else 0.0,
+            }
+        server_stages: Dict[str, Dict[str, float]] = {}
+        for name in sorted({k for r in ok for k in r.server_timing}):
+            values = [r.server_timing[name] for r in ok if name in r.server_timing]
+            server_stages[name] = {"p50": percentile(values, 50), "p99": percentile(values, 99)}
+        statuses: Dict[str, int] = {}
+        for r in completed:
+            key = str(r.status) if r.status else (r.error or "error")
+            statuses[key] = statuses.get(key, 0) + 1
+        return {
+            "requests": len(group),
+            "ok": len(ok),
+            "error_rate": 1 - len(ok) / len(completed) if completed else 0.0,
+            "throughput_rps": len(ok) / duration_s if duration_s > 0 else 0.0,
+            "statuses": statuses,
+            "stages_ms": stages,
+            "server_timing_ms": server_stages,
+        }
+
+    report: Dict[str, Any] = {"phases": [], "slo_p99_ms": slo_p99_ms, "max_error_rate": max_error_rate}
+    sustainable_rate = 0.0
+    for index, phase in enumerate(phases):
+        phase_records = [r for r in records if r.phase == index]
+        # Requests still draining after the arrival window count against the phase's wall time
+        wall_s = phase.duration_s
+        if phase_records:
+            wall_s = max(wall_s, max(r.done_at for r in phase_records) - min(r.scheduled_at for r in phase_records))
+        summary = summarize(phase_records, wall_s)
+        summary["offered_rate"] = phase.rate
+        summary["dropped"] = dropped.get(index, 0)
+        summary["scenarios"] = {
+            name: summarize([r for r in phase_records if r.scenario == name], wall_s)
+            for name in sorted({r.scenario for r in phase_records})
+        }
+        summary["meets_slo"] = (
+            summary["stages_ms"]["end_to_end"]["p99"] <= slo_p99_ms
+            and summary["error_rate"] <= max_error_rate
+            and summary["dropped"] == 0
+        )
+        if summary["meets_slo"]:
+            sustainable_rate = max(sustainable_rate, summary["throughput_rps"])
+        report["phases"].append(summary)
+
+    report["capacity_rps_per_replica"] = sustainable_rate
+    if stub_stats is not None:
+        report["llm_stub"] = stub_stats
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human readable summary of a load report"""
+    lines = []
+    for index, phase in enumerate(report["phases"]):
+        lines.append(
+            f"phase {index}: offered {phase['offered_rate']:.1f} rps, achieved {phase['throughput_rps']:.2f} rps, "
+            f"errors {phase['error_rate']:.1%}, dropped {phase['dropped']}, "
+            f"{'meets' if phase['meets_slo'] else 'misses'} SLO"
+        )
+        header = f"  {'scenario':<28} {'n':>6} " + " ".join(f"{s + ' p50/p99':>22}" for s in STAGES)
+        lines.append(header)
+        for name, s in phase["scenarios"].items():
+            cells = " ".join(
+                f"{s['stages_ms'][stage]['p50']:>10.1f}/{s['stages_ms'][stage]['p99']:<11.1f}" for stage in STAGES
+            )
+            lines.append(f"  {name:<28} {s['requests']:>6} {cells}")
+    lines.append(f"capacity per replica at p99<={report['slo_p99_ms']:.0f}ms: "
+                 f"{report['capacity_rps_per_replica']:.2f} rps")
+    if "llm_stub" in report:
+        stub = report["llm_stub"]
+        lines.append(f"llm stub: {stub['requests']} requests, service p50 {stub['service_ms']['p50']:.1f}ms "
+                     f"p99 {stub['service_ms']['p99']:.1f}ms, queue p99 {stub['queue_ms']['p99']:.1f}ms")
+    return "\n".join(lines)
+
+
+__all__ = [
+    'STAGES',
+    'RequestRecord',
+    'LoadGenerator',
+    'parse_server_timing',
+    'percentile',
+    'build_report',
+    'format_report',
+]
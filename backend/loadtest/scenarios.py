@@ -0,0 +1,140 @@
+"""
+Load Test Scenarios
+Request templates and the default end-to-end scenario mix
+"""
+
+import io
+import json
+import math
+import struct
+import wave
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Scenario:
+    """One request template in the mix"""
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    json_body: Optional[Dict[str, Any]] = None
+    form_fields: Dict[str, str] = field(default_factory=dict)
+    upload_field: Optional[str] = None
+    upload_name: str = "speech.wav"
+    upload_content_type: str = "audio/wav"
+    stream: bool = False
+    expected_status: List[int] = field(default_factory=lambda: [200])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Scenario":
+        return cls(**data)
+
+
+@dataclass
+class Phase:
+    """Open-loop arrival phase: constant or Poisson arrivals at ``rate`` req/s"""
+    rate: float
+    duration_s: float
+    arrival: str = "poisson"  # poisson | constant
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Phase":
+        return cls(**data)
+
+
+def synthetic_wav(duration_s: float = 2.0, sample_rate: int = 16000) -> bytes:
+    """Deterministic 16-bit mono WAV: a 220 Hz tone with a pause in the middle"""
+    frames = bytearray()
+    total = int(duration_s * sample_rate)
+    for i in range(total):
+        silent = total * 0.45 < i < total * 0.55
+        value = 0 if silent else int(8000 * math.sin(2 * math.pi * 220 * i / sample_rate))
+        frames += struct.pack("<h", value)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+DEFAULT_SCENARIOS: List[Scenario] = [
+    Scenario(
+        name="voice_enhanced_generate",
+        method="POST",
+        path="/api/v0/voice/enhanced/generate-app",
+        weight=1.0,
+        form_fields={"language": "en", "complexity_level": "medium"},
+        upload_field="audio_file",
+    ),
+    Scenario(
+        name="voice_transcribe",
+        method="POST",
+        path="/api/v0/voice/transcribe",
+        weight=2.0,
+        form_fields={"language": "en"},
+        upload_field="audio_file",
+    ),
+    Scenario(
+        name="orchestration_unified",
+        method="POST",
+        path="/api/v0/orchestration/unified/orchestrate",
+        weight=2.0,
+        json_body={"id": "loadtest", "type": "code_generation",
+                   "description": "Create a REST endpoint that lists users with pagination"},
+    ),
+    Scenario(
+        name="orchestration_swarm",
+        method="POST",
+        path="/api/v0/orchestration/swarm/coordinate",
+        weight=1.0,
+        json_body={"task": "Review this function for bugs", "agents": 3},
+    ),
+    Scenario(
+        name="code_completion_stream",
+        method="POST",
+        path="/api/v0/code/completions/stream",
+        weight=2.0,
+        json_body={"file_path": "service.py", "language": "python",
+                   "content": "def list_users(page: int, size: int):\n    ", "cursor_line": 1, "cursor_column": 4},
+        stream=True,
+    ),
+    Scenario(
+        name="health",
+        method="GET",
+        path="/health",
+        weight=0.5,
+    ),
+]
+
+DEFAULT_PHASES: List[Phase] = [
+    Phase(rate=2.0, duration_s=30.0),
+    Phase(rate=5.0, duration_s=60.0),
+    Phase(rate=10.0, duration_s=60.0),
+]
+
+
+def load_plan(path: Optional[str]) -> Dict[str, Any]:
+    """Load a JSON plan with optional "scenarios", "phases" and "stub_profile" keys"""
+    if not path:
+        return {"scenarios": DEFAULT_SCENARIOS, "phases": DEFAULT_PHASES, "stub_profile": {}}
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {
+        "scenarios": [Scenario.from_dict(s) for s in data.get("scenarios", [])] or DEFAULT_SCENARIOS,
+        "phases": [Phase.from_dict(p) for p in data.get("phases", [])] or DEFAULT_PHASES,
+        "stub_profile": data.get("stub_profile", {}),
+    }
+
+
+__all__ = [
+    'Scenario',
+    'Phase',
+    'DEFAULT_SCENARIOS',
+    'DEFAULT_PHASES',
+    'synthetic_wav',
+    'load_plan',
+]
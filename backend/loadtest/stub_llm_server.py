@@ -0,0 +1,445 @@
+"""
+Deterministic Local LLM Stand-In
+Ollama- and OpenAI-compatible stub server with configurable latency and token rates
+
+Every response is derived from a hash of (seed, model, prompt), so the same request
+always yields the same text, token count and latency. Streaming follows each API's
+wire format: NDJSON for Ollama, SSE for OpenAI.
+
+    python -m loadtest stub --port 11434 --ttft-ms 250 --tokens-per-second 40
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import structlog
+from aiohttp import web
+
+logger = structlog.get_logger()
+
+_VOCABULARY = (
+    "def class return self await async import from for in if else try except "
+    "with as yield lambda None True False value result data items key config "
+    "user request response client cache index token model service handler "
+    "( ) : , . = == + - [ ] { } \n"
+).split(" ")
+
+
+@dataclass
+class LatencyDistribution:
+    """Latency sampler (milliseconds)
+
+    kind: constant | uniform | exponential | lognormal
+    For lognormal, ``median_ms`` is the median and ``sigma`` the log-space spread.
+    """
+    kind: str = "lognormal"
+    median_ms: float = 200.0
+    sigma: float = 0.35
+    min_ms: float = 0.0
+    max_ms: float = 30000.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant":
+            value = self.median_ms
+        elif self.kind == "uniform":
+            value = rng.uniform(self.median_ms * (1 - self.sigma), self.median_ms * (1 + self.sigma))
+        elif self.kind == "exponential":
+            value = rng.expovariate(math.log(2) / self.median_ms) if self.median_ms > 0 else 0.0
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(max(self.median_ms, 1e-3)), self.sigma)
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.kind}")
+        return min(self.max_ms, max(self.min_ms, value))
+
+
+@dataclass
+class StubProfile:
+    """Behaviour of the stub server"""
+    seed: int = 1234
+    time_to_first_token: LatencyDistribution = field(default_factory=LatencyDistribution)
+    tokens_per_second: float = 40.0
+    token_rate_jitter: float = 0.1
+    min_output_tokens: int = 16
+    max_output_tokens: int = 256
+    embedding_dimension: int = 384
+    embedding_latency: LatencyDistribution = field(
+        default_factory=lambda: LatencyDistribution(kind="lognormal", median_ms=15.0, sigma=0.2)
+    )
+    error_rate: float = 0.0
+    error_status: int = 503
+    max_concurrency: int = 0  # 0 = unlimited; otherwise requests queue like a single-GPU server
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StubProfile":
+        data = dict(data)
+        for key in ("time_to_first_token", "embedding_latency"):
+            if isinstance(data.get(key), dict):
+                data[key] = LatencyDistribution(**data[key])
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class GenerationPlan:
+    """Deterministic plan for one generation request"""
+    tokens: List[str]
+    ttft_ms: float
+    token_interval_ms: float
+    fail: bool
+
+
+class StubStats:
+    """Rolling request statistics exposed at /__stub/stats"""
+
+    def __init__(self, window: int = 10000):
+        self.started_at = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.tokens_generated = 0
+        self.queue_ms: Deque[float] = deque(maxlen=window)
+        self.service_ms: Deque[float] = deque(maxlen=window)
+        self.by_endpoint: Dict[str, int] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        def pct(values: Deque[float], p: float) -> float:
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(math.ceil(p / 100 * len(ordered))) - 1)]
+
+        uptime = max(time.time() - self.started_at, 1e-9)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight,
+            "tokens_generated": self.tokens_generated,
+            "tokens_per_second": self.tokens_generated / uptime,
+            "by_endpoint": dict(self.by_endpoint),
+            "queue_ms": {"p50": pct(self.queue_ms, 50), "p95": pct(self.queue_ms, 95), "p99": pct(self.queue_ms, 99)},
+            "service_ms": {"p50": pct(self.service_ms, 50), "p95": pct(self.service_ms, 95), "p99": pct(self.service_ms, 99)},
+        }
+
+
+class StubLLMServer:
+    """aiohttp application emulating Ollama and OpenAI-compatible endpoints"""
+
+    def __init__(self, profile: Optional[StubProfile] = None):
+        self.profile = profile or StubProfile()
+        self.stats = StubStats()
+        self._semaphore = (asyncio.Semaphore(self.profile.max_concurrency)
+                           if self.profile.max_concurrency > 0 else None)
+        self._runner: Optional[web.AppRunner] = None
+        self.app = self._build_app()
+
+    # ------------------------------------------------------------------
+    # Deterministic generation
+    # ------------------------------------------------------------------
+
+    def _rng(self, *parts: str) -> random.Random:
+        digest = hashlib.sha256("\x1f".join((str(self.profile.seed),) + parts).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def plan_generation(self, model: str, prompt: str, max_tokens: Optional[int]) -> GenerationPlan:
+        """Derive output tokens and timing from the request content"""
+        rng = self._rng("generate", model, prompt)
+        limit = self.profile.max_output_tokens
+        if max_tokens:
+            limit = min(limit, int(max_tokens))
+        count = rng.randint(min(self.profile.min_output_tokens, limit), max(limit, 1))
+        tokens = [rng.choice(_VOCABULARY) for _ in range(count)]
+
+        rate = self.profile.tokens_per_second * (1 + rng.uniform(-1, 1) * self.profile.token_rate_jitter)
+        interval_ms = 1000.0 / rate if rate > 0 else 0.0
+        fail = rng.random() < self.profile.error_rate
+        return GenerationPlan(
+            tokens=tokens,
+            ttft_ms=self.profile.time_to_first_token.sample(rng),
+            token_interval_ms=interval_ms,
+            fail=fail,
+        )
+
+    def embed(self, model: str, text: str) -> List[float]:
+        """Deterministic unit-length embedding for text"""
+        rng = self._rng("embed", model, text)
+        vector = [rng.gauss(0.0, 1.0) for _ in range(self.profile.embedding_dimension)]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    async def _stream_tokens(self, plan: GenerationPlan) -> AsyncIterator[Tuple[int, str]]:
+        """Yield tokens paced by the plan's time-to-first-token and token rate"""
+        await asyncio.sleep(plan.ttft_ms / 1000.0)
+        start = time.perf_counter()
+        for index, token in enumerate(plan.tokens):
+            if index:
+                # Pace against the schedule rather than sleeping a fixed interval,
+                # so event-loop jitter does not accumulate
+                due = start + index * plan.token_interval_ms / 1000.0
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self.stats.tokens_generated += 1
+            yield index, token
+
+    # ------------------------------------------------------------------
+    # Request accounting
+    # ------------------------------------------------------------------
+
+    async def _admit(self, endpoint: str) -> float:
+        self.stats.requests += 1
+        self.stats.by_endpoint[endpoint] = self.stats.by_endpoint.get(endpoint, 0) + 1
+        queued_at = time.perf_counter()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        self.stats.in_flight += 1
+        self.stats.queue_ms.append((time.perf_counter() - queued_at) * 1000.0)
+        return time.perf_counter()
+
+    def _release(self, started_at: float) -> None:
+        self.stats.in_flight -= 1
+        self.stats.service_ms.append((time.perf_counter() - started_at) * 1000.0)
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def _error_response(self) -> web.Response:
+        self.stats.errors += 1
+        return web.json_response({"error": "stub injected failure"}, status=self.profile.error_status)
+
+    # ------------------------------------------------------------------
+    # Ollama API
+    # ------------------------------------------------------------------
+
+    async def ollama_generate(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        return await self._ollama_generation(
+            request, "ollama.generate", body.get("model", "llama2"), body.get("prompt", ""),
+            body.get("options", {}).get("num_predict"), body.get("stream", True), chat=False
+        )
+
+    async def ollama_chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        prompt = "\n".join(f"{m.get('role')}: {m.get('content')}" for m in body.get("messages", []))
+        return await self._ollama_generation(
+            request, "ollama.chat", body.get("model", "llama2"), prompt,
+            body.get("options", {}).get("num_predict"), body.get("stream", True), chat=True
+        )
+
+    async def _ollama_generation(self, request: web.Request, endpoint: str, model: str, prompt: str,
+                                 max_tokens: Optional[int], stream: bool, chat: bool) -> web.StreamResponse:
+        started = await self._admit(endpoint)
+        try:
+            plan = self.plan_generation(model, prompt, max_tokens)
+            if plan.fail:
+                await asyncio.sleep(plan.ttft_ms / 1000.0)
+                return self._error_response()
+
+            def chunk(text: str, done: bool) -> Dict[str, Any]:
+                payload: Dict[str, Any] = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"), "done": done}
+                if chat:
+                    payload["message"] = {"role": "assistant", "content": text}
+                else:
+                    payload["response"] = text
+                if done:
+                    payload["eval_count"] = len(plan.tokens)
+                    payload["prompt_eval_count"] = len(prompt.split())
+                return payload
+
+            if not stream:
+                text = "".join([t async for _, t in self._stream_tokens(plan)])
+                return web.json_response(chunk(text, True))
+
+            response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await response.prepare(request)
+            try:
+                async for _, token in self._stream_tokens(plan):
+                    await response.write((json.dumps(chunk(token, False)) + "\n").encode())
+                await response.write((json.dumps(chunk("", True)) + "\n").encode())
+                await response.write_eof()
+            except ConnectionResetError:
+                # Client went away mid-stream; stop generating like a real server would
+                self.stats.cancelled += 1
+            return response
+        finally:
+            self._release(started)
+
+    async def ollama_embeddings(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        started = await self._admit("ollama.embeddings")
+        try:
+            model = body.get("model", "nomic-embed-text")
+            inputs = body.get("input", body.get("prompt", ""))
+            batch = inputs if isinstance(inputs, list) else [inputs]
+            await asyncio.sleep(self.profile.embedding_latency.sample(self._rng("embed-latency", model, *batch)) / 1000.0)
+            vectors = [self.embed(model, text) for text in batch]
+            if request.path.endswith("/api/embed"):
+                return web.json_response({"model": model, "embeddings": vectors})
+            return web.json_response({"embedding": vectors[0]})
+        finally:
+            self._release(started)
+
+    async def ollama_tags(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": [
+            {"name": "llama2", "size": 3826793677, "modified_at": "2024-01-01T00:00:00Z"},
+            {"name": "codellama", "size": 3825910662, "modified_at": "2024-01-01T00:00:00Z"},
+        ]})
+
+    # ------------------------------------------------------------------
+    # OpenAI-compatible API
+    # ------------------------------------------------------------------
+
+    async def openai_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        prompt = body.get("prompt", "")
+        if isinstance(prompt, list):
+            prompt = "\n".join(prompt)
+        return await self._openai_generation(request, "openai.completions", body, prompt, chat=False)
+
+    async def openai_chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        prompt = "\n".join(f"{m.get('role')}: {m.get('content')}" for m in body.get("messages", []))
+        return await self._openai_generation(request, "openai.chat", body, prompt, chat=True)
+
+    async def _openai_generation(self, request: web.Request, endpoint: str, body: Dict[str, Any],
+                                 prompt: str, chat: bool) -> web.StreamResponse:
+        started = await self._admit(endpoint)
+        try:
+            model = body.get("model", "stub-model")
+            plan = self.plan_generation(model, prompt, body.get("max_tokens"))
+            if plan.fail:
+                await asyncio.sleep(plan.ttft_ms / 1000.0)
+                return self._error_response()
+
+            response_id = "cmpl-" + hashlib.sha1(f"{model}{prompt}".encode()).hexdigest()[:24]
+            object_type = "chat.completion" if chat else "text_completion"
+
+            def choice(text: str, finish: Optional[str], streaming: bool) -> Dict[str, Any]:
+                if chat:
+                    key = "delta" if streaming else "message"
+                    return {"index": 0, key: {"role": "assistant", "content": text}, "finish_reason": finish}
+                return {"index": 0, "text": text, "finish_reason": finish}
+
+            if not body.get("stream", False):
+                text = "".join([t async for _, t in self._stream_tokens(plan)])
+                return web.json_response({
+                    "id": response_id,
+                    "object": object_type,
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [choice(text, "stop", False)],
+                    "usage": {
+                        "prompt_tokens": len(prompt.split()),
+                        "completion_tokens": len(plan.tokens),
+                        "total_tokens": len(prompt.split()) + len(plan.tokens),
+                    },
+                })
+
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+            await response.prepare(request)
+            chunk_type = f"{object_type}.chunk" if chat else object_type
+            try:
+                async for _, token in self._stream_tokens(plan):
+                    event = {"id": response_id, "object": chunk_type, "model": model,
+                             "choices": [choice(token, None, True)]}
+                    await response.write(f"data: {json.dumps(event)}\n\n".encode())
+                final = {"id": response_id, "object": chunk_type, "model": model,
+                         "choices": [choice("", "stop", True)]}
+                await response.write(f"data: {json.dumps(final)}\n\n".encode())
+                await response.write(b"data: [DONE]\n\n")
+                await response.write_eof()
+            except ConnectionResetError:
+                self.stats.cancelled += 1
+            return response
+        finally:
+            self._release(started)
+
+    async def openai_embeddings(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        started = await self._admit("openai.embeddings")
+        try:
+            model = body.get("model", "stub-embedding")
+            inputs = body.get("input", "")
+            batch = inputs if isinstance(inputs, list) else [inputs]
+            await asyncio.sleep(self.profile.embedding_latency.sample(self._rng("embed-latency", model, *batch)) / 1000.0)
+            return web.json_response({
+                "object": "list",
+                "model": model,
+                "data": [{"object": "embedding", "index": i, "embedding": self.embed(model, text)}
+                         for i, text in enumerate(batch)],
+            })
+        finally:
+            self._release(started)
+
+    async def openai_models(self, request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "data": [
+            {"id": "stub-model", "object": "model", "created": 0, "owned_by": "stub"},
+        ]})
+
+    # ------------------------------------------------------------------
+    # Control endpoints
+    # ------------------------------------------------------------------
+
+    async def stub_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats.snapshot())
+
+    async def stub_reset(self, request: web.Request) -> web.Response:
+        self.stats = StubStats()
+        return web.json_response({"reset": True})
+
+    async def stub_profile(self, request: web.Request) -> web.Response:
+        if request.method == "POST":
+            self.profile = StubProfile.from_dict({**self.profile.to_dict(), **(await request.json())})
+            self._semaphore = (asyncio.Semaphore(self.profile.max_concurrency)
+                               if self.profile.max_concurrency > 0 else None)
+        return web.json_response(self.profile.to_dict())
+
+    def _build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/generate", self.ollama_generate)
+        app.router.add_post("/api/chat", self.ollama_chat)
+        app.router.add_post("/api/embeddings", self.ollama_embeddings)
+        app.router.add_post("/api/embed", self.ollama_embeddings)
+        app.router.add_get("/api/tags", self.ollama_tags)
+        app.router.add_post("/v1/completions", self.openai_completions)
+        app.router.add_post("/v1/chat/completions", self.openai_chat_completions)
+        app.router.add_post("/v1/embeddings", self.openai_embeddings)
+        app.router.add_get("/v1/models", self.openai_models)
+        app.router.add_get("/__stub/stats", self.stub_stats)
+        app.router.add_post("/__stub/reset", self.stub_reset)
+        app.router.add_get("/__stub/profile", self.stub_profile)
+        app.router.add_post("/__stub/profile", self.stub_profile)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 11434) -> int:
+        """Start serving in the current event loop; returns the bound port"""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1] if self._runner.addresses else port
+        logger.info("Stub LLM server started", host=host, port=bound_port)
+        return bound_port
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+__all__ = [
+    'LatencyDistribution',
+    'StubProfile',
+    'GenerationPlan',
+    'StubStats',
+    'StubLLMServer',
+]
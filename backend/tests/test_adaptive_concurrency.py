@@ -0,0 +1,100 @@
+"""
+Tests for adaptive concurrency limits and load shedding in hierarchical orchestration
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.adaptive_concurrency import AdaptiveConcurrencyLimiter, OverloadedError
+from app.services.hierarchical_orchestration_manager import (
+    HierarchicalOrchestrationManager,
+    LoadBalancingConfig,
+    OrchestrationLevel,
+    OrchestrationStrategy,
+    OrchestrationTask,
+    TaskComplexity,
+)
+
+
+def test_aimd_follows_latency():
+    limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=4, max_limit=8, latency_floor=0.01)
+    for _ in range(8):
+        limiter.record(0.02)
+    assert limiter.capacity == 5 and limiter.stats["increases"] == 8
+
+    # Latency triples: one multiplicative cut per round trip, not one per slow call
+    limiter.record(0.1, started=time.monotonic())
+    cut_at = time.monotonic()
+    limiter.record(0.1, started=cut_at - 1)
+    assert limiter.capacity == 4 and limiter.stats["decreases"] == 1
+    limiter.record(0.1, started=time.monotonic())
+    assert limiter.capacity == 3
+
+
+@pytest.mark.asyncio
+async def test_priority_queue_eviction_and_timeout():
+    limiter = AdaptiveConcurrencyLimiter("svc", initial_limit=1, max_queue=2, queue_timeout=0.05)
+    await limiter.acquire()
+    admitted = []
+
+    async def wait(priority):
+        await limiter.acquire(priority)
+        admitted.append(priority)
+
+    low, mid = asyncio.create_task(wait(2)), asyncio.create_task(wait(5))
+    await asyncio.sleep(0)
+    high = asyncio.create_task(wait(9))
+    await asyncio.sleep(0)
+    with pytest.raises(OverloadedError, match="displaced"):
+        await low
+    assert limiter.would_shed(5) and not limiter.would_shed(6)
+    with pytest.raises(OverloadedError, match="queue is full"):
+        await limiter.acquire(1)
+
+    limiter.release()
+    await high
+    limiter.release()
+    await mid
+    assert admitted == [9, 5]
+    with pytest.raises(OverloadedError, match="timed out"):
+        await limiter.acquire()
+    assert limiter.get_stats()["queued"] == 0 and limiter.stats["rejected"] == 1
+
+
+class SlowOperations:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def orchestrate_task(self, task):
+        self.calls += 1
+        await self.release.wait()
+        return {"done": task.task_id}
+
+
+@pytest.mark.asyncio
+async def test_manager_sheds_and_degrades_fan_out():
+    manager = HierarchicalOrchestrationManager(LoadBalancingConfig(initial_concurrency=1, max_queued_tasks=1))
+    operations = SlowOperations()
+    manager.orchestrators[OrchestrationLevel.OPERATIONS] = operations
+
+    def simple(priority):
+        return OrchestrationTask(task_type="cleanup", complexity=TaskComplexity.SIMPLE, priority=priority)
+
+    running = asyncio.create_task(manager.route_task(simple(5)))
+    queued = asyncio.create_task(manager.route_task(simple(4)))
+    await asyncio.sleep(0.01)
+    assert manager._is_saturated()
+    assert manager._degrade_when_saturated(OrchestrationStrategy.CONSENSUS_VALIDATION) == \
+        OrchestrationStrategy.SINGLE_ORCHESTRATOR
+    with pytest.raises(OverloadedError):
+        await manager.submit_task("cleanup", {}, TaskComplexity.SIMPLE, priority=3)
+
+    operations.release.set()
+    results = await asyncio.gather(running, queued)
+    assert all(result.success for result in results) and operations.calls == 2
+    status = await manager.get_orchestrator_status()
+    assert status["hierarchical_manager"]["shed"] == 1 and status["hierarchical_manager"]["degraded"] == 1
+    assert status["orchestrators"]["ai_component"]["concurrency"]["in_flight"] == 0
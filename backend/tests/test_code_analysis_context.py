@@ -0,0 +1,141 @@
+"""
+Tests for the shared parse-once analysis context and multi-visitor
+"""
+
+import ast
+
+import pytest
+
+from app.core.code_analysis_context import (
+    AnalysisContextCache,
+    AnalysisVisitor,
+    CodeAnalysisContext,
+    MultiVisitor,
+    get_analysis_context,
+    run_visitors,
+)
+from app.core.code_quality_analyzer import CodeQualityAnalyzer
+from app.services.smart_coding_ai_advanced_analysis import ComplexityAnalyzer
+
+SAMPLE = '''
+import os
+from typing import List
+
+
+class Repo:
+    def load(self, path):
+        if path:
+            for line in open(path):
+                if line.strip():
+                    while False:
+                        pass
+        return os.getcwd()
+
+
+async def fetch(items: List[int]) -> int:
+    try:
+        return sum(items)
+    except ValueError:
+        return 0
+'''
+
+
+def test_buckets_match_ast_walk_order():
+    context = CodeAnalysisContext(SAMPLE)
+    walked = list(ast.walk(ast.parse(SAMPLE)))
+
+    def names(nodes):
+        return [(type(n).__name__, getattr(n, "lineno", None)) for n in nodes]
+
+    expected = [n for n in walked if isinstance(n, (ast.If, ast.For, ast.While))]
+    assert names(context.of_type(ast.If, ast.For, ast.While)) == names(expected)
+    assert [f.name for f in context.functions] == ["fetch", "load"]
+    assert len(context.imports) == 2
+    assert len(context.loops) == 2
+    # Abstract bases resolve to their concrete node types
+    assert len(context.of_type(ast.stmt)) == len([n for n in walked if isinstance(n, ast.stmt)])
+
+
+def test_syntax_error_is_kept_and_reraised():
+    context = CodeAnalysisContext("def broken(:\n")
+    assert not context.is_valid
+    with pytest.raises(SyntaxError):
+        context.require_tree()
+
+
+def test_cache_hits_and_lru_eviction():
+    cache = AnalysisContextCache(max_entries=2)
+    first = cache.get("a = 1")
+    assert cache.get("a = 1") is first
+    cache.get("b = 2")
+    cache.get("c = 3")
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get("a = 1") is not first
+    assert cache.hits == 1
+
+
+def test_line_index_and_tokens():
+    context = CodeAnalysisContext("x = 1\n# note\ny = 2\n")
+    assert context.position(context.code.index("y")) == (3, 0)
+    assert context.line(2) == "# note"
+    assert context.comment_lines == 1
+
+
+class _LoopDepth(AnalysisVisitor):
+    def __init__(self):
+        self.max_depth = 0
+
+    def visit_For(self, node, state):
+        self.max_depth = max(self.max_depth, state.count_enclosing(ast.For, ast.While) + 1)
+
+    def visit_While(self, node, state):
+        self.visit_For(node, state)
+
+    def result(self):
+        return self.max_depth
+
+
+class _EnterLeave(AnalysisVisitor):
+    def __init__(self):
+        self.events = []
+
+    def visit_FunctionDef(self, node, state):
+        self.events.append(("enter", node.name, state.enclosing(ast.ClassDef).name))
+
+    def leave_FunctionDef(self, node, state):
+        self.events.append(("leave", node.name))
+
+    def result(self):
+        return self.events
+
+
+def test_multi_visitor_runs_all_visitors_in_one_pass():
+    depth, events = run_visitors(SAMPLE, _LoopDepth(), _EnterLeave())
+    assert depth == 2
+    assert events == [("enter", "load", "Repo"), ("leave", "load")]
+
+
+def test_multi_visitor_callbacks_for_abstract_types():
+    seen = []
+    MultiVisitor().on(ast.stmt, enter=lambda node, state: seen.append(type(node).__name__)).run(
+        get_analysis_context("if x:\n    y = 1\n")
+    )
+    assert seen == ["If", "Assign"]
+
+
+@pytest.mark.asyncio
+async def test_complexity_metrics_from_shared_context():
+    result = await ComplexityAnalyzer().analyze_complexity(SAMPLE, "python")
+    metrics = result["metrics"]
+    # if, for, if, while, except handler
+    assert metrics["cyclomatic_complexity"] == 6
+    assert metrics["nesting_depth"] == 4
+    assert metrics["function_length"] == {"load": 6}
+    assert metrics["class_complexity"] == {"Repo": 1}
+
+
+def test_quality_analyzer_nested_condition_count():
+    analyzer = CodeQualityAnalyzer.__new__(CodeQualityAnalyzer)
+    context = get_analysis_context("if a:\n    if b:\n        if c:\n            pass\n")
+    # Pairs (outer, inner): (1,2), (1,3), (2,3)
+    assert analyzer._count_nested_conditions(context) == 3
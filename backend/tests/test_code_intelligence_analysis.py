@@ -0,0 +1,128 @@
+"""
+Tests for the analyzer-backed code-intelligence endpoints and batch analysis
+"""
+
+import io
+import json
+import tarfile
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.streaming import ndjson_response
+from app.services.code_intelligence_analysis import (
+    CodeAnalysisError,
+    CodeAnalysisService,
+    SourceFile,
+    iter_archive_files,
+)
+
+NESTED = '''
+def process(items, lower_threshold, upper_threshold, retry_count, timeout_seconds, batch_size, verbose_output, dry_run):
+    result = []
+    for item in items:
+        if item:
+            for sub in item:
+                if sub > 1000:
+                    while sub:
+                        result = result + [sub]
+                        sub -= 1
+    return result
+'''
+
+
+@pytest.mark.asyncio
+async def test_analyze_reports_real_findings_and_caches():
+    service = CodeAnalysisService(max_workers=1)
+    results = await service.analyze(NESTED, "python")
+    assert results["complexity"]["metrics"]["nesting_depth"] >= 4
+    assert 0 < results["complexity"]["metrics"]["maintainability_index"] <= 100
+    assert any(s["type"] == "long_parameter_list" for s in results["smells"]["smells"])
+    assert {s["type"] for s in results["refactor"]["suggestions"]} >= {
+        "reduce_nesting", "introduce_parameter_object", "extract_constant", "optimize_nested_loops"}
+
+    assert await service.analyze(NESTED, "python") is results
+    assert service.stats == {"analyzed": 1, "cache_hits": 1, "batches": 0, "errors": 0}
+
+    with pytest.raises(CodeAnalysisError):
+        await service.analyze(NESTED, "python", ["style"])
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_results_from_workers():
+    service = CodeAnalysisService(max_workers=2)
+    files = [
+        SourceFile("a.py", NESTED),
+        SourceFile("vendored/a_copy.py", NESTED),
+        SourceFile("b.py", "def ok():\n    return 1\n"),
+        SourceFile("notes.txt", "not code"),
+    ]
+    try:
+        records = [record async for record in service.analyze_batch(files, ["complexity"])]
+        again = [record async for record in service.analyze_batch(files[:1], ["complexity"])]
+    finally:
+        service.shutdown()
+
+    by_path = {r["path"]: r for r in records if r["type"] == "file"}
+    assert by_path["notes.txt"]["status"] == "skipped"
+    assert by_path["a.py"]["results"] == by_path["vendored/a_copy.py"]["results"]
+    assert set(by_path["b.py"]["results"]) == {"complexity"}
+    assert records[-1] == {**records[-1], "type": "summary", "files": 4, "ok": 3, "skipped": 1}
+    # Identical content was analyzed once; the second batch is served from cache
+    assert service.stats["analyzed"] == 2
+    assert again[0]["cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_batch_reads_lazy_sources_off_the_event_loop():
+    service = CodeAnalysisService(max_workers=1)
+    readers = []
+
+    def lazy_files():
+        for name in ("a.py", "b.py"):
+            readers.append(threading.current_thread())
+            yield SourceFile(name, "x = 1\n")
+
+    try:
+        records = [record async for record in service.analyze_batch(lazy_files(), ["complexity"])]
+    finally:
+        service.shutdown()
+    assert records[-1]["ok"] == 2
+    assert readers and threading.main_thread() not in readers
+
+
+def test_archive_skips_vendored_and_binary_files():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in [("./src/app.py", b"x = 1\n"), ("node_modules/lib.js", b"var x;"),
+                           ("./.git/hooks/pre-commit.py", b"x = 2\n"), (".venv/lib/site.py", b"x = 3\n"),
+                           ("src/blob.py", b"\xff\xfe"), ("README.md", b"# readme")]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    files = list(iter_archive_files(buffer.getvalue(), max_file_bytes=1000))
+    assert [(f.path, f.skip_reason) for f in files] == [("src/app.py", None), ("src/blob.py", "not UTF-8 text")]
+    with pytest.raises(CodeAnalysisError):
+        list(iter_archive_files(b"plain text", max_file_bytes=1000))
+
+
+def test_batch_streams_as_ndjson():
+    service = CodeAnalysisService(max_workers=1)
+    app = FastAPI()
+
+    @app.post("/batch")
+    async def batch():
+        return ndjson_response(service.analyze_batch(
+            [SourceFile("a.py", NESTED), SourceFile("b.js", "var x = 1;")], ["smells"]))
+
+    try:
+        response = TestClient(app).post("/batch")
+    finally:
+        service.shutdown()
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["path"] for line in lines[:-1]) == ["a.py", "b.js"]
+    assert lines[-1]["type"] == "summary" and lines[-1]["ok"] == 2
@@ -0,0 +1,66 @@
+"""
+Tests for the prefix-aware inline completion cache
+"""
+
+from app.core.completion_cache import CompletionCache, cursor_offset
+from app.services.smart_coding_ai_enums import Language
+from app.services.smart_coding_ai_models import CompletionContext, InlineCompletion
+
+HEADER = "import os\n\n"
+BODY = "def load(path):\n    with open(path) as f:\n        return f.re"
+TRAILER = "\n\n\ndef save(path, data):\n    pass\n"
+
+
+def _context(before, after=TRAILER, path="app.py"):
+    line = before.count("\n") + 1
+    column = len(before) - (before.rfind("\n") + 1)
+    return CompletionContext(file_path=path, language=Language.PYTHON, content=before + after,
+                             cursor_position=(line, column))
+
+
+def _completion(text, context):
+    line, column = context.cursor_position
+    return InlineCompletion(
+        completion_id="c1", text=text, completion_type="method", language="python", confidence=0.9,
+        accuracy_score=0.9, context_relevance=0.5, semantic_similarity=0.5, pattern_match_score=0.5,
+        ml_prediction_score=0.5, ensemble_score=0.9, start_line=line, end_line=line,
+        start_column=column, end_column=column + len(text), description="read",
+    )
+
+
+def test_cursor_offset():
+    content = "ab\ncdef\ng"
+    assert cursor_offset(content, 1, 1) == 1
+    assert cursor_offset(content, 2, 2) == 5
+    assert cursor_offset(content, 2, 99) == 7  # clamped to the end of the line
+    assert cursor_offset(content, 9, 0) == len(content)
+
+
+def test_window_key_and_prefix_continuation():
+    cache = CompletionCache(prefix_chars=64)
+    context = _context(HEADER + BODY)
+    cache.put(context, _completion("ad()", context))
+
+    # Edits outside the window keep the key
+    assert cache.get(_context("import sys\n" + HEADER + BODY)).text == "ad()"
+
+    continued = cache.get(_context(HEADER + BODY + "ad"))
+    assert (continued.text, continued.start_column, continued.end_column) == ("()", 21, 23)
+    assert cache.get(_context(HEADER + BODY + "x")) is None
+    assert cache.get(_context(HEADER + BODY, after="\nother = 1\n")) is None
+    assert cache.get(_context(HEADER + BODY, path="other.py")) is None
+    assert cache.get_stats()["continuation_hits"] == 1 and cache.get_stats()["hits"] == 1
+
+
+def test_entry_and_byte_bounds():
+    cache = CompletionCache(max_entries=3)
+    contexts = [_context(f"value_{index} = ") for index in range(5)]
+    for context in contexts:
+        cache.put(context, _completion("compute()", context))
+    assert len(cache) == 3 and cache.get(contexts[0]) is None and cache.get(contexts[4]) is not None
+
+    small = CompletionCache(max_bytes=4000)
+    for context in contexts:
+        small.put(context, _completion("compute()", context))
+    assert small.get_stats()["bytes"] <= 4000 and small.stats["evictions"] > 0
+    assert small.get(contexts[-1]) is not None
@@ -0,0 +1,111 @@
+"""
+Tests for the persistent completion channel (deltas, debounce, cancellation, multiplexing)
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.completion_channel import CompletionChannel, apply_changes
+from app.services.smart_coding_ai_models import InlineCompletion
+
+
+def _completion(context, text):
+    line, column = context.cursor_position
+    return InlineCompletion(
+        completion_id=f"{context.file_path}:{len(context.content)}", text=text, completion_type="line",
+        language=context.language.value, confidence=0.9, accuracy_score=0.9, context_relevance=0.5,
+        semantic_similarity=0.5, pattern_match_score=0.5, ml_prediction_score=0.5, ensemble_score=0.9,
+        start_line=line, end_line=line, start_column=column, end_column=column + len(text), description="",
+    )
+
+
+class RecordingEngine:
+    """Completes with the document's length after ``delay``; records every generation it started"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.started = []
+        self.streaming_completions = {}
+
+    async def get_inline_completion(self, context):
+        self.started.append((context.file_path, context.content))
+        await asyncio.sleep(self.delay)
+        return _completion(context, f"<{len(context.content)}>")
+
+    async def get_streaming_completion(self, context):
+        for text in ("re", "return", "return x"):
+            await asyncio.sleep(0)
+            yield _completion(context, text)
+
+
+async def _channel(engine, debounce_ms=10):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    return CompletionChannel(engine, send, debounce_ms=debounce_ms), sent
+
+
+def test_apply_changes():
+    content = "def f(x):\n    return x\n"
+    assert apply_changes(content, [{"start": [2, 11], "end": [2, 12], "text": "x + 1"}]) == \
+        "def f(x):\n    return x + 1\n"
+    # Each change applies to the result of the previous one
+    assert apply_changes("ab", [{"start": [1, 2], "text": "c"}, {"start": [1, 0], "end": [1, 1], "text": ""}]) == "bc"
+    assert apply_changes(content, [{"text": "new"}]) == "new"
+
+
+@pytest.mark.asyncio
+async def test_debounce_supersedes_and_deltas():
+    engine = RecordingEngine()
+    channel, sent = await _channel(engine)
+    await channel.handle({"type": "open", "file_path": "a.py", "language": "python", "content": "x = "})
+
+    # A burst of keystrokes: only the last request generates
+    for version, char in enumerate("abc", start=1):
+        await channel.handle({"type": "change", "file_path": "a.py", "version": version,
+                              "changes": [{"start": [1, 3 + version], "text": char}]})
+        await channel.handle({"type": "complete", "file_path": "a.py", "cursor": [1, 4 + version]})
+    await asyncio.sleep(0.05)
+
+    assert engine.started == [("a.py", "x = abc")]
+    completions = [m for m in sent if m["type"] == "completion"]
+    assert [(m["version"], m["completion"]["text"]) for m in completions] == [(3, "<7>")]
+    assert channel.stats["superseded"] == 2 and channel.stats["delta_bytes"] == 3
+
+    # A lost delta forces the client to re-open the file
+    await channel.handle({"type": "change", "file_path": "a.py", "version": 5, "changes": [{"text": "y"}]})
+    assert sent[-1] == {"type": "resync", "file_path": "a.py", "version": 3} and "a.py" not in channel.documents
+
+
+@pytest.mark.asyncio
+async def test_keystroke_cancels_in_flight_and_files_multiplex():
+    engine = RecordingEngine(delay=0.05)
+    channel, sent = await _channel(engine, debounce_ms=0)
+    for path in ("a.py", "b.py"):
+        await channel.handle({"type": "open", "file_path": path, "language": "python", "content": "pass"})
+
+    await channel.handle({"type": "complete", "file_path": "a.py", "cursor": [1, 4], "request_id": "r1"})
+    await channel.handle({"type": "complete", "file_path": "b.py", "cursor": [1, 4], "request_id": "r2"})
+    await asyncio.sleep(0.02)
+    assert set(engine.streaming_completions) == {"r1", "r2"}
+
+    # Typing in a.py abandons r1 while b.py's generation carries on
+    await channel.handle({"type": "change", "file_path": "a.py", "version": 1, "changes": [{"text": "pass\n"}]})
+    await asyncio.sleep(0.06)
+    assert [m["request_id"] for m in sent if m["type"] == "completion"] == ["r2"]
+    assert engine.streaming_completions == {} and channel.get_stats()["in_flight"] == 0
+
+    await channel.handle({"type": "complete", "file_path": "a.py", "cursor": [2, 0], "request_id": "r3",
+                          "stream": True})
+    await asyncio.sleep(0.01)
+    streamed = [(m["partial"], m["completion"]["text"]) for m in sent if m.get("request_id") == "r3"]
+    assert streamed == [(True, "re"), (True, "return"), (False, "return x")]
+
+    await channel.handle({"type": "complete", "file_path": "b.py", "cursor": [9, 9]})
+    await channel.handle({"type": "bogus"})
+    assert sent[-1]["type"] == "error"
+    await channel.close()
+    assert channel.get_stats()["open_documents"] == 0
@@ -0,0 +1,122 @@
+"""
+Tests for the parallel DAG executor (scheduling, retries/timeouts, memoized partial re-execution)
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.dag_executor import DAGError, DAGExecutor, DAGNode, NodeStatus, critical_path, parallel_levels
+
+
+def sleeper(delay, started, result=None):
+    async def action(upstream):
+        started.append(action.node_id)
+        await asyncio.sleep(delay)
+        return result if result is not None else sum(upstream.values(), 1)
+    return action
+
+
+def node(node_id, delay, started, dependencies=(), cost=1.0, **kwargs):
+    action = sleeper(delay, started)
+    action.node_id = node_id
+    return DAGNode(node_id, action, list(dependencies), cost=cost, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_parallel_levels_and_critical_path_first():
+    started = []
+    nodes = [
+        node("short", 0.05, started, cost=1),
+        node("long", 0.05, started, cost=5),
+        node("after_long", 0.05, started, ["long"], cost=5),
+        node("join", 0.05, started, ["short", "after_long"]),
+    ]
+    assert parallel_levels(nodes) == [["short", "long"], ["after_long"], ["join"]]
+    assert critical_path(nodes) == (["long", "after_long", "join"], 11)
+
+    # Budget of one: the long branch goes first even though "short" is listed first
+    run = await DAGExecutor(max_concurrency=1).run(nodes)
+    assert started[:2] == ["long", "after_long"] and run.outputs["join"] == 4
+
+    started.clear()
+    wide = [node(f"n{i}", 0.1, started) for i in range(4)]
+    begin = time.perf_counter()
+    run = await DAGExecutor(max_concurrency=4).run(wide)
+    assert time.perf_counter() - begin < 0.3 and run.max_parallelism == 4
+
+    with pytest.raises(DAGError, match="Cycle"):
+        await DAGExecutor().run([node("a", 0, [], ["b"]), node("b", 0, [], ["a"])])
+
+
+@pytest.mark.asyncio
+async def test_retries_timeouts_and_downstream_skip():
+    calls = {"flaky": 0}
+
+    async def flaky(upstream):
+        calls["flaky"] += 1
+        if calls["flaky"] < 2:
+            raise RuntimeError("transient")
+        return 1
+
+    started = []
+    nodes = [
+        DAGNode("flaky", flaky, retries=1),
+        node("hangs", 1.0, started, timeout=0.05, retries=0),
+        node("blocked", 0, started, ["hangs"]),
+        node("independent", 0, started, ["flaky"]),
+    ]
+    executor = DAGExecutor(retry_backoff=0.01)
+    run = await executor.run(nodes)
+
+    assert run.results["flaky"].status == NodeStatus.SUCCEEDED and run.results["flaky"].attempts == 2
+    assert run.results["hangs"].status == NodeStatus.FAILED and "Timed out" in run.results["hangs"].error
+    assert run.results["blocked"].status == NodeStatus.SKIPPED and "blocked" not in started
+    assert run.results["independent"].status == NodeStatus.SUCCEEDED
+    assert not run.succeeded and run.failed_nodes() == ["hangs", "blocked"]
+    assert executor.stats["timeouts"] == 1 and executor.stats["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rerun_reuses_memoized_nodes():
+    attempts = {"a": 0, "b": 0, "c": 0}
+    broken = {"b": True}
+
+    def counting(node_id):
+        async def action(upstream):
+            attempts[node_id] += 1
+            if broken.get(node_id):
+                raise RuntimeError("boom")
+            return node_id + "".join(upstream.values())
+        return action
+
+    nodes = [DAGNode("a", counting("a")), DAGNode("b", counting("b"), ["a"]), DAGNode("c", counting("c"), ["b"])]
+    executor = DAGExecutor()
+    first = await executor.run(nodes)
+    assert first.failed_nodes() == ["b", "c"]
+
+    broken["b"] = False
+    second = await executor.run(nodes, previous=first)
+    assert second.outputs["c"] == "cba" and attempts == {"a": 1, "b": 2, "c": 1}
+    assert second.results["a"].cached and second.summary()["cached"] == 1
+
+    # A fresh executor still reuses results carried by ``previous``
+    third = await DAGExecutor().run(nodes, previous=second)
+    assert third.summary()["cached"] == 3 and attempts == {"a": 1, "b": 2, "c": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_workflow_phase_is_not_retried():
+    from app.services.ai_orchestration_layer import WorkflowManager
+
+    manager = WorkflowManager()
+    calls = []
+
+    async def execute_phase(phase, context):
+        calls.append(phase)
+        return {"phase": phase, "success": phase != "implementation", "error": "build broke"}
+
+    manager._execute_phase = execute_phase
+    await manager.manage_workflow("api_development", {})
+    assert calls == ["design", "implementation"]
@@ -0,0 +1,67 @@
+"""
+Tests for micro-batched embedding generation
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.embedding_batcher import EmbeddingBatcher, EmbeddingBatcherConfig, estimate_tokens
+
+
+class RecordingBackend:
+    """Embedding backend that records each batch it receives"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+
+class TestEmbeddingBatcher:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingBatcher(backend, EmbeddingBatcherConfig(max_wait_ms=20))
+        texts = [f"text {i}" for i in range(10)]
+        vectors = await asyncio.gather(*(batcher.embed(t) for t in texts))
+        assert len(backend.batches) == 1
+        assert vectors == [[float(len(t)), float(ord(t[0]))] for t in texts]
+
+    @pytest.mark.asyncio
+    async def test_identical_texts_are_deduplicated(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingBatcher(backend, EmbeddingBatcherConfig(max_wait_ms=20))
+        vectors = await batcher.embed_many(["same", "same", "other", "same"])
+        assert backend.batches == [["same", "other"]]
+        assert vectors[0] == vectors[1] == vectors[3]
+        assert batcher.stats.deduplicated == 2
+
+    @pytest.mark.asyncio
+    async def test_size_and_token_limits_split_batches(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingBatcher(backend, EmbeddingBatcherConfig(max_batch_size=4, max_wait_ms=20))
+        await batcher.embed_many([f"t{i}" for i in range(10)])
+        assert [len(b) for b in backend.batches] == [4, 4, 2]
+
+        backend = RecordingBackend()
+        long_text = "x" * 400
+        limit = estimate_tokens(long_text) * 2
+        batcher = EmbeddingBatcher(backend, EmbeddingBatcherConfig(max_batch_tokens=limit, max_wait_ms=20))
+        await batcher.embed_many([long_text + str(i) for i in range(5)])
+        assert all(sum(estimate_tokens(t) for t in b) <= limit for b in backend.batches)
+        assert sum(len(b) for b in backend.batches) == 5
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_reaches_every_waiter(self):
+        batcher = EmbeddingBatcher(RecordingBackend(fail=True), EmbeddingBatcherConfig(max_wait_ms=5))
+        results = await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher.stats.failed_batches == 1
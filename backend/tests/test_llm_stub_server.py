@@ -0,0 +1,86 @@
+"""
+Tests for the offline load-test LLM stub server
+
+The stub must be deterministic for a given seed and speak the Ollama and
+OpenAI wire formats closely enough for the real provider strategies.
+"""
+
+import json
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+
+from loadtest.load_generator import parse_server_timing, percentile
+from loadtest.stub_llm_server import StubLLMServer, StubProfile
+
+FAST_PROFILE = {
+    "time_to_first_token": {"kind": "constant", "median_ms": 1.0},
+    "tokens_per_second": 5000.0,
+    "max_output_tokens": 16,
+}
+
+
+@asynccontextmanager
+async def running_stub():
+    server = StubLLMServer(StubProfile.from_dict(FAST_PROFILE))
+    port = await server.start("127.0.0.1", 0)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await server.stop()
+
+
+class TestStubDeterminism:
+    """Same seed and prompt produce the same output"""
+
+    def test_generation_plan_is_deterministic(self):
+        first = StubLLMServer(StubProfile.from_dict(FAST_PROFILE)).plan_generation("llama2", "hello", 16)
+        second = StubLLMServer(StubProfile.from_dict(FAST_PROFILE)).plan_generation("llama2", "hello", 16)
+        assert first.tokens == second.tokens
+
+    def test_embedding_dimension_and_determinism(self):
+        server = StubLLMServer(StubProfile.from_dict({"embedding_dimension": 64}))
+        vector = server.embed("nomic", "text")
+        assert len(vector) == 64
+        assert vector == server.embed("nomic", "text")
+
+
+class TestStubWireFormats:
+    """Ollama NDJSON and OpenAI SSE streaming"""
+
+    @pytest.mark.asyncio
+    async def test_ollama_streaming_ndjson(self):
+        async with running_stub() as stub_url, aiohttp.ClientSession() as session:
+            async with session.post(f"{stub_url}/api/generate",
+                                    json={"model": "llama2", "prompt": "hi", "stream": True}) as response:
+                lines = [json.loads(line) for line in (await response.text()).splitlines() if line]
+        assert lines[-1]["done"] is True
+        assert all(not line["done"] for line in lines[:-1])
+
+    @pytest.mark.asyncio
+    async def test_openai_streaming_sse(self):
+        body = {"model": "gpt", "messages": [{"role": "user", "content": "hi"}], "stream": True}
+        async with running_stub() as stub_url, aiohttp.ClientSession() as session:
+            async with session.post(f"{stub_url}/v1/chat/completions", json=body) as response:
+                events = [line[6:] for line in (await response.text()).splitlines() if line.startswith("data: ")]
+        assert events[-1] == "[DONE]"
+        assert json.loads(events[0])["object"] == "chat.completion.chunk"
+
+    @pytest.mark.asyncio
+    async def test_stats_count_requests(self):
+        async with running_stub() as stub_url, aiohttp.ClientSession() as session:
+            await session.post(f"{stub_url}/api/generate", json={"model": "llama2", "prompt": "hi", "stream": False})
+            async with session.get(f"{stub_url}/__stub/stats") as response:
+                stats = await response.json()
+        assert stats["requests"] == 1
+
+
+def test_parse_server_timing():
+    assert parse_server_timing("app;dur=12.5, llm;desc=\"x\";dur=3") == {"app": 12.5, "llm": 3.0}
+    assert parse_server_timing(None) == {}
+
+
+def test_percentile_nearest_rank():
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([], 99) == 0.0
@@ -0,0 +1,82 @@
+"""
+Tests for the multi-agent message bus (mailboxes, batching, request/reply, topics, backpressure)
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.adaptive_concurrency import OverloadedError
+from app.core.message_bus import InProcessTransport, MessageBus, MessageBusError, MessageKind
+from app.services.ai_orchestration_layer import MultiAgentCoordinator
+
+
+@pytest.mark.asyncio
+async def test_batched_requests_and_correlated_replies():
+    bus = MessageBus(InProcessTransport(batch_size=8))
+    batches = []
+
+    async def double(messages):
+        batches.append(len(messages))
+        if any(message.payload == "bad" for message in messages):
+            raise ValueError("bad input")
+        return [message.payload * 2 for message in messages]
+
+    bus.register("doubler", double, batched=True)
+    replies = await asyncio.gather(*(bus.request("doubler", i) for i in range(10)))
+    assert replies == [i * 2 for i in range(10)]
+    assert sorted(batches, reverse=True)[:2] == [8, 2]  # queued requests were drained in batches
+
+    with pytest.raises(MessageBusError, match="bad input"):
+        await bus.request("doubler", "bad")
+    with pytest.raises(MessageBusError, match="Unknown agent"):
+        await bus.tell("nobody", 1)
+
+    stats = bus.get_stats()
+    assert stats["replies"] == 11 and stats["pending_requests"] == 0
+    assert stats["agents"]["doubler"]["processed"] == 11 and stats["agents"]["doubler"]["failed"] == 1
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_full_mailbox_applies_backpressure_and_sheds():
+    bus = MessageBus(InProcessTransport(mailbox_size=1), send_timeout=0.05)
+    gate = asyncio.Event()
+    seen = []
+
+    async def slow(message):
+        await gate.wait()
+        seen.append((message.kind, message.topic, message.payload))
+
+    async def fast(message):
+        seen.append((message.kind, message.topic, message.payload))
+
+    bus.register("slow", slow, topics=["news"])
+    bus.register("fast", fast, topics=["news"])
+    await bus.tell("slow", 1)
+    await asyncio.sleep(0)  # worker takes message 1 and blocks
+    await bus.tell("slow", 2)  # fills the mailbox
+    with pytest.raises(OverloadedError, match="mailbox is full"):
+        await bus.tell("slow", 3)
+
+    assert await bus.publish("news", "hello") == 1  # the slow subscriber sheds the event
+    gate.set()
+    await asyncio.sleep(0.01)
+    assert (MessageKind.EVENT, "news", "hello") in seen and [p for _, _, p in seen if p != "hello"] == [1, 2]
+    assert bus.get_stats()["agents"]["slow"]["shed"] == 2 and bus.get_stats()["shed"] == 2
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_runs_agents_over_the_bus():
+    coordinator = MultiAgentCoordinator()
+    result = await coordinator.coordinate_agents(
+        {"id": "t1", "type": "api"}, {"required_agents": ["api_designer", "code_generator", "test_generator"]}
+    )
+    assert result["status"] == "completed"
+    assert all(agent["success"] for agent in result["results"].values()) and len(result["results"]) == 3
+
+    assert await coordinator.broadcast("capability.test_generation", {"event": "ping"}) == 1
+    bus_stats = (await coordinator.get_agent_registry_status())["message_bus"]
+    assert bus_stats["requests"] == 3 and bus_stats["agents"]["code_generator"]["processed"] == 1
+    await coordinator.message_bus.close()
@@ -0,0 +1,75 @@
+"""
+Tests for the compiled multi-pattern rule engine
+"""
+
+import random
+import re
+
+from app.core.pattern_engine import PatternRule, RuleSet, required_literals
+
+PATTERNS = [
+    (r'eval\s*\(', 0),
+    (r'(api_key|password|token|secret)\s*=\s*"[^"]{5,}"', re.IGNORECASE),
+    (r'(?i)(;.*?$)', 0),
+    (r'(?i)(&&|\|\|)', 0),
+    (r'[;&|`$(){}]', 0),
+    (r'^\s*return\s+True\s*$', 0),
+    (r'password.*hash', 0),
+    (r'(?i)(cmd\.exe|powershell|bash|sh)', 0),
+    (r'on\w+\s*=', re.IGNORECASE),
+    (r'pass', 0),
+    (r'password', 0),
+    (r'def [A-Z]', 0),
+    (r'x\s+y', 0),
+]
+
+ALPHABET = ["eval(", "password", "PASSWORD", " = ", '"secret1"', "&&", "||", ";", "return True", "hash",
+            "bash", "sh", "onclick=", "def Foo", "x", " ", "\n", "y", "ſ", "İ", "pass", "{", "z"]
+
+
+def _brute_force_lines(text, all_matches):
+    hits = []
+    for number, line in enumerate(text.split("\n"), 1):
+        for index, (pattern, flags) in enumerate(PATTERNS):
+            regex = re.compile(pattern, flags)
+            matches = list(regex.finditer(line)) if all_matches else [m for m in [regex.search(line)] if m]
+            hits.extend((number, index, m.start(), m.group(0)) for m in matches)
+    return hits
+
+
+def test_required_literals():
+    assert required_literals(r'eval\s*\(') == ("eval",)
+    assert required_literals(r'(api_key|password)\s*=') == ("api_key", "password")
+    assert required_literals(r'(?:foo)?bar+') == ("ba",)  # optional groups are not required
+    assert required_literals(r'(?:foo)?x+') is None  # "x" alone is too short to prune anything
+    assert required_literals(r'(?:foo)?barbaz') == ("barbaz",)
+    assert required_literals(r'[;&|]') is None
+
+
+def test_results_match_per_rule_regexes():
+    rules = RuleSet(PatternRule(index, pattern, flags) for index, (pattern, flags) in enumerate(PATTERNS))
+    generator = random.Random(7)
+    for _ in range(300):
+        text = "".join(generator.choice(ALPHABET) for _ in range(generator.randint(0, 40)))
+        for all_matches in (False, True):
+            hits = [(h.line, h.rule_id, h.column, h.text) for h in rules.scan_lines(text, all_matches)]
+            assert hits == _brute_force_lines(text, all_matches)
+
+        expected = sorted(
+            ((m.start(), index, m.group(0)) for index, (p, f) in enumerate(PATTERNS)
+             for m in re.finditer(p, text, f)),
+            key=lambda item: item[0],
+        )
+        assert sorted((h.match.start(), h.rule_id, h.text) for h in rules.scan(text)) == sorted(expected)
+        assert rules.matching_rules(text) == [i for i, (p, f) in enumerate(PATTERNS) if re.search(p, text, f)]
+
+
+def test_first_match_follows_rule_order_and_skips_rules():
+    rules = RuleSet([PatternRule("drop", r";.*DROP", re.IGNORECASE), PatternRule("comment", r"--")])
+    hit = rules.first_match("name'; drop table users --")
+    assert (hit.rule_id, hit.line, hit.column) == ("drop", 1, 5)
+    assert rules.first_match("plain value") is None
+
+    stats = rules.get_stats()
+    assert stats["literal_rules"] == 2
+    assert stats["rules_skipped"] >= 2  # neither regex ran on "plain value"
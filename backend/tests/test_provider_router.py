@@ -0,0 +1,154 @@
+"""
+Tests for the latency-aware provider router
+
+Covers latency/cost ranking, circuit breaker transitions and hedged requests
+cancelling the losing provider.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from app.core.strategies.ai_provider_strategy import AIProviderManager, AIProviderType
+from app.core.strategies.provider_router import (
+    CircuitBreakerConfig,
+    CircuitState,
+    ProviderRouter,
+    ProviderUnavailableError,
+    RoutingPolicy,
+)
+
+
+class FakeProvider:
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False, cost: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.cost = cost
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_completion(self, prompt, max_tokens=1000, temperature=0.7, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return self.name
+
+    def get_cost_estimate(self, prompt_tokens, completion_tokens):
+        return self.cost
+
+
+def _router(providers, policy: RoutingPolicy = None, breaker: CircuitBreakerConfig = None) -> ProviderRouter:
+    manager = AIProviderManager()
+    types = [AIProviderType.GROQ, AIProviderType.TOGETHER, AIProviderType.LOCAL_LLM]
+    for provider_type, provider in zip(types, providers):
+        manager.providers[provider_type] = provider
+    policies = {"default": policy or RoutingPolicy(exploration_rate=0.0)}
+    return ProviderRouter(manager, policies=policies, breaker=breaker, rng=random.Random(0))
+
+
+class TestRanking:
+
+    @pytest.mark.asyncio
+    async def test_prefers_lower_observed_latency(self):
+        slow, fast = FakeProvider("slow", delay=0.03), FakeProvider("fast", delay=0.0)
+        router = _router([slow, fast])
+        router.priority = ["groq", "together"]
+        router.cold_start_latency_ms = 0.0
+
+        assert await router.execute(lambda p: p.generate_completion("x")) == "slow"
+        assert router.rank("default") == [AIProviderType.TOGETHER, AIProviderType.GROQ]
+        assert await router.execute(lambda p: p.generate_completion("x")) == "fast"
+
+    @pytest.mark.asyncio
+    async def test_embeddings_only_route_to_capable_providers(self):
+        class Embedder(FakeProvider):
+            supports_embeddings = True
+
+            async def generate_embeddings(self, texts, **kwargs):
+                self.calls += 1
+                return [[1.0] for _ in texts]
+
+        chat_only, embedder = FakeProvider("chat"), Embedder("embed")
+        router = _router([chat_only, embedder])
+        router.priority = ["groq", "together"]
+
+        assert await router.generate_embeddings(["a", "b"]) == [[1.0], [1.0]]
+        assert chat_only.calls == 0 and embedder.calls == 1
+        assert AIProviderType.GROQ not in router.health  # never attempted, so its health is untouched
+
+    def test_cost_weight_breaks_latency_parity(self):
+        cheap, pricey = FakeProvider("cheap", cost=0.0), FakeProvider("pricey", cost=0.01)
+        router = _router([pricey, cheap], RoutingPolicy(cost_weight=1.0, exploration_rate=0.0))
+        assert router.rank("default") == [AIProviderType.TOGETHER, AIProviderType.GROQ]
+
+
+class TestCircuitBreaker:
+
+    @pytest.mark.asyncio
+    async def test_opens_then_recovers_via_half_open(self):
+        flaky, backup = FakeProvider("flaky", fail=True), FakeProvider("backup")
+        breaker = CircuitBreakerConfig(failure_threshold=2, open_duration_s=0.05)
+        # Rank by priority alone so flaky stays first while its circuit is closed
+        policy = RoutingPolicy(latency_weight=0.0, error_weight=0.0, exploration_rate=0.0)
+        router = _router([flaky, backup], policy, breaker)
+        router.priority = ["groq", "together"]
+
+        for _ in range(2):
+            assert await router.execute(lambda p: p.generate_completion("x")) == "backup"
+        health = router.health[AIProviderType.GROQ]
+        assert health.state == CircuitState.OPEN
+        assert AIProviderType.GROQ not in router.rank("default")
+
+        await asyncio.sleep(0.06)
+        flaky.fail = False
+        assert health.allow_request()
+        assert health.state == CircuitState.HALF_OPEN
+        await router.execute(lambda p: p.generate_completion("x"))
+        assert health.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_all_failing_raises(self):
+        router = _router([FakeProvider("a", fail=True), FakeProvider("b", fail=True)])
+        with pytest.raises(ProviderUnavailableError):
+            await router.execute(lambda p: p.generate_completion("x"))
+
+
+class TestHedging:
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_cancels_loser(self):
+        stuck, quick = FakeProvider("stuck", delay=1.0), FakeProvider("quick", delay=0.0)
+        policy = RoutingPolicy(hedge=True, min_hedge_delay_ms=10.0, exploration_rate=0.0)
+        router = _router([stuck, quick], policy)
+        router.priority = ["groq", "together"]
+        router.cold_start_latency_ms = 10.0
+
+        assert await router.execute(lambda p: p.generate_completion("x")) == "quick"
+        await asyncio.sleep(0)
+        assert stuck.cancelled == 1
+        # A cancelled hedge loser is not counted as a failure
+        assert router.health[AIProviderType.GROQ].ewma_error_rate == 0.0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_when_primary_is_fast(self):
+        fast, other = FakeProvider("fast"), FakeProvider("other")
+        router = _router([fast, other], RoutingPolicy(hedge=True, min_hedge_delay_ms=50.0, exploration_rate=0.0))
+        router.priority = ["groq", "together"]
+        assert await router.execute(lambda p: p.generate_completion("x")) == "fast"
+        assert other.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_primary_failing_before_hedge_delay_falls_over(self):
+        bad, good = FakeProvider("bad", fail=True), FakeProvider("good")
+        policy = RoutingPolicy(hedge=True, max_attempts=2, min_hedge_delay_ms=1000.0, exploration_rate=0.0)
+        router = _router([bad, good], policy)
+        router.priority = ["groq", "together"]
+        assert await router.execute(lambda p: p.generate_completion("x")) == "good"
+        assert bad.calls == 1 and good.calls == 1
@@ -0,0 +1,117 @@
+"""
+Tests for incremental repository indexing behind CodebaseMemorySystem
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from app.services.codebase_memory_system import CodebaseMemorySystem
+from app.services.repository_indexer import RepositoryIndexer, compile_gitignore, is_ignored, scan_repository
+
+
+def _write(root, path, text, mtime=None):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text)
+    if mtime is not None:
+        os.utime(target, ns=(mtime, mtime))
+
+
+def test_gitignore_rules_and_scan(tmp_path):
+    rules = compile_gitignore("*.log\n!keep.log\nbuild/\n/docs/*.md\n")
+    assert is_ignored(rules, "a/b/debug.log", False)
+    assert not is_ignored(rules, "keep.log", False)
+    assert is_ignored(rules, "src/build", True) and not is_ignored(rules, "src/build", False)
+    assert is_ignored(rules, "docs/x.md", False) and not is_ignored(rules, "src/docs/x.md", False)
+
+    _write(tmp_path, ".gitignore", "*.log\nbuild/\n")
+    _write(tmp_path, "src/app.py", "x = 1\n")
+    _write(tmp_path, "src/.gitignore", "generated_*.py\n")
+    _write(tmp_path, "src/generated_api.py", "y = 2\n")
+    _write(tmp_path, "build/out.py", "z = 3\n")
+    _write(tmp_path, "node_modules/lib.js", "var a = 1;")
+    _write(tmp_path, "server.log", "")
+    assert sorted(entry.path for entry in scan_repository(str(tmp_path))) == [
+        ".gitignore", "src/.gitignore", "src/app.py"]
+    assert sorted((e.path, e.is_dir) for e in scan_repository(str(tmp_path), max_depth=0)) == [
+        (".gitignore", False), ("src", True)]
+
+
+@pytest.mark.asyncio
+async def test_reanalysis_only_reparses_changed_files(tmp_path):
+    for index in range(60):
+        _write(tmp_path, f"pkg/module_{index}.py", f"def handler_{index}():\n    return {index}\n", mtime=10**18)
+    memory = CodebaseMemorySystem()
+    try:
+        snapshot = await memory.analyze_project(str(tmp_path), "deep")
+        project_id = snapshot["project_id"]
+        assert memory.get_indexing_progress(project_id)["files_parsed"] == 60
+        assert {p["pattern_name"] for p in snapshot["coding_patterns"]} >= {"handler_0", "handler_59"}
+
+        _write(tmp_path, "pkg/module_1.py", "def renamed_handler():\n    return 1\n", mtime=2 * 10**18)
+        _write(tmp_path, "pkg/module_2.py", "def handler_2():\n    return 2\n", mtime=2 * 10**18)  # touched only
+        os.remove(tmp_path / "pkg/module_3.py")
+        snapshot = await memory.analyze_project(str(tmp_path), "deep")
+    finally:
+        memory.shutdown()
+
+    progress = memory.get_indexing_progress(project_id)
+    assert snapshot["project_id"] == project_id
+    assert (progress["files_parsed"], progress["files_removed"], progress["files_unchanged"]) == (2, 1, 58)
+    names = {p["pattern_name"] for p in snapshot["coding_patterns"]}
+    assert "renamed_handler" in names and "handler_1" not in names and "handler_3" not in names
+    assert "pkg/module_3.py" not in snapshot["project_structure"]["file_tree"]
+    assert {r["pattern_name"] for r in await memory.search_memory("renamed_handler", result_type="pattern")} == \
+        {"renamed_handler"}
+    assert "handler_3" not in {r["pattern_name"] for r in await memory.search_memory("handler_3", limit=100)}
+
+
+@pytest.mark.asyncio
+async def test_file_grown_past_size_limit_is_marked_skipped(tmp_path):
+    _write(tmp_path, "app.py", "def handler():\n    return 1\n")
+    indexer = RepositoryIndexer(str(tmp_path), max_workers=1, max_file_bytes=100)
+    [first] = [update async for update in indexer.run()]
+    assert first.patterns and first.skipped is None
+
+    _write(tmp_path, "app.py", "def handler():\n    return 1\n" + "# padding\n" * 20)
+    [grown] = [update async for update in indexer.run()]
+    assert (grown.status, grown.patterns, grown.skipped) == ("changed", [], "larger than 100 bytes")
+    assert indexer.progress.files_skipped == 1
+
+
+
+@pytest.mark.asyncio
+async def test_memory_drops_patterns_of_skipped_files(tmp_path):
+    _write(tmp_path, "app.py", "def handler():\n    return 1\n")
+    memory = CodebaseMemorySystem()
+    try:
+        snapshot = await memory.analyze_project(str(tmp_path), "deep")
+        project_id = snapshot["project_id"]
+        assert {p["pattern_name"] for p in snapshot["coding_patterns"]} == {"handler"}
+
+        memory.indexers[project_id].max_file_bytes = 100
+        _write(tmp_path, "app.py", "def handler():\n    return 1\n" + "# padding\n" * 20)
+        snapshot = await memory.analyze_project(str(tmp_path), "deep")
+    finally:
+        memory.shutdown()
+    assert snapshot["coding_patterns"] == []
+    assert snapshot["project_structure"]["file_tree"]["app.py"]["skipped"] == "larger than 100 bytes"
+
+
+@pytest.mark.asyncio
+async def test_polling_watch_reports_changes(tmp_path):
+    _write(tmp_path, "app.py", "def first():\n    pass\n", mtime=10**18)
+    indexer = RepositoryIndexer(str(tmp_path), max_workers=1)
+    assert [update.status async for update in indexer.run()] == ["added"]
+
+    async def next_batch():
+        async for updates in indexer.watch(interval=0.01, force_polling=True):
+            return updates
+
+    watcher = asyncio.ensure_future(next_batch())
+    _write(tmp_path, "app.py", "def second():\n    pass\n", mtime=2 * 10**18)
+    updates = await asyncio.wait_for(watcher, timeout=5)
+    assert [(u.path, u.status) for u in updates] == [("app.py", "changed")]
+    assert {p["pattern_name"] for p in updates[0].patterns} == {"second"}
@@ -0,0 +1,59 @@
+"""
+Tests for the bounded result store (TTL, memory budget, spill to disk, user index)
+"""
+
+import os
+import time
+
+from app.core.result_store import ResultStore
+
+
+def test_ttl_user_index_and_entry_bound():
+    store = ResultStore("plans", ttl_seconds=60, max_entries=3)
+    store.put("p1", {"n": 1}, user_id="alice")
+    store.put("p2", {"n": 2}, user_id="bob")
+    store.put("p3", {"n": 3}, user_id="alice", ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert "p3" not in store and store.for_user("alice") == [{"n": 1}]
+
+    store.get("p1")  # p2 is now least recently used
+    store.put("p4", {"n": 4}, user_id="alice")
+    store.put("p5", {"n": 5})
+    assert store.keys() == ["p1", "p4", "p5"] and store.for_user("bob") == []
+    assert [plan["n"] for plan in store.for_user("alice")] == [1, 4]
+    assert store.get_stats()["evicted"] == 1 and store.get_stats()["expired"] == 1
+
+
+def test_large_payloads_spill_to_compressed_segments(tmp_path):
+    store = ResultStore("results", max_memory_bytes=30_000, spill_min_bytes=1_000,
+                        max_disk_bytes=4_000, segment_bytes=1_500, spill_dir=str(tmp_path))
+    payload = lambda i: {"id": i, "log": f"line {i}\n" * 1_500}
+    for i in range(4):
+        store.put(f"r{i}", payload(i))
+    store.put("small", "ok")
+
+    stats = store.get_stats()
+    assert store.memory_bytes <= 30_000 and stats["on_disk"] >= 1 and stats["spilled"] == stats["on_disk"]
+    assert 0 < store.disk_bytes < 1_000  # repetitive payloads compress well
+    assert store.get("r0") == payload(0) and store.stats["disk_hits"] == 1
+    assert store.values()[0] == payload(0) and store.get("small") == "ok"
+
+    # Replacing a spilled entry drops its segment once nothing else references it
+    store.put("r0", "replaced")
+    segments = [name for name in os.listdir(next(tmp_path.iterdir())) if name.endswith(".seg")]
+    assert len(segments) == store.get_stats()["segments"]
+    store.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pinned_entries_stay_live_until_unpinned():
+    store = ResultStore("tasks", ttl_seconds=0.01, max_memory_bytes=100, spill_min_bytes=10**9)
+    task = {"progress": 0}
+    store.put("t1", task, pinned=True)
+    store.put("t2", "x" * 500)
+    time.sleep(0.02)
+    assert store.get("t1") is task and "t2" not in store  # over budget and not worth spilling
+
+    task["progress"] = 100
+    store.unpin("t1")
+    assert store.get_stats()["pinned"] == 0 and store.get("t1") is None  # expired once unpinned
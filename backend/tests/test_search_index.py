@@ -0,0 +1,69 @@
+"""
+Tests for the BM25/trigram search index behind CodebaseMemorySystem.search_memory
+"""
+
+import pytest
+
+from app.core.search_index import SearchIndex, tokenize
+from app.services.codebase_memory_system import CodebaseMemorySystem
+
+
+def _snapshot(project_id, names):
+    return {
+        "project_id": project_id,
+        "coding_patterns": [
+            {"pattern_name": name, "pattern_type": "function", "language": "python", "confidence": 0.9}
+            for name in names
+        ],
+        "dependencies": [{"name": "redis", "type": "runtime", "language": "python"}],
+        "project_structure": {"file_tree": {"src/user_service.py": {"type": "file", "extension": ".py"}}},
+    }
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("getUserName") == ["getusername", "get", "user", "name"]
+    assert tokenize("src/HTTPServer_v2.py") == ["src", "httpserver_v2", "http", "server", "v", "2", "py"]
+
+
+def test_exact_substring_and_fuzzy_ranking():
+    index = SearchIndex(field_weights={"name": 3.0})
+    for doc_id, name in [("a", "validate_payment"), ("b", "paymentGateway"), ("c", "render_template")]:
+        index.add(doc_id, {"name": name})
+
+    assert sorted(hit.doc_id for hit in index.search("payment").hits) == ["a", "b"]
+    assert [hit.doc_id for hit in index.search("validate_payment").hits] == ["a"]
+    assert [hit.doc_id for hit in index.search("templ").hits] == ["c"]  # substring via trigrams
+    assert index.search("paymnt").hits[0].doc_id in {"a", "b"}  # typo via trigram similarity
+
+    index.remove("a")
+    assert [hit.doc_id for hit in index.search("validate").hits] == []
+    assert index.get_stats()["documents"] == 2
+
+
+@pytest.mark.asyncio
+async def test_search_memory_filters_paginates_and_does_not_mutate():
+    memory = CodebaseMemorySystem()
+    await memory.store_snapshot(_snapshot("p1", ["get_user", "create_order", "delete_user"]))
+    await memory.store_snapshot(_snapshot("p2", ["get_user_profile"]))
+
+    page = await memory.search_memory_page("user", result_type="pattern", limit=2)
+    assert page["total"] == 3
+    assert [r["pattern_name"] for r in page["results"]] == ["get_user", "delete_user"]
+    assert [r["pattern_name"] for r in await memory.search_memory("user", result_type="pattern", offset=2)] == \
+        ["get_user_profile"]
+
+    ranked = await memory.search_memory("user", result_type="pattern")  # no limit: every match
+    assert len(ranked) == 3 and ranked[0]["confidence"] == 1.0
+    assert all(0 < r["confidence"] <= 1 for r in ranked)
+    # Confidence is absolute: a typo-only match stays low even as the best hit
+    assert 0 < (await memory.search_memory("get_usr", result_type="pattern"))[0]["confidence"] < 0.7
+
+    results = await memory.search_memory("user", project_id="p1")
+    assert {r["result_type"] for r in results} == {"pattern", "file"}
+    assert all(r["project_id"] == "p1" for r in results)
+    assert memory.memory_snapshots["p1"]["coding_patterns"][0]["confidence"] == 0.9
+
+    # Re-analysing a project replaces its indexed documents
+    await memory.store_snapshot(_snapshot("p1", ["create_order"]))
+    assert [r["pattern_name"] for r in await memory.search_memory("user", result_type="pattern")] == \
+        ["get_user_profile"]
@@ -0,0 +1,93 @@
+"""
+Tests for the compact, versioned snapshot store behind CodebaseMemorySystem
+"""
+
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.services.codebase_memory_system import CodebaseMemorySystem
+from app.services.snapshot_store import SnapshotStore, SnapshotView, encode_snapshot
+
+
+def _snapshot(project_id, names):
+    return {
+        "project_id": project_id,
+        "timestamp": datetime(2024, 5, 1, 12, 30),
+        "coding_patterns": [
+            {"pattern_id": str(uuid.uuid4()), "pattern_name": name, "pattern_type": "function",
+             "language": "python", "file_path": "src/app.py", "line_number": i + 1,
+             "context": {"args": ["self"], "seen": datetime(2024, 1, 1)}, "confidence": 0.9, "complexity": 1.5}
+            for i, name in enumerate(names)
+        ] + [{"pattern_name": "loose", "custom": [1, 2]}],
+        "dependencies": [{"name": "redis", "type": "runtime", "language": "python"}],
+        "project_structure": {"project_type": "python", "file_tree": {
+            "src": {"type": "directory", "modified": datetime(2024, 5, 1)},
+            "src/app.py": {"type": "file", "size": 120, "modified": datetime(2024, 5, 1), "extension": ".py"},
+        }},
+    }
+
+
+def test_encode_round_trip_and_lazy_access():
+    snapshot = _snapshot("p1", ["get_user", "create_order"])
+    view = SnapshotView(encode_snapshot(snapshot))
+
+    assert view.to_dict() == snapshot
+    assert len(view["coding_patterns"]) == 3
+    assert view["coding_patterns"][-1] == {"pattern_name": "loose", "custom": [1, 2]}
+    assert view["project_structure"]["file_tree"]["src/app.py"]["size"] == 120
+    assert dict(view)["dependencies"] == snapshot["dependencies"]
+
+
+def test_disk_store_versions_and_prunes(tmp_path):
+    store = SnapshotStore(str(tmp_path), keep_versions=2)
+    first = store.save(_snapshot("p1", ["v1"]))
+    for name in ("v2", "v3"):
+        store.save(_snapshot("p1", [name]))
+
+    assert store.current_version("p1") == 3
+    assert sorted(os.listdir(tmp_path / "p1")) == ["CURRENT", "v00000002.snap", "v00000003.snap"]
+    assert store.load("p1")["coding_patterns"][0]["pattern_name"] == "v3"
+    assert first["coding_patterns"][0]["pattern_name"] == "v1"  # old mapping stays readable
+    assert store.project_ids() == ["p1"] and store.delete("p1") and store.project_ids() == []
+
+
+def test_load_retries_when_another_writer_prunes_the_version(tmp_path, monkeypatch):
+    writer, reader = SnapshotStore(str(tmp_path), keep_versions=1), SnapshotStore(str(tmp_path))
+    writer.save(_snapshot("p1", ["v1"]))
+    writer.save(_snapshot("p1", ["v2"]))  # prunes v1
+
+    # The reader saw CURRENT -> 1 just before the other writer replaced it
+    stale = iter([1])
+    current_version = reader.current_version
+    monkeypatch.setattr(reader, "current_version", lambda project_id: next(stale, None) or current_version(project_id))
+    assert reader.load("p1")["coding_patterns"][0]["pattern_name"] == "v2"
+
+
+@pytest.mark.asyncio
+async def test_restart_restores_search_and_incremental_manifest(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    for index in range(5):
+        (project / f"module_{index}.py").write_text(f"def handler_{index}():\n    return {index}\n")
+
+    memory = CodebaseMemorySystem(SnapshotStore(str(tmp_path / "store")))
+    try:
+        project_id = (await memory.analyze_project(str(project), "deep"))["project_id"]
+        assert isinstance(memory.memory_snapshots[project_id], SnapshotView)
+    finally:
+        memory.shutdown()
+
+    restarted = CodebaseMemorySystem(SnapshotStore(str(tmp_path / "store")))
+    try:
+        assert await restarted.load_persisted_projects() == 1
+        results = await restarted.search_memory("handler_4", result_type="pattern")
+        assert results[0]["pattern_name"] == "handler_4" and results[0]["project_id"] == project_id
+
+        snapshot = await restarted.analyze_project(str(project), "deep")
+        assert snapshot["project_id"] == project_id
+        assert restarted.get_indexing_progress(project_id)["files_parsed"] == 0
+    finally:
+        restarted.shutdown()
@@ -0,0 +1,120 @@
+"""
+Tests for next-file prediction driven speculative prefetch
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.speculative_prefetch import FileTransitionModel, SpeculativePrefetcher, anchor_path
+
+
+def test_transition_model_confidence():
+    model = FileTransitionModel()
+    for path in ["a.py", "b.py", "a.py", "b.py", "a.py", "c.py", "a.py"]:
+        model.record("u1", path)
+    assert model.predict("u1", "a.py", k=2) == [("b.py", 2 / 3), ("c.py", 1 / 3)]
+    assert model.predict("u1", "c.py") == []  # one observation is not enough
+    assert model.predict("u2", "a.py") == []
+
+
+@pytest.mark.asyncio
+async def test_hits_mispredictions_and_cancellation(tmp_path):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text(f"# {name}\n")
+    a, b, c = (str(tmp_path / name) for name in ("a.py", "b.py", "c.py"))
+
+    model = FileTransitionModel()
+    for path in [a, b, a, b, a]:
+        model.record("u1", path)
+    prefetcher = SpeculativePrefetcher(model, lambda project_id: str(tmp_path), idle_ms=0)
+    release = asyncio.Event()
+    warmed = []
+
+    async def parse(target):
+        warmed.append(target.file_path)
+        return len(target.content)
+
+    async def slow(target):
+        await release.wait()
+
+    prefetcher.add_warmer("parse", parse)
+    [target] = await prefetcher.on_file_access("u1", a)
+    assert (target.file_path, target.confidence) == (b, 1.0)
+    await asyncio.sleep(0.05)
+    assert warmed == [b] and target.done
+    [late] = await prefetcher.on_file_access("u1", b)
+    assert prefetcher.stats["hits"] == 1 and target.artifacts == {"parse": len("# b.py\n")}
+
+    # Opening b predicted a; a arrives while that prefetch is stuck in "slow" (a late hit)
+    prefetcher.add_warmer("slow", slow)
+    await prefetcher.on_file_access("u1", a)
+    assert prefetcher.stats["late_hits"] == 1
+
+    # The user opens c while the prediction for b is still warming
+    await asyncio.sleep(0.05)
+    await prefetcher.on_file_access("u1", c)
+    stats = prefetcher.get_stats()
+    assert (stats["mispredictions"], stats["cancelled"], stats["in_flight"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 2 / 3
+    release.set()
+    await asyncio.sleep(0.01)
+    assert late.warmed == ["parse", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_budget_and_idle_gate(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("y = 2\n")
+    a, b = str(tmp_path / "a.py"), str(tmp_path / "b.py")
+    model = FileTransitionModel(min_observations=1)
+    model.record("u1", a)
+    model.record("u1", b)
+
+    prefetcher = SpeculativePrefetcher(model, lambda project_id: str(tmp_path), time_budget_ms=30, idle_ms=40)
+    ran = []
+
+    async def hog(target):
+        ran.append("hog")
+        await asyncio.sleep(1)
+
+    async def after(target):
+        ran.append("after")
+
+    prefetcher.add_warmer("hog", hog)
+    prefetcher.add_warmer("after", after)
+    prefetcher.note_activity()
+    [target] = await prefetcher.on_file_access("u1", a)
+    await asyncio.sleep(0.02)
+    assert ran == []  # the user was typing a moment ago
+
+    await asyncio.sleep(0.2)
+    assert ran == ["hog"] and target.done and target.warmed == []
+    assert prefetcher.stats["throttled"] == 1 and target.spent_ms < 100
+    await prefetcher.close()
+
+
+@pytest.mark.asyncio
+async def test_paths_outside_the_project_root_are_not_read(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "a.py").write_text("a = 1\n")
+    (tmp_path / "secret.txt").write_text("token\n")
+    assert anchor_path(str(root), "a.py") == str((root / "a.py").resolve())
+    assert anchor_path(str(root), "../secret.txt") is None
+    assert anchor_path(str(root), str(tmp_path / "secret.txt")) is None
+
+    model = FileTransitionModel(min_observations=1)
+    for path in ["a.py", "../secret.txt", "a.py", "../secret.txt", "a.py"]:
+        model.record("u1", path)
+    prefetcher = SpeculativePrefetcher(model, lambda project_id: str(root) if project_id else None, idle_ms=0)
+    read = []
+
+    async def parse(target):
+        read.append(target.content)
+
+    prefetcher.add_warmer("parse", parse)
+    assert await prefetcher.on_file_access("u1", "a.py", "p1") == []
+    assert await prefetcher.on_file_access("u1", "../secret.txt") == []  # no project, no root
+    await asyncio.sleep(0.01)
+    assert read == [] and prefetcher.stats["rejected"] == 2
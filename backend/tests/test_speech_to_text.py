@@ -0,0 +1,111 @@
+"""
+Tests for offline speech-to-text (incremental WAV decoding, VAD segmentation, parallel chunk decoding)
+"""
+
+import io
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from app.core.speech_to_text import (
+    AudioDecoder,
+    AudioTooLargeError,
+    AudioInputError,
+    DeterministicBackend,
+    SpeechModelUnavailableError,
+    SpeechToTextEngine,
+    UnsupportedAudioError,
+    VoiceActivitySegmenter,
+    WhisperBackend,
+)
+
+
+def tone(seconds, rate=16000, amplitude=0.3):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds, rate=16000):
+    return np.zeros(int(seconds * rate), dtype=np.float32)
+
+
+def wav_bytes(samples, rate=16000, channels=1):
+    pcm = (np.repeat(samples, channels) * 32767).astype("<i2").tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def test_wav_decodes_incrementally_across_chunk_boundaries():
+    samples = tone(0.2, rate=22050)
+    data = wav_bytes(samples, rate=22050, channels=2)
+    decoder = AudioDecoder()
+    pieces = [decoder.feed(data[i:i + 7]) for i in range(0, len(data), 7)]
+    decoded = np.concatenate(pieces + [decoder.finish()])
+
+    assert decoder.sample_rate == 22050 and decoder.channels == 2
+    assert sum(piece.size > 0 for piece in pieces) > 100  # samples arrive while bytes stream in
+    assert decoded.shape == samples.shape and np.allclose(decoded, samples, atol=1e-4)
+
+    garbage = AudioDecoder()
+    garbage.feed(b"not audio at all")
+    with pytest.raises(UnsupportedAudioError):
+        garbage.finish()
+
+
+def test_vad_splits_on_pauses_and_drops_clicks():
+    audio = np.concatenate([
+        silence(0.3), tone(0.6), silence(0.6), tone(0.03), silence(0.6),  # 30 ms click
+        tone(0.9), silence(0.2), tone(0.3), silence(0.5),  # short pause stays inside the segment
+        tone(1.5),
+    ])
+    segmenter = VoiceActivitySegmenter(16000, min_silence_ms=400, max_segment_seconds=1.0)
+    segments = []
+    for start in range(0, len(audio), 1000):
+        segments += segmenter.feed(audio[start:start + 1000])
+    segments += segmenter.flush()
+
+    # Padding keeps 150 ms around speech; long utterances are cut at the 1 s limit
+    assert [(round(s.start, 2), round(s.end, 2)) for s in segments] == [
+        (0.15, 1.05), (1.98, 2.97), (2.97, 3.69), (3.93, 4.92), (4.92, 5.53)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_engine_streams_ordered_partials_from_parallel_workers():
+    utterance = np.concatenate([tone(0.5), silence(0.5)])
+    data = wav_bytes(np.concatenate([silence(0.2)] + [utterance] * 4))
+    phrases = ["create", "a todo", "app", "with login"]
+    engine = SpeechToTextEngine(DeterministicBackend(phrases, delay=0.2), workers=4, min_silence_ms=300)
+
+    async def upload():
+        for i in range(0, len(data), 4096):
+            yield data[i:i + 4096]
+
+    started = time.perf_counter()
+    partials = [partial async for partial in engine.stream(upload(), "en")]
+    assert time.perf_counter() - started < 0.6  # four 0.2 s decodes overlapped
+    assert [partial.segment.text for partial in partials] == phrases
+    assert partials[1].text == "create a todo" and partials[-1].text == "create a todo app with login"
+
+    transcript = await engine.transcribe(data, "en")
+    assert transcript.text == "create a todo app with login" and transcript.backend == "deterministic"
+    assert engine.get_stats()["segments"] == 8
+    with pytest.raises(AudioTooLargeError, match="File size must be less than"):
+        await engine.transcribe(io.BytesIO(data), "en", max_bytes=len(data) // 2)
+    with pytest.raises(AudioInputError):  # input errors are not retried on another backend
+        await engine.transcribe(b"not audio at all", "en")
+    engine.close()
+
+
+def test_whisper_backend_does_not_download_by_default():
+    pytest.importorskip("transformers")
+    backend = WhisperBackend("example-org/not-a-cached-model")
+    with pytest.raises(SpeechModelUnavailableError, match="STT_ALLOW_DOWNLOAD"):
+        backend.transcribe(None, "en")
@@ -0,0 +1,78 @@
+"""
+Tests for quorum-based early exit in the swarm orchestrator
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.swarm_ai_orchestrator import (
+    AgentResult,
+    AgentRole,
+    ConsensusLevel,
+    QuorumPolicy,
+    SwarmAgent,
+    SwarmAIOrchestrator,
+    SwarmArchitecture,
+    SwarmTask,
+)
+
+
+class TimedAgent(SwarmAgent):
+    """Answers with a fixed confidence after ``delay`` seconds"""
+
+    def __init__(self, agent_id, role, delay, confidence=0.95):
+        super().__init__(agent_id, role, [])
+        self.delay = delay
+        self.confidence = confidence
+        self.cancelled = False
+
+    async def process_task(self, task):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return AgentResult(self.agent_id, task.task_id, {"by": self.agent_id}, self.confidence, 0.95, [], "")
+
+
+def _task(**constraints):
+    return SwarmTask("t1", "analysis", "check", complexity_level=1, accuracy_requirement=0.5, constraints=constraints)
+
+
+async def _swarm(agents, policy=None):
+    swarm = SwarmAIOrchestrator("s1", SwarmArchitecture.CONSENSUS, policy)
+    for agent in agents:
+        await swarm.add_agent(agent)
+    return swarm
+
+
+@pytest.mark.asyncio
+async def test_majority_quorum_cancels_stragglers():
+    fast = [TimedAgent(f"e{i}", AgentRole.EXECUTOR, 0.01 * i) for i in range(3)]
+    slow = [TimedAgent("v0", AgentRole.VALIDATOR, 5), TimedAgent("v1", AgentRole.VALIDATOR, 5)]
+    swarm = await _swarm(fast + slow, QuorumPolicy(level=ConsensusLevel.MAJORITY))
+
+    result = await asyncio.wait_for(swarm.execute_swarm_task(_task()), 1)
+    quorum = result.validation_summary["quorum"]
+    assert quorum["early_exit"] and quorum["required_results"] == 3
+    assert sorted(result.consensus_agents) == ["e0", "e1", "e2"]
+    assert sorted(quorum["cancelled_agents"]) == ["v0", "v1"] and all(agent.cancelled for agent in slow)
+
+    metrics = (await swarm.get_swarm_status())["metrics"]
+    assert (metrics["early_exit_rate"], metrics["agents_cancelled"]) == (1.0, 2)
+
+
+@pytest.mark.asyncio
+async def test_low_agreement_and_unanimity_wait_for_everyone():
+    agents = [TimedAgent("e0", AgentRole.EXECUTOR, 0, 0.5), TimedAgent("e1", AgentRole.EXECUTOR, 0, 0.5),
+              TimedAgent("e2", AgentRole.EXECUTOR, 0.05), TimedAgent("v0", AgentRole.VALIDATOR, 0.05)]
+    swarm = await _swarm(agents, QuorumPolicy(level=ConsensusLevel.MAJORITY, min_confidence=80))
+    outcome = await swarm._execute_parallel_processing(_task(), agents)
+    assert not outcome.early_exit and len(outcome.results) == 4
+
+    # A task can demand unanimity; a straggler past its role timeout is dropped instead
+    swarm.quorum_policy.role_timeouts = {AgentRole.VALIDATOR: 0.01}
+    outcome = await swarm._execute_parallel_processing(_task(consensus_level="unanimous"), agents)
+    assert outcome.required_results == 4 and not outcome.early_exit
+    assert outcome.timed_out_agents == ["v0"] and len(outcome.results) == 3
@@ -0,0 +1,70 @@
+"""
+Tests for the project symbol trie behind identifier completions
+"""
+
+import pytest
+
+from app.services.smart_coding_ai_enums import Language
+from app.services.smart_coding_ai_models import CompletionContext
+from app.services.smart_coding_ai_optimized import CompletionGenerator
+from app.services.symbol_completion import (
+    SymbolCompletionIndex,
+    SymbolEntry,
+    SymbolTrie,
+    drop_symbol_completion_index,
+    get_symbol_completion_index,
+)
+
+
+def test_persistent_trie_updates_and_best_first_order():
+    names = ["get", "get_user", "get_user_profile", "getter", "set_user", "gamma"]
+    trie = SymbolTrie.build((name, SymbolEntry(name, "function", definitions=len(name))) for name in names)
+    updated = trie.set("get_users", SymbolEntry("get_users", "function", definitions=100)).set("getter", None)
+
+    # The original snapshot is untouched by later updates
+    assert [entry.name for entry in trie.walk("get")] == ["get_user_profile", "get_user", "getter", "get"]
+    assert [entry.name for entry in updated.top("get", 3)] == ["get_users", "get_user_profile", "get_user"]
+    assert len(trie) == 6 and len(updated) == 6 and updated.get("getter") is None
+    assert updated.get("gamma").name == "gamma" and updated.top("x", 3) == []
+
+    # Incremental and bulk construction agree
+    incremental = SymbolTrie()
+    for name in names:
+        incremental = incremental.set(name, SymbolEntry(name, "function", definitions=len(name)))
+    assert [entry.name for entry in incremental.walk()] == [entry.name for entry in trie.walk()]
+
+
+def test_index_prefix_fuzzy_and_usage_ranking():
+    index = SymbolCompletionIndex()
+    index.update_file("users.py", [("get_user_profile", "function"), ("UserProfile", "class"),
+                                   ("get_username", "function"), ("user_id", "variable")])
+    index.update_file("api.py", [("get_user_profile", "function"), ("groupUsersByPlan", "function")])
+
+    assert [match.name for match in index.complete("get_u", 2)] == ["get_user_profile", "get_username"]
+    assert index.complete("gup", 1)[0].name == "get_user_profile"  # initials
+    assert index.complete("gubp", 1)[0].name == "groupUsersByPlan"
+    assert index.complete("grpusr", 1)[0].match == "fuzzy"  # subsequence scan
+
+    index.record_use("get_username")
+    index.record_use("get_username")
+    assert index.complete("get_u", 1)[0].name == "get_username"
+    assert index.complete("user", 2, history=["UserProfile()"])[0].name == "UserProfile"
+
+    index.remove_file("users.py")
+    assert [match.name for match in index.complete("get", 5)] == ["get_user_profile"]
+    index.remove_file("api.py")
+    assert index.complete("get", 5) == [] and len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_generator_completes_project_identifiers():
+    index = get_symbol_completion_index("symbols-project")
+    index.update_file("billing.py", [("calculate_invoice_total", "function")])
+    try:
+        content = "def checkout(cart):\n    total = calculate_inv"
+        context = CompletionContext(file_path="checkout.py", language=Language.PYTHON, content=content,
+                                    cursor_position=(2, 29), project_context={"project_id": "symbols-project"})
+        completion = await CompletionGenerator().generate_completion(context)
+        assert completion.text == "oice_total"
+    finally:
+        drop_symbol_completion_index("symbols-project")
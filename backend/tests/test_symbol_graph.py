@@ -0,0 +1,90 @@
+"""
+Tests for the cross-file symbol graph used by agent mode
+"""
+
+import os
+
+import pytest
+
+from app.services.repository_indexer import RepositoryIndexer
+from app.services.symbol_graph import SYMBOL_LANGUAGES, SymbolGraph, extract_file_symbols
+
+FILES = {
+    "pkg/__init__.py": "",
+    "pkg/billing.py": "class PaymentService:\n    def refund(self, amount):\n        return amount\n",
+    "pkg/api.py": "from pkg.billing import PaymentService\n\ndef refund_order(order):\n"
+                  "    return PaymentService().refund(order.total)\n",
+    "pkg/routes.py": "from . import api\n\nROUTES = [api.refund_order]\n",
+    "other/unrelated.py": "def refund(x):\n    return x\n\nrefund(1)\n",
+    "web/client.ts": "import { fetchOrder } from './orders';\nexport function show() { return fetchOrder(1); }\n",
+    "web/orders.ts": "export async function fetchOrder(id: number) { return id; }\n",
+}
+
+
+def _write(root, path, text):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text)
+
+
+async def _sync(indexer, graph):
+    async for update in indexer.run():
+        graph.apply(update)
+
+
+@pytest.mark.asyncio
+async def test_definitions_references_and_impact(tmp_path):
+    for path, text in FILES.items():
+        _write(tmp_path, path, text)
+    graph = SymbolGraph()
+    await _sync(RepositoryIndexer(str(tmp_path), max_workers=1, parser=extract_file_symbols,
+                                  languages=SYMBOL_LANGUAGES), graph)
+
+    assert [(d.qualified_name, d.kind, d.path, d.line) for d in graph.definitions("PaymentService.refund")] == \
+        [("PaymentService.refund", "method", "pkg/billing.py", 2)]
+    assert {d.path for d in graph.definitions("refund")} == {"pkg/billing.py", "other/unrelated.py"}
+
+    # Strict references skip files that merely share the name
+    assert [(r.path, r.line) for r in graph.find_references("PaymentService.refund")] == [("pkg/api.py", 4)]
+    assert "other/unrelated.py" in {r.path for r in graph.find_references("PaymentService.refund", strict=False)}
+
+    assert graph.dependents("pkg/api.py") == ["pkg/routes.py"]
+    assert graph.dependencies("web/client.ts") == ["web/orders.ts"]
+    assert graph.impact("PaymentService") == {"pkg/billing.py": 0, "pkg/api.py": 1, "pkg/routes.py": 2}
+    assert graph.impact("PaymentService", max_depth=1) == {"pkg/billing.py": 0, "pkg/api.py": 1}
+    assert graph.impact("web/orders.ts") == {"web/orders.ts": 0, "web/client.ts": 1}
+    assert graph.files_for_request("change how the payment service refunds")[:2] == ["pkg/billing.py", "pkg/api.py"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_rewire_edges(tmp_path):
+    for path, text in FILES.items():
+        _write(tmp_path, path, text)
+    graph = SymbolGraph()
+    indexer = RepositoryIndexer(str(tmp_path), max_workers=1, parser=extract_file_symbols, languages=SYMBOL_LANGUAGES)
+    await _sync(indexer, graph)
+
+    os.remove(tmp_path / "pkg/billing.py")
+    await _sync(indexer, graph)
+    assert graph.definitions("PaymentService") == [] and graph.dependencies("pkg/api.py") == []
+
+    # An importer whose target appears later is connected without being re-parsed
+    _write(tmp_path, "pkg/billing.py", "class PaymentService:\n    pass\n")
+    await _sync(indexer, graph)
+    assert indexer.progress.files_parsed == 1
+    assert graph.dependencies("pkg/api.py") == ["pkg/billing.py"]
+    assert graph.impact("PaymentService")["pkg/routes.py"] == 2
+
+
+@pytest.mark.asyncio
+async def test_file_grown_past_size_limit_drops_its_symbols(tmp_path):
+    _write(tmp_path, "pkg/billing.py", FILES["pkg/billing.py"])
+    graph = SymbolGraph()
+    indexer = RepositoryIndexer(str(tmp_path), max_workers=1, max_file_bytes=200,
+                                parser=extract_file_symbols, languages=SYMBOL_LANGUAGES)
+    await _sync(indexer, graph)
+    assert [d.path for d in graph.definitions("PaymentService")] == ["pkg/billing.py"]
+
+    _write(tmp_path, "pkg/billing.py", FILES["pkg/billing.py"] + "# padding\n" * 50)
+    await _sync(indexer, graph)
+    assert graph.definitions("PaymentService") == [] and graph.stats["removals"] == 1
@@ -0,0 +1,166 @@
+"""
+Tests for provider token streaming and the SSE/WebSocket transports
+
+Covers chunk ordering, fallback only before the first token, and that a
+client going away closes the upstream provider request.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from app.core.streaming import sse_token_events, websocket_token_stream
+from app.core.strategies.ai_provider_strategy import (
+    AIProviderManager,
+    AIProviderType,
+    LocalLLMStrategy,
+)
+from loadtest.stub_llm_server import StubLLMServer, StubProfile
+
+
+class TrackedTokens:
+    """Async token source that records whether it was closed early"""
+
+    def __init__(self, tokens, delay: float = 0.0, fail_after: int = None):
+        self.tokens = tokens
+        self.delay = delay
+        self.fail_after = fail_after
+        self.closed = False
+        self.emitted = 0
+
+    async def __call__(self, *args, **kwargs):
+        try:
+            for token in self.tokens:
+                if self.fail_after is not None and self.emitted >= self.fail_after:
+                    raise RuntimeError("provider failed")
+                await asyncio.sleep(self.delay)
+                self.emitted += 1
+                yield token
+        finally:
+            self.closed = True
+
+
+class FakeProvider:
+    def __init__(self, source: TrackedTokens):
+        self.stream_completion = source
+        self.stream_chat_completion = source
+
+
+def _manager(*sources: TrackedTokens) -> AIProviderManager:
+    manager = AIProviderManager()
+    provider_types = [AIProviderType.LOCAL_LLM, AIProviderType.OPENAI, AIProviderType.ANTHROPIC]
+    for provider_type, source in zip(provider_types, sources):
+        manager.providers[provider_type] = FakeProvider(source)
+    manager.primary_provider = provider_types[0]
+    manager.fallback_providers = provider_types[1:len(sources)]
+    return manager
+
+
+class TestProviderManagerStreaming:
+    """Fallback happens only before anything was emitted"""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_before_first_token(self):
+        manager = _manager(TrackedTokens(["a"], fail_after=0), TrackedTokens(["b", "c"]))
+        assert [t async for t in manager.stream_completion("prompt")] == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_failure_is_raised(self):
+        fallback = TrackedTokens(["x"])
+        manager = _manager(TrackedTokens(["a", "b"], fail_after=1), fallback)
+        received = []
+        with pytest.raises(RuntimeError):
+            async for text in manager.stream_completion("prompt"):
+                received.append(text)
+        assert received == ["a"]
+        assert fallback.emitted == 0
+
+
+class TestSSETransport:
+
+    @pytest.mark.asyncio
+    async def test_event_sequence(self):
+        source = TrackedTokens(["def", " f", "():"])
+        events = [e async for e in sse_token_events(source(), stream_id="s1")]
+        names = [e.split("\n", 1)[0] for e in events]
+        assert names == ["event: start", "event: token", "event: token", "event: token", "event: done"]
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert done["chunks"] == 3
+        assert done["time_to_first_token_ms"] is not None
+
+    @pytest.mark.asyncio
+    async def test_early_close_closes_upstream(self):
+        source = TrackedTokens(["a"] * 100, delay=0.001)
+        events = sse_token_events(source(), stream_id="s2")
+        await events.__anext__()
+        await events.__anext__()
+        await events.aclose()
+        assert source.closed
+        assert source.emitted < 100
+
+
+class TestWebSocketTransport:
+
+    def test_cancel_stops_stream(self):
+        source = TrackedTokens(["tok"] * 1000, delay=0.005)
+        app = FastAPI()
+
+        @app.websocket("/ws")
+        async def endpoint(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.receive_json()
+            await websocket_token_stream(websocket, source(), stream_id="w1")
+            await websocket.close()
+
+        with TestClient(app).websocket_connect("/ws") as ws:
+            ws.send_json({"type": "complete"})
+            assert ws.receive_json()["type"] == "start"
+            assert ws.receive_json()["type"] == "token"
+            ws.send_json({"type": "cancel"})
+            message = ws.receive_json()
+            while message["type"] == "token":
+                message = ws.receive_json()
+            assert message["type"] == "cancelled"
+
+        assert source.closed
+        assert source.emitted < 1000
+
+
+@pytest.mark.asyncio
+async def test_local_llm_stream_abort_reaches_server():
+    """Closing a LocalLLMStrategy stream drops the upstream connection"""
+    server = StubLLMServer(StubProfile.from_dict({"tokens_per_second": 200.0, "max_output_tokens": 400,
+                                                  "min_output_tokens": 400}))
+    port = await server.start("127.0.0.1", 0)
+    strategy = LocalLLMStrategy("", f"http://127.0.0.1:{port}")
+    try:
+        stream = strategy.stream_completion("hello", max_tokens=400)
+        assert await stream.__anext__()
+        await stream.aclose()
+        for _ in range(50):
+            if server.stats.cancelled:
+                break
+            await asyncio.sleep(0.02)
+        assert server.stats.cancelled == 1
+    finally:
+        await strategy._session.close()
+        await server.stop()
+
+
+def test_streaming_prompt_ends_at_cursor():
+    """The prompt prefix stops at the 1-based cursor line and column"""
+    from app.services.smart_coding_ai_enums import Language
+    from app.services.smart_coding_ai_models import CompletionContext
+    from app.services.smart_coding_ai_optimized import smart_coding_ai_optimized
+
+    content = "def foo():\n    retAFTER\nNEXTLINE_zzz\n"
+    context = CompletionContext(file_path="foo.py", language=Language.PYTHON, content=content,
+                                cursor_position=(2, 7))
+    prompt = smart_coding_ai_optimized._build_streaming_prompt(context)
+    assert prompt.endswith("\ndef foo():\n    ret")
+
+    context.cursor_position = (99, 3)
+    assert smart_coding_ai_optimized._build_streaming_prompt(context).endswith("NEXTLINE_zzz\n")
@@ -0,0 +1,138 @@
+"""
+Tests for the concurrent, budgeted validator engine
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.core.validation_engine import (
+    ExecutionMode,
+    ValidationEngine,
+    ValidationEngineConfig,
+    ValidatorSpec,
+    ValidatorStatus,
+)
+
+
+class SleepyValidator:
+    async def check(self, delay: float, verdict: str = "ok"):
+        await asyncio.sleep(delay)
+        return {"verdict": verdict}
+
+
+class PidValidator:
+    def check(self, code: str):
+        return {"pid": os.getpid(), "length": len(code)}
+
+
+def _engine(**overrides) -> ValidationEngine:
+    config = ValidationEngineConfig(mode=ExecutionMode.ASYNC, max_workers=2, default_timeout_s=1.0,
+                                    budget_ms=1000.0, process_min_code_chars=0)
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return ValidationEngine(config)
+
+
+def _sleepy(name: str, delay: float, verdict: str = "ok", **kwargs) -> ValidatorSpec:
+    return ValidatorSpec(name, SleepyValidator(), "check", (delay, verdict), mode=ExecutionMode.ASYNC, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_validators_run_concurrently():
+    started = time.perf_counter()
+    run = await _engine().run([_sleepy(f"v{i}", 0.05) for i in range(4)])
+    assert (time.perf_counter() - started) < 0.15
+    assert not run.partial
+    assert set(run.results) == {"v0", "v1", "v2", "v3"}
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_failure_are_isolated():
+    run = await _engine().run([
+        _sleepy("fast", 0.0),
+        _sleepy("stuck", 1.0, timeout_s=0.02),
+        ValidatorSpec("broken", None, "check", mode=ExecutionMode.ASYNC),
+    ])
+    assert run.results == {"fast": {"verdict": "ok"}}
+    assert run.outcomes["stuck"].status == ValidatorStatus.TIMED_OUT
+    assert run.outcomes["broken"].status == ValidatorStatus.FAILED
+    assert run.partial
+
+
+@pytest.mark.asyncio
+async def test_budget_returns_partial_results():
+    run = await _engine(budget_ms=30.0).run([_sleepy("fast", 0.0), _sleepy("slow", 0.5)])
+    assert run.elapsed_ms < 200
+    assert "fast" in run.results
+    assert run.outcomes["slow"].status == ValidatorStatus.SKIPPED
+    assert run.summary()["partial"] is True
+
+
+@pytest.mark.asyncio
+async def test_critical_failure_short_circuits():
+    run = await _engine().run([
+        _sleepy("security", 0.0, "vulnerable", is_critical_failure=lambda r: r["verdict"] == "vulnerable"),
+        _sleepy("quality", 0.5),
+    ])
+    assert run.short_circuited_by == "security"
+    assert run.outcomes["quality"].status == ValidatorStatus.CANCELLED
+
+    run = await _engine().run([
+        _sleepy("security", 0.0, "vulnerable", is_critical_failure=lambda r: r["verdict"] == "vulnerable"),
+        _sleepy("quality", 0.01),
+    ], short_circuit=False)
+    assert run.short_circuited_by is None
+    assert not run.partial
+
+
+@pytest.mark.asyncio
+async def test_process_mode_runs_in_worker_and_falls_back():
+    class LocalValidator:
+        # Not importable by name, so it cannot be sent to a worker
+        def check(self, code: str):
+            return {"length": len(code)}
+
+    engine = _engine(mode=ExecutionMode.PROCESS, default_timeout_s=10.0, budget_ms=10000.0)
+    try:
+        run = await engine.run([
+            ValidatorSpec("pid", PidValidator(), "check", ("x = 1",)),
+            ValidatorSpec("local", LocalValidator(), "check", ("x = 1",)),
+        ])
+    finally:
+        engine.shutdown()
+
+    assert run.outcomes["pid"].mode == ExecutionMode.PROCESS
+    assert run.results["pid"] == {"pid": run.results["pid"]["pid"], "length": 5}
+    assert run.results["pid"]["pid"] != os.getpid()
+    # Unpicklable validators run inline instead of failing
+    assert run.outcomes["local"].mode == ExecutionMode.ASYNC
+    assert run.results["local"] == {"length": 5}
+
+
+class BlockingValidator:
+    def check(self, delay: float):
+        time.sleep(delay)
+        return {"verdict": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_small_inputs_stay_in_process():
+    engine = _engine(mode=ExecutionMode.PROCESS, process_min_code_chars=1000)
+    run = await engine.run([ValidatorSpec("pid", PidValidator(), "check", ("x = 1",))], size_hint=5)
+    assert run.outcomes["pid"].mode == ExecutionMode.THREAD
+    assert run.results["pid"]["pid"] == os.getpid()
+    assert engine._pool is None
+
+
+@pytest.mark.asyncio
+async def test_small_blocking_validator_still_times_out():
+    engine = _engine(mode=ExecutionMode.PROCESS, process_min_code_chars=1000, default_timeout_s=0.05)
+    started = time.perf_counter()
+    run = await engine.run([ValidatorSpec("slow", BlockingValidator(), "check", (0.5,)), _sleepy("fast", 0.01)],
+                           size_hint=5)
+    assert time.perf_counter() - started < 0.4
+    assert run.outcomes["slow"].status == ValidatorStatus.TIMED_OUT
+    assert run.outcomes["fast"].status == ValidatorStatus.COMPLETED
@@ -0,0 +1,96 @@
+"""
+Tests for the in-process vector index and semantic memory retrieval
+"""
+
+import numpy as np
+import pytest
+
+from app.core.vector_index import VectorIndex
+from app.services.codebase_memory_system import CodebaseMemorySystem
+from app.services.snapshot_store import SnapshotStore
+
+
+def _clustered(n, dim=32, clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(0, clusters, n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def test_exact_and_ivf_search_agree():
+    vectors = _clustered(4000)
+    ids = [f"v{i}" for i in range(len(vectors))]
+    index = VectorIndex(ann_threshold=1000)
+    index.add(ids, vectors, [{"kind": "even" if i % 2 == 0 else "odd"} for i in range(len(ids))])
+
+    queries = _clustered(20, seed=1)
+    recall = []
+    for query in queries:
+        exact = {hit.id for hit in index.search(query, 10, exact=True)}
+        approximate = {hit.id for hit in index.search(query, 10)}
+        recall.append(len(exact & approximate) / 10)
+    assert np.mean(recall) >= 0.9
+    assert index.get_stats()["mode"] == "ivf" and index.stats["ann_searches"] == 20
+
+    hits = index.search(queries[0], 5, filters={"kind": "odd"}, exact=True)
+    assert len(hits) == 5 and all(int(hit.id[1:]) % 2 == 1 for hit in hits)
+    assert index.search(queries[0], 5, filters={"kind": "missing"}) == []
+
+
+def test_tombstones_compaction_and_persistence(tmp_path):
+    vectors = _clustered(2000)
+    index = VectorIndex(path=str(tmp_path))
+    index.add([f"v{i}" for i in range(2000)], vectors, [{"project_id": f"p{i % 2}"} for i in range(2000)],
+              payloads=list(range(2000)))
+    assert index.search(vectors[7], 1)[0].id == "v7"
+
+    index.delete(["v7"])
+    assert index.search(vectors[7], 1)[0].id != "v7" and "v7" not in index
+    assert index.delete_where(project_id="p0") == 1000
+    assert index.stats["compactions"] == 1 and index.get_stats()["tombstones"] == 0
+
+    index.add(["v1"], vectors[0])  # replacing an id moves it to the new vector
+    assert index.search(vectors[0], 1)[0].id == "v1"
+    index.save()
+
+    reloaded = VectorIndex(path=str(tmp_path))
+    assert len(reloaded) == 999
+    hit = reloaded.search(vectors[9], 1, filters={"project_id": "p1"})[0]
+    assert (hit.id, hit.payload, hit.metadata) == ("v9", 9, {"project_id": "p1"})
+    assert len([path for path in tmp_path.iterdir() if path.suffix in (".f32", ".npz")]) == 2
+
+
+def test_captured_state_survives_compaction_before_the_write(tmp_path):
+    vectors = _clustered(2000)
+    index = VectorIndex(path=str(tmp_path))
+    index.add([f"v{i}" for i in range(2000)], vectors)
+    state = index.capture_state()
+    index.delete([f"v{i}" for i in range(1000)])  # compacts onto a new matrix file
+    index.write_state(state)
+
+    assert len(VectorIndex(path=str(tmp_path))) == 2000
+    index.save()
+    assert len(VectorIndex(path=str(tmp_path))) == 1000
+    assert len([path for path in tmp_path.iterdir() if path.suffix in (".f32", ".npz")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_retrieve_context_fuses_semantic_and_keyword_hits(tmp_path):
+    project = tmp_path / "project"
+    (project / "billing").mkdir(parents=True)
+    (project / "billing" / "invoices.py").write_text(
+        "def calculate_invoice_total(items):\n    return sum(items)\n\n"
+        "def send_invoice_email(invoice):\n    pass\n"
+    )
+    (project / "users.py").write_text("class UserProfile:\n    pass\n\ndef get_user_profile(user_id):\n    pass\n")
+
+    memory = CodebaseMemorySystem(SnapshotStore(None))
+    try:
+        project_id = (await memory.analyze_project(str(project), "deep"))["project_id"]
+        results = await memory.retrieve_context("compute the total of an invoice", project_id, limit=3)
+        assert results[0]["pattern_name"] == "calculate_invoice_total"
+
+        classes = await memory.retrieve_context("user profile", project_id, kinds=["class"])
+        assert [result["pattern_name"] for result in classes] == ["UserProfile"]
+        assert (await memory.get_memory_status())["vector_index"]["pending"] == 0
+    finally:
+        memory.shutdown()